@@ -0,0 +1,141 @@
+"""Word-prefix search over the accession search summaries.
+
+:class:`cms.filters.AccessionFilter` resolves its taxon, element and rank
+filters to the ids of matching accessions through this module rather than
+joining rows, identifications, taxa and elements. Each filter value is split
+into words, and an accession matches when every word starts a word in the
+searched :class:`cms.models.AccessionSearchSummary` column.
+
+On MySQL the columns carry ``FULLTEXT`` indexes (migration
+``0100_accession_search_fulltext``) searched with ``MATCH ... AGAINST`` in
+boolean mode. Other databases, including the SQLite test database, use an
+equivalent regular expression. ``ACCESSION_SEARCH_BACKEND`` names the
+backend class to use instead of the automatic choice.
+"""
+from __future__ import annotations
+
+import re
+from functools import reduce
+from operator import and_
+
+from django.conf import settings
+from django.db import connection, models
+from django.db.models import F, Q
+from django.utils.module_loading import import_string
+
+from .accession_summaries import RANK_FIELDS
+from .models import AccessionSearchSummary
+
+#: Summary columns the accession filters search.
+SEARCH_FIELDS = ("taxon_names", "elements", *RANK_FIELDS)
+
+_WORD = re.compile(r"\w+")
+
+# InnoDB's default FULLTEXT stopwords, which the index never holds.
+_INNODB_STOPWORDS = frozenset(
+    "a about an are as at be by com de en for from how i in is it la of on or "
+    "that the this to was what when where who will with und www".split()
+)
+
+
+def search_terms(value: str) -> list[str]:
+    """Return the distinct words of ``value`` in order."""
+
+    return list(dict.fromkeys(_WORD.findall(value or "")))
+
+
+def min_token_size() -> int:
+    """Shortest word the ``FULLTEXT`` index holds (``innodb_ft_min_token_size``)."""
+
+    try:
+        return max(1, int(getattr(settings, "ACCESSION_SEARCH_MIN_TOKEN_SIZE", 3)))
+    except (TypeError, ValueError):
+        return 3
+
+
+class MatchAgainst(models.Func):
+    """``MATCH (column) AGAINST (query IN BOOLEAN MODE)`` relevance of one column."""
+
+    output_field = models.FloatField()
+
+    def __init__(self, column: str, query: str):
+        super().__init__(F(column), models.Value(query))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        column_sql, column_params = compiler.compile(self.source_expressions[0])
+        query_sql, query_params = compiler.compile(self.source_expressions[1])
+        return (
+            f"MATCH ({column_sql}) AGAINST ({query_sql} IN BOOLEAN MODE)",
+            (*column_params, *query_params),
+        )
+
+
+class WordPrefixSearchBackend:
+    """Match word prefixes with a case-insensitive regular expression."""
+
+    def condition(self, field: str, terms: list[str]) -> Q:
+        return reduce(
+            and_,
+            (Q(**{f"{field}__iregex": rf"(^|\W){re.escape(term)}"}) for term in terms),
+        )
+
+    def matching(self, field: str, terms: list[str]) -> models.QuerySet:
+        return AccessionSearchSummary.objects.filter(self.condition(field, terms))
+
+
+class FullTextSearchBackend(WordPrefixSearchBackend):
+    """Match word prefixes through MySQL ``FULLTEXT`` indexes.
+
+    Words shorter than the index's minimum token size and stopwords are not
+    indexed, so they are matched with the regular expression instead.
+    """
+
+    def _indexed(self, term: str) -> bool:
+        return len(term) >= min_token_size() and term.lower() not in _INNODB_STOPWORDS
+
+    def matching(self, field: str, terms: list[str]) -> models.QuerySet:
+        indexed = [term for term in terms if self._indexed(term)]
+        unindexed = [term for term in terms if not self._indexed(term)]
+        queryset = AccessionSearchSummary.objects.all()
+        if indexed:
+            query = " ".join(f"+{term}*" for term in indexed)
+            queryset = queryset.alias(relevance=MatchAgainst(field, query)).filter(relevance__gt=0)
+        if unindexed:
+            queryset = queryset.filter(self.condition(field, unindexed))
+        return queryset
+
+
+def get_backend() -> WordPrefixSearchBackend:
+    path = getattr(settings, "ACCESSION_SEARCH_BACKEND", "")
+    if path:
+        return import_string(path)()
+    if connection.vendor == "mysql":
+        return FullTextSearchBackend()
+    return WordPrefixSearchBackend()
+
+
+def matching_accession_ids(field: str, value: str) -> models.QuerySet | None:
+    """Return the ids of accessions whose summary ``field`` contains every word of ``value``.
+
+    The result is a subquery for ``pk__in`` lookups. ``None`` means ``value``
+    holds no words and should not filter at all.
+    """
+
+    if field not in SEARCH_FIELDS:
+        raise ValueError(f"{field!r} is not a searchable accession summary field.")
+    terms = search_terms(value)
+    if not terms:
+        return None
+    return get_backend().matching(field, terms).values("accession_id")
+
+
+__all__ = [
+    "FullTextSearchBackend",
+    "MatchAgainst",
+    "SEARCH_FIELDS",
+    "WordPrefixSearchBackend",
+    "get_backend",
+    "matching_accession_ids",
+    "min_token_size",
+    "search_terms",
+]
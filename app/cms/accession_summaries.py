@@ -0,0 +1,301 @@
+"""Denormalised accession summaries behind the accession lists and filters.
+
+Accession lists used to prefetch every row, identification, taxon and
+element of the page, and the taxon and element filters joined through all of
+them, to show one line of taxa and elements per accession. Instead,
+:class:`cms.models.AccessionSearchSummary` keeps that line, the names the
+filters match and a few counts in one row per accession.
+
+The signal handlers in :mod:`cms.signals` call :func:`refresh` for the
+accessions touched by an :class:`AccessionRow`, :class:`Identification`,
+:class:`NatureOfSpecimen` or :class:`Taxon` save or delete; bulk writers that
+bypass signals call it themselves. :func:`rebuild` recomputes every summary
+(see the ``rebuild_accession_summaries`` management command) after taxonomy
+syncs, element or storage renames and other bulk changes.
+"""
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+from typing import Any, Iterable
+
+from django.db import models, transaction
+from django.db.models import Q
+
+from .models import (
+    Accession,
+    AccessionRow,
+    AccessionSearchSummary,
+    Identification,
+    NatureOfSpecimen,
+    Taxon,
+    TaxonStatus,
+)
+
+#: Taxon attributes copied into the summary for the rank filters.
+RANK_FIELDS = ("family", "subfamily", "tribe", "genus", "species")
+
+#: Accessions refreshed and written per batch.
+BATCH_SIZE = 500
+
+#: Fields whose changes alter the summary of the accession a record belongs to.
+TRACKED_FIELDS: dict[type[models.Model], tuple[str, ...]] = {
+    AccessionRow: ("accession", "storage"),
+    Identification: ("accession_row", "taxon", "taxon_verbatim", "taxon_record"),
+    NatureOfSpecimen: ("accession_row", "element"),
+    Taxon: ("taxon_name", "status", "is_active", "accepted_taxon", *RANK_FIELDS),
+}
+
+# Lookup from each tracked record to the accession it belongs to.
+_ACCESSION_LOOKUPS: dict[type[models.Model], str] = {
+    AccessionRow: "accession_id",
+    Identification: "accession_row__accession_id",
+    NatureOfSpecimen: "accession_row__accession_id",
+}
+
+_PREVIOUS_ATTR = "_accession_summary_previous"
+
+# Accessions and rows whose deletion is in progress on this thread. Their
+# children are deleted first, and refreshing the summary at that point would
+# recreate a row the cascade has already removed.
+_deleting = threading.local()
+
+
+def _pending(kind: str) -> set[int]:
+    pending = getattr(_deleting, kind, None)
+    if pending is None:
+        pending = set()
+        setattr(_deleting, kind, pending)
+    return pending
+
+
+def _join(values: Iterable[str | None]) -> str:
+    cleaned = {value.strip() for value in values if value and value.strip()}
+    return AccessionSearchSummary.SEPARATOR.join(sorted(cleaned))
+
+
+def _tracks(model: type[models.Model], update_fields: Iterable[str] | None) -> bool:
+    if update_fields is None:
+        return True
+    names = set(update_fields)
+    return any(
+        field.name in names or field.attname in names
+        for field in (model._meta.get_field(name) for name in TRACKED_FIELDS[model])
+    )
+
+
+def build_summaries(accession_ids: Iterable[int]) -> list[AccessionSearchSummary]:
+    """Return unsaved summaries for ``accession_ids`` computed with a fixed number of queries."""
+
+    ids = list(accession_ids)
+    if not ids:
+        return []
+    counts: dict[int, dict[str, int]] = {pk: defaultdict(int) for pk in ids}
+    values: dict[int, dict[str, set[str]]] = {pk: defaultdict(set) for pk in ids}
+
+    for accession_id, area in AccessionRow.objects.filter(accession_id__in=ids).values_list(
+        "accession_id", "storage__area"
+    ):
+        counts[accession_id]["row_count"] += 1
+        values[accession_id]["storage_areas"].add(area)
+
+    identifications = list(
+        Identification.objects.filter(accession_row__accession_id__in=ids).values(
+            "accession_row__accession_id",
+            "taxon",
+            "taxon_verbatim",
+            "taxon_record_id",
+            "taxon_record__taxon_name",
+            *(f"taxon_record__{rank}" for rank in RANK_FIELDS),
+        )
+    )
+    record_ids = {row["taxon_record_id"] for row in identifications if row["taxon_record_id"]}
+    synonyms: dict[int, set[str]] = defaultdict(set)
+    if record_ids:
+        for accepted_id, name in Taxon.objects.filter(accepted_taxon_id__in=record_ids).values_list(
+            "accepted_taxon_id", "taxon_name"
+        ):
+            synonyms[accepted_id].add(name)
+    # Free-text names also pick up the ranks of the accepted taxa they spell out.
+    free_text = {
+        name
+        for row in identifications
+        for name in (row["taxon"], row["taxon_verbatim"])
+        if name
+    }
+    ranks_by_name: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    if free_text:
+        for taxon in Taxon.objects.filter(
+            status=TaxonStatus.ACCEPTED, is_active=True, taxon_name__in=free_text
+        ).values("taxon_name", *RANK_FIELDS):
+            ranks_by_name[taxon["taxon_name"]].append(taxon)
+
+    for row in identifications:
+        accession_id = row["accession_row__accession_id"]
+        found = values[accession_id]
+        counts[accession_id]["identification_count"] += 1
+        controlled = row["taxon_record__taxon_name"]
+        found["taxa"].add(controlled or row["taxon"] or row["taxon_verbatim"])
+        names = {row["taxon"], row["taxon_verbatim"], controlled}
+        names.update(synonyms.get(row["taxon_record_id"], ()))
+        found["taxon_names"].update(names)
+        rank_sources = [{rank: row[f"taxon_record__{rank}"] for rank in RANK_FIELDS}] if controlled else []
+        for name in (row["taxon"], row["taxon_verbatim"]):
+            rank_sources.extend(ranks_by_name.get(name, ()))
+        for source in rank_sources:
+            for rank in RANK_FIELDS:
+                found[rank].add(source[rank])
+
+    for accession_id, element in NatureOfSpecimen.objects.filter(
+        accession_row__accession_id__in=ids
+    ).values_list("accession_row__accession_id", "element__name"):
+        counts[accession_id]["specimen_count"] += 1
+        values[accession_id]["elements"].add(element)
+
+    text_fields = ("taxa", "taxon_names", "elements", "storage_areas", *RANK_FIELDS)
+    return [
+        AccessionSearchSummary(
+            accession_id=pk,
+            row_count=counts[pk]["row_count"],
+            identification_count=counts[pk]["identification_count"],
+            specimen_count=counts[pk]["specimen_count"],
+            **{field: _join(values[pk][field]) for field in text_fields},
+        )
+        for pk in ids
+    ]
+
+
+def refresh(accession_ids: Iterable[int | None]) -> None:
+    """Recompute the summaries of ``accession_ids``.
+
+    Accessions that no longer exist lose their summary; those whose deletion
+    is in progress are left to the cascade.
+    """
+
+    deleting = _pending("accessions")
+    ids = sorted({pk for pk in accession_ids if pk is not None and pk not in deleting})
+    for start in range(0, len(ids), BATCH_SIZE):
+        batch = ids[start : start + BATCH_SIZE]
+        existing = Accession.objects.filter(pk__in=batch).values_list("pk", flat=True)
+        summaries = build_summaries(sorted(existing))
+        with transaction.atomic():
+            AccessionSearchSummary.objects.filter(accession_id__in=batch).delete()
+            AccessionSearchSummary.objects.bulk_create(summaries)
+
+
+def _accession_id(instance: models.Model) -> int | None:
+    if isinstance(instance, AccessionRow):
+        return instance.accession_id
+    if instance.accession_row_id is None:
+        return None
+    return instance.accession_row.accession_id
+
+
+def _taxon_accession_ids(taxon_ids: set[int | None], names: set[str | None]) -> list[int]:
+    taxon_ids.discard(None)
+    names.discard(None)
+    names.discard("")
+    query = Q(taxon_record_id__in=taxon_ids) | Q(taxon_verbatim__in=names) | Q(taxon__in=names)
+    return list(
+        Identification.objects.filter(query)
+        .order_by()
+        .values_list("accession_row__accession_id", flat=True)
+        .distinct()
+    )
+
+
+def load_previous_state(instance: models.Model, *, update_fields: Iterable[str] | None = None) -> None:
+    """Remember which accession (or which taxon names) ``instance`` belonged to before it is saved.
+
+    New records and saves whose ``update_fields`` leave the tracked fields
+    alone skip the lookup.
+    """
+
+    model = type(instance)
+    instance.__dict__.pop(_PREVIOUS_ATTR, None)
+    if instance._state.adding or instance.pk is None or not _tracks(model, update_fields):
+        return
+    if model is Taxon:
+        lookup = ("taxon_name", "accepted_taxon_id")
+    else:
+        lookup = (_ACCESSION_LOOKUPS[model],)
+    previous = model._base_manager.filter(pk=instance.pk).values_list(*lookup).first()
+    if previous is not None:
+        setattr(instance, _PREVIOUS_ATTR, previous)
+
+
+def record_saved(instance: models.Model, *, update_fields: Iterable[str] | None = None) -> None:
+    """Refresh the accessions ``instance`` belongs to now and belonged to before the save."""
+
+    previous = instance.__dict__.pop(_PREVIOUS_ATTR, ())
+    if not _tracks(type(instance), update_fields):
+        return
+    if isinstance(instance, Taxon):
+        refresh(_taxon_accession_ids(
+            {instance.pk, instance.accepted_taxon_id, *previous[1:]},
+            {instance.taxon_name, *previous[:1]},
+        ))
+        return
+    refresh({_accession_id(instance), *previous})
+
+
+def accession_deleting(accession: Accession) -> None:
+    _pending("accessions").add(accession.pk)
+
+
+def accession_deleted(accession: Accession) -> None:
+    _pending("accessions").discard(accession.pk)
+
+
+def row_deleting(row: AccessionRow) -> None:
+    _pending("rows").add(row.pk)
+
+
+def record_deleted(instance: models.Model) -> None:
+    """Refresh the accession a deleted row, identification or nature belonged to."""
+
+    if isinstance(instance, AccessionRow):
+        _pending("rows").discard(instance.pk)
+        refresh([instance.accession_id])
+        return
+    if instance.accession_row_id in _pending("rows"):
+        # The row's own delete handler refreshes the accession once.
+        return
+    refresh(
+        AccessionRow.objects.filter(pk=instance.accession_row_id).values_list("accession_id", flat=True)
+    )
+
+
+def taxon_deleted(taxon: Taxon) -> None:
+    refresh(_taxon_accession_ids({taxon.accepted_taxon_id}, {taxon.taxon_name}))
+
+
+def rebuild() -> int:
+    """Recompute every accession summary and return the number of rows written.
+
+    Writes made while the rebuild runs may be lost; run it when the archive
+    is quiet.
+    """
+
+    ids = list(Accession.objects.order_by("pk").values_list("pk", flat=True))
+    with transaction.atomic():
+        AccessionSearchSummary.objects.all().delete()
+        for start in range(0, len(ids), BATCH_SIZE):
+            AccessionSearchSummary.objects.bulk_create(build_summaries(ids[start : start + BATCH_SIZE]))
+    return len(ids)
+
+
+__all__ = [
+    "RANK_FIELDS",
+    "TRACKED_FIELDS",
+    "accession_deleted",
+    "accession_deleting",
+    "build_summaries",
+    "load_previous_state",
+    "rebuild",
+    "record_deleted",
+    "record_saved",
+    "refresh",
+    "row_deleting",
+    "taxon_deleted",
+]
@@ -6,7 +6,7 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.db.models import Count, OuterRef, Exists, Q
 from django.conf import settings
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.shortcuts import redirect
+from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
@@ -40,6 +40,9 @@ from .models import (
     Media,
     MediaQCLog,
     MediaQCComment,
+    BackgroundJob,
+    LLMBatchJob,
+    LLMResponseCache,
     LLMUsageRecord,
     SpecimenGeology,
     GeologicalContext,
@@ -85,6 +88,7 @@ from django.contrib.auth import admin as auth_admin
 from django.contrib.auth import get_user_model
 
 from .taxonomy import NowTaxonomySyncService
+from cms import jobs
 from cms.upload_processing import queue_specimen_list_processing
 
 # Configure the logger
@@ -223,18 +227,30 @@ def _taxonomy_sync_apply_view(request):
     if request.method != "POST":
         return redirect("taxonomy_sync_preview")
 
-    service = NowTaxonomySyncService()
+    job = jobs.enqueue(BackgroundJob.Kind.TAXONOMY_SYNC, dedupe_key="taxonomy_sync")
+    return redirect("taxonomy_sync_job", pk=job.pk)
 
-    try:
-        result = service.sync(apply=True)
-    except Exception as exc:  # pragma: no cover - defensive guard for runtime errors
-        messages.error(
-            request,
-            _("Unable to apply taxonomy sync: %(error)s") % {"error": exc},
-        )
-        return redirect("taxonomy_sync_preview")
 
-    import_log = result.import_log
+def _taxonomy_sync_job_view(request, pk):
+    """Show a queued taxonomy sync, then its result once a worker has applied it."""
+
+    if not _user_can_sync_taxa(request.user):
+        raise PermissionDenied
+
+    job = get_object_or_404(BackgroundJob, pk=pk, kind=BackgroundJob.Kind.TAXONOMY_SYNC)
+    if job.status != BackgroundJob.Status.SUCCEEDED:
+        context = {
+            **admin.site.each_context(request),
+            "title": _("Sync Taxa Now"),
+            "job": job,
+            "notes": [],
+            "pending_total": None,
+            "refresh_seconds": 5 if job.is_active else None,
+        }
+        return TemplateResponse(request, "admin/job_status.html", context)
+
+    result = job.result
+    import_log = TaxonomyImport.objects.filter(pk=result.get("import_log_id")).first()
     log_url = None
     if import_log:
         log_url = reverse(
@@ -242,16 +258,13 @@ def _taxonomy_sync_apply_view(request):
             args=[import_log.pk],
         )
 
-    preview = result.preview
     context = {
         **admin.site.each_context(request),
         "opts": Taxon._meta,
         "title": _("Sync Taxa Now"),
-        "result": result,
-        "preview": preview,
-        "preview_data": _serialize_preview_for_template(preview),
-        "counts": preview.counts,
-        "source_version": preview.source_version,
+        "preview_data": result.get("preview_data", {}),
+        "counts": result.get("counts", {}),
+        "source_version": result.get("source_version"),
         "import_log": import_log,
         "log_url": log_url,
         "back_url": reverse(
@@ -266,6 +279,7 @@ def _taxonomy_sync_apply_view(request):
 
 taxonomy_sync_preview_view = admin.site.admin_view(_taxonomy_sync_preview_view)
 taxonomy_sync_apply_view = admin.site.admin_view(_taxonomy_sync_apply_view)
+taxonomy_sync_job_view = admin.site.admin_view(_taxonomy_sync_job_view)
 
 
 class MergeAdminActionMixin:
@@ -1287,12 +1301,12 @@ class MediaQCLogInline(admin.TabularInline):
         return format_html("<pre style='white-space: pre-wrap;'>{}</pre>", formatted)
 
     def old_value_display(self, obj):
-        return self._format_value(obj.old_value)
+        return self._format_value(obj.old_document)
 
     old_value_display.short_description = "Previous Value"
 
     def new_value_display(self, obj):
-        return self._format_value(obj.new_value)
+        return self._format_value(obj.new_document)
 
     new_value_display.short_description = "New Value"
 
@@ -1329,6 +1343,7 @@ class LLMUsageRecordInline(admin.StackedInline):
         "completion_tokens",
         "total_tokens",
         "cost_usd",
+        "cache_hit",
         "response_id",
         "created_at",
         "updated_at",
@@ -1363,6 +1378,11 @@ class MediaAdmin(HistoricalImportExportAdmin):
         "intern_checked_on",
         "expert_checked_by",
         "expert_checked_on",
+        "ocr_data_digest",
+        "content_sha256",
+        "perceptual_hash",
+        "duplicate_of",
+        "duplicate_distance",
     )
     search_fields = (
         'file_name',
@@ -1372,13 +1392,14 @@ class MediaAdmin(HistoricalImportExportAdmin):
         'license',
         'rights_holder',
         'scanning__drawer__code',
+        'content_sha256',
     )
     autocomplete_fields = [
         'accession',
         'accession_row',
         'scanning',
     ]
-    list_filter = ('type', 'format', 'qc_status', 'rows_rearranged', ManualImportMediaFilter)
+    list_filter = ('type', 'format', 'qc_status', 'ocr_status', 'rows_rearranged', ManualImportMediaFilter)
     ordering = ('file_name',)
     inlines = [MediaQCLogInline, LLMUsageRecordInline]
     fieldsets = (
@@ -1420,6 +1441,18 @@ class MediaAdmin(HistoricalImportExportAdmin):
                 )
             },
         ),
+        (
+            'Duplicates',
+            {
+                'fields': (
+                    'duplicate_of',
+                    'duplicate_distance',
+                    'content_sha256',
+                    'perceptual_hash',
+                ),
+                'classes': ('collapse',),
+            },
+        ),
         (
             'Audit',
             {
@@ -1481,8 +1514,8 @@ class MediaQCLogAdmin(admin.ModelAdmin):
         "media",
         "change_type",
         "field_name",
-        "old_value",
-        "new_value",
+        "old_document",
+        "new_document",
         "description",
         "changed_by",
         "created_on",
@@ -1513,6 +1546,7 @@ class LLMUsageRecordAdmin(admin.ModelAdmin):
         "completion_tokens",
         "total_tokens",
         "cost_usd",
+        "cache_hit",
         "created_at",
     )
     search_fields = (
@@ -1522,7 +1556,7 @@ class LLMUsageRecordAdmin(admin.ModelAdmin):
         "model_name",
         "response_id",
     )
-    list_filter = ("model_name", "created_at")
+    list_filter = ("model_name", "cache_hit", "created_at")
     readonly_fields = (
         "media",
         "model_name",
@@ -1530,15 +1564,134 @@ class LLMUsageRecordAdmin(admin.ModelAdmin):
         "completion_tokens",
         "total_tokens",
         "cost_usd",
+        "cache_hit",
+        "response_id",
+        "created_at",
+        "updated_at",
+    )
+    ordering = ("-created_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+
+@admin.register(LLMResponseCache)
+class LLMResponseCacheAdmin(admin.ModelAdmin):
+    list_display = ("kind", "model_name", "image_sha256", "hit_count", "created_at", "last_used_at")
+    search_fields = ("key", "image_sha256", "response_id")
+    list_filter = ("kind", "model_name")
+    readonly_fields = (
+        "key",
+        "kind",
+        "model_name",
+        "image_sha256",
+        "prompt_sha256",
+        "content",
+        "usage",
         "response_id",
+        "batch_id",
+        "hit_count",
+        "created_at",
+        "last_used_at",
+    )
+    ordering = ("-last_used_at",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "kind",
+        "status",
+        "priority",
+        "attempts",
+        "max_attempts",
+        "locked_by",
+        "created_by",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("kind", "status")
+    search_fields = ("dedupe_key", "locked_by", "last_error")
+    readonly_fields = (
+        "kind",
+        "payload",
+        "status",
+        "priority",
+        "dedupe_key",
+        "attempts",
+        "max_attempts",
+        "run_after",
+        "locked_by",
+        "lease_expires_at",
+        "result",
+        "last_error",
+        "created_by",
+        "created_at",
+        "started_at",
+        "finished_at",
+    )
+    ordering = ("-created_at",)
+    actions = ["retry_jobs"]
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description=_("Retry selected failed jobs"))
+    def retry_jobs(self, request, queryset):
+        updated = queryset.filter(status=BackgroundJob.Status.FAILED).update(
+            status=BackgroundJob.Status.QUEUED,
+            attempts=0,
+            run_after=now(),
+            finished_at=None,
+        )
+        self.message_user(request, _("Requeued %(count)d jobs.") % {"count": updated})
+
+
+@admin.register(LLMBatchJob)
+class LLMBatchJobAdmin(admin.ModelAdmin):
+    list_display = (
+        "batch_id",
+        "target",
+        "status",
+        "remote_status",
+        "request_count",
+        "ingested_count",
+        "error_count",
+        "created_at",
+        "completed_at",
+    )
+    search_fields = ("batch_id",)
+    list_filter = ("target", "status")
+    readonly_fields = (
+        "batch_id",
+        "target",
+        "status",
+        "remote_status",
+        "requests",
+        "request_count",
+        "output_file_id",
+        "error_file_id",
+        "ingested_count",
+        "error_count",
         "created_at",
         "updated_at",
+        "completed_at",
     )
     ordering = ("-created_at",)
 
     def has_add_permission(self, request):
         return False
 
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 # NatureOfSpecimen Model
 class NatureOfSpecimenAdmin(HistoricalImportExportAdmin):
@@ -2,6 +2,7 @@ import django_filters
 from django import forms
 from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
+from .accession_search import matching_accession_ids
 from .models import (
     Accession,
     CollectionMethod,
@@ -30,15 +31,6 @@ from .forms import FieldSlipFilterForm
 User = get_user_model()
 
 
-def _matching_taxon_names(attribute: str, value: str) -> set[str]:
-    taxa = Taxon.objects.filter(
-        status=TaxonStatus.ACCEPTED,
-        is_active=True,
-        **{f"{attribute}__icontains": value},
-    )
-    return set(taxa.values_list("taxon_name", flat=True))
-
-
 def _ensure_widget_has_w3_class(widget, fallback_class: str = "w3-input") -> None:
     classes = widget.attrs.get("class", "")
     tokens = [token for token in classes.split() if token]
@@ -168,40 +160,22 @@ class AccessionFilter(django_filters.FilterSet):
             accessioned_by__organisation_membership__organisation=value
         ).distinct()
 
-    def filter_by_taxon(self, queryset, name, value):
+    def _filter_by_search_field(self, queryset, field, value):
         if not value:
             return queryset
-        taxon_q = Q(accessionrow__identification__taxon_verbatim__icontains=value)
-        taxon_q |= Q(accessionrow__identification__taxon__icontains=value)
-        taxon_q |= Q(
-            accessionrow__identification__taxon_record__taxon_name__icontains=value
-        )
-        taxon_q |= Q(
-            accessionrow__identification__taxon_record__synonyms__taxon_name__icontains=value
-        )
-        return queryset.filter(taxon_q).distinct()
+        accession_ids = matching_accession_ids(field, value)
+        if accession_ids is None:
+            return queryset
+        return queryset.filter(pk__in=accession_ids)
+
+    def filter_by_taxon(self, queryset, name, value):
+        return self._filter_by_search_field(queryset, "taxon_names", value)
 
     def filter_by_element(self, queryset, name, value):
-        if value:
-            return queryset.filter(
-                accessionrow__natureofspecimen__element__name__icontains=value
-            ).distinct()
-        return queryset
+        return self._filter_by_search_field(queryset, "elements", value)
 
     def _filter_by_taxon_attribute(self, queryset, attribute, value):
-        if not value:
-            return queryset
-        lookup = {
-            f"accessionrow__identification__taxon_record__{attribute}__icontains": value
-        }
-        matching_names = _matching_taxon_names(attribute, value)
-        name_filter = Q(**lookup)
-        if matching_names:
-            name_filter |= Q(
-                accessionrow__identification__taxon_verbatim__in=matching_names
-            )
-            name_filter |= Q(accessionrow__identification__taxon__in=matching_names)
-        return queryset.filter(name_filter).distinct()
+        return self._filter_by_search_field(queryset, attribute, value)
 
     def filter_by_family(self, queryset, name, value):
         return self._filter_by_taxon_attribute(queryset, "family", value)
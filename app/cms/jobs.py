@@ -0,0 +1,362 @@
+"""Durable, database-backed job queue.
+
+Web requests only enqueue :class:`cms.models.BackgroundJob` rows; the
+``run_workers`` management command claims and runs them. A claimed job holds
+a lease that its worker renews while the job runs. If the worker dies, the
+lease expires and another worker picks the job up again. Failed jobs are
+retried with exponential backoff until ``max_attempts`` is reached.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import socket
+import threading
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from crum import get_current_user, impersonate
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict[str, Any]], dict[str, Any] | None]
+
+HANDLERS: dict[str, JobHandler] = {}
+
+_MAX_RETRY_DELAY_SECONDS = 3600
+
+
+def handler(kind: str) -> Callable[[JobHandler], JobHandler]:
+    """Register the decorated function as the handler for jobs of ``kind``."""
+
+    def register(func: JobHandler) -> JobHandler:
+        HANDLERS[kind] = func
+        return func
+
+    return register
+
+
+def lease_seconds() -> int:
+    try:
+        return max(10, int(getattr(settings, "JOB_LEASE_SECONDS", 300)))
+    except (TypeError, ValueError):
+        return 300
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Return how long a job waits before its next attempt after ``attempts`` failures."""
+
+    try:
+        base = max(1, int(getattr(settings, "JOB_RETRY_BASE_SECONDS", 30)))
+    except (TypeError, ValueError):
+        base = 30
+    return timedelta(seconds=min(base * 2 ** max(0, attempts - 1), _MAX_RETRY_DELAY_SECONDS))
+
+
+def default_worker_id(index: int = 0) -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{index}"
+
+
+def enqueue(
+    kind: str,
+    payload: dict[str, Any] | None = None,
+    *,
+    priority: int = 0,
+    dedupe_key: str = "",
+    max_attempts: int = 3,
+    user: Any = None,
+) -> BackgroundJob:
+    """Queue a job and return it.
+
+    When ``dedupe_key`` is set and a job with the same key is still queued or
+    running, that job is returned instead of queueing another. The job runs
+    as ``user``, defaulting to the current user.
+    """
+
+    if kind not in HANDLERS:
+        raise ValueError(f"No handler registered for job kind {kind!r}.")
+    if user is None:
+        user = get_current_user()
+    if isinstance(user, AnonymousUser):
+        user = None
+
+    with transaction.atomic():
+        if dedupe_key:
+            existing = (
+                BackgroundJob.objects.select_for_update()
+                .filter(dedupe_key=dedupe_key, status__in=BackgroundJob.ACTIVE_STATUSES)
+                .order_by("pk")
+                .first()
+            )
+            if existing is not None:
+                return existing
+        job = BackgroundJob.objects.create(
+            kind=kind,
+            payload=payload or {},
+            priority=priority,
+            dedupe_key=dedupe_key,
+            max_attempts=max(1, max_attempts),
+            created_by=user,
+        )
+    logger.info("Queued %s", job)
+    return job
+
+
+def _claimable(now, kinds: Iterable[str] | None):
+    ready = Q(status=BackgroundJob.Status.QUEUED, run_after__lte=now) | Q(
+        status=BackgroundJob.Status.RUNNING, lease_expires_at__lt=now
+    )
+    queryset = BackgroundJob.objects.filter(ready)
+    if kinds:
+        queryset = queryset.filter(kind__in=list(kinds))
+    return queryset.order_by("-priority", "run_after", "pk")
+
+
+def claim_next(worker_id: str, *, kinds: Iterable[str] | None = None) -> BackgroundJob | None:
+    """Lease the next runnable job to ``worker_id``.
+
+    Rows are selected with ``FOR UPDATE SKIP LOCKED`` where the database
+    supports it, and the claim itself is a conditional update, so two
+    workers never claim the same job. Running jobs whose lease has expired
+    are reclaimed, or failed once they are out of attempts.
+    """
+
+    while True:
+        now = timezone.now()
+        with transaction.atomic():
+            job = _claimable(now, kinds).select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            current = BackgroundJob.objects.filter(
+                pk=job.pk, status=job.status, attempts=job.attempts, locked_by=job.locked_by
+            )
+            if job.status == BackgroundJob.Status.RUNNING and job.attempts >= job.max_attempts:
+                current.update(
+                    status=BackgroundJob.Status.FAILED,
+                    last_error=f"Lease held by {job.locked_by} expired.",
+                    lease_expires_at=None,
+                    finished_at=now,
+                )
+                logger.warning("%s failed: lease held by %s expired", job, job.locked_by)
+                continue
+            claimed = current.update(
+                status=BackgroundJob.Status.RUNNING,
+                locked_by=worker_id,
+                lease_expires_at=now + timedelta(seconds=lease_seconds()),
+                attempts=job.attempts + 1,
+                started_at=now,
+            )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def renew_lease(job: BackgroundJob, worker_id: str) -> bool:
+    """Extend the lease on ``job``; ``False`` means another worker has taken it over."""
+
+    return bool(
+        BackgroundJob.objects.filter(
+            pk=job.pk, status=BackgroundJob.Status.RUNNING, locked_by=worker_id
+        ).update(lease_expires_at=timezone.now() + timedelta(seconds=lease_seconds()))
+    )
+
+
+def _finish(job: BackgroundJob, worker_id: str, **fields: Any) -> bool:
+    updated = BackgroundJob.objects.filter(
+        pk=job.pk, status=BackgroundJob.Status.RUNNING, locked_by=worker_id
+    ).update(locked_by="", lease_expires_at=None, **fields)
+    if not updated:
+        logger.warning("%s was taken over by another worker; discarding this run's outcome", job)
+    return bool(updated)
+
+
+def _record_failure(job: BackgroundJob, worker_id: str, exc: BaseException) -> None:
+    error = f"{type(exc).__name__}: {exc}"
+    if job.attempts < job.max_attempts:
+        _finish(
+            job,
+            worker_id,
+            status=BackgroundJob.Status.QUEUED,
+            run_after=timezone.now() + retry_delay(job.attempts),
+            last_error=error,
+        )
+        logger.warning("%s failed (attempt %s/%s), retrying: %s", job, job.attempts, job.max_attempts, error)
+    else:
+        _finish(
+            job,
+            worker_id,
+            status=BackgroundJob.Status.FAILED,
+            last_error=error,
+            finished_at=timezone.now(),
+        )
+        logger.error("%s failed after %s attempts", job, job.attempts, exc_info=exc)
+
+
+def _keep_lease(job: BackgroundJob, worker_id: str, done: threading.Event) -> None:
+    interval = lease_seconds() / 3
+    try:
+        while not done.wait(interval):
+            if not renew_lease(job, worker_id):
+                return
+    finally:
+        connections.close_all()
+
+
+def run_job(job: BackgroundJob, worker_id: str) -> None:
+    """Run a claimed ``job`` as its creator while renewing its lease."""
+
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_keep_lease, args=(job, worker_id, done), name=f"job-lease-{job.pk}", daemon=True
+    )
+    heartbeat.start()
+    try:
+        func = HANDLERS.get(job.kind)
+        if func is None:
+            raise LookupError(f"No handler registered for job kind {job.kind!r}.")
+        with impersonate(job.created_by):
+            result = func(dict(job.payload))
+    except Exception as exc:
+        done.set()
+        _record_failure(job, worker_id, exc)
+    else:
+        done.set()
+        _finish(
+            job,
+            worker_id,
+            status=BackgroundJob.Status.SUCCEEDED,
+            result=result or {},
+            last_error="",
+            finished_at=timezone.now(),
+        )
+        logger.info("%s succeeded", job)
+    finally:
+        heartbeat.join()
+
+
+def work(
+    worker_id: str,
+    stop: threading.Event,
+    *,
+    kinds: Iterable[str] | None = None,
+    poll_interval: float = 5.0,
+    burst: bool = False,
+) -> int:
+    """Claim and run jobs until ``stop`` is set; return the number of jobs run.
+
+    With ``burst`` the worker returns as soon as no job is runnable.
+    """
+
+    kinds = list(kinds) if kinds else None
+    processed = 0
+    try:
+        while not stop.is_set():
+            close_old_connections()
+            job = claim_next(worker_id, kinds=kinds)
+            if job is None:
+                if burst:
+                    break
+                stop.wait(poll_interval)
+                continue
+            run_job(job, worker_id)
+            processed += 1
+    finally:
+        close_old_connections()
+    return processed
+
+
+@handler(BackgroundJob.Kind.SPLIT_SPECIMEN_LIST_PDF)
+def _split_specimen_list_pdf(payload: dict[str, Any]) -> dict[str, Any]:
+    from .models import SpecimenListPDF
+    from .upload_processing import process_specimen_list_pdf
+
+    pdf_id = payload["pdf_id"]
+    process_specimen_list_pdf(pdf_id)
+    pdf = SpecimenListPDF.objects.filter(pk=pdf_id).values("status", "page_count").first() or {}
+    return {"pdf_id": pdf_id, **pdf}
+
+
+@handler(BackgroundJob.Kind.SCAN_OCR)
+def _scan_ocr(payload: dict[str, Any]) -> dict[str, Any]:
+    from .ocr_processing import process_pending_scans
+
+    successes, failures, total, errors, jammed, processed, insufficient_quota = process_pending_scans(
+        limit=payload.get("limit"), workers=payload.get("workers")
+    )
+    return {
+        "successes": successes,
+        "failures": failures,
+        "total": total,
+        "errors": [error for error in errors if error != "insufficient_quota"],
+        "jammed": jammed,
+        "latest_filename": processed[-1] if processed else None,
+        "insufficient_quota": insufficient_quota,
+    }
+
+
+@handler(BackgroundJob.Kind.SPECIMEN_LIST_PIPELINE)
+def _specimen_list_pipeline(payload: dict[str, Any]) -> dict[str, Any]:
+    from .tasks import PIPELINE_STAGES, run_specimen_list_pipeline
+
+    summary = run_specimen_list_pipeline(
+        stages=payload.get("stages") or PIPELINE_STAGES,
+        limit=payload.get("limit"),
+        ids=payload.get("ids"),
+        force=bool(payload.get("force")),
+        workers=payload.get("workers"),
+    )
+    return {
+        "pages": summary.pages,
+        "stages": {
+            name: {
+                "successes": stage.successes,
+                "failures": stage.failures,
+                "total": stage.total,
+                "errors": stage.errors,
+            }
+            for name, stage in summary.stages.items()
+        },
+    }
+
+
+@handler(BackgroundJob.Kind.TAXONOMY_SYNC)
+def _taxonomy_sync(payload: dict[str, Any]) -> dict[str, Any]:
+    from .admin import _serialize_preview_for_template
+    from .taxonomy import NowTaxonomySyncService
+
+    result = NowTaxonomySyncService().sync(apply=True)
+    preview_data = _serialize_preview_for_template(result.preview)
+    return {
+        "counts": dict(result.preview.counts),
+        "source_version": result.preview.source_version,
+        "import_log_id": result.import_log.pk if result.import_log else None,
+        # Round-trip through JSON so model values in the changes become strings.
+        "preview_data": json.loads(json.dumps(preview_data, default=str)),
+    }
+
+
+@handler(BackgroundJob.Kind.INGEST_SCANS)
+def _ingest_scans(payload: dict[str, Any]) -> dict[str, Any]:
+    from .upload_processing import ingest_files
+
+    incoming_dir = Path(settings.MEDIA_ROOT) / "uploads" / "incoming"
+    # A retried job skips files an earlier attempt already moved.
+    paths = [incoming_dir / name for name in payload["files"]]
+    present = [path for path in paths if path.exists()]
+    destinations = ingest_files(present)
+    return {
+        "total": len(paths),
+        "missing": len(paths) - len(present),
+        "destinations": dict(Counter(path.parent.name for path in destinations)),
+    }
@@ -0,0 +1,303 @@
+"""Submit OCR backlogs to the OpenAI Batch API.
+
+Batch mode reuses the synchronous OCR code rather than duplicating it. The
+queue is replayed inside :func:`deferring`, where every chat completion
+that is not already in the LLM response cache raises
+:class:`BatchRequestDeferred` instead of calling the API. The deferred
+requests are written to a JSONL batch, and when the batch completes its
+results are stored in the response cache under the same keys. The next
+replay then finds every answer cached and persists it through the usual
+code paths, or defers the follow-up call (for example OCR after card type
+detection) to the next batch.
+
+The API client is pluggable through ``OPENAI_BATCH_CLIENT`` so tests and
+local runs can substitute a stub.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Iterable, Iterator, Protocol
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from . import llm_cache
+from .models import LLMBatchJob
+
+logger = logging.getLogger(__name__)
+
+CHAT_COMPLETIONS_ENDPOINT = "/v1/chat/completions"
+_REMOTE_FAILED = {"failed", "expired", "cancelled", "cancelling"}
+
+
+@dataclass(frozen=True)
+class DeferredRequest:
+    """A chat completion to send in the next batch."""
+
+    cache_key: llm_cache.CacheKey
+    body: dict[str, Any]
+
+    @property
+    def custom_id(self) -> str:
+        return self.cache_key.key
+
+    def as_jsonl(self) -> str:
+        return json.dumps(
+            {
+                "custom_id": self.custom_id,
+                "method": "POST",
+                "url": CHAT_COMPLETIONS_ENDPOINT,
+                "body": self.body,
+            },
+            ensure_ascii=False,
+        )
+
+
+class BatchRequestDeferred(BaseException):
+    """Raised on a cache miss while deferring.
+
+    Derives from :class:`BaseException` so the ``except Exception`` retry
+    loops around OCR calls let it through instead of retrying.
+    """
+
+    def __init__(self, request: DeferredRequest) -> None:
+        super().__init__(request.custom_id)
+        self.request = request
+
+
+_state = threading.local()
+
+
+@contextmanager
+def deferring() -> Iterator[None]:
+    """Defer uncached chat completions made in this thread to a batch."""
+
+    previous = getattr(_state, "active", False)
+    _state.active = True
+    try:
+        yield
+    finally:
+        _state.active = previous
+
+
+def is_deferring() -> bool:
+    return getattr(_state, "active", False)
+
+
+def defer(cache_key: llm_cache.CacheKey, *, model: str, messages: list[dict[str, Any]]) -> None:
+    raise BatchRequestDeferred(DeferredRequest(cache_key, {"model": model, "messages": messages}))
+
+
+@dataclass
+class BatchStatus:
+    status: str
+    output_file_id: str = ""
+    error_file_id: str = ""
+
+
+class BatchClient(Protocol):
+    def submit(self, jsonl: str, *, metadata: dict[str, str]) -> str: ...
+
+    def status(self, batch_id: str) -> BatchStatus: ...
+
+    def download(self, file_id: str) -> str: ...
+
+
+class OpenAIBatchClient:
+    """Batch client backed by the ``openai`` SDK.
+
+    ``OPENAI_BATCH_BASE_URL`` points the client at another server, such as a
+    local stub implementing the files and batches endpoints.
+    """
+
+    def __init__(self, client: Any = None) -> None:
+        if client is None:
+            base_url = getattr(settings, "OPENAI_BATCH_BASE_URL", "")
+            if base_url:
+                from openai import OpenAI
+
+                client = OpenAI(base_url=base_url)
+            else:
+                from .ocr_processing import get_openai_client
+
+                client = get_openai_client()
+        if client is None:
+            raise RuntimeError(
+                "OpenAI client is not configured. Ensure OPENAI_API_KEY is set and the openai package is installed."
+            )
+        self.client = client
+
+    def submit(self, jsonl: str, *, metadata: dict[str, str]) -> str:
+        upload = self.client.files.create(
+            file=("ocr-batch.jsonl", io.BytesIO(jsonl.encode("utf-8"))),
+            purpose="batch",
+        )
+        batch = self.client.batches.create(
+            input_file_id=upload.id,
+            endpoint=CHAT_COMPLETIONS_ENDPOINT,
+            completion_window="24h",
+            metadata=metadata,
+        )
+        return batch.id
+
+    def status(self, batch_id: str) -> BatchStatus:
+        batch = self.client.batches.retrieve(batch_id)
+        return BatchStatus(
+            status=batch.status,
+            output_file_id=getattr(batch, "output_file_id", None) or "",
+            error_file_id=getattr(batch, "error_file_id", None) or "",
+        )
+
+    def download(self, file_id: str) -> str:
+        return self.client.files.content(file_id).text
+
+
+def get_batch_client() -> BatchClient:
+    factory = import_string(getattr(settings, "OPENAI_BATCH_CLIENT", "cms.llm_batch.OpenAIBatchClient"))
+    return factory()
+
+
+def max_batch_requests() -> int:
+    try:
+        return max(1, int(getattr(settings, "OPENAI_BATCH_MAX_REQUESTS", 1000)))
+    except (TypeError, ValueError):
+        return 1000
+
+
+@dataclass
+class BatchCycleSummary:
+    """Outcome of one poll, ingest, replay and submit cycle."""
+
+    ingested: int = 0
+    result_errors: int = 0
+    completed_items: int = 0
+    failed_items: int = 0
+    submitted_requests: int = 0
+    submitted_batches: list[str] = field(default_factory=list)
+    open_batches: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+def pending_request_keys(target: str) -> set[str]:
+    """Return the custom ids already waiting in submitted batches for ``target``."""
+
+    keys: set[str] = set()
+    for requests in LLMBatchJob.objects.filter(
+        target=target, status=LLMBatchJob.Status.SUBMITTED
+    ).values_list("requests", flat=True):
+        keys.update(requests or {})
+    return keys
+
+
+def submit_requests(
+    target: str,
+    requests: Iterable[DeferredRequest],
+    *,
+    client: BatchClient | None = None,
+) -> list[LLMBatchJob]:
+    """Submit ``requests`` as one or more batches, skipping duplicates and in-flight ones."""
+
+    waiting = pending_request_keys(target)
+    unique: dict[str, DeferredRequest] = {}
+    for request in requests:
+        if request.custom_id not in waiting:
+            unique.setdefault(request.custom_id, request)
+    if not unique:
+        return []
+
+    client = client or get_batch_client()
+    chunk_size = max_batch_requests()
+    items = list(unique.values())
+    jobs = []
+    for start in range(0, len(items), chunk_size):
+        chunk = items[start : start + chunk_size]
+        jsonl = "\n".join(request.as_jsonl() for request in chunk) + "\n"
+        batch_id = client.submit(jsonl, metadata={"target": target})
+        jobs.append(
+            LLMBatchJob.objects.create(
+                target=target,
+                batch_id=batch_id,
+                requests={request.custom_id: asdict(request.cache_key) for request in chunk},
+                request_count=len(chunk),
+            )
+        )
+        logger.info("Submitted %s OCR requests as batch %s", len(chunk), batch_id)
+    return jobs
+
+
+def _ingest_output(job: LLMBatchJob, output: str) -> tuple[int, int]:
+    ingested = 0
+    errors = 0
+    for line in output.splitlines():
+        if not line.strip():
+            continue
+        record = json.loads(line)
+        meta = job.requests.get(record.get("custom_id"))
+        response = record.get("response") or {}
+        body = response.get("body") or {}
+        if meta is None or record.get("error") or response.get("status_code") != 200:
+            errors += 1
+            logger.warning("Batch %s request %s failed: %s", job.batch_id, record.get("custom_id"), record.get("error") or body)
+            continue
+        try:
+            content = body["choices"][0]["message"]["content"] or ""
+        except (KeyError, IndexError, TypeError):
+            errors += 1
+            continue
+        llm_cache.store_batch_result(
+            llm_cache.CacheKey(**meta),
+            content=content,
+            usage=body.get("usage"),
+            response_id=str(body.get("id") or ""),
+            batch_id=job.batch_id,
+        )
+        ingested += 1
+    return ingested, errors
+
+
+def poll_jobs(target: str, *, client: BatchClient | None = None) -> BatchCycleSummary:
+    """Refresh submitted batches for ``target`` and cache the results of finished ones."""
+
+    summary = BatchCycleSummary()
+    jobs = list(LLMBatchJob.objects.filter(target=target, status=LLMBatchJob.Status.SUBMITTED))
+    if not jobs:
+        return summary
+    client = client or get_batch_client()
+    for job in jobs:
+        status = client.status(job.batch_id)
+        job.remote_status = status.status
+        if status.status in _REMOTE_FAILED:
+            job.status = LLMBatchJob.Status.FAILED
+            job.completed_at = timezone.now()
+            summary.errors.append(f"batch {job.batch_id} {status.status}")
+        elif status.status == "completed":
+            ingested, errors = 0, 0
+            if status.output_file_id:
+                ingested, errors = _ingest_output(job, client.download(status.output_file_id))
+            job.output_file_id = status.output_file_id
+            job.error_file_id = status.error_file_id
+            job.ingested_count = ingested
+            job.error_count = errors + max(0, job.request_count - ingested - errors)
+            job.status = LLMBatchJob.Status.COMPLETED
+            job.completed_at = timezone.now()
+            summary.ingested += ingested
+            summary.result_errors += job.error_count
+        else:
+            summary.open_batches += 1
+        job.save()
+    return summary
+
+
+def mark_replayed(target: str) -> int:
+    """Mark completed batches for ``target`` as ingested once their results were replayed."""
+
+    return LLMBatchJob.objects.filter(target=target, status=LLMBatchJob.Status.COMPLETED).update(
+        status=LLMBatchJob.Status.INGESTED
+    )
@@ -0,0 +1,191 @@
+"""Content-addressed cache for OpenAI chat completions used by OCR.
+
+Responses are keyed by the model, a hash of the uploaded image and a hash of
+the prompt text, so re-running OCR on identical bytes with an identical
+prompt (forced re-runs, rescans of the same card, requeued PDFs) is answered
+from the database instead of the API. Changing the prompt or the model
+changes the key, and callers can bypass the cache per call.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+
+from .llm_usage import build_usage_payload
+from .models import LLMResponseCache
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_MAX_ENTRIES = 10000
+
+
+def response_cache_enabled() -> bool:
+    return bool(getattr(settings, "LLM_RESPONSE_CACHE_ENABLED", True))
+
+
+def _max_entries() -> int:
+    try:
+        return max(0, int(getattr(settings, "LLM_RESPONSE_CACHE_MAX_ENTRIES", _DEFAULT_MAX_ENTRIES)))
+    except (TypeError, ValueError):
+        return _DEFAULT_MAX_ENTRIES
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    key: str
+    kind: str
+    model: str
+    image_sha256: str
+    prompt_sha256: str
+
+
+def build_cache_key(kind: str, model: str, messages: list[dict[str, Any]]) -> CacheKey:
+    """Return the cache key for a chat completion request.
+
+    Image parts are hashed on their own; every other part of ``messages``
+    (system prompt, user prompt text) forms the prompt hash.
+    """
+
+    images: list[str] = []
+    prompt_messages: list[dict[str, Any]] = []
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, list):
+            text_parts = []
+            for part in content:
+                if part.get("type") == "image_url":
+                    images.append(part["image_url"]["url"])
+                else:
+                    text_parts.append(part)
+            content = text_parts
+        prompt_messages.append({**message, "content": content})
+
+    image_sha256 = _sha256("\n".join(images))
+    prompt_sha256 = _sha256(json.dumps(prompt_messages, sort_keys=True, ensure_ascii=False))
+    key = _sha256(f"{model}\n{image_sha256}\n{prompt_sha256}")
+    return CacheKey(
+        key=key,
+        kind=kind,
+        model=model,
+        image_sha256=image_sha256,
+        prompt_sha256=prompt_sha256,
+    )
+
+
+@dataclass
+class _Message:
+    content: str
+
+
+@dataclass
+class _Choice:
+    message: _Message
+
+
+@dataclass
+class _Usage:
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+
+
+@dataclass
+class CachedCompletion:
+    """Response-shaped view of a cache entry.
+
+    ``usage`` is empty because a cache hit costs no tokens; ``cache_hit`` lets
+    :func:`cms.llm_usage.build_usage_payload` flag the usage payload. The
+    first use of a Batch API result is not a cache hit: it carries the usage
+    the batch reported, so the call is billed once.
+    """
+
+    id: str
+    model: str
+    choices: list[_Choice] = field(default_factory=list)
+    usage: Any = None
+    cache_hit: bool = True
+
+    @classmethod
+    def from_entry(cls, entry: LLMResponseCache) -> "CachedCompletion":
+        completion = cls(
+            id=entry.response_id,
+            model=entry.model_name,
+            choices=[_Choice(message=_Message(content=entry.content))],
+        )
+        if entry.batch_id and entry.hit_count == 1:
+            usage = entry.usage or {}
+            completion.usage = _Usage(
+                prompt_tokens=int(usage.get("prompt_tokens") or 0),
+                completion_tokens=int(usage.get("completion_tokens") or 0),
+                total_tokens=int(usage.get("total_tokens") or 0),
+            )
+            completion.cache_hit = False
+        return completion
+
+
+def lookup(cache_key: CacheKey) -> CachedCompletion | None:
+    entry = LLMResponseCache.objects.lookup(cache_key.key)
+    if entry is None:
+        return None
+    logger.info("Serving %s response from the LLM response cache.", entry.kind)
+    return CachedCompletion.from_entry(entry)
+
+
+def store(cache_key: CacheKey, response: Any) -> None:
+    """Cache ``response`` under ``cache_key`` and evict beyond the size limit."""
+
+    if getattr(response, "cache_hit", False):
+        return
+    max_entries = _max_entries()
+    if max_entries == 0:
+        return
+    content = response.choices[0].message.content or ""
+    LLMResponseCache.objects.update_or_create(
+        key=cache_key.key,
+        defaults={
+            "kind": cache_key.kind,
+            "model_name": cache_key.model,
+            "image_sha256": cache_key.image_sha256,
+            "prompt_sha256": cache_key.prompt_sha256,
+            "content": content,
+            "usage": build_usage_payload(response, cache_key.model),
+            "response_id": getattr(response, "id", None) or "",
+        },
+    )
+    LLMResponseCache.objects.evict(max_entries)
+
+
+def store_batch_result(
+    cache_key: CacheKey,
+    *,
+    content: str,
+    usage: dict[str, Any] | None,
+    response_id: str,
+    batch_id: str,
+) -> None:
+    """Cache a completion returned by the Batch API for replay by the OCR code."""
+
+    LLMResponseCache.objects.update_or_create(
+        key=cache_key.key,
+        defaults={
+            "kind": cache_key.kind,
+            "model_name": cache_key.model,
+            "image_sha256": cache_key.image_sha256,
+            "prompt_sha256": cache_key.prompt_sha256,
+            "content": content,
+            "usage": usage or {},
+            "response_id": response_id,
+            "batch_id": batch_id,
+            "hit_count": 0,
+        },
+    )
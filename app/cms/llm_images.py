@@ -0,0 +1,285 @@
+"""Prepare scan images for upload to the LLM APIs.
+
+Scans and specimen list pages are stored as full-resolution PNGs, which are
+far larger than the vision models use: images are scaled down server-side
+before they are read. Each call therefore uploads a size-capped JPEG or WebP
+derivative instead. Derivatives are cached on disk, keyed by the SHA-256 of
+the source bytes and the profile, so every stage that sends the same image
+reuses one encode. The cache is capped at ``LLM_IMAGE_CACHE_MAX_BYTES``; the
+least recently used derivatives are deleted once it grows past the cap.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import io
+import logging
+import mimetypes
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+logger = logging.getLogger(__name__)
+
+_FORMAT_MIME_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp", "PNG": "image/png"}
+_FORMAT_SUFFIXES = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png"}
+_SOURCE_DIGEST_CACHE_SIZE = 256
+_DEFAULT_CACHE_MAX_BYTES = 2 * 1024**3
+# Pruning stops below the cap so the next few writes do not prune again.
+_PRUNE_TARGET = 0.9
+# Derivatives used this recently may still be read by a pending request.
+_PRUNE_MIN_AGE_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class ImageProfile:
+    """How an image is downscaled and encoded for one kind of LLM call."""
+
+    name: str
+    max_edge: int
+    format: str = "JPEG"
+    quality: int = 85
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}-{self.max_edge}-{self.format.lower()}-q{self.quality}"
+
+
+#: ``classify`` serves card type detection and page classification, which only
+#: need the page layout. ``ocr`` serves transcription; vision models fit
+#: high-detail images within 2048px anyway, so larger uploads add nothing.
+IMAGE_PROFILES = {
+    "classify": ImageProfile("classify", max_edge=1024, quality=80),
+    "ocr": ImageProfile("ocr", max_edge=2048, quality=90),
+}
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    """An encoded image ready to embed in a chat completion request."""
+
+    path: Path
+    mime_type: str
+    source_sha256: str
+
+    @property
+    def base64(self) -> str:
+        return base64.b64encode(self.path.read_bytes()).decode("ascii")
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime_type};base64,{self.base64}"
+
+
+def get_image_profile(name: str) -> ImageProfile:
+    """Return the named profile with any ``LLM_IMAGE_PROFILES`` overrides applied."""
+
+    profile = IMAGE_PROFILES[name]
+    overrides = getattr(settings, "LLM_IMAGE_PROFILES", {}).get(name) or {}
+    if overrides:
+        profile = replace(profile, **overrides)
+    return profile
+
+
+def _cache_dir() -> Path:
+    configured = getattr(settings, "LLM_IMAGE_CACHE_DIR", None)
+    if configured:
+        return Path(configured)
+    return Path(settings.MEDIA_ROOT) / "cache" / "llm_images"
+
+
+def _cache_max_bytes() -> int:
+    try:
+        return max(0, int(getattr(settings, "LLM_IMAGE_CACHE_MAX_BYTES", _DEFAULT_CACHE_MAX_BYTES)))
+    except (TypeError, ValueError):
+        return _DEFAULT_CACHE_MAX_BYTES
+
+
+def _cached_files(directory: Path) -> list[tuple[float, int, Path]]:
+    entries = []
+    for path in directory.glob("*/*"):
+        if path.name.startswith(".tmp-"):
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+
+def prune_cache(max_bytes: int | None = None) -> int:
+    """Delete the least recently used derivatives until the cache fits ``max_bytes``.
+
+    Defaults to ``settings.LLM_IMAGE_CACHE_MAX_BYTES``; ``0`` leaves the cache
+    unbounded. Derivatives used in the last minute are kept. Returns the size
+    of the cache afterwards.
+    """
+
+    directory = _cache_dir()
+    if max_bytes is None:
+        max_bytes = _cache_max_bytes()
+    entries = _cached_files(directory)
+    total = sum(size for _, size, _ in entries)
+    if not max_bytes or total <= max_bytes:
+        return total
+    target = int(max_bytes * _PRUNE_TARGET)
+    cutoff = time.time() - _PRUNE_MIN_AGE_SECONDS
+    for used_at, size, path in sorted(entries):
+        if total <= target or used_at > cutoff:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+    return total
+
+
+class _CacheUsage:
+    """Running size of each cache directory, pruned once it passes the cap.
+
+    The size is measured from disk on the first write and after each prune,
+    so writes from other processes are picked up at those points.
+    """
+
+    def __init__(self) -> None:
+        self._bytes: dict[Path, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, size: int) -> None:
+        max_bytes = _cache_max_bytes()
+        if not max_bytes:
+            return
+        directory = _cache_dir()
+        with self._lock:
+            if directory in self._bytes:
+                self._bytes[directory] += size
+            else:
+                self._bytes[directory] = sum(entry[1] for entry in _cached_files(directory))
+            if self._bytes[directory] > max_bytes:
+                self._bytes[directory] = prune_cache(max_bytes)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._bytes.clear()
+
+
+cache_usage = _CacheUsage()
+
+
+class _SourceDigests:
+    """LRU of source digests keyed by path, size and modification time."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, int, int], str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def digest(self, path: Path) -> str:
+        stat = path.stat()
+        key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                return cached
+        digest = hashlib.sha256()
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(chunk)
+        value = digest.hexdigest()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+source_digests = _SourceDigests(_SOURCE_DIGEST_CACHE_SIZE)
+
+
+def _encode(source: Path, profile: ImageProfile) -> tuple[bytes, str]:
+    """Return the encoded derivative of ``source`` and its Pillow format.
+
+    The source bytes are kept when they are already a JPEG or WebP within the
+    size cap and smaller than a re-encode would be.
+    """
+
+    with Image.open(source) as image:
+        source_format = image.format
+        image = ImageOps.exif_transpose(image)
+        within_cap = max(image.size) <= profile.max_edge
+        if image.mode not in ("RGB", "L"):
+            background = Image.new("RGB", image.size, "white")
+            converted = image.convert("RGBA")
+            background.paste(converted, mask=converted.getchannel("A"))
+            image = background
+        image.thumbnail((profile.max_edge, profile.max_edge), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format=profile.format, quality=profile.quality, optimize=True)
+    encoded = buffer.getvalue()
+
+    if within_cap and source_format in ("JPEG", "WEBP"):
+        original = source.read_bytes()
+        if len(original) <= len(encoded):
+            return original, source_format
+    return encoded, profile.format
+
+
+def _write_atomically(path: Path, payload: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            stream.write(payload)
+        os.replace(temp_name, path)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+
+
+def prepare_image(image_path: Path | str, profile: str | ImageProfile = "ocr") -> PreparedImage:
+    """Return the cached derivative of ``image_path`` for ``profile``.
+
+    Images Pillow cannot read are sent unchanged, labelled with the MIME type
+    guessed from their file name.
+    """
+
+    source = Path(image_path)
+    if isinstance(profile, str):
+        profile = get_image_profile(profile)
+    digest = source_digests.digest(source)
+    stem = f"{digest}-{profile.key}"
+    directory = _cache_dir() / digest[:2]
+
+    for pillow_format, suffix in _FORMAT_SUFFIXES.items():
+        cached = directory / f"{stem}{suffix}"
+        if cached.exists():
+            try:
+                # Mark the derivative as recently used for pruning.
+                os.utime(cached)
+            except FileNotFoundError:
+                break
+            return PreparedImage(cached, _FORMAT_MIME_TYPES[pillow_format], digest)
+
+    try:
+        payload, pillow_format = _encode(source, profile)
+    except OSError as exc:
+        logger.warning("Sending %s unprepared: %s", source, exc)
+        mime_type = mimetypes.guess_type(source.name)[0] or "image/png"
+        return PreparedImage(source, mime_type, digest)
+
+    target = directory / f"{stem}{_FORMAT_SUFFIXES[pillow_format]}"
+    _write_atomically(target, payload)
+    cache_usage.add(len(payload))
+    return PreparedImage(target, _FORMAT_MIME_TYPES[pillow_format], digest)
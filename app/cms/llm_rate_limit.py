@@ -0,0 +1,403 @@
+"""Shared rate limiting and adaptive concurrency for OpenAI calls.
+
+Every chat completion goes through :func:`get_limiter`, which enforces
+per-model requests-per-minute and tokens-per-minute token buckets and a
+concurrency limit. The buckets, the concurrency limit and the cooldown set
+after a 429 live in Redis when ``USE_REDIS`` is enabled, so gunicorn workers
+and management commands running together share one budget; otherwise they are
+kept in process. While Redis is unreachable each process falls back to local
+state and retries Redis with a growing delay, returning to it once it answers.
+
+The concurrency limit adapts additively-increase/multiplicatively-decrease:
+it halves on every 429, shrinks when calls are slower than
+``OPENAI_LATENCY_TARGET_SECONDS`` and grows by one call per limit's worth of
+fast successes, between 1 and ``OPENAI_MAX_CONCURRENCY``.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Iterator
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+REDIS_CACHE_ALIAS = "llm_rate_limit"
+KEY_PREFIX = "llm-rate-limit"
+_MAX_BACKOFF_SECONDS = 60.0
+# After Redis fails, calls use local state and retry Redis after this delay,
+# doubling on each further failure.
+_REDIS_RETRY_SECONDS = 5.0
+_MAX_REDIS_RETRY_SECONDS = 300.0
+
+_TAKE_SCRIPT = """
+local amount = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local rate = tonumber(ARGV[3])
+local force = tonumber(ARGV[4])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'level', 'updated')
+local level = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+level = math.min(capacity, level + math.max(0, now - updated) * rate)
+local wait = 0
+if force == 1 or level >= amount then
+  level = level - amount
+else
+  wait = (amount - level) / rate
+end
+redis.call('HSET', KEYS[1], 'level', tostring(level), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+return {tostring(level), tostring(wait)}
+"""
+
+
+class LocalStore:
+    """In-process state used without Redis and as the fallback when it fails."""
+
+    name = "local"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buckets: dict[str, tuple[float, float]] = {}
+        self._values: dict[str, tuple[str, float | None]] = {}
+
+    def take(self, key: str, amount: float, capacity: float, rate: float, *, force: bool = False) -> tuple[float, float]:
+        """Take ``amount`` from a bucket; return ``(level, seconds to wait)``.
+
+        Nothing is taken when the caller has to wait, unless ``force`` is set,
+        which lets the level go negative to settle actual usage.
+        """
+
+        now = time.monotonic()
+        with self._lock:
+            level, updated = self._buckets.get(key, (capacity, now))
+            level = min(capacity, level + max(0.0, now - updated) * rate)
+            wait = 0.0
+            if force or level >= amount:
+                level -= amount
+            else:
+                wait = (amount - level) / rate
+            self._buckets[key] = (level, now)
+        return level, wait
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            value, expires = self._values.get(key, (None, None))
+            if expires is not None and expires <= time.monotonic():
+                self._values.pop(key, None)
+                return None
+            return value
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        expires = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._values[key] = (value, expires)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            value, expires = self._values.get(key, ("0", None))
+            count = int(value) + 1
+            self._values[key] = (str(count), expires)
+        return count
+
+
+class RedisStore:
+    """Shared state in the ``llm_rate_limit`` Redis cache."""
+
+    name = "redis"
+
+    def __init__(self, connection: Any) -> None:
+        self.connection = connection
+        self._take = connection.register_script(_TAKE_SCRIPT)
+
+    def take(self, key: str, amount: float, capacity: float, rate: float, *, force: bool = False) -> tuple[float, float]:
+        level, wait = self._take(keys=[key], args=[amount, capacity, rate, int(force)])
+        return float(level), float(wait)
+
+    def get(self, key: str) -> str | None:
+        value = self.connection.get(key)
+        return value.decode() if isinstance(value, bytes) else value
+
+    def set(self, key: str, value: str, ttl: float | None = None) -> None:
+        self.connection.set(key, value, px=int(ttl * 1000) if ttl else None)
+
+    def incr(self, key: str) -> int:
+        return int(self.connection.incr(key))
+
+
+def _setting(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(getattr(settings, name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+@dataclass
+class LimiterConfig:
+    requests_per_minute: float
+    tokens_per_minute: float
+    max_concurrency: int
+    latency_target: float
+    estimated_tokens: int
+
+    @classmethod
+    def from_settings(cls) -> "LimiterConfig":
+        return cls(
+            requests_per_minute=_setting("OPENAI_REQUESTS_PER_MINUTE", 500),
+            tokens_per_minute=_setting("OPENAI_TOKENS_PER_MINUTE", 0),
+            max_concurrency=max(1, int(_setting("OPENAI_MAX_CONCURRENCY", 8))),
+            latency_target=_setting("OPENAI_LATENCY_TARGET_SECONDS", 30),
+            estimated_tokens=int(_setting("OPENAI_ESTIMATED_TOKENS_PER_CALL", 2000)),
+        )
+
+
+class Permit:
+    """A granted call slot; report the outcome with :meth:`complete`."""
+
+    def __init__(self, limiter: "RateLimiter", model: str, estimated_tokens: int) -> None:
+        self.limiter = limiter
+        self.model = model
+        self.estimated_tokens = estimated_tokens
+        self.started = time.monotonic()
+
+    def complete(self, tokens_used: int | None = None) -> None:
+        self.limiter.record_success(
+            self.model,
+            latency=time.monotonic() - self.started,
+            tokens_used=tokens_used,
+            estimated_tokens=self.estimated_tokens,
+        )
+
+
+class RateLimiter:
+    def __init__(self, store: LocalStore | RedisStore, config: LimiterConfig) -> None:
+        self.store = store
+        self.config = config
+        self._fallback: LocalStore | None = None
+        self._redis_retry_at = 0.0
+        self._redis_retry_delay = _REDIS_RETRY_SECONDS
+        self._condition = threading.Condition()
+        self._in_flight = 0
+
+    # Store access -------------------------------------------------------
+
+    def _call_store(self, method: str, *args, **kwargs):
+        if self.store.name == LocalStore.name:
+            return getattr(self.store, method)(*args, **kwargs)
+        if self._fallback is not None and time.monotonic() < self._redis_retry_at:
+            return getattr(self._fallback, method)(*args, **kwargs)
+        try:
+            result = getattr(self.store, method)(*args, **kwargs)
+        except Exception as exc:
+            if self._fallback is None:
+                logger.warning("LLM rate limiter falling back to local state: %s", exc)
+                self._fallback = LocalStore()
+                self._redis_retry_delay = _REDIS_RETRY_SECONDS
+            else:
+                self._redis_retry_delay = min(_MAX_REDIS_RETRY_SECONDS, self._redis_retry_delay * 2)
+            self._redis_retry_at = time.monotonic() + self._redis_retry_delay
+            return getattr(self._fallback, method)(*args, **kwargs)
+        if self._fallback is not None:
+            logger.info("LLM rate limiter is using %s again", self.store.name)
+            self._fallback = None
+        return result
+
+    @property
+    def backend(self) -> str:
+        return (self._fallback or self.store).name
+
+    @staticmethod
+    def _key(*parts: str) -> str:
+        return ":".join((KEY_PREFIX, *parts))
+
+    def _take(self, model: str, bucket: str, per_minute: float, amount: float, *, force: bool = False):
+        capacity = per_minute
+        return self._call_store(
+            "take",
+            self._key(model, bucket),
+            min(amount, capacity),
+            capacity,
+            per_minute / 60.0,
+            force=force,
+        )
+
+    # Adaptive concurrency -----------------------------------------------
+
+    def concurrency_limit(self) -> float:
+        value = self._call_store("get", self._key("concurrency"))
+        try:
+            limit = float(value) if value is not None else float(self.config.max_concurrency)
+        except ValueError:
+            limit = float(self.config.max_concurrency)
+        return min(float(self.config.max_concurrency), max(1.0, limit))
+
+    def _set_concurrency_limit(self, limit: float) -> None:
+        limit = min(float(self.config.max_concurrency), max(1.0, limit))
+        self._call_store("set", self._key("concurrency"), f"{limit:.3f}")
+        with self._condition:
+            self._condition.notify_all()
+
+    def cooldown_remaining(self) -> float:
+        value = self._call_store("get", self._key("cooldown-until"))
+        if value is None:
+            return 0.0
+        try:
+            return max(0.0, float(value) - time.time())
+        except ValueError:
+            return 0.0
+
+    def record_throttle(self, model: str, retry_after: float | None = None) -> None:
+        """Halve the concurrency limit and pause every worker after a 429."""
+
+        pause = retry_after if retry_after and retry_after > 0 else 1.0
+        pause = min(pause, _MAX_BACKOFF_SECONDS)
+        self._call_store("set", self._key("cooldown-until"), f"{time.time() + pause:.3f}", pause)
+        self._call_store("incr", self._key("throttled"))
+        self._set_concurrency_limit(self.concurrency_limit() / 2)
+        logger.warning("OpenAI rate limit hit for %s; pausing calls for %.1fs", model, pause)
+
+    def record_success(
+        self,
+        model: str,
+        *,
+        latency: float,
+        tokens_used: int | None,
+        estimated_tokens: int,
+    ) -> None:
+        self._call_store("set", self._key("last-latency"), f"{latency:.3f}")
+        if tokens_used is not None and self.config.tokens_per_minute:
+            self._take(model, "tokens", self.config.tokens_per_minute, tokens_used - estimated_tokens, force=True)
+        limit = self.concurrency_limit()
+        if self.config.latency_target and latency > self.config.latency_target:
+            self._set_concurrency_limit(limit * 0.9)
+        elif limit < self.config.max_concurrency:
+            self._set_concurrency_limit(limit + 1 / limit)
+
+    # Acquiring ----------------------------------------------------------
+
+    def _wait_for_budget(self, model: str, estimated_tokens: int) -> None:
+        while True:
+            pause = self.cooldown_remaining()
+            if not pause and self.config.requests_per_minute:
+                _, pause = self._take(model, "requests", self.config.requests_per_minute, 1)
+            if not pause and self.config.tokens_per_minute:
+                _, pause = self._take(model, "tokens", self.config.tokens_per_minute, estimated_tokens)
+                if pause and self.config.requests_per_minute:
+                    self._take(model, "requests", self.config.requests_per_minute, -1, force=True)
+            if not pause:
+                return
+            time.sleep(min(pause, _MAX_BACKOFF_SECONDS))
+
+    @contextmanager
+    def acquire(self, model: str, *, estimated_tokens: int | None = None) -> Iterator[Permit]:
+        """Wait for a concurrency slot and bucket budget, then yield a :class:`Permit`."""
+
+        estimate = self.config.estimated_tokens if estimated_tokens is None else estimated_tokens
+        with self._condition:
+            while self._in_flight >= int(self.concurrency_limit()):
+                self._condition.wait(timeout=1.0)
+            self._in_flight += 1
+        try:
+            self._wait_for_budget(model, estimate)
+            yield Permit(self, model, estimate)
+        finally:
+            with self._condition:
+                self._in_flight -= 1
+                self._condition.notify()
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Return the jittered delay before retry ``attempt``, honouring any cooldown."""
+
+        base = min(float(2 ** attempt), _MAX_BACKOFF_SECONDS)
+        return max(base / 2 + random.uniform(0, base / 2), self.cooldown_remaining())
+
+    def state(self, model: str | None = None) -> dict[str, object]:
+        """Return the limiter state for monitoring."""
+
+        model = model or str(getattr(settings, "OPENAI_DEFAULT_MODEL", "gpt-5.2"))
+        last_latency = self._call_store("get", self._key("last-latency"))
+        state: dict[str, object] = {
+            "backend": self.backend,
+            "model": model,
+            "concurrency_limit": round(self.concurrency_limit(), 3),
+            "max_concurrency": self.config.max_concurrency,
+            "in_flight": self._in_flight,
+            "cooldown_seconds": round(self.cooldown_remaining(), 3),
+            "throttled_total": int(self._call_store("get", self._key("throttled")) or 0),
+            "last_latency_seconds": float(last_latency) if last_latency else None,
+            "requests_per_minute": self.config.requests_per_minute,
+            "tokens_per_minute": self.config.tokens_per_minute,
+        }
+        for bucket, per_minute in (
+            ("requests", self.config.requests_per_minute),
+            ("tokens", self.config.tokens_per_minute),
+        ):
+            if per_minute:
+                level, _ = self._take(model, bucket, per_minute, 0)
+                state[f"{bucket}_available"] = round(level, 1)
+        return state
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """Return ``True`` for HTTP 429 responses from the OpenAI API."""
+
+    if getattr(exc, "status_code", None) == 429:
+        return True
+    response = getattr(exc, "response", None)
+    return getattr(response, "status_code", None) == 429
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value in (None, ""):
+            continue
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            continue
+        return seconds / 1000 if header.endswith("-ms") else seconds
+    return None
+
+
+_limiter: RateLimiter | None = None
+_limiter_lock = threading.Lock()
+
+
+def _build_store() -> LocalStore | RedisStore:
+    if getattr(settings, "USE_REDIS", False):
+        try:
+            from django_redis import get_redis_connection
+
+            return RedisStore(get_redis_connection(REDIS_CACHE_ALIAS))
+        except Exception as exc:  # pragma: no cover - depends on deployment
+            logger.warning("Redis unavailable for the LLM rate limiter: %s", exc)
+    return LocalStore()
+
+
+def get_limiter() -> RateLimiter:
+    """Return the process-wide limiter, building it from settings on first use."""
+
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter(_build_store(), LimiterConfig.from_settings())
+    return _limiter
+
+
+def reset_limiter() -> None:
+    """Forget the process-wide limiter so the next call re-reads settings."""
+
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
@@ -70,6 +70,8 @@ def build_usage_payload(response: Any, model: str) -> dict[str, object | None]:
 
     if remaining_quota not in (None, ""):
         payload["remaining_quota_usd"] = remaining_quota
+    if getattr(response, "cache_hit", False):
+        payload["cache_hit"] = True
 
     return payload
 
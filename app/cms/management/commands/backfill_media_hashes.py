@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.models import Media
+from cms.scan_duplicates import ImageHashes, compute_image_hashes, index_hashes
+
+
+def _hash_file(item: tuple[int, str]) -> tuple[int, ImageHashes | None]:
+    pk, name = item
+    path = Path(default_storage.path(name))
+    if not path.is_file():
+        return pk, None
+    return pk, compute_image_hashes(path)
+
+
+class Command(BaseCommand):
+    help = "Compute content and perceptual hashes for media recorded before duplicate detection."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            help="Hash at most this many media rows.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of files hashed concurrently.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of media rows hashed and written per batch.",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Rehash media that already have a content hash.",
+        )
+
+    def handle(self, *args, **options):
+        limit: int | None = options.get("limit")
+        workers: int = options["workers"]
+        batch_size: int = options["batch_size"]
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        queryset = Media.objects.exclude(media_location="").exclude(media_location__isnull=True)
+        if not options.get("force"):
+            queryset = queryset.filter(content_sha256="")
+        rows = queryset.order_by("pk").values_list("pk", "media_location")
+
+        hashed = 0
+        missing = 0
+        last_pk = 0
+        remaining = limit
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            while remaining is None or remaining > 0:
+                size = batch_size if remaining is None else min(batch_size, remaining)
+                batch = list(rows.filter(pk__gt=last_pk)[:size])
+                if not batch:
+                    break
+                last_pk = batch[-1][0]
+                if remaining is not None:
+                    remaining -= len(batch)
+
+                updates = []
+                for pk, hashes in executor.map(_hash_file, batch):
+                    if hashes is None:
+                        missing += 1
+                        continue
+                    updates.append(
+                        Media(
+                            pk=pk,
+                            content_sha256=hashes.content_sha256,
+                            perceptual_hash=hashes.perceptual_hash,
+                        )
+                    )
+                Media.objects.bulk_update(updates, ["content_sha256", "perceptual_hash"])
+                index_hashes((media.pk, media.perceptual_hash) for media in updates)
+                hashed += len(updates)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Hashed {hashed} media files: {missing} skipped (file missing).")
+        )
@@ -1,6 +1,7 @@
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
 
-from cms.tasks import classify_pending_specimen_pages
+from cms.tasks import STAGE_CLASSIFY, run_specimen_list_pipeline
 
 
 class Command(BaseCommand):
@@ -25,13 +26,33 @@ class Command(BaseCommand):
             action="store_true",
             help="Reclassify pages even if they already have a classification status.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=(
+                "Number of pages to classify concurrently "
+                "(defaults to the SPECIMEN_LIST_PIPELINE_WORKERS setting)."
+            ),
+        )
 
     def handle(self, *args, **options):
         limit = options.get("limit")
         ids = options.get("ids")
         force = options.get("force")
+        workers = options.get("workers")
+        if workers is None:
+            workers = getattr(settings, "SPECIMEN_LIST_PIPELINE_WORKERS", 1)
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
 
-        summary = classify_pending_specimen_pages(limit=limit, ids=ids, force=force)
+        summary = run_specimen_list_pipeline(
+            stages=(STAGE_CLASSIFY,),
+            limit=limit,
+            ids=ids,
+            force=force,
+            workers=workers,
+        ).stages[STAGE_CLASSIFY]
 
         for error in summary.errors:
             self.stdout.write(self.style.WARNING(error))
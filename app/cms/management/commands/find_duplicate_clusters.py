@@ -0,0 +1,65 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.merge.clusters import DEFAULT_CLUSTER_THRESHOLD
+from cms.merge.mixins import MergeMixin
+from cms.tasks import run_duplicate_cluster_job
+
+
+class Command(BaseCommand):
+    help = "Precompute near-duplicate clusters for merge-enabled models."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help=(
+                "Model labels to cluster, e.g. cms.Element "
+                "(defaults to every merge-enabled model)."
+            ),
+        )
+        parser.add_argument(
+            "--fields",
+            default="",
+            help="Comma separated fields to compare (defaults to each model's merge display fields).",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=DEFAULT_CLUSTER_THRESHOLD,
+            help="Minimum pairwise similarity (1-100) for records to be clustered.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=-1,
+            help="Scoring threads per block; -1 uses every available core.",
+        )
+
+    def handle(self, *args, **options):
+        threshold = options["threshold"]
+        if not 0 < threshold <= 100:
+            raise CommandError("--threshold must be between 1 and 100.")
+
+        targets = []
+        for label in options.get("models") or []:
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc)) from exc
+            if not issubclass(model, MergeMixin):
+                raise CommandError(f"{label} is not merge-enabled.")
+            targets.append(model)
+
+        fields = [item.strip() for item in options["fields"].split(",") if item.strip()]
+        summary = run_duplicate_cluster_job(
+            models=targets or None,
+            fields=fields or None,
+            threshold=threshold,
+            workers=options["workers"],
+        )
+
+        for error in summary.errors:
+            self.stdout.write(self.style.WARNING(error))
+        for label, count in summary.clusters.items():
+            self.stdout.write(self.style.SUCCESS(f"{label}: stored {count} duplicate clusters."))
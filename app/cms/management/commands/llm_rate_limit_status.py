@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import json
+
+from django.core.management.base import BaseCommand
+
+from cms.llm_rate_limit import get_limiter
+
+
+class Command(BaseCommand):
+    help = "Show the shared OpenAI rate limiter state (buckets, concurrency limit, cooldown)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            help="Model whose request and token buckets are reported (defaults to OPENAI_DEFAULT_MODEL).",
+        )
+        parser.add_argument(
+            "--json",
+            action="store_true",
+            help="Print the state as a JSON object for monitoring.",
+        )
+
+    def handle(self, *args, **options):
+        state = get_limiter().state(options.get("model"))
+        if options.get("json"):
+            self.stdout.write(json.dumps(state, sort_keys=True))
+            return
+        for key, value in state.items():
+            self.stdout.write(f"{key}: {value}")
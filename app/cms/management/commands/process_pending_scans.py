@@ -0,0 +1,84 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.models import LLMBatchJob
+from cms.ocr_processing import process_pending_scans
+from cms.tasks import run_ocr_batch_cycle
+
+
+class Command(BaseCommand):
+    help = "Run OCR on scans waiting in uploads/pending."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=None,
+            help="Maximum number of scans to process in this run.",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=(
+                "Number of scans to process concurrently "
+                "(defaults to the OCR_SCAN_WORKERS setting)."
+            ),
+        )
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help=(
+                "Use the OpenAI Batch API: collect finished batches, persist their "
+                "results and submit the remaining scans as a new batch."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        limit = options.get("limit")
+        if options.get("batch"):
+            self._run_batch_cycle(limit)
+            return
+        workers = options.get("workers")
+        if workers is None:
+            workers = getattr(settings, "OCR_SCAN_WORKERS", 1)
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        (
+            successes,
+            failures,
+            total,
+            errors,
+            jammed,
+            _processed,
+            insufficient_quota,
+        ) = process_pending_scans(limit=limit, workers=workers)
+
+        for error in errors:
+            if error == "insufficient_quota":
+                continue
+            self.stdout.write(self.style.WARNING(error))
+        if jammed:
+            self.stdout.write(self.style.ERROR(f"OCR stopped: {jammed} repeatedly timed out."))
+        if insufficient_quota:
+            self.stdout.write(self.style.ERROR("OCR stopped: the OpenAI quota is exhausted."))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"OCR: {successes} succeeded, {failures} failed (total {total}, workers {workers})."
+            )
+        )
+
+    def _run_batch_cycle(self, limit):
+        summary = run_ocr_batch_cycle(LLMBatchJob.Target.SCANS, limit=limit)
+        for error in summary.errors:
+            self.stdout.write(self.style.WARNING(error))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Batch OCR: {summary.ingested} results collected, "
+                f"{summary.completed_items} scans succeeded, {summary.failed_items} failed, "
+                f"{summary.submitted_requests} requests submitted "
+                f"({summary.open_batches} batches open)."
+            )
+        )
@@ -1,27 +1,49 @@
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
+from cms import jobs
+from cms.models import BackgroundJob, LLMBatchJob
 from cms.tasks import (
-    run_specimen_list_ocr_queue,
-    run_specimen_list_row_extraction_queue,
+    STAGE_CLASSIFY,
+    STAGE_RAW,
+    STAGE_ROWS,
+    run_ocr_batch_cycle,
+    run_specimen_list_pipeline,
 )
 
 
+STAGE_CHOICES = {
+    "raw": (STAGE_RAW,),
+    "rows": (STAGE_ROWS,),
+    "both": (STAGE_RAW, STAGE_ROWS),
+    "all": (STAGE_CLASSIFY, STAGE_RAW, STAGE_ROWS),
+}
+
+STAGE_LABELS = {
+    STAGE_CLASSIFY: "Classification",
+    STAGE_RAW: "OCR",
+    STAGE_ROWS: "Rows",
+}
+
+
 class Command(BaseCommand):
     help = "Run raw OCR and row extraction queues for specimen list pages."
 
     def add_arguments(self, parser):
         parser.add_argument(
             "--stage",
-            choices=["raw", "rows", "both"],
+            choices=list(STAGE_CHOICES),
             default="both",
-            help="Which stage to run: raw OCR, row extraction, or both.",
+            help=(
+                "Which stages to run: raw OCR, row extraction, both, or all "
+                "(classification, raw OCR and row extraction)."
+            ),
         )
         parser.add_argument(
             "--limit",
             type=int,
             default=None,
-            help="Maximum number of pages to process per stage in this run.",
+            help="Maximum number of pages to process in this run.",
         )
         parser.add_argument(
             "--ids",
@@ -35,32 +57,92 @@ class Command(BaseCommand):
             action="store_true",
             help="Re-run OCR/extraction even if results already exist.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help=(
+                "Number of pages each stage processes concurrently "
+                "(defaults to the SPECIMEN_LIST_PIPELINE_WORKERS setting)."
+            ),
+        )
+        parser.add_argument(
+            "--queue",
+            action="store_true",
+            help="Queue the run as a background job for run_workers instead of running it now.",
+        )
+        parser.add_argument(
+            "--batch",
+            action="store_true",
+            help=(
+                "Use the OpenAI Batch API: collect finished batches, persist their "
+                "results and submit the remaining requests as a new batch."
+            ),
+        )
 
     def handle(self, *args, **options):
         stage = options.get("stage")
         limit = options.get("limit")
         ids = options.get("ids")
         force = options.get("force")
+        workers = options.get("workers")
+        if workers is None:
+            workers = getattr(settings, "SPECIMEN_LIST_PIPELINE_WORKERS", 1)
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
 
-        raw_limit = limit or getattr(settings, "SPECIMEN_LIST_OCR_BATCH_SIZE", None)
-        row_limit = limit or getattr(settings, "SPECIMEN_LIST_ROW_EXTRACTION_BATCH_SIZE", None)
+        if stage == "rows":
+            limit = limit or getattr(settings, "SPECIMEN_LIST_ROW_EXTRACTION_BATCH_SIZE", None)
+        else:
+            limit = limit or getattr(settings, "SPECIMEN_LIST_OCR_BATCH_SIZE", None)
 
-        if stage in {"raw", "both"}:
-            summary = run_specimen_list_ocr_queue(limit=raw_limit, ids=ids, force=force)
-            for error in summary.errors:
-                self.stdout.write(self.style.WARNING(error))
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"OCR: {summary.successes} succeeded, {summary.failures} failed (total {summary.total})."
-                )
+        if options.get("batch"):
+            if force or ids:
+                raise CommandError("--batch cannot be combined with --force or --ids.")
+            self._run_batch_cycle(STAGE_CHOICES[stage], limit)
+            return
+
+        if options.get("queue"):
+            job = jobs.enqueue(
+                BackgroundJob.Kind.SPECIMEN_LIST_PIPELINE,
+                {
+                    "stages": list(STAGE_CHOICES[stage]),
+                    "limit": limit,
+                    "ids": ids,
+                    "force": force,
+                    "workers": workers,
+                },
             )
+            self.stdout.write(self.style.SUCCESS(f"Queued background job {job.pk}."))
+            return
+
+        pipeline = run_specimen_list_pipeline(
+            stages=STAGE_CHOICES[stage],
+            limit=limit,
+            ids=ids,
+            force=force,
+            workers=workers,
+        )
 
-        if stage in {"rows", "both"}:
-            summary = run_specimen_list_row_extraction_queue(limit=row_limit, ids=ids, force=force)
+        for name, summary in pipeline.stages.items():
             for error in summary.errors:
                 self.stdout.write(self.style.WARNING(error))
             self.stdout.write(
                 self.style.SUCCESS(
-                    f"Rows: {summary.successes} succeeded, {summary.failures} failed (total {summary.total})."
+                    f"{STAGE_LABELS[name]}: {summary.successes} succeeded, "
+                    f"{summary.failures} failed (total {summary.total})."
                 )
             )
+
+    def _run_batch_cycle(self, stages, limit):
+        summary = run_ocr_batch_cycle(LLMBatchJob.Target.SPECIMEN_LISTS, limit=limit, stages=stages)
+        for error in summary.errors:
+            self.stdout.write(self.style.WARNING(error))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Batch OCR: {summary.ingested} results collected, "
+                f"{summary.completed_items} stages succeeded, {summary.failed_items} failed, "
+                f"{summary.submitted_requests} requests submitted "
+                f"({summary.open_batches} batches open)."
+            )
+        )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cms.accession_summaries import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the accession search summaries read by the accession lists and filters."
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} accession summaries."))
@@ -0,0 +1,45 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from cms.merge.index import rebuild_index
+from cms.signals import MERGE_SEARCH_INDEXED_MODELS
+
+
+class Command(BaseCommand):
+    help = "Rebuild the trigram index used to shortlist fuzzy merge candidates."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help=(
+                "Model labels to rebuild, e.g. cms.FieldSlip "
+                "(defaults to every merge-enabled model)."
+            ),
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of index rows written per bulk insert.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        labels = options.get("models") or []
+        if labels:
+            try:
+                targets = [apps.get_model(label) for label in labels]
+            except (LookupError, ValueError) as exc:
+                raise CommandError(str(exc)) from exc
+        else:
+            targets = list(MERGE_SEARCH_INDEXED_MODELS)
+
+        for model in targets:
+            indexed = rebuild_index(model, batch_size=batch_size)
+            self.stdout.write(
+                self.style.SUCCESS(f"Indexed {indexed} {model._meta.label} records.")
+            )
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from cms.report_rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the rollup tables behind the media, accession and LLM usage reports."
+
+    def handle(self, *args, **options):
+        for label, rows in rebuild().items():
+            self.stdout.write(self.style.SUCCESS(f"Wrote {rows} {label} rows."))
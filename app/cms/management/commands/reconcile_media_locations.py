@@ -85,6 +85,7 @@ class Command(BaseCommand):
         queryset = (
             Media.objects.filter(media_location__contains="/pages/")
             .exclude(media_location__contains="/pages/approved/")
+            .defer("ocr_data")
             .order_by("pk")
         )
         if limit is not None:
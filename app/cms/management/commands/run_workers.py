@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from cms.jobs import default_worker_id, work
+from cms.models import BackgroundJob
+
+
+def _run_worker(index: int, stop: threading.Event, options: dict, processed: list[int]) -> None:
+    try:
+        processed[index] = work(
+            default_worker_id(index),
+            stop,
+            kinds=options.get("kinds"),
+            poll_interval=options["poll_interval"],
+            burst=options.get("burst", False),
+        )
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = "Run background job workers (PDF splitting, scan OCR, specimen list pipeline, taxonomy sync)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of jobs run concurrently by this process.",
+        )
+        parser.add_argument(
+            "--kinds",
+            nargs="+",
+            choices=BackgroundJob.Kind.values,
+            default=None,
+            help="Only run jobs of these kinds.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds an idle worker waits before checking for new jobs.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no job is ready to run instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        workers: int = options["workers"]
+        if workers < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        stop = threading.Event()
+
+        def _request_stop(signum, frame):
+            self.stdout.write("Stopping after the current jobs finish.")
+            stop.set()
+
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, _request_stop)
+
+        processed = [0] * workers
+        threads = [
+            threading.Thread(
+                target=_run_worker,
+                args=(index, stop, options, processed),
+                name=f"job-worker-{index}",
+            )
+            for index in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        # Join with a timeout so the main thread keeps handling signals.
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=1)
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {sum(processed)} jobs with {workers} workers."))
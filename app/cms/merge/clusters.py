@@ -0,0 +1,297 @@
+"""Bulk discovery of near-duplicate clusters for merge-enabled models.
+
+Records are grouped into blocks that share a token prefix, each block is
+scored as a matrix with :func:`rapidfuzz.process.cdist` and pairs reaching
+the threshold are joined into clusters with a union-find. The resulting
+clusters are persisted as :class:`cms.models.MergeDuplicateCluster` rows so
+the merge candidate screen can list them without recomputing scores.
+"""
+from __future__ import annotations
+
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from django.apps import apps
+from django.db import models, transaction
+
+from .fuzzy import _iter_candidate_texts
+from .index import model_label
+from .mixins import MergeMixin
+
+try:  # pragma: no cover - dependency injection is environment specific
+    import numpy as np
+    from rapidfuzz import fuzz, process
+except ImportError:  # pragma: no cover
+    np = None  # type: ignore[assignment]
+    fuzz = process = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+#: Default minimum pairwise score for two records to be linked.
+DEFAULT_CLUSTER_THRESHOLD = 90.0
+
+#: Number of leading token characters used as a blocking key.
+BLOCK_PREFIX_LENGTH = 4
+
+#: Blocks larger than this share a key too common to be informative and are
+#: skipped rather than scored as one very large matrix.
+DEFAULT_MAX_BLOCK_SIZE = 2000
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+@dataclass
+class DuplicateCluster:
+    """Near-duplicate records linked by pairwise scores."""
+
+    pks: List[Any]
+    pairs: List[Tuple[Any, Any, float]] = field(default_factory=list)
+
+    @property
+    def top_score(self) -> float:
+        return max((score for _, _, score in self.pairs), default=0.0)
+
+
+def merge_enabled_models() -> List[type[models.Model]]:
+    """Return every concrete ``MergeMixin`` model of the CMS app."""
+
+    return [
+        model
+        for model in apps.get_app_config("cms").get_models()
+        if issubclass(model, MergeMixin)
+    ]
+
+
+def default_cluster_fields(model: type[models.Model]) -> List[str]:
+    """Return the merge display fields used when no fields are requested."""
+
+    try:
+        instance = model()
+    except TypeError:
+        return []
+    return [name for name in instance.get_merge_display_fields() if name]
+
+
+def blocking_keys(text: str) -> set[str]:
+    """Return the token prefixes used to block ``text`` for comparison."""
+
+    keys: set[str] = set()
+    for token in _TOKEN_RE.findall(text.lower()):
+        if len(token) < 3 and not token.isdigit():
+            continue
+        keys.add(token[:BLOCK_PREFIX_LENGTH])
+    return keys
+
+
+class _DisjointSet:
+    def __init__(self, size: int) -> None:
+        self.parent = list(range(size))
+
+    def find(self, item: int) -> int:
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, left: int, right: int) -> None:
+        left_root, right_root = self.find(left), self.find(right)
+        if left_root != right_root:
+            self.parent[max(left_root, right_root)] = min(left_root, right_root)
+
+
+def _score_block(
+    texts: Sequence[str], threshold: float, workers: int
+) -> Iterable[Tuple[int, int, float]]:
+    """Yield ``(row, column, score)`` for block pairs at or above ``threshold``."""
+
+    matrix = process.cdist(
+        texts,
+        texts,
+        scorer=fuzz.token_set_ratio,
+        score_cutoff=threshold,
+        dtype=np.float32,
+        workers=workers,
+    )
+    rows, columns = np.nonzero(np.triu(matrix, k=1) >= threshold)
+    for row, column in zip(rows.tolist(), columns.tolist()):
+        yield row, column, float(matrix[row, column])
+
+
+def find_duplicate_clusters(
+    model: type[models.Model],
+    *,
+    fields: Sequence[str] | None = None,
+    threshold: float = DEFAULT_CLUSTER_THRESHOLD,
+    queryset: models.QuerySet | None = None,
+    workers: int = -1,
+    max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+) -> List[DuplicateCluster]:
+    """Return clusters of records whose texts score at least ``threshold``.
+
+    ``workers`` is passed to :func:`rapidfuzz.process.cdist`; ``-1`` scores
+    each block on every available core.
+    """
+
+    if process is None or np is None:
+        raise RuntimeError("Fuzzy matching dependencies are not installed.")
+    if threshold <= 0:
+        raise ValueError("threshold must be greater than zero.")
+
+    fields = [name for name in (fields or default_cluster_fields(model)) if name]
+    if not fields:
+        return []
+    if queryset is None:
+        queryset = model._default_manager.all()
+
+    pks: List[Any] = []
+    texts: List[str] = []
+    blocks: Dict[str, List[int]] = defaultdict(list)
+    for pk, text in _iter_candidate_texts(model, queryset.order_by("pk"), fields):
+        if not text:
+            continue
+        position = len(pks)
+        pks.append(pk)
+        texts.append(text)
+        for key in blocking_keys(text):
+            blocks[key].append(position)
+
+    pair_scores: Dict[Tuple[int, int], float] = {}
+    for key, members in blocks.items():
+        if len(members) < 2:
+            continue
+        if len(members) > max_block_size:
+            logger.info(
+                "Skipping %s duplicate block %r with %s records", model_label(model), key, len(members)
+            )
+            continue
+        block_texts = [texts[position] for position in members]
+        for row, column, score in _score_block(block_texts, threshold, workers):
+            pair = (members[row], members[column])
+            if pair not in pair_scores:
+                pair_scores[pair] = score
+
+    disjoint = _DisjointSet(len(pks))
+    for left, right in pair_scores:
+        disjoint.union(left, right)
+
+    grouped: Dict[int, DuplicateCluster] = {}
+    for (left, right), score in sorted(pair_scores.items()):
+        root = disjoint.find(left)
+        cluster = grouped.setdefault(root, DuplicateCluster(pks=[]))
+        cluster.pairs.append((pks[left], pks[right], score))
+    for position, pk in enumerate(pks):
+        cluster = grouped.get(disjoint.find(position))
+        if cluster is not None:
+            cluster.pks.append(pk)
+
+    clusters = list(grouped.values())
+    clusters.sort(key=lambda item: (-item.top_score, -len(item.pks)))
+    return clusters
+
+
+def refresh_duplicate_clusters(
+    model: type[models.Model],
+    *,
+    fields: Sequence[str] | None = None,
+    threshold: float = DEFAULT_CLUSTER_THRESHOLD,
+    workers: int = -1,
+    max_block_size: int = DEFAULT_MAX_BLOCK_SIZE,
+) -> int:
+    """Recompute and persist the duplicate clusters for ``model``.
+
+    Previously stored clusters for the model are replaced. Returns the number
+    of clusters written.
+    """
+
+    from cms.models import MergeDuplicateCluster
+
+    fields = list(fields or default_cluster_fields(model))
+    clusters = find_duplicate_clusters(
+        model,
+        fields=fields,
+        threshold=threshold,
+        workers=workers,
+        max_block_size=max_block_size,
+    )
+    label = model_label(model)
+    rows = [
+        MergeDuplicateCluster(
+            model_label=label,
+            fields=fields,
+            threshold=threshold,
+            member_pks=[str(pk) for pk in cluster.pks],
+            pair_scores=[[str(left), str(right), round(score, 2)] for left, right, score in cluster.pairs],
+            size=len(cluster.pks),
+            top_score=round(cluster.top_score, 2),
+        )
+        for cluster in clusters
+    ]
+    with transaction.atomic():
+        MergeDuplicateCluster.objects.filter(model_label=label).delete()
+        MergeDuplicateCluster.objects.bulk_create(rows)
+    return len(rows)
+
+
+def cluster_worklist(*, model_labels: Iterable[str] | None = None, limit: int = 50) -> List[Dict[str, Any]]:
+    """Return the highest scoring stored clusters with member labels.
+
+    Only the records of the returned clusters are loaded, one query per model.
+    Members deleted since the clusters were computed are omitted.
+    """
+
+    from cms.models import MergeDuplicateCluster
+
+    clusters = MergeDuplicateCluster.objects.all()
+    if model_labels is not None:
+        clusters = clusters.filter(model_label__in=list(model_labels))
+    clusters = list(clusters[:limit])
+
+    wanted: Dict[str, set[str]] = defaultdict(set)
+    for cluster in clusters:
+        wanted[cluster.model_label].update(cluster.member_pks)
+    instances: Dict[str, Dict[str, models.Model]] = {}
+    for label, member_pks in wanted.items():
+        try:
+            model = apps.get_model(label)
+        except LookupError:
+            instances[label] = {}
+            continue
+        loaded = model._default_manager.in_bulk(list(member_pks))
+        instances[label] = {str(pk): instance for pk, instance in loaded.items()}
+
+    worklist: List[Dict[str, Any]] = []
+    for cluster in clusters:
+        loaded = instances.get(cluster.model_label, {})
+        members = [
+            {"pk": pk, "label": str(loaded[pk])}
+            for pk in cluster.member_pks
+            if pk in loaded
+        ]
+        if len(members) < 2:
+            continue
+        worklist.append(
+            {
+                "id": cluster.pk,
+                "model_label": cluster.model_label,
+                "top_score": cluster.top_score,
+                "size": cluster.size,
+                "members": members,
+                "computed_at": cluster.computed_at,
+            }
+        )
+    return worklist
+
+
+__all__ = [
+    "DEFAULT_CLUSTER_THRESHOLD",
+    "DuplicateCluster",
+    "blocking_keys",
+    "cluster_worklist",
+    "default_cluster_fields",
+    "find_duplicate_clusters",
+    "merge_enabled_models",
+    "refresh_duplicate_clusters",
+]
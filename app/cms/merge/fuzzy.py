@@ -2,13 +2,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, List, Sequence, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
 
 from django.db import models
 
+from .index import INDEX_MIN_THRESHOLD, shortlist_candidate_pks
+
 try:  # pragma: no cover - dependency injection is environment specific
-    from rapidfuzz import fuzz
+    from rapidfuzz import fuzz, process
 except ImportError:  # pragma: no cover
+    process = None  # type: ignore[assignment]
     try:
         from fuzzywuzzy import fuzz  # type: ignore[assignment]
     except ImportError:  # pragma: no cover
@@ -45,6 +48,19 @@ class CandidateMatch:
     combined_text: str
 
 
+@dataclass(frozen=True)
+class ScoredCandidate:
+    """Score for a candidate identified by primary key only.
+
+    Ranking works on these lightweight records so that only the page of
+    results being displayed needs full model instances.
+    """
+
+    pk: Any
+    score: float
+    combined_text: str
+
+
 def _yield_candidate_text(instance: models.Model, fields: Sequence[str]) -> str:
     """Return a normalised string representation for ``instance`` fields."""
 
@@ -57,6 +73,131 @@ def _yield_candidate_text(instance: models.Model, fields: Sequence[str]) -> str:
     return " ".join(parts)
 
 
+def _join_values(values: Iterable[Any]) -> str:
+    return " ".join(str(value) for value in values if value not in (None, ""))
+
+
+def _are_plain_columns(model: type[models.Model], fields: Sequence[str]) -> bool:
+    """Return ``True`` when every field can be read with ``values_list``."""
+
+    concrete = {field.name: field for field in model._meta.concrete_fields}
+    return all(name in concrete and not concrete[name].is_relation for name in fields)
+
+
+def _iter_candidate_texts(
+    model: type[models.Model],
+    queryset: models.QuerySet,
+    fields: Sequence[str],
+) -> Iterator[Tuple[Any, str]]:
+    """Yield ``(pk, combined_text)`` pairs for the records in ``queryset``."""
+
+    if _are_plain_columns(model, fields):
+        for row in queryset.values_list("pk", *fields).iterator():
+            yield row[0], _join_values(row[1:])
+        return
+    # Relations and properties need model instances to render their values.
+    for instance in queryset.iterator():
+        yield instance.pk, _yield_candidate_text(instance, fields)
+
+
+def _extract_scores(
+    query: str, choices: Dict[Any, str], threshold: float
+) -> List[ScoredCandidate]:
+    if process is None:
+        scored = [
+            ScoredCandidate(pk=pk, score=similarity_ratio(query, text), combined_text=text)
+            for pk, text in choices.items()
+        ]
+        scored = [item for item in scored if item.score >= threshold]
+    else:
+        results = process.extract(
+            query,
+            choices,
+            scorer=fuzz.token_set_ratio,
+            score_cutoff=threshold,
+            limit=None,
+        )
+        scored = [
+            ScoredCandidate(pk=pk, score=float(score), combined_text=text)
+            for text, score, pk in results
+        ]
+    # Ties keep the queryset order, matching a stable sort by score.
+    position = {pk: index for index, pk in enumerate(choices)}
+    scored.sort(key=lambda item: (-item.score, position[item.pk]))
+    return scored
+
+
+def rank_candidate_keys(
+    model: type[models.Model],
+    query: str,
+    *,
+    fields: Sequence[str],
+    threshold: float = 0,
+    queryset: models.QuerySet | None = None,
+    use_index: bool = True,
+) -> List[ScoredCandidate]:
+    """Return scored candidate keys for ``query`` ordered by score.
+
+    Accepts the same arguments as :func:`score_candidates`. When ``threshold``
+    is at least :data:`~cms.merge.index.INDEX_MIN_THRESHOLD` and the model's
+    trigram index covers ``fields``, only the shortlisted records are read
+    and scored; otherwise every record in ``queryset`` is scored. Only the
+    requested field values are loaded from the database.
+    """
+
+    if not query:
+        return []
+    if not fuzz:
+        raise RuntimeError("Fuzzy matching dependencies are not installed.")
+
+    if queryset is None:
+        queryset = model._default_manager.all()
+
+    cleaned_fields: List[str] = [field for field in fields if field]
+    if not cleaned_fields:
+        return []
+
+    if use_index and threshold >= INDEX_MIN_THRESHOLD:
+        shortlist = shortlist_candidate_pks(model, query, fields=cleaned_fields)
+        if shortlist is not None:
+            if not shortlist:
+                return []
+            queryset = queryset.filter(pk__in=shortlist)
+
+    choices: Dict[Any, str] = {}
+    for pk, combined_text in _iter_candidate_texts(model, queryset, cleaned_fields):
+        if combined_text:
+            choices[pk] = combined_text
+    return _extract_scores(query, choices, threshold)
+
+
+def materialise_candidates(
+    model: type[models.Model],
+    scored: Sequence[ScoredCandidate],
+    *,
+    queryset: models.QuerySet | None = None,
+) -> List[CandidateMatch]:
+    """Load the instances for ``scored`` keys, preserving their order.
+
+    Records deleted since scoring are dropped from the result.
+    """
+
+    if not scored:
+        return []
+    if queryset is None:
+        queryset = model._default_manager.all()
+    instances = queryset.in_bulk([item.pk for item in scored])
+    return [
+        CandidateMatch(
+            instance=instances[item.pk],
+            score=item.score,
+            combined_text=item.combined_text,
+        )
+        for item in scored
+        if item.pk in instances
+    ]
+
+
 def score_candidates(
     model: type[models.Model],
     query: str,
@@ -89,28 +230,18 @@ def score_candidates(
         Ordered list of matches sorted by score in descending order.
     """
 
-    if not query:
-        return []
-
-    if queryset is None:
-        queryset = model._default_manager.all()
-
-    cleaned_fields: List[str] = [field for field in fields if field]
-    if not cleaned_fields:
-        return []
-
-    matches: List[CandidateMatch] = []
-    for instance in queryset.iterator():
-        combined_text = _yield_candidate_text(instance, cleaned_fields)
-        if not combined_text:
-            continue
-        score = similarity_ratio(query, combined_text)
-        if score < threshold:
-            continue
-        matches.append(CandidateMatch(instance=instance, score=score, combined_text=combined_text))
-
-    matches.sort(key=lambda item: item.score, reverse=True)
-    return matches
-
-
-__all__ = ["similarity_ratio", "rank_candidates", "score_candidates", "CandidateMatch"]
+    scored = rank_candidate_keys(
+        model, query, fields=fields, threshold=threshold, queryset=queryset
+    )
+    return materialise_candidates(model, scored, queryset=queryset)
+
+
+__all__ = [
+    "similarity_ratio",
+    "rank_candidates",
+    "rank_candidate_keys",
+    "materialise_candidates",
+    "score_candidates",
+    "CandidateMatch",
+    "ScoredCandidate",
+]
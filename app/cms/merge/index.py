@@ -0,0 +1,216 @@
+"""Trigram index used to shortlist fuzzy merge candidates.
+
+Scoring every record of a large model with ``token_set_ratio`` is expensive,
+so merge-enabled models can keep an inverted index of token trigrams in
+:class:`cms.models.MergeSearchGram`. Candidate searches look up the trigrams
+of the query, keep the records sharing the most trigrams and only score that
+shortlist. The index is populated with :func:`rebuild_index` (see the
+``rebuild_merge_search_index`` management command) and kept current by the
+save/delete signal handlers in :mod:`cms.signals`.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Iterable, List, Sequence
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count
+
+#: Thresholds below this value are too permissive for trigram shortlisting:
+#: records sharing no trigram with the query can still reach them, so such
+#: searches score the full queryset instead.
+INDEX_MIN_THRESHOLD = 50.0
+
+#: Default number of records kept after trigram shortlisting.
+DEFAULT_SHORTLIST_SIZE = 2000
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def model_label(model: type[models.Model]) -> str:
+    """Return the dotted label used to key index rows for ``model``."""
+
+    return f"{model._meta.app_label}.{model._meta.model_name}"
+
+
+def text_grams(text: Any) -> set[str]:
+    """Return the padded, lower-cased token trigrams of ``text``."""
+
+    grams: set[str] = set()
+    if text in (None, ""):
+        return grams
+    for token in _TOKEN_RE.findall(str(text).lower()):
+        padded = f" {token} "
+        for start in range(len(padded) - 2):
+            grams.add(padded[start : start + 3])
+    return grams
+
+
+def indexable_fields(model: type[models.Model]) -> List[str]:
+    """Return the concrete text fields of ``model`` covered by the index."""
+
+    names: List[str] = []
+    for field in model._meta.concrete_fields:
+        if field.primary_key or field.is_relation:
+            continue
+        if isinstance(field, (models.CharField, models.TextField)):
+            names.append(field.name)
+    return names
+
+
+def shortlist_size() -> int:
+    """Return the configured number of records kept after shortlisting."""
+
+    return int(getattr(settings, "MERGE_INDEX_SHORTLIST_SIZE", DEFAULT_SHORTLIST_SIZE))
+
+
+def _build_grams(label: str, pk: Any, values: Iterable[tuple[str, Any]]):
+    from cms.models import MergeSearchGram
+
+    object_pk = str(pk)
+    rows = []
+    for field_name, value in values:
+        for gram in sorted(text_grams(value)):
+            rows.append(
+                MergeSearchGram(
+                    model_label=label,
+                    object_pk=object_pk,
+                    field_name=field_name,
+                    gram=gram,
+                )
+            )
+    return rows
+
+
+def get_index_state(model: type[models.Model]):
+    """Return the index state for ``model`` or ``None`` when never built."""
+
+    from cms.models import MergeSearchIndexState
+
+    return MergeSearchIndexState.objects.filter(model_label=model_label(model)).first()
+
+
+def rebuild_index(model: type[models.Model], *, batch_size: int = 1000) -> int:
+    """Rebuild the trigram index for ``model`` and return the indexed record count."""
+
+    from cms.models import MergeSearchGram, MergeSearchIndexState
+
+    label = model_label(model)
+    fields = indexable_fields(model)
+    indexed = 0
+    with transaction.atomic():
+        MergeSearchGram.objects.filter(model_label=label).delete()
+        pending = []
+        rows = model._default_manager.values_list("pk", *fields).order_by().iterator(
+            chunk_size=batch_size
+        )
+        for row in rows:
+            pending.extend(_build_grams(label, row[0], zip(fields, row[1:])))
+            indexed += 1
+            if len(pending) >= batch_size:
+                MergeSearchGram.objects.bulk_create(pending, batch_size=batch_size)
+                pending = []
+        if pending:
+            MergeSearchGram.objects.bulk_create(pending, batch_size=batch_size)
+        MergeSearchIndexState.objects.update_or_create(
+            model_label=label,
+            defaults={"fields": fields, "record_count": indexed},
+        )
+    return indexed
+
+
+def index_instance(instance: models.Model, *, update_fields: Iterable[str] | None = None) -> int:
+    """Refresh the index rows for ``instance`` when its model index exists.
+
+    Returns the number of trigram rows written. Saves that only touch
+    non-indexed fields leave the index untouched.
+    """
+
+    from cms.models import MergeSearchGram
+
+    state = get_index_state(type(instance))
+    if state is None:
+        return 0
+    fields = [name for name in state.fields if name]
+    if update_fields is not None and not set(update_fields) & set(fields):
+        return 0
+
+    label = state.model_label
+    rows = _build_grams(
+        label,
+        instance.pk,
+        ((name, getattr(instance, name, "")) for name in fields),
+    )
+    with transaction.atomic():
+        MergeSearchGram.objects.filter(model_label=label, object_pk=str(instance.pk)).delete()
+        MergeSearchGram.objects.bulk_create(rows)
+    return len(rows)
+
+
+def remove_instance(instance: models.Model, *, pk: Any = None) -> int:
+    """Delete the index rows stored for ``instance``."""
+
+    from cms.models import MergeSearchGram
+
+    object_pk = instance.pk if pk is None else pk
+    if object_pk is None:
+        return 0
+    deleted, _ = MergeSearchGram.objects.filter(
+        model_label=model_label(type(instance)), object_pk=str(object_pk)
+    ).delete()
+    return deleted
+
+
+def shortlist_candidate_pks(
+    model: type[models.Model],
+    query: str,
+    *,
+    fields: Sequence[str],
+    limit: int | None = None,
+) -> List[str] | None:
+    """Return primary keys of records sharing trigrams with ``query``.
+
+    ``None`` signals that the index cannot answer the search — it has not
+    been built for ``model``, does not cover every requested field or the
+    query has no indexable tokens — and the caller should score the full
+    queryset instead. Records are ordered by the number of shared trigrams
+    and capped at ``limit`` (defaults to :func:`shortlist_size`).
+    """
+
+    from cms.models import MergeSearchGram
+
+    grams = text_grams(query)
+    if not grams:
+        return None
+    state = get_index_state(model)
+    if state is None or not set(fields) <= set(state.fields):
+        return None
+
+    limit = shortlist_size() if limit is None else limit
+    rows = (
+        MergeSearchGram.objects.filter(
+            model_label=state.model_label,
+            field_name__in=list(fields),
+            gram__in=sorted(grams),
+        )
+        .values("object_pk")
+        .annotate(hits=Count("gram", distinct=True))
+        .order_by("-hits", "object_pk")
+    )
+    return [row["object_pk"] for row in rows[:limit]]
+
+
+__all__ = [
+    "INDEX_MIN_THRESHOLD",
+    "DEFAULT_SHORTLIST_SIZE",
+    "get_index_state",
+    "index_instance",
+    "indexable_fields",
+    "model_label",
+    "rebuild_index",
+    "remove_instance",
+    "shortlist_candidate_pks",
+    "shortlist_size",
+    "text_grams",
+]
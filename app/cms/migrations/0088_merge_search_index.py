@@ -0,0 +1,42 @@
+# Generated by Django 5.2.14 on 2026-10-16 20:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0087_collectionmethod_fossilgroup_grainsize_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MergeSearchIndexState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text='Dotted label of the indexed model.', max_length=100, unique=True)),
+                ('fields', models.JSONField(default=list, help_text='Text fields covered by the index.')),
+                ('record_count', models.PositiveIntegerField(default=0)),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Merge Search Index State',
+                'verbose_name_plural': 'Merge Search Index States',
+            },
+        ),
+        migrations.CreateModel(
+            name='MergeSearchGram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text='Dotted label of the indexed model.', max_length=100)),
+                ('object_pk', models.CharField(help_text='Primary key of the indexed record.', max_length=64)),
+                ('field_name', models.CharField(help_text='Field the trigram was extracted from.', max_length=100)),
+                ('gram', models.CharField(help_text='Lower-cased, space padded token trigram.', max_length=3)),
+            ],
+            options={
+                'verbose_name': 'Merge Search Gram',
+                'verbose_name_plural': 'Merge Search Grams',
+                'indexes': [models.Index(fields=['model_label', 'field_name', 'gram'], name='merge_gram_lookup_idx'), models.Index(fields=['model_label', 'object_pk'], name='merge_gram_object_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.14 on 2026-10-16 20:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0088_merge_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MergeDuplicateCluster',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model_label', models.CharField(help_text='Dotted label of the model the cluster belongs to.', max_length=100)),
+                ('fields', models.JSONField(default=list, help_text='Fields concatenated to build the compared text.')),
+                ('threshold', models.FloatField(help_text='Minimum pairwise score used when building the cluster.')),
+                ('member_pks', models.JSONField(default=list, help_text='Primary keys of the records in the cluster.')),
+                ('pair_scores', models.JSONField(default=list, help_text='Scored record pairs linking the cluster as [pk, pk, score].')),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('top_score', models.FloatField(default=0)),
+                ('computed_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Merge Duplicate Cluster',
+                'verbose_name_plural': 'Merge Duplicate Clusters',
+                'ordering': ['-top_score', '-size', 'pk'],
+                'indexes': [models.Index(fields=['model_label', '-top_score'], name='merge_cluster_model_idx')],
+            },
+        ),
+    ]
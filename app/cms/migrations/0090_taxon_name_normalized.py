@@ -0,0 +1,30 @@
+# Generated by Django 5.2.14 on 2026-10-16 20:47
+
+from django.db import migrations, models
+from django.db.models.functions import Lower, Trim
+
+
+def populate_taxon_name_normalized(apps, schema_editor):
+    Taxon = apps.get_model("cms", "Taxon")
+    Taxon.objects.update(taxon_name_normalized=Lower(Trim("taxon_name")))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0089_merge_duplicate_cluster'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='historicaltaxon',
+            name='taxon_name_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Trimmed, lower-cased taxon name used for case-insensitive matching.', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='taxon',
+            name='taxon_name_normalized',
+            field=models.CharField(blank=True, db_index=True, default='', editable=False, help_text='Trimmed, lower-cased taxon name used for case-insensitive matching.', max_length=50),
+        ),
+        migrations.RunPython(populate_taxon_name_normalized, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,104 @@
+# Generated by Django 5.2.14 on 2026-10-16 20:56
+
+import hashlib
+import json
+
+from django.db import migrations, models
+
+BATCH_SIZE = 500
+
+
+def _digest(data):
+    if data is None:
+        return ""
+    canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def move_ocr_data_to_blobs(apps, schema_editor):
+    OCRDataBlob = apps.get_model("cms", "OCRDataBlob")
+    Media = apps.get_model("cms", "Media")
+    HistoricalMedia = apps.get_model("cms", "HistoricalMedia")
+    MediaQCLog = apps.get_model("cms", "MediaQCLog")
+
+    def store(payloads):
+        blobs = {}
+        for data in payloads:
+            digest = _digest(data)
+            if digest:
+                blobs.setdefault(digest, OCRDataBlob(digest=digest, content=data))
+        OCRDataBlob.objects.bulk_create(blobs.values(), ignore_conflicts=True)
+
+    def flush(model, pk_name, rows):
+        store(data for _, data in rows)
+        for pk, data in rows:
+            model.objects.filter(**{pk_name: pk}).update(ocr_data_digest=_digest(data))
+
+    def backfill(queryset, pk_name):
+        pending = []
+        for pk, data in queryset.values_list(pk_name, "ocr_data").iterator(chunk_size=BATCH_SIZE):
+            pending.append((pk, data))
+            if len(pending) >= BATCH_SIZE:
+                flush(queryset.model, pk_name, pending)
+                pending = []
+        if pending:
+            flush(queryset.model, pk_name, pending)
+
+    backfill(Media.objects.filter(ocr_data__isnull=False), "pk")
+    backfill(HistoricalMedia.objects.filter(ocr_data__isnull=False), "history_id")
+
+    logs = MediaQCLog.objects.filter(change_type="ocr_data", field_name="ocr_data")
+    for log in logs.iterator(chunk_size=BATCH_SIZE):
+        store([log.old_value, log.new_value])
+        log.old_ocr_digest = _digest(log.old_value)
+        log.new_ocr_digest = _digest(log.new_value)
+        log.old_value = None
+        log.new_value = None
+        log.save(update_fields=["old_ocr_digest", "new_ocr_digest", "old_value", "new_value"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0090_taxon_name_normalized'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OCRDataBlob',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('content', models.JSONField()),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'OCR data blob',
+                'verbose_name_plural': 'OCR data blobs',
+            },
+        ),
+        migrations.AddField(
+            model_name='historicalmedia',
+            name='ocr_data_digest',
+            field=models.CharField(blank=True, default='', help_text='Digest of the OCR data blob recorded in history and QC logs.', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='media',
+            name='ocr_data_digest',
+            field=models.CharField(blank=True, default='', help_text='Digest of the OCR data blob recorded in history and QC logs.', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='mediaqclog',
+            name='new_ocr_digest',
+            field=models.CharField(blank=True, default='', help_text='Digest of the OCR data blob after a full OCR data change.', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='mediaqclog',
+            name='old_ocr_digest',
+            field=models.CharField(blank=True, default='', help_text='Digest of the OCR data blob before a full OCR data change.', max_length=64),
+        ),
+        migrations.RunPython(move_ocr_data_to_blobs, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='historicalmedia',
+            name='ocr_data',
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.14 on 2026-10-16 21:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0091_ocr_data_blobs"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LLMResponseCache",
+            fields=[
+                ("key", models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ("kind", models.CharField(help_text="OCR call that produced the response.", max_length=50)),
+                ("model_name", models.CharField(max_length=255)),
+                ("image_sha256", models.CharField(db_index=True, max_length=64)),
+                ("prompt_sha256", models.CharField(max_length=64)),
+                ("content", models.TextField(help_text="Message content returned by the model.")),
+                (
+                    "usage",
+                    models.JSONField(blank=True, default=dict, help_text="Usage payload of the original call."),
+                ),
+                ("response_id", models.CharField(blank=True, default="", max_length=255)),
+                ("hit_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("last_used_at", models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+            ],
+            options={
+                "verbose_name": "LLM response cache entry",
+                "verbose_name_plural": "LLM response cache entries",
+                "ordering": ["-last_used_at"],
+            },
+        ),
+        migrations.AddField(
+            model_name="llmusagerecord",
+            name="cache_hit",
+            field=models.BooleanField(
+                default=False,
+                help_text="Whether the OCR result was served from the LLM response cache.",
+            ),
+        ),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 5.2.14 on 2026-10-16 22:15
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+OCR_STATUS_CHOICES = [
+    ("pending", "Pending"),
+    ("completed", "Completed"),
+    ("failed", "Failed"),
+    ("duplicate", "Duplicate"),
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0092_llm_response_cache"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="media",
+            name="content_sha256",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                help_text="SHA-256 of the image file recorded at ingest.",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="perceptual_hash",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                default="",
+                help_text="64-bit difference hash of the image, in hex, used to find near-duplicate scans.",
+                max_length=16,
+            ),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Earlier media this scan duplicates or nearly duplicates.",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="cms.media",
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalmedia",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                blank=True,
+                db_constraint=False,
+                help_text="Earlier media this scan duplicates or nearly duplicates.",
+                null=True,
+                on_delete=django.db.models.deletion.DO_NOTHING,
+                related_name="+",
+                to="cms.media",
+            ),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="duplicate_distance",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                help_text="Bits differing from the perceptual hash of the duplicated media (0 for identical files).",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="historicalmedia",
+            name="duplicate_distance",
+            field=models.PositiveSmallIntegerField(
+                blank=True,
+                help_text="Bits differing from the perceptual hash of the duplicated media (0 for identical files).",
+                null=True,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="media",
+            name="ocr_status",
+            field=models.CharField(
+                choices=OCR_STATUS_CHOICES,
+                default="pending",
+                help_text="Status of OCR processing",
+                max_length=20,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="historicalmedia",
+            name="ocr_status",
+            field=models.CharField(
+                choices=OCR_STATUS_CHOICES,
+                default="pending",
+                help_text="Status of OCR processing",
+                max_length=20,
+            ),
+        ),
+        migrations.CreateModel(
+            name="MediaHashBand",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("band", models.PositiveSmallIntegerField(help_text="Position of the slice within the hash.")),
+                ("value", models.CharField(help_text="Hex digits of the slice.", max_length=4)),
+                (
+                    "media",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="hash_bands",
+                        to="cms.media",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["band", "value"], name="media_hash_band_lookup_idx")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("media", "band"), name="media_hash_band_unique")
+                ],
+            },
+        ),
+    ]
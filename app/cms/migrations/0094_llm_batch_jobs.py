@@ -0,0 +1,75 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0093_media_duplicate_detection"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="llmresponsecache",
+            name="batch_id",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="OpenAI batch that produced the response, if any.",
+                max_length=255,
+            ),
+        ),
+        migrations.CreateModel(
+            name="LLMBatchJob",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "target",
+                    models.CharField(
+                        choices=[("scans", "Pending scans"), ("specimen_lists", "Specimen list pages")],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("submitted", "Submitted"),
+                            ("completed", "Completed"),
+                            ("ingested", "Ingested"),
+                            ("failed", "Failed"),
+                        ],
+                        db_index=True,
+                        default="submitted",
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "batch_id",
+                    models.CharField(help_text="OpenAI batch identifier.", max_length=255, unique=True),
+                ),
+                (
+                    "remote_status",
+                    models.CharField(blank=True, default="", help_text="Status reported by OpenAI.", max_length=30),
+                ),
+                (
+                    "requests",
+                    models.JSONField(default=dict, help_text="Cache key metadata of each request, keyed by custom_id."),
+                ),
+                ("request_count", models.PositiveIntegerField(default=0)),
+                ("output_file_id", models.CharField(blank=True, default="", max_length=255)),
+                ("error_file_id", models.CharField(blank=True, default="", max_length=255)),
+                ("ingested_count", models.PositiveIntegerField(default=0)),
+                ("error_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("completed_at", models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                "verbose_name": "LLM batch job",
+                "verbose_name_plural": "LLM batch jobs",
+                "ordering": ["-created_at"],
+            },
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0095_background_jobs"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="media",
+            name="claimed_by",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="OCR worker currently processing this scan.",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="media",
+            name="claim_expires_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="When the OCR worker's claim lapses unless renewed.",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="specimenlistpage",
+            name="claimed_by",
+            field=models.CharField(
+                blank=True,
+                default="",
+                help_text="Pipeline worker currently processing this page.",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="specimenlistpage",
+            name="claim_expires_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                help_text="When the pipeline worker's claim lapses unless renewed.",
+                null=True,
+            ),
+        ),
+    ]
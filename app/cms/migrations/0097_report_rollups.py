@@ -0,0 +1,85 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def populate_rollups(apps, schema_editor):
+    Media = apps.get_model("cms", "Media")
+    Accession = apps.get_model("cms", "Accession")
+    MediaStatusRollup = apps.get_model("cms", "MediaStatusRollup")
+    MediaDailyRollup = apps.get_model("cms", "MediaDailyRollup")
+    AccessionLocalityRollup = apps.get_model("cms", "AccessionLocalityRollup")
+
+    MediaStatusRollup.objects.bulk_create(
+        MediaStatusRollup(ocr_status=row["ocr_status"], media_count=row["total"])
+        for row in Media.objects.order_by().values("ocr_status").annotate(total=Count("pk"))
+    )
+    MediaDailyRollup.objects.bulk_create(
+        MediaDailyRollup(day=row["day"], media_count=row["total"])
+        for row in Media.objects.order_by()
+        .annotate(day=TruncDate("created_on"))
+        .values("day")
+        .annotate(total=Count("pk"))
+        if row["day"] is not None
+    )
+    AccessionLocalityRollup.objects.bulk_create(
+        AccessionLocalityRollup(
+            locality_id=row["specimen_prefix"],
+            accession_count=row["accessions"],
+            specimen_count=row["specimens"],
+        )
+        for row in Accession.objects.order_by()
+        .values("specimen_prefix")
+        .annotate(accessions=Count("pk"), specimens=Count("specimen_no", distinct=True))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0096_work_claims"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MediaStatusRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("ocr_status", models.CharField(max_length=20, unique=True)),
+                ("media_count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="MediaDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField(unique=True)),
+                ("media_count", models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="AccessionLocalityRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("accession_count", models.IntegerField(default=0)),
+                (
+                    "specimen_count",
+                    models.IntegerField(
+                        default=0, help_text="Distinct specimen numbers accessioned under the locality."
+                    ),
+                ),
+                (
+                    "locality",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="accession_rollup",
+                        to="cms.locality",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(populate_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:59
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+SCAN_OCR_STAGE = "card_ocr"
+
+
+def populate_rollup(apps, schema_editor):
+    LLMUsageRecord = apps.get_model("cms", "LLMUsageRecord")
+    LLMUsageDailyRollup = apps.get_model("cms", "LLMUsageDailyRollup")
+
+    LLMUsageDailyRollup.objects.bulk_create(
+        LLMUsageDailyRollup(
+            day=row["day"],
+            model_name=row["model_name"],
+            stage=SCAN_OCR_STAGE,
+            record_count=row["records"],
+            cache_hit_count=row["cache_hits"],
+            prompt_tokens=row["prompt"] or 0,
+            completion_tokens=row["completion"] or 0,
+            total_tokens=row["tokens"] or 0,
+            cost_usd=row["cost"] or Decimal("0"),
+            processing_seconds=row["seconds"] or Decimal("0"),
+        )
+        for row in LLMUsageRecord.objects.order_by()
+        .annotate(day=TruncDate("created_at"))
+        .values("day", "model_name")
+        .annotate(
+            records=Count("pk"),
+            cache_hits=Count("pk", filter=Q(cache_hit=True)),
+            prompt=Sum("prompt_tokens"),
+            completion=Sum("completion_tokens"),
+            tokens=Sum("total_tokens"),
+            cost=Sum("cost_usd"),
+            seconds=Sum("processing_seconds"),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0097_report_rollups"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="llmusagerecord",
+            index=models.Index(fields=["created_at"], name="llm_usage_created_at_idx"),
+        ),
+        migrations.CreateModel(
+            name="LLMUsageDailyRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("day", models.DateField()),
+                ("model_name", models.CharField(max_length=255)),
+                ("stage", models.CharField(help_text="Pipeline stage that made the calls.", max_length=64)),
+                ("record_count", models.IntegerField(default=0)),
+                ("cache_hit_count", models.IntegerField(default=0)),
+                ("prompt_tokens", models.BigIntegerField(default=0)),
+                ("completion_tokens", models.BigIntegerField(default=0)),
+                ("total_tokens", models.BigIntegerField(default=0)),
+                ("cost_usd", models.DecimalField(decimal_places=6, default=Decimal("0"), max_digits=16)),
+                ("processing_seconds", models.DecimalField(decimal_places=3, default=Decimal("0"), max_digits=14)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("day", "model_name", "stage"), name="llm_usage_daily_rollup_unique"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_rollup, migrations.RunPython.noop),
+    ]
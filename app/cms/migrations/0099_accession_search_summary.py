@@ -0,0 +1,146 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:59
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+RANK_FIELDS = ("family", "subfamily", "tribe", "genus", "species")
+BATCH_SIZE = 500
+
+
+def _join(values):
+    return "\n".join(sorted({value.strip() for value in values if value and value.strip()}))
+
+
+def populate_summaries(apps, schema_editor):
+    Accession = apps.get_model("cms", "Accession")
+    AccessionRow = apps.get_model("cms", "AccessionRow")
+    Identification = apps.get_model("cms", "Identification")
+    NatureOfSpecimen = apps.get_model("cms", "NatureOfSpecimen")
+    Taxon = apps.get_model("cms", "Taxon")
+    AccessionSearchSummary = apps.get_model("cms", "AccessionSearchSummary")
+
+    accession_ids = list(Accession.objects.order_by("pk").values_list("pk", flat=True))
+    for start in range(0, len(accession_ids), BATCH_SIZE):
+        ids = accession_ids[start : start + BATCH_SIZE]
+        counts = {pk: defaultdict(int) for pk in ids}
+        values = {pk: defaultdict(set) for pk in ids}
+        for accession_id, area in AccessionRow.objects.filter(accession_id__in=ids).values_list(
+            "accession_id", "storage__area"
+        ):
+            counts[accession_id]["row_count"] += 1
+            values[accession_id]["storage_areas"].add(area)
+
+        identifications = list(
+            Identification.objects.filter(accession_row__accession_id__in=ids).values(
+                "accession_row__accession_id",
+                "taxon",
+                "taxon_verbatim",
+                "taxon_record_id",
+                "taxon_record__taxon_name",
+                *(f"taxon_record__{rank}" for rank in RANK_FIELDS),
+            )
+        )
+        synonyms = defaultdict(set)
+        for accepted_id, name in Taxon.objects.filter(
+            accepted_taxon_id__in={row["taxon_record_id"] for row in identifications if row["taxon_record_id"]}
+        ).values_list("accepted_taxon_id", "taxon_name"):
+            synonyms[accepted_id].add(name)
+        ranks_by_name = defaultdict(list)
+        for taxon in Taxon.objects.filter(
+            status="accepted",
+            is_active=True,
+            taxon_name__in={
+                name for row in identifications for name in (row["taxon"], row["taxon_verbatim"]) if name
+            },
+        ).values("taxon_name", *RANK_FIELDS):
+            ranks_by_name[taxon["taxon_name"]].append(taxon)
+
+        for row in identifications:
+            accession_id = row["accession_row__accession_id"]
+            found = values[accession_id]
+            counts[accession_id]["identification_count"] += 1
+            controlled = row["taxon_record__taxon_name"]
+            found["taxa"].add(controlled or row["taxon"] or row["taxon_verbatim"])
+            found["taxon_names"].update({row["taxon"], row["taxon_verbatim"], controlled})
+            found["taxon_names"].update(synonyms.get(row["taxon_record_id"], ()))
+            sources = [{rank: row[f"taxon_record__{rank}"] for rank in RANK_FIELDS}] if controlled else []
+            for name in (row["taxon"], row["taxon_verbatim"]):
+                sources.extend(ranks_by_name.get(name, ()))
+            for source in sources:
+                for rank in RANK_FIELDS:
+                    found[rank].add(source[rank])
+
+        for accession_id, element in NatureOfSpecimen.objects.filter(
+            accession_row__accession_id__in=ids
+        ).values_list("accession_row__accession_id", "element__name"):
+            counts[accession_id]["specimen_count"] += 1
+            values[accession_id]["elements"].add(element)
+
+        AccessionSearchSummary.objects.bulk_create(
+            AccessionSearchSummary(
+                accession_id=pk,
+                row_count=counts[pk]["row_count"],
+                identification_count=counts[pk]["identification_count"],
+                specimen_count=counts[pk]["specimen_count"],
+                **{
+                    field: _join(values[pk][field])
+                    for field in ("taxa", "taxon_names", "elements", "storage_areas", *RANK_FIELDS)
+                },
+            )
+            for pk in ids
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0098_llm_usage_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AccessionSearchSummary",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "taxa",
+                    models.TextField(
+                        blank=True, default="", help_text="Preferred taxon name of each identification."
+                    ),
+                ),
+                (
+                    "taxon_names",
+                    models.TextField(
+                        blank=True,
+                        default="",
+                        help_text="Verbatim, legacy, controlled and synonym names matched by the taxon filter.",
+                    ),
+                ),
+                ("elements", models.TextField(blank=True, default="")),
+                ("family", models.TextField(blank=True, default="")),
+                ("subfamily", models.TextField(blank=True, default="")),
+                ("tribe", models.TextField(blank=True, default="")),
+                ("genus", models.TextField(blank=True, default="")),
+                ("species", models.TextField(blank=True, default="")),
+                ("storage_areas", models.TextField(blank=True, default="")),
+                ("row_count", models.IntegerField(default=0)),
+                ("identification_count", models.IntegerField(default=0)),
+                (
+                    "specimen_count",
+                    models.IntegerField(default=0, help_text="Nature of specimen entries across all rows."),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "accession",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_summary",
+                        to="cms.accession",
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunPython(populate_summaries, migrations.RunPython.noop),
+    ]
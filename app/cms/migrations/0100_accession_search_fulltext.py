@@ -0,0 +1,39 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:59
+
+from django.db import migrations
+
+SEARCH_FIELDS = ("taxon_names", "elements", "family", "subfamily", "tribe", "genus", "species")
+
+
+def _index_name(field):
+    return f"accession_summary_{field}_ft"
+
+
+def create_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    table = schema_editor.quote_name(apps.get_model("cms", "AccessionSearchSummary")._meta.db_table)
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX {schema_editor.quote_name(_index_name(field))} "
+            f"ON {table} ({schema_editor.quote_name(field)})"
+        )
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    table = schema_editor.quote_name(apps.get_model("cms", "AccessionSearchSummary")._meta.db_table)
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(f"DROP INDEX {schema_editor.quote_name(_index_name(field))} ON {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0099_accession_search_summary"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_indexes, drop_fulltext_indexes),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("cms", "0100_accession_search_fulltext"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="backgroundjob",
+            name="kind",
+            field=models.CharField(
+                choices=[
+                    ("split_specimen_list_pdf", "Split specimen list PDF"),
+                    ("scan_ocr", "Scan OCR"),
+                    ("specimen_list_pipeline", "Specimen list pipeline"),
+                    ("taxonomy_sync", "Taxonomy sync"),
+                    ("ingest_scans", "Ingest uploaded scans"),
+                ],
+                max_length=50,
+            ),
+        ),
+    ]
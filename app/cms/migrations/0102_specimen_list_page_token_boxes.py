@@ -0,0 +1,37 @@
+# Generated by Django 5.2.14 on 2026-10-16 23:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def delete_token_box_ocr_entries(apps, schema_editor):
+    # Token boxes used to be stored as OCR entries; they are only a cache.
+    SpecimenListPageOCR = apps.get_model("cms", "SpecimenListPageOCR")
+    SpecimenListPageOCR.objects.filter(ocr_engine__startswith="token-boxes:").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cms', '0101_background_job_ingest_scans'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpecimenListPageTokenBoxes',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('backend', models.CharField(help_text='OCR box backend and settings that produced the boxes.', max_length=100)),
+                ('roi', models.JSONField(blank=True, help_text='Region of the image that was read, or empty for the whole image.', null=True)),
+                ('tokens', models.JSONField(blank=True, default=list, help_text='Token boxes with their text, confidence and coordinates.')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('page', models.ForeignKey(help_text='Specimen list page the boxes were read from.', on_delete=django.db.models.deletion.CASCADE, related_name='token_boxes', to='cms.specimenlistpage')),
+            ],
+            options={
+                'verbose_name': 'Specimen list page token boxes',
+                'verbose_name_plural': 'Specimen list page token boxes',
+                'constraints': [models.UniqueConstraint(fields=('page', 'backend'), name='unique_page_token_boxes_backend')],
+            },
+        ),
+        migrations.RunPython(delete_token_box_ocr_entries, migrations.RunPython.noop),
+    ]
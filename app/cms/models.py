@@ -1,4 +1,6 @@
 from decimal import Decimal, InvalidOperation
+import hashlib
+import json
 import warnings
 
 from crum import get_current_user
@@ -118,6 +120,24 @@ class BaseModel(models.Model):
             raise ValidationError("You must be logged in to delete this record.")
         super().delete(*args, **kwargs)
 
+    @classmethod
+    def stamp_bulk_instances(cls, instances) -> User:
+        """Apply the audit fields ``save`` would set to bulk written instances.
+
+        ``bulk_create``/``bulk_update`` bypass :meth:`save`, so callers use
+        this to enforce the logged-in user check once and stamp
+        ``created_by``/``modified_by``. Returns the current user.
+        """
+
+        user = get_current_user()
+        if not user or isinstance(user, AnonymousUser):
+            raise ValidationError("You must be logged in to perform this action.")
+        for instance in instances:
+            if not instance.pk and not instance.created_by_id:
+                instance.created_by = user
+            instance.modified_by = user
+        return user
+
 
 def _resolve_user_organisation(user: User | None) -> Optional["Organisation"]:
     """Return the organisation for a user when a membership exists."""
@@ -287,6 +307,108 @@ class MergeLog(BaseModel):
     def __str__(self) -> str:
         return f"Merge {self.source_pk} → {self.target_pk} ({self.model_label})"
 
+
+class MergeSearchGram(models.Model):
+    """Trigram posting used to shortlist fuzzy merge candidates."""
+
+    model_label = models.CharField(
+        max_length=100,
+        help_text="Dotted label of the indexed model.",
+    )
+    object_pk = models.CharField(
+        max_length=64,
+        help_text="Primary key of the indexed record.",
+    )
+    field_name = models.CharField(
+        max_length=100,
+        help_text="Field the trigram was extracted from.",
+    )
+    gram = models.CharField(
+        max_length=3,
+        help_text="Lower-cased, space padded token trigram.",
+    )
+
+    class Meta:
+        indexes = [
+            Index(
+                fields=["model_label", "field_name", "gram"],
+                name="merge_gram_lookup_idx",
+            ),
+            Index(
+                fields=["model_label", "object_pk"],
+                name="merge_gram_object_idx",
+            ),
+        ]
+        verbose_name = "Merge Search Gram"
+        verbose_name_plural = "Merge Search Grams"
+
+    def __str__(self) -> str:
+        return f"{self.model_label}:{self.object_pk} {self.field_name} '{self.gram}'"
+
+
+class MergeSearchIndexState(models.Model):
+    """Record which merge models have a complete trigram index."""
+
+    model_label = models.CharField(
+        max_length=100,
+        unique=True,
+        help_text="Dotted label of the indexed model.",
+    )
+    fields = models.JSONField(
+        default=list,
+        help_text="Text fields covered by the index.",
+    )
+    record_count = models.PositiveIntegerField(default=0)
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Merge Search Index State"
+        verbose_name_plural = "Merge Search Index States"
+
+    def __str__(self) -> str:
+        return f"{self.model_label} ({self.record_count} records)"
+
+
+class MergeDuplicateCluster(models.Model):
+    """Precomputed group of near-duplicate records awaiting review."""
+
+    model_label = models.CharField(
+        max_length=100,
+        help_text="Dotted label of the model the cluster belongs to.",
+    )
+    fields = models.JSONField(
+        default=list,
+        help_text="Fields concatenated to build the compared text.",
+    )
+    threshold = models.FloatField(
+        help_text="Minimum pairwise score used when building the cluster.",
+    )
+    member_pks = models.JSONField(
+        default=list,
+        help_text="Primary keys of the records in the cluster.",
+    )
+    pair_scores = models.JSONField(
+        default=list,
+        help_text="Scored record pairs linking the cluster as [pk, pk, score].",
+    )
+    size = models.PositiveIntegerField(default=0)
+    top_score = models.FloatField(default=0)
+    computed_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-top_score", "-size", "pk"]
+        indexes = [
+            Index(
+                fields=["model_label", "-top_score"],
+                name="merge_cluster_model_idx",
+            ),
+        ]
+        verbose_name = "Merge Duplicate Cluster"
+        verbose_name_plural = "Merge Duplicate Clusters"
+
+    def __str__(self) -> str:
+        return f"{self.model_label}: {self.size} records ({self.top_score:.0f})"
+
 # Locality Model
 class Locality(BaseModel):
     class GeologicalTime(models.TextChoices):
@@ -1426,6 +1548,11 @@ class Identification(BaseModel):
     def clean(self):
         super().clean()
         self._sync_taxon_fields()
+        self.validate_taxon_fields()
+
+    def validate_taxon_fields(self) -> None:
+        """Raise ``ValidationError`` when the synchronised taxon fields are invalid."""
+
         if not self.taxon_verbatim:
             raise ValidationError(
                 {"taxon_verbatim": _("Provide the lowest taxon for this identification.")}
@@ -1439,8 +1566,12 @@ class Identification(BaseModel):
         self._sync_taxon_fields()
         super().save(*args, **kwargs)
 
-    def _sync_taxon_fields(self) -> None:
-        """Keep legacy and unified taxon fields consistent and auto-link controlled records."""
+    def _sync_taxon_fields(self, taxon_matches: Optional[Dict[str, Optional["Taxon"]]] = None) -> None:
+        """Keep legacy and unified taxon fields consistent and auto-link controlled records.
+
+        ``taxon_matches`` may hold the result of :meth:`match_controlled_taxa`
+        so that bulk writers resolve taxa without a query per identification.
+        """
 
         original_taxon = self.taxon
         original_taxon_record_id = self.taxon_record_id
@@ -1453,7 +1584,10 @@ class Identification(BaseModel):
             # Keep legacy column populated for backwards compatibility while it exists.
             self.taxon = self.taxon_verbatim
 
-        matched_taxon = self._match_controlled_taxon(self.taxon_verbatim)
+        if taxon_matches is not None and self.taxon_verbatim:
+            matched_taxon = taxon_matches.get(Taxon.normalize_name(self.taxon_verbatim))
+        else:
+            matched_taxon = self._match_controlled_taxon(self.taxon_verbatim)
         self.taxon_record = matched_taxon
 
         if (
@@ -1483,24 +1617,29 @@ class Identification(BaseModel):
         )
         return self.taxon_verbatim or self.taxon or ""
 
+    @classmethod
+    def match_controlled_taxa(cls, taxon_names) -> Dict[str, Optional["Taxon"]]:
+        """Return unique accepted, active taxa keyed by normalised name.
+
+        Equivalent to calling :meth:`_match_controlled_taxon` for each name
+        but resolved through the taxon resolver cache with at most one query
+        per batch of uncached names. Names without a unique match map to
+        ``None``.
+        """
+
+        from cms.taxonomy.resolver import resolve_controlled_taxa
+
+        return resolve_controlled_taxa(taxon_names)
+
     def _match_controlled_taxon(self, taxon_name: Optional[str]) -> Optional["Taxon"]:
         """Return a unique accepted, active Taxon that matches the provided name."""
 
         if not taxon_name:
             return None
 
-        matches = list(
-            Taxon.objects.filter(
-                taxon_name__iexact=taxon_name,
-                status=TaxonStatus.ACCEPTED,
-                is_active=True,
-            )[:2]
-        )
-
-        if len(matches) == 1:
-            return matches[0]
+        from cms.taxonomy.resolver import resolve_controlled_taxon
 
-        return None
+        return resolve_controlled_taxon(taxon_name)
 
 
 # Taxon Model
@@ -1592,6 +1731,14 @@ class Taxon(BaseModel):
         max_length=50,
         help_text="Primary taxon name for the selected rank.",
     )
+    taxon_name_normalized = models.CharField(
+        max_length=50,
+        blank=True,
+        default="",
+        editable=False,
+        db_index=True,
+        help_text="Trimmed, lower-cased taxon name used for case-insensitive matching.",
+    )
     kingdom = models.CharField(
         max_length=255,
         help_text="Kingdom assignment for the taxon.",
@@ -1711,6 +1858,19 @@ class Taxon(BaseModel):
         if self.parent_id is not None and self.parent_id == self.pk:
             raise ValidationError({"parent": _("A taxon cannot be its own parent.")})
 
+    def save(self, *args, **kwargs):
+        self.taxon_name_normalized = self.normalize_name(self.taxon_name)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "taxon_name" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "taxon_name_normalized"}
+        super().save(*args, **kwargs)
+
+    @staticmethod
+    def normalize_name(name: Optional[str]) -> str:
+        """Return the form of ``name`` stored in ``taxon_name_normalized``."""
+
+        return (name or "").strip().lower()
+
     def get_absolute_url(self):
         return reverse('taxon-detail', args=[str(self.id)])
 
@@ -1796,6 +1956,91 @@ class TaxonomyImport(BaseModel):
         self.save(update_fields=["ok", "counts", "report_json", "finished_at", "modified_on", "modified_by"])
 
 
+class OCRDataBlobManager(models.Manager):
+    @staticmethod
+    def digest_for(data: Any) -> str:
+        """Return the SHA-256 digest of the canonical JSON form of ``data``."""
+
+        if data is None:
+            return ""
+        canonical = json.dumps(data, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def store(self, data: Any, *, digest: Optional[str] = None) -> str:
+        """Persist ``data`` once per distinct content and return its digest."""
+
+        if digest is None:
+            digest = self.digest_for(data)
+        if digest:
+            self.bulk_create(
+                [self.model(digest=digest, content=data)],
+                ignore_conflicts=True,
+            )
+        return digest
+
+    def documents(self, digests) -> Dict[str, Any]:
+        """Return stored documents keyed by digest, skipping blank digests."""
+
+        wanted = {digest for digest in digests if digest}
+        if not wanted:
+            return {}
+        return dict(self.filter(digest__in=wanted).values_list("digest", "content"))
+
+    def document(self, digest: str) -> Any:
+        """Return the document stored under ``digest`` or ``None``."""
+
+        return self.documents([digest]).get(digest)
+
+
+class OCRDataBlob(models.Model):
+    """Content-addressed OCR payload shared by media history and QC logs."""
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    content = models.JSONField()
+    created_on = models.DateTimeField(auto_now_add=True)
+
+    objects = OCRDataBlobManager()
+
+    class Meta:
+        verbose_name = "OCR data blob"
+        verbose_name_plural = "OCR data blobs"
+
+    def __str__(self):
+        return self.digest
+
+
+class HistoricalOCRDataMixin(models.Model):
+    """Reconstruct ``ocr_data`` for historical media rows from its blob.
+
+    Historical media rows record ``ocr_data_digest`` instead of a copy of the
+    payload; the document is loaded on access and restored on
+    ``history.instance`` so reverts keep the historical OCR data.
+    """
+
+    class Meta:
+        abstract = True
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        instance = cls.__dict__.get("instance")
+        if not isinstance(instance, property):
+            return
+        get_instance = instance.fget
+
+        def get_instance_with_ocr_data(self):
+            result = get_instance(self)
+            result.ocr_data = self.ocr_data
+            return result
+
+        cls.instance = property(get_instance_with_ocr_data)
+
+    @property
+    def ocr_data(self):
+        if not hasattr(self, "_ocr_data_cache"):
+            self._ocr_data_cache = OCRDataBlob.objects.document(self.ocr_data_digest)
+        return self._ocr_data_cache
+
+
 class Media(BaseModel):
     # Dropdown choices for 'type' field
     MEDIA_TYPE_CHOICES = [
@@ -1874,6 +2119,7 @@ class Media(BaseModel):
         PENDING = "pending", "Pending"
         COMPLETED = "completed", "Completed"
         FAILED = "failed", "Failed"
+        DUPLICATE = "duplicate", "Duplicate"
 
     class QCStatus(models.TextChoices):
         PENDING_INTERN = "pending_intern", "Pending Intern Review"
@@ -1882,6 +2128,12 @@ class Media(BaseModel):
         REJECTED = "rejected", "Rejected"
 
     ocr_data = models.JSONField(null=True, blank=True, help_text="OCR extracted data")
+    ocr_data_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Digest of the OCR data blob recorded in history and QC logs.",
+    )
     ocr_status = models.CharField(max_length=20, choices=OCRStatus.choices, default=OCRStatus.PENDING, help_text="Status of OCR processing")
     qc_status = models.CharField(
         max_length=20,
@@ -1919,10 +2171,60 @@ class Media(BaseModel):
         default=False,
         help_text="Indicates if specimen rows were rearranged to match the media content during QC.",
     )
-    history = HistoricalRecords()
+    content_sha256 = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="SHA-256 of the image file recorded at ingest.",
+    )
+    perceptual_hash = models.CharField(
+        max_length=16,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="64-bit difference hash of the image, in hex, used to find near-duplicate scans.",
+    )
+    duplicate_of = models.ForeignKey(
+        "self",
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="duplicates",
+        help_text="Earlier media this scan duplicates or nearly duplicates.",
+    )
+    duplicate_distance = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text="Bits differing from the perceptual hash of the duplicated media (0 for identical files).",
+    )
+    claimed_by = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="OCR worker currently processing this scan.",
+    )
+    claim_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="When the OCR worker's claim lapses unless renewed.",
+    )
+    history = HistoricalRecords(
+        excluded_fields=["ocr_data", "content_sha256", "perceptual_hash", "claimed_by", "claim_expires_at"],
+        bases=[HistoricalOCRDataMixin],
+    )
+
+    #: Digest fields shown in change logs as the document they address.
+    history_document_fields = {"ocr_data_digest": "ocr_data"}
 
     MANUAL_IMPORT_SOURCE = MANUAL_QC_SOURCE
 
+    #: Fields whose changes ``save`` records in :class:`MediaQCLog`.
+    QC_TRACKED_FIELDS = ("qc_status", "ocr_data", "rows_rearranged")
+    #: Fields whose loaded values are remembered; ``ocr_status`` feeds the report rollups.
+    LOADED_STATE_FIELDS = QC_TRACKED_FIELDS + ("ocr_status",)
+
     def get_manual_import_metadata(self) -> Optional[Dict[str, Any]]:
         """Return manual import metadata embedded in the OCR payload, if any."""
 
@@ -1951,6 +2253,53 @@ class Media(BaseModel):
             return f"{row_id} — {created_by}"
         return row_id or created_by
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._remember_qc_state()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        super().refresh_from_db(using=using, fields=fields, **kwargs)
+        self._remember_qc_state(fields)
+
+    def _remember_qc_state(self, fields=None) -> None:
+        """Record the loaded values of :attr:`LOADED_STATE_FIELDS`.
+
+        ``ocr_data`` is remembered by its stored digest so change detection in
+        :meth:`save` never keeps or re-reads a copy of the JSON document.
+        """
+
+        loaded = self.__dict__
+        state = dict(getattr(self, "_qc_loaded_state", {}))
+        for name in self.LOADED_STATE_FIELDS if fields is None else fields:
+            if name == "ocr_data":
+                if "ocr_data_digest" in loaded:
+                    state[name] = loaded["ocr_data_digest"]
+                elif name in loaded:
+                    state[name] = OCRDataBlob.objects.digest_for(loaded[name])
+            elif name in self.LOADED_STATE_FIELDS and name in loaded:
+                state[name] = loaded[name]
+        self._qc_loaded_state = state
+
+    def _previous_qc_state(self, tracked) -> Optional[Dict[str, Any]]:
+        """Return the stored values of ``tracked`` fields, querying only for gaps."""
+
+        if not self.pk or not tracked:
+            return None
+        state = getattr(self, "_qc_loaded_state", {})
+        missing = [name for name in tracked if name not in state]
+        if not missing:
+            return state
+        columns = ["ocr_data_digest" if name == "ocr_data" else name for name in missing]
+        row = self.__class__._base_manager.filter(pk=self.pk).values(*columns).first()
+        if row is None:
+            return None
+        previous = dict(state)
+        for name, column in zip(missing, columns):
+            previous[name] = row[column]
+        return previous
+
     def save(self, *args, **kwargs):
         user_override_set = hasattr(self, "_force_qc_user")
         if user_override_set:
@@ -1960,20 +2309,40 @@ class Media(BaseModel):
         if isinstance(user, AnonymousUser):
             user = None
 
-        previous = None
-        if self.pk:
-            previous = self.__class__.objects.filter(pk=self.pk).first()
+        update_fields = kwargs.get("update_fields")
+        tracked = [
+            name
+            for name in self.QC_TRACKED_FIELDS
+            if update_fields is None or name in update_fields
+        ]
+        previous = self._previous_qc_state(tracked)
 
         if self.media_location:
             self.file_name = os.path.basename(self.media_location.name)
             self.format = os.path.splitext(self.media_location.name)[1].lower().strip('.')
 
-        status_changed = previous and previous.qc_status != self.qc_status
-        ocr_changed = previous and previous.ocr_data != self.ocr_data
-        rows_rearranged_changed = previous and previous.rows_rearranged != self.rows_rearranged
+        ocr_digest = None
+        if "ocr_data" in tracked:
+            ocr_digest = OCRDataBlob.objects.digest_for(self.ocr_data)
+
+        status_changed = (
+            previous and "qc_status" in tracked and previous["qc_status"] != self.qc_status
+        )
+        ocr_changed = previous and ocr_digest is not None and previous["ocr_data"] != ocr_digest
+        rows_rearranged_changed = (
+            previous
+            and "rows_rearranged" in tracked
+            and previous["rows_rearranged"] != self.rows_rearranged
+        )
 
         note = getattr(self, "_qc_transition_note", None)
 
+        if ocr_digest is not None and (ocr_digest != self.ocr_data_digest or ocr_changed):
+            OCRDataBlob.objects.store(self.ocr_data, digest=ocr_digest)
+            self.ocr_data_digest = ocr_digest
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "ocr_data_digest"}
+
         if status_changed:
             timestamp = timezone.now()
             if self.qc_status in {
@@ -1994,8 +2363,11 @@ class Media(BaseModel):
         super().save(*args, **kwargs)
 
         if status_changed:
+            previous_status = dict(self.QCStatus.choices).get(
+                previous["qc_status"], previous["qc_status"]
+            )
             description = (
-                f"Status changed from {previous.get_qc_status_display()} to {self.get_qc_status_display()}"
+                f"Status changed from {previous_status} to {self.get_qc_status_display()}"
                 if previous
                 else f"Status set to {self.get_qc_status_display()}"
             )
@@ -2005,7 +2377,7 @@ class Media(BaseModel):
                 media=self,
                 change_type=MediaQCLog.ChangeType.STATUS,
                 field_name="qc_status",
-                old_value={"qc_status": previous.qc_status} if previous else None,
+                old_value={"qc_status": previous["qc_status"]} if previous else None,
                 new_value={"qc_status": self.qc_status},
                 description=description,
                 changed_by=user,
@@ -2016,8 +2388,8 @@ class Media(BaseModel):
                 media=self,
                 change_type=MediaQCLog.ChangeType.OCR_DATA,
                 field_name="ocr_data",
-                old_value=previous.ocr_data if previous else None,
-                new_value=self.ocr_data,
+                old_ocr_digest=previous["ocr_data"],
+                new_ocr_digest=ocr_digest,
                 description="OCR data updated during QC.",
                 changed_by=user,
             )
@@ -2027,12 +2399,16 @@ class Media(BaseModel):
                 media=self,
                 change_type=MediaQCLog.ChangeType.ROWS_REARRANGED,
                 field_name="rows_rearranged",
-                old_value={"rows_rearranged": previous.rows_rearranged},
+                old_value={"rows_rearranged": previous["rows_rearranged"]},
                 new_value={"rows_rearranged": self.rows_rearranged},
                 description="Rows rearranged flag updated.",
                 changed_by=user,
             )
 
+        self._remember_qc_state(
+            [name for name in self.LOADED_STATE_FIELDS if update_fields is None or name in update_fields]
+        )
+
         if user_override_set and hasattr(self, "_force_qc_user"):
             delattr(self, "_force_qc_user")
         if hasattr(self, "_qc_transition_note"):
@@ -2176,6 +2552,111 @@ class Media(BaseModel):
         return {"created": created, "conflicts": conflicts}
 
 
+class MediaHashBand(models.Model):
+    """Slice of a media perceptual hash used to shortlist near-duplicate scans.
+
+    Hashes within a few bits of each other share at least one band exactly,
+    so near-duplicate lookups only compare media that share a band.
+    """
+
+    media = models.ForeignKey(Media, on_delete=models.CASCADE, related_name="hash_bands")
+    band = models.PositiveSmallIntegerField(help_text="Position of the slice within the hash.")
+    value = models.CharField(max_length=4, help_text="Hex digits of the slice.")
+
+    class Meta:
+        indexes = [
+            Index(fields=["band", "value"], name="media_hash_band_lookup_idx"),
+        ]
+        constraints = [
+            UniqueConstraint(fields=["media", "band"], name="media_hash_band_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.media_id}:{self.band}={self.value}"
+
+
+class MediaStatusRollup(models.Model):
+    """Number of media per OCR status, maintained by :mod:`cms.report_rollups`."""
+
+    ocr_status = models.CharField(max_length=20, unique=True)
+    media_count = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.ocr_status}: {self.media_count}"
+
+
+class MediaDailyRollup(models.Model):
+    """Number of media created per local calendar day, maintained by :mod:`cms.report_rollups`."""
+
+    day = models.DateField(unique=True)
+    media_count = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.day}: {self.media_count}"
+
+
+class AccessionLocalityRollup(models.Model):
+    """Accession totals per locality, maintained by :mod:`cms.report_rollups`."""
+
+    locality = models.OneToOneField(Locality, on_delete=models.CASCADE, related_name="accession_rollup")
+    accession_count = models.IntegerField(default=0)
+    specimen_count = models.IntegerField(
+        default=0, help_text="Distinct specimen numbers accessioned under the locality."
+    )
+
+    def __str__(self) -> str:
+        return f"{self.locality_id}: {self.specimen_count}"
+
+
+class AccessionSearchSummary(models.Model):
+    """Taxa, elements, ranks, storage and counts of one accession in a single row.
+
+    Maintained by :mod:`cms.accession_summaries` and read by the accession
+    lists and :class:`cms.filters.AccessionFilter`. Text columns hold sorted,
+    newline-separated values so ``icontains`` lookups never match across two
+    names.
+    """
+
+    SEPARATOR = "\n"
+
+    accession = models.OneToOneField(Accession, on_delete=models.CASCADE, related_name="search_summary")
+    taxa = models.TextField(blank=True, default="", help_text="Preferred taxon name of each identification.")
+    taxon_names = models.TextField(
+        blank=True,
+        default="",
+        help_text="Verbatim, legacy, controlled and synonym names matched by the taxon filter.",
+    )
+    elements = models.TextField(blank=True, default="")
+    family = models.TextField(blank=True, default="")
+    subfamily = models.TextField(blank=True, default="")
+    tribe = models.TextField(blank=True, default="")
+    genus = models.TextField(blank=True, default="")
+    species = models.TextField(blank=True, default="")
+    storage_areas = models.TextField(blank=True, default="")
+    row_count = models.IntegerField(default=0)
+    identification_count = models.IntegerField(default=0)
+    specimen_count = models.IntegerField(default=0, help_text="Nature of specimen entries across all rows.")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.accession_id}: {self.taxa_list}"
+
+    def _values(self, text: str) -> list[str]:
+        return [value for value in text.split(self.SEPARATOR) if value]
+
+    @property
+    def taxa_list(self) -> list[str]:
+        return self._values(self.taxa)
+
+    @property
+    def element_list(self) -> list[str]:
+        return self._values(self.elements)
+
+    @property
+    def storage_list(self) -> list[str]:
+        return self._values(self.storage_areas)
+
+
 class MediaQCLog(models.Model):
     class ChangeType(models.TextChoices):
         STATUS = "status", "QC Status"
@@ -2187,6 +2668,18 @@ class MediaQCLog(models.Model):
     field_name = models.CharField(max_length=100, blank=True)
     old_value = models.JSONField(null=True, blank=True)
     new_value = models.JSONField(null=True, blank=True)
+    old_ocr_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Digest of the OCR data blob before a full OCR data change.",
+    )
+    new_ocr_digest = models.CharField(
+        max_length=64,
+        blank=True,
+        default="",
+        help_text="Digest of the OCR data blob after a full OCR data change.",
+    )
     description = models.TextField(blank=True)
     changed_by = models.ForeignKey(
         User,
@@ -2205,6 +2698,39 @@ class MediaQCLog(models.Model):
     def __str__(self):
         return f"QC change on {self.media} at {self.created_on:%Y-%m-%d %H:%M:%S}"
 
+    @classmethod
+    def load_documents(cls, logs) -> None:
+        """Resolve the OCR data blobs of ``logs`` with a single query."""
+
+        logs = list(logs)
+        documents = OCRDataBlob.objects.documents(
+            digest
+            for log in logs
+            for digest in (log.old_ocr_digest, log.new_ocr_digest)
+        )
+        for log in logs:
+            log._ocr_documents = documents
+
+    def _document(self, digest: str, fallback: Any) -> Any:
+        if not digest:
+            return fallback
+        documents = getattr(self, "_ocr_documents", None)
+        if documents is None or digest not in documents:
+            return OCRDataBlob.objects.document(digest)
+        return documents[digest]
+
+    @property
+    def old_document(self) -> Any:
+        """Previous value, reconstructed from its OCR data blob when stored as one."""
+
+        return self._document(self.old_ocr_digest, self.old_value)
+
+    @property
+    def new_document(self) -> Any:
+        """New value, reconstructed from its OCR data blob when stored as one."""
+
+        return self._document(self.new_ocr_digest, self.new_value)
+
 
 class MediaQCComment(models.Model):
     log = models.ForeignKey(MediaQCLog, on_delete=models.CASCADE, related_name='comments')
@@ -2278,6 +2804,10 @@ class LLMUsageRecord(models.Model):
         help_text="Measured time spent processing the OCR request in seconds.",
     )
     response_id = models.CharField(max_length=255, blank=True, null=True)
+    cache_hit = models.BooleanField(
+        default=False,
+        help_text="Whether the OCR result was served from the LLM response cache.",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -2285,6 +2815,9 @@ class LLMUsageRecord(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            Index(fields=["created_at"], name="llm_usage_created_at_idx"),
+        ]
 
     def __str__(self) -> str:
         return f"Usage for {self.media_id}: {self.model_name}"
@@ -2333,6 +2866,7 @@ class LLMUsageRecord(models.Model):
             "total_tokens": total_tokens,
             "cost_usd": cost_usd,
             "response_id": str(response_id) if response_id not in (None, "") else None,
+            "cache_hit": bool(payload.get("cache_hit")),
         }
 
         remaining_quota = payload.get("remaining_quota") or payload.get("remaining_quota_usd")
@@ -2355,6 +2889,189 @@ class LLMUsageRecord(models.Model):
         self.save(update_fields=list(defaults.keys()) + ["updated_at"])
 
 
+class LLMUsageDailyRollup(models.Model):
+    """LLM usage per local day, model and pipeline stage, maintained by :mod:`cms.report_rollups`."""
+
+    day = models.DateField()
+    model_name = models.CharField(max_length=255)
+    stage = models.CharField(max_length=64, help_text="Pipeline stage that made the calls.")
+    record_count = models.IntegerField(default=0)
+    cache_hit_count = models.IntegerField(default=0)
+    prompt_tokens = models.BigIntegerField(default=0)
+    completion_tokens = models.BigIntegerField(default=0)
+    total_tokens = models.BigIntegerField(default=0)
+    cost_usd = models.DecimalField(max_digits=16, decimal_places=6, default=Decimal("0"))
+    processing_seconds = models.DecimalField(max_digits=14, decimal_places=3, default=Decimal("0"))
+
+    class Meta:
+        constraints = [
+            UniqueConstraint(fields=["day", "model_name", "stage"], name="llm_usage_daily_rollup_unique"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.day} {self.model_name} {self.stage}: {self.record_count}"
+
+
+class LLMResponseCacheManager(models.Manager):
+    def lookup(self, key: str) -> "LLMResponseCache | None":
+        """Return the cached response for ``key`` and record the hit."""
+
+        entry = self.filter(key=key).first()
+        if entry is None:
+            return None
+        now = timezone.now()
+        self.filter(key=key).update(hit_count=models.F("hit_count") + 1, last_used_at=now)
+        entry.hit_count += 1
+        entry.last_used_at = now
+        return entry
+
+    def evict(self, max_entries: int) -> int:
+        """Delete the least recently used entries beyond ``max_entries``."""
+
+        stale = list(
+            self.order_by("-last_used_at", "-created_at").values_list("key", flat=True)[max_entries:]
+        )
+        if not stale:
+            return 0
+        deleted, _ = self.filter(key__in=stale).delete()
+        return deleted
+
+
+class LLMResponseCache(models.Model):
+    """OpenAI chat completion reused for identical image, prompt and model."""
+
+    key = models.CharField(max_length=64, primary_key=True)
+    kind = models.CharField(max_length=50, help_text="OCR call that produced the response.")
+    model_name = models.CharField(max_length=255)
+    image_sha256 = models.CharField(max_length=64, db_index=True)
+    prompt_sha256 = models.CharField(max_length=64)
+    content = models.TextField(help_text="Message content returned by the model.")
+    usage = models.JSONField(default=dict, blank=True, help_text="Usage payload of the original call.")
+    response_id = models.CharField(max_length=255, blank=True, default="")
+    batch_id = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text="OpenAI batch that produced the response, if any.",
+    )
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    objects = LLMResponseCacheManager()
+
+    class Meta:
+        verbose_name = "LLM response cache entry"
+        verbose_name_plural = "LLM response cache entries"
+        ordering = ["-last_used_at"]
+
+    def __str__(self) -> str:
+        return f"{self.kind} ({self.model_name})"
+
+
+class LLMBatchJob(models.Model):
+    """OpenAI Batch API job submitted for an OCR backlog."""
+
+    class Target(models.TextChoices):
+        SCANS = "scans", "Pending scans"
+        SPECIMEN_LISTS = "specimen_lists", "Specimen list pages"
+
+    class Status(models.TextChoices):
+        SUBMITTED = "submitted", "Submitted"
+        COMPLETED = "completed", "Completed"
+        INGESTED = "ingested", "Ingested"
+        FAILED = "failed", "Failed"
+
+    target = models.CharField(max_length=20, choices=Target.choices)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.SUBMITTED, db_index=True)
+    batch_id = models.CharField(max_length=255, unique=True, help_text="OpenAI batch identifier.")
+    remote_status = models.CharField(max_length=30, blank=True, default="", help_text="Status reported by OpenAI.")
+    requests = models.JSONField(
+        default=dict,
+        help_text="Cache key metadata of each request, keyed by custom_id.",
+    )
+    request_count = models.PositiveIntegerField(default=0)
+    output_file_id = models.CharField(max_length=255, blank=True, default="")
+    error_file_id = models.CharField(max_length=255, blank=True, default="")
+    ingested_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "LLM batch job"
+        verbose_name_plural = "LLM batch jobs"
+        ordering = ["-created_at"]
+
+    def __str__(self) -> str:
+        return f"{self.batch_id} ({self.get_target_display()}, {self.get_status_display()})"
+
+
+class BackgroundJob(models.Model):
+    """Unit of work run by the ``run_workers`` command instead of a web worker."""
+
+    class Kind(models.TextChoices):
+        SPLIT_SPECIMEN_LIST_PDF = "split_specimen_list_pdf", "Split specimen list PDF"
+        SCAN_OCR = "scan_ocr", "Scan OCR"
+        SPECIMEN_LIST_PIPELINE = "specimen_list_pipeline", "Specimen list pipeline"
+        TAXONOMY_SYNC = "taxonomy_sync", "Taxonomy sync"
+        INGEST_SCANS = "ingest_scans", "Ingest uploaded scans"
+
+    class Status(models.TextChoices):
+        QUEUED = "queued", "Queued"
+        RUNNING = "running", "Running"
+        SUCCEEDED = "succeeded", "Succeeded"
+        FAILED = "failed", "Failed"
+
+    ACTIVE_STATUSES = (Status.QUEUED, Status.RUNNING)
+
+    kind = models.CharField(max_length=50, choices=Kind.choices)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    priority = models.SmallIntegerField(default=0, help_text="Jobs with a higher priority run first.")
+    dedupe_key = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        db_index=True,
+        help_text="Jobs sharing a key are not queued twice while one is active.",
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=255, blank=True, default="")
+    lease_expires_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(default=dict, blank=True)
+    last_error = models.TextField(blank=True, default="")
+    created_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="background_jobs",
+        help_text="User the job runs as.",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Background job"
+        verbose_name_plural = "Background jobs"
+        ordering = ["-created_at"]
+        indexes = [
+            Index(fields=["status", "priority", "run_after"], name="backgroundjob_claim_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in self.ACTIVE_STATUSES
+
+
 class SpecimenGeology(BaseModel):
     # ForeignKey relationships to Accession and GeologicalContext
     accession = models.ForeignKey(
@@ -2946,7 +3663,19 @@ class SpecimenListPage(BaseModel):
         blank=True,
         help_text=_("Timestamp when the page was approved."),
     )
-    history = HistoricalRecords()
+    claimed_by = models.CharField(
+        max_length=255,
+        blank=True,
+        default="",
+        help_text=_("Pipeline worker currently processing this page."),
+    )
+    claim_expires_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text=_("When the pipeline worker's claim lapses unless renewed."),
+    )
+    history = HistoricalRecords(excluded_fields=["claimed_by", "claim_expires_at"])
 
     class Meta:
         ordering = ["pdf", "page_number"]
@@ -3019,6 +3748,42 @@ class SpecimenListPageOCR(models.Model):
         return f"OCR for {self.page_id} @ {self.created_at:%Y-%m-%d}"
 
 
+class SpecimenListPageTokenBoxes(models.Model):
+    """Word boxes found on a page image by one OCR box backend."""
+
+    page = models.ForeignKey(
+        SpecimenListPage,
+        on_delete=models.CASCADE,
+        related_name="token_boxes",
+        help_text=_("Specimen list page the boxes were read from."),
+    )
+    backend = models.CharField(
+        max_length=100,
+        help_text=_("OCR box backend and settings that produced the boxes."),
+    )
+    roi = models.JSONField(
+        null=True,
+        blank=True,
+        help_text=_("Region of the image that was read, or empty for the whole image."),
+    )
+    tokens = models.JSONField(
+        default=list,
+        blank=True,
+        help_text=_("Token boxes with their text, confidence and coordinates."),
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = _("Specimen list page token boxes")
+        verbose_name_plural = _("Specimen list page token boxes")
+        constraints = [
+            models.UniqueConstraint(fields=["page", "backend"], name="unique_page_token_boxes_backend"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Token boxes for {self.page_id} ({self.backend})"
+
+
 class SpecimenListRowCandidate(models.Model):
     class ReviewStatus(models.TextChoices):
         UNREVIEWED = "unreviewed", _("Unreviewed")
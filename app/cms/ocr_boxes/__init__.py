@@ -1,11 +1,17 @@
-from .base import OCRBoxBackend, ROI, TokenBox
-from .service import configure_backend, get_token_boxes, get_token_crops
+from .base import OCRBoxBackend, ROI, TokenBox, TokenBoxStore
+from .cache import PageTokens, TokenBoxCache, page_token_cache
+from .service import backend_cache_key, configure_backend, get_token_boxes, get_token_crops
 
 __all__ = [
     "OCRBoxBackend",
+    "PageTokens",
     "ROI",
     "TokenBox",
+    "TokenBoxCache",
+    "TokenBoxStore",
+    "backend_cache_key",
     "configure_backend",
     "get_token_boxes",
     "get_token_crops",
+    "page_token_cache",
 ]
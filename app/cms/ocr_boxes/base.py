@@ -37,3 +37,13 @@ class OCRBoxBackend(Protocol):
     ) -> list[TokenBox]:
         """Return token boxes for ``image`` and optional ROI."""
 
+
+
+class TokenBoxStore(Protocol):
+    """Protocol for persisting token boxes beyond the in-process cache."""
+
+    def load(self, backend_key: str, roi: ROI | None) -> list[TokenBox] | None:
+        """Return stored token boxes or ``None`` when nothing usable is stored."""
+
+    def save(self, backend_key: str, roi: ROI | None, token_boxes: list[TokenBox]) -> None:
+        """Persist ``token_boxes`` for later corrections of the same page."""
@@ -0,0 +1,179 @@
+"""Page-level cache for OCR token boxes and their crops.
+
+Tooth-marking correction runs once per element string, but every element on a
+page is corrected against the same page image. Tokenising the page and
+cropping every token is the expensive part, so results are cached per image,
+ROI and backend and shared by all corrections for that page.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Hashable
+
+from PIL import Image
+
+from .base import ImageInput, ROI, TokenBox
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CACHE_SIZE = 8
+
+
+def token_crop_key(box: TokenBox) -> tuple[int, int, int, int, int]:
+    return box.token_id, box.x1, box.y1, box.x2, box.y2
+
+
+@dataclass(slots=True)
+class PageTokens:
+    """Token boxes for one page image plus the crops computed so far.
+
+    Crops are filled lazily, per token, so only tokens that are actually
+    classified are ever cropped.
+    """
+
+    boxes: tuple[TokenBox, ...]
+    crops: dict[tuple[int, int, int, int, int], dict[str, object]] = field(default_factory=dict)
+
+
+class TokenBoxCache:
+    """Thread-safe LRU cache of :class:`PageTokens` keyed by page identity."""
+
+    def __init__(self, maxsize: int = _DEFAULT_CACHE_SIZE) -> None:
+        self.maxsize = max(0, int(maxsize))
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, PageTokens] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> PageTokens | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(self, key: Hashable, value: PageTokens) -> None:
+        if self.maxsize == 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _cache_size_from_env() -> int:
+    raw = os.getenv("OCR_BOX_CACHE_SIZE", str(_DEFAULT_CACHE_SIZE)).strip()
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning(
+            "Invalid OCR_BOX_CACHE_SIZE value '%s'; using default %s",
+            raw,
+            _DEFAULT_CACHE_SIZE,
+        )
+        return _DEFAULT_CACHE_SIZE
+
+
+page_token_cache = TokenBoxCache(maxsize=_cache_size_from_env())
+
+
+def image_identity(image: ImageInput | None) -> str | None:
+    """Return a stable identity for ``image`` or ``None`` when it cannot be cached.
+
+    Paths are identified by their resolved location, size and modification
+    time so a re-rendered page is never served stale boxes. In-memory images
+    are identified by a digest of their pixel data.
+    """
+
+    if image is None:
+        return None
+    if isinstance(image, Image.Image):
+        digest = hashlib.sha1(image.tobytes()).hexdigest()
+        return f"pil:{image.mode}:{image.size[0]}x{image.size[1]}:{digest}"
+    try:
+        path = Path(image).resolve()
+        stat = path.stat()
+    except (OSError, TypeError, ValueError):
+        return None
+    return f"path:{path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def page_tokens_cache_key(
+    image: ImageInput | None,
+    roi: ROI | None,
+    backend_key: str,
+) -> tuple[str, ROI | None, str] | None:
+    identity = image_identity(image)
+    if identity is None:
+        return None
+    normalized_roi = tuple(int(value) for value in roi) if roi is not None else None
+    return identity, normalized_roi, backend_key
+
+
+def token_boxes_to_json(token_boxes: list[TokenBox]) -> list[dict[str, object]]:
+    """Serialise token boxes to JSON-compatible dictionaries."""
+
+    return [
+        {
+            "token_id": box.token_id,
+            "text": box.text,
+            "conf": box.conf,
+            "x1": box.x1,
+            "y1": box.y1,
+            "x2": box.x2,
+            "y2": box.y2,
+            "line_id": box.line_id,
+            "block_id": box.block_id,
+        }
+        for box in token_boxes
+    ]
+
+
+def token_boxes_from_json(payload: object) -> list[TokenBox] | None:
+    """Rebuild token boxes from :func:`token_boxes_to_json` output.
+
+    Returns ``None`` when the payload is malformed so callers fall back to
+    running the OCR backend again.
+    """
+
+    if not isinstance(payload, list):
+        return None
+    token_boxes: list[TokenBox] = []
+    try:
+        for item in payload:
+            token_boxes.append(
+                TokenBox(
+                    token_id=int(item["token_id"]),
+                    text=str(item["text"]),
+                    conf=None if item.get("conf") is None else float(item["conf"]),
+                    x1=int(item["x1"]),
+                    y1=int(item["y1"]),
+                    x2=int(item["x2"]),
+                    y2=int(item["y2"]),
+                    line_id=item.get("line_id"),
+                    block_id=item.get("block_id"),
+                )
+            )
+    except (KeyError, TypeError, ValueError, AttributeError):
+        return None
+    return token_boxes
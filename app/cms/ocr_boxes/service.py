@@ -5,6 +5,7 @@ from pathlib import Path
 from PIL import Image
 
 from .base import ImageInput, OCRBoxBackend, ROI, TokenBox
+from .cache import page_token_cache
 
 
 class NullOCRBoxBackend:
@@ -27,6 +28,14 @@ def configure_backend(backend: OCRBoxBackend) -> None:
 
     global _backend
     _backend = backend
+    page_token_cache.clear()
+
+
+def backend_cache_key() -> str:
+    """Return an identifier for the configured backend used in cache keys."""
+
+    backend_type = type(_backend)
+    return f"{backend_type.__module__}.{backend_type.__qualname__}"
 
 
 def get_token_boxes(image: ImageInput, roi: ROI | None = None) -> list[TokenBox]:
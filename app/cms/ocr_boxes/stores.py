@@ -0,0 +1,51 @@
+"""Database-backed token box stores."""
+
+from __future__ import annotations
+
+import logging
+
+from .base import ROI, TokenBox
+from .cache import token_boxes_from_json, token_boxes_to_json
+
+logger = logging.getLogger(__name__)
+
+
+class SpecimenListPageTokenBoxStore:
+    """Persist token boxes for a page as ``SpecimenListPageTokenBoxes`` rows.
+
+    Each page keeps one row per backend, holding the ROI the boxes were read
+    from, so a request for another ROI reads the image again.
+    """
+
+    def __init__(self, page) -> None:
+        self.page = page
+
+    def load(self, backend_key: str, roi: ROI | None) -> list[TokenBox] | None:
+        if self.page is None or self.page.pk is None:
+            return None
+        from cms.models import SpecimenListPageTokenBoxes
+
+        entry = SpecimenListPageTokenBoxes.objects.filter(page=self.page, backend=backend_key[:100]).first()
+        if entry is None:
+            return None
+        expected_roi = list(roi) if roi is not None else None
+        if entry.roi != expected_roi:
+            return None
+        return token_boxes_from_json(entry.tokens)
+
+    def save(self, backend_key: str, roi: ROI | None, token_boxes: list[TokenBox]) -> None:
+        if self.page is None or self.page.pk is None:
+            return
+        from cms.models import SpecimenListPageTokenBoxes
+
+        try:
+            SpecimenListPageTokenBoxes.objects.update_or_create(
+                page=self.page,
+                backend=backend_key[:100],
+                defaults={
+                    "roi": list(roi) if roi is not None else None,
+                    "tokens": token_boxes_to_json(token_boxes),
+                },
+            )
+        except Exception as exc:  # pragma: no cover - persistence is best effort
+            logger.warning("Could not persist token boxes for page %s: %s", self.page.pk, exc)
@@ -1,11 +1,13 @@
-import base64
 import json
 import logging
 import os
 import re
 import shutil
+import threading
 import time
 import textwrap
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import date
 from pathlib import Path
 from typing import Any, Optional
@@ -31,10 +33,16 @@ except ImportError:  # pragma: no cover
     OpenAI = None
     APITimeoutError = None  # type: ignore[assignment]
 
+from crum import get_current_user, impersonate
 from django.conf import settings
-from django.db.models import Max, Prefetch
+from django.db import connections
+from django.db.models import Max, Prefetch, Q
+from django.utils import timezone
 from django.utils.dateparse import parse_date
+from simple_history.utils import bulk_update_with_history
 
+from . import accession_summaries, llm_batch, llm_cache, llm_rate_limit, report_rollups
+from .llm_images import prepare_image
 from .llm_usage import add_usage_timing, build_timed_usage_payload, build_usage_payload
 from .models import (
     Media,
@@ -64,6 +72,7 @@ from .models import (
     SpecimenListRowCandidate,
 )
 from .utils import apply_ditto_marks
+from .work_claims import WorkClaims
 from .tooth_markings.integration import apply_tooth_marking_correction
 
 
@@ -94,6 +103,15 @@ def _default_ocr_engine() -> str:
     return str(getattr(settings, "OCR_DEFAULT_ENGINE", "chatgpt-vision"))
 
 
+def default_scan_workers() -> int:
+    """Return ``settings.OCR_SCAN_WORKERS``, the default OCR concurrency, as at least 1."""
+
+    try:
+        return max(1, int(getattr(settings, "OCR_SCAN_WORKERS", 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
 MAX_OCR_ROWS_PER_ACCESSION = 50
 
 
@@ -145,6 +163,7 @@ def _load_env() -> None:
 
 
 _client: Any = None
+_client_lock = threading.Lock()
 
 
 def _is_insufficient_quota_error(exc: BaseException) -> bool:
@@ -183,17 +202,73 @@ def get_openai_client() -> Any:
     if _client is not None:
         return _client
 
-    _load_env()
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key or OpenAI is None:
-        return None
-    _client = OpenAI(api_key=api_key)
+    with _client_lock:
+        if _client is not None:
+            return _client
+        _load_env()
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key or OpenAI is None:
+            return None
+        _client = OpenAI(api_key=api_key)
     return _client
 
 
-def encode_image_to_base64(image_path: Path) -> str:
-    with open(image_path, "rb") as f:
-        return base64.b64encode(f.read()).decode("utf-8")
+def prepare_image_url(image_path: Path, profile: str = "ocr") -> str:
+    """Return a data URL for the cached LLM derivative of ``image_path``."""
+
+    return prepare_image(image_path, profile).data_url
+
+
+def _create_chat_completion(
+    client: Any,
+    *,
+    kind: str,
+    model: str,
+    timeout: int,
+    messages: list[dict[str, Any]],
+    use_cache: bool = True,
+) -> tuple[Any, llm_cache.CacheKey | None]:
+    """Create a chat completion, answering repeated requests from the cache.
+
+    Calls that reach the API go through the shared rate limiter. Inside
+    :func:`cms.llm_batch.deferring`, cache misses raise
+    :class:`cms.llm_batch.BatchRequestDeferred` instead. Returns the
+    response and, for fresh API responses, the key to pass to
+    :func:`_cache_completion` once the response has parsed successfully.
+    """
+
+    cache_key = None
+    deferring = llm_batch.is_deferring()
+    if deferring or (use_cache and llm_cache.response_cache_enabled()):
+        cache_key = llm_cache.build_cache_key(kind, model, messages)
+        cached = llm_cache.lookup(cache_key)
+        if cached is not None:
+            return cached, None
+    if deferring:
+        llm_batch.defer(cache_key, model=model, messages=messages)
+
+    limiter = llm_rate_limit.get_limiter()
+    with limiter.acquire(model) as permit:
+        try:
+            response = client.chat.completions.create(model=model, timeout=timeout, messages=messages)
+        except Exception as exc:
+            if llm_rate_limit.is_rate_limit_error(exc) and not _is_insufficient_quota_error(exc):
+                limiter.record_throttle(model, llm_rate_limit.retry_after_seconds(exc))
+            raise
+        tokens_used = getattr(getattr(response, "usage", None), "total_tokens", None)
+        permit.complete(tokens_used if isinstance(tokens_used, int) else None)
+    return response, cache_key
+
+
+def _retry_delay(attempt: int) -> float:
+    """Return how long to wait before retrying after failed ``attempt``."""
+
+    return llm_rate_limit.get_limiter().backoff_delay(attempt)
+
+
+def _cache_completion(cache_key: llm_cache.CacheKey | None, response: Any) -> None:
+    if cache_key is not None:
+        llm_cache.store(cache_key, response)
 
 
 def _strip_code_fences(content: str) -> str:
@@ -212,8 +287,15 @@ def run_specimen_list_raw_ocr(
     timeout: int = 60,
     max_retries: int = 3,
     force: bool = False,
+    image_url: str | None = None,
+    use_cache: bool = True,
 ) -> SpecimenListPageOCR:
-    """Run raw OCR on a specimen list page and persist the verbatim output."""
+    """Run raw OCR on a specimen list page and persist the verbatim output.
+
+    ``image_url`` lets pipeline callers reuse an image data URL they already
+    prepared with :func:`prepare_image_url`. Pass ``use_cache=False`` to
+    bypass the LLM response cache and always call the API.
+    """
 
     ocr_engine = ocr_engine or _default_ocr_engine()
     model = model or _default_openai_model()
@@ -232,8 +314,8 @@ def run_specimen_list_raw_ocr(
             "OpenAI client is not configured. Ensure OPENAI_API_KEY is set and the openai package is installed."
         )
 
-    image_path = Path(page.image_file.path)
-    base64_image = encode_image_to_base64(image_path)
+    if image_url is None:
+        image_url = prepare_image_url(Path(page.image_file.path), "ocr")
     prompt = (
         "You are performing OCR on a specimen list page. Return ONLY a JSON object with:\n"
         '- "raw_text": the full transcription as plain text (preserve line breaks as seen),\n'
@@ -245,9 +327,12 @@ def run_specimen_list_raw_ocr(
     for attempt in range(max_retries):
         try:
             start_ts = time.perf_counter()
-            response = client.chat.completions.create(
+            response, cache_key = _create_chat_completion(
+                client,
+                kind="specimen_list_raw_ocr",
                 model=model,
                 timeout=timeout,
+                use_cache=use_cache and attempt == 0,
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that extracts OCR text from images."},
                     {
@@ -256,7 +341,7 @@ def run_specimen_list_raw_ocr(
                             {"type": "text", "text": prompt},
                             {
                                 "type": "image_url",
-                                "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
+                                "image_url": {"url": image_url},
                             },
                         ],
                     },
@@ -271,11 +356,13 @@ def run_specimen_list_raw_ocr(
             if not isinstance(raw_text, str):
                 raw_text = str(raw_text)
             bounding_boxes = payload.get("bounding_boxes")
+            _cache_completion(cache_key, response)
             usage_payload = build_timed_usage_payload(response, model, elapsed)
             logger.info(
                 "Specimen list OCR usage recorded.",
                 extra={"page_id": page.id, "usage": usage_payload},
             )
+            report_rollups.record_llm_usage("specimen_list_raw_ocr", usage_payload)
             return SpecimenListPageOCR.objects.create(
                 page=page,
                 raw_text=raw_text,
@@ -291,7 +378,7 @@ def run_specimen_list_raw_ocr(
             if attempt == max_retries - 1:
                 logger.exception("Specimen list OCR failed after retries.", extra={"page_id": page.id})
                 raise
-            time.sleep(2 ** attempt)
+            time.sleep(_retry_delay(attempt))
 
     raise RuntimeError("Specimen list OCR failed unexpectedly.") from last_error
 
@@ -340,8 +427,15 @@ def run_specimen_list_row_extraction(
     timeout: int = 120,
     max_retries: int = 3,
     force: bool = False,
+    image_url: str | None = None,
+    ocr_entry: SpecimenListPageOCR | None = None,
+    use_cache: bool = True,
 ) -> list[SpecimenListRowCandidate]:
-    """Extract structured rows for specimen list detail pages and store candidates."""
+    """Extract structured rows for specimen list detail pages and store candidates.
+
+    Pipeline callers may pass the ``ocr_entry`` produced by raw OCR and an
+    already prepared ``image_url`` to avoid reloading either.
+    """
 
     ocr_engine = ocr_engine or _default_ocr_engine()
     model = model or _default_openai_model()
@@ -364,7 +458,8 @@ def run_specimen_list_row_extraction(
     if existing_rows and not force:
         return existing_rows
 
-    ocr_entry = page.ocr_entries.filter(ocr_engine=ocr_engine).order_by("-created_at").first()
+    if ocr_entry is None:
+        ocr_entry = page.ocr_entries.filter(ocr_engine=ocr_engine).order_by("-created_at").first()
     if ocr_entry is None or not ocr_entry.raw_text:
         raise ValueError("Raw OCR text is required before row extraction can run.")
 
@@ -374,8 +469,8 @@ def run_specimen_list_row_extraction(
             "OpenAI client is not configured. Ensure OPENAI_API_KEY is set and the openai package is installed."
         )
 
-    image_path = Path(page.image_file.path)
-    base64_image = encode_image_to_base64(image_path)
+    if image_url is None:
+        image_url = prepare_image_url(Path(page.image_file.path), "ocr")
     prompt = (
         "Given this handwritten page OCR + image, detect tabular rows.\n"
         "• detect rows; infer columns carefully\n"
@@ -409,9 +504,12 @@ def run_specimen_list_row_extraction(
     for attempt in range(max_retries):
         try:
             start_ts = time.perf_counter()
-            response = client.chat.completions.create(
+            response, cache_key = _create_chat_completion(
+                client,
+                kind="specimen_list_row_extraction",
                 model=model,
                 timeout=timeout,
+                use_cache=use_cache and attempt == 0,
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that extracts rows from OCR text."},
                     {
@@ -420,7 +518,7 @@ def run_specimen_list_row_extraction(
                             {"type": "text", "text": prompt},
                             {
                                 "type": "image_url",
-                                "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
+                                "image_url": {"url": image_url},
                             },
                         ],
                     },
@@ -435,11 +533,13 @@ def run_specimen_list_row_extraction(
             except json.JSONDecodeError:
                 payload = _load_first_json_object(content)
             parsed = _parse_row_extraction_payload(payload)
+            _cache_completion(cache_key, response)
             usage_payload = build_timed_usage_payload(response, model, elapsed)
             logger.info(
                 "Specimen list row extraction usage recorded.",
                 extra={"page_id": page.id, "usage": usage_payload},
             )
+            report_rollups.record_llm_usage("specimen_list_row_extraction", usage_payload)
             rows = apply_ditto_marks([dict(row) for row in parsed["rows"]])
             if force:
                 page.row_candidates.all().delete()
@@ -471,12 +571,18 @@ def run_specimen_list_row_extraction(
             if attempt == max_retries - 1:
                 logger.exception("Specimen list row extraction failed after retries.", extra={"page_id": page.id})
                 raise
-            time.sleep(2 ** attempt)
+            time.sleep(_retry_delay(attempt))
 
     raise RuntimeError("Specimen list row extraction failed unexpectedly.") from last_error
 
 
-def detect_card_type(image_path: Path, model: str | None = None, timeout: int = 30, max_retries: int = 3) -> dict:
+def detect_card_type(
+    image_path: Path,
+    model: str | None = None,
+    timeout: int = 30,
+    max_retries: int = 3,
+    use_cache: bool = True,
+) -> dict:
     model = model or _default_openai_model()
     client = get_openai_client()
     if client is None:
@@ -484,7 +590,7 @@ def detect_card_type(image_path: Path, model: str | None = None, timeout: int =
             "OpenAI client is not configured. Ensure OPENAI_API_KEY is set and the openai package is installed."
         )
 
-    base64_image = encode_image_to_base64(image_path)
+    image_url = prepare_image_url(image_path, "classify")
 
     detection_prompt = (
         "Please examine this card image and classify it as one of the following types:\n"
@@ -496,9 +602,12 @@ def detect_card_type(image_path: Path, model: str | None = None, timeout: int =
 
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
+            response, cache_key = _create_chat_completion(
+                client,
+                kind="card_type_detection",
                 model=model,
                 timeout=timeout,
+                use_cache=use_cache and attempt == 0,
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that classifies card types."},
                     {
@@ -507,7 +616,7 @@ def detect_card_type(image_path: Path, model: str | None = None, timeout: int =
                             {"type": "text", "text": detection_prompt},
                             {
                                 "type": "image_url",
-                                "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
+                                "image_url": {"url": image_url},
                             },
                         ],
                     },
@@ -518,11 +627,13 @@ def detect_card_type(image_path: Path, model: str | None = None, timeout: int =
                 raw = "\n".join(
                     line for line in raw.splitlines() if not line.strip().startswith("```")
                 )
-            return json.loads(raw)
+            result = json.loads(raw)
+            _cache_completion(cache_key, response)
+            return result
         except Exception:
             if attempt == max_retries - 1:
                 raise
-            time.sleep(2 ** attempt)
+            time.sleep(_retry_delay(attempt))
 
 
 def classify_specimen_list_page(
@@ -531,6 +642,8 @@ def classify_specimen_list_page(
     model: str | None = None,
     timeout: int = 30,
     max_retries: int = 3,
+    image_url: str | None = None,
+    use_cache: bool = True,
 ) -> dict[str, object]:
     model = model or _default_openai_model()
     client = get_openai_client()
@@ -539,7 +652,8 @@ def classify_specimen_list_page(
             "OpenAI client is not configured. Ensure OPENAI_API_KEY is set and the openai package is installed."
         )
 
-    base64_image = encode_image_to_base64(image_path)
+    if image_url is None:
+        image_url = prepare_image_url(image_path, "classify")
     prompt = (
         "You classify specimen list pages. Choose exactly one page type:\n"
         "1. specimen list with accession details (columns like Acc. No., Field No., Classification/Taxon, Description/Element, Site/Locality)\n"
@@ -554,9 +668,12 @@ def classify_specimen_list_page(
     for attempt in range(max_retries):
         try:
             start_ts = time.perf_counter()
-            response = client.chat.completions.create(
+            response, cache_key = _create_chat_completion(
+                client,
+                kind="specimen_list_classification",
                 model=model,
                 timeout=timeout,
+                use_cache=use_cache and attempt == 0,
                 messages=[
                     {
                         "role": "system",
@@ -568,7 +685,7 @@ def classify_specimen_list_page(
                             {"type": "text", "text": prompt},
                             {
                                 "type": "image_url",
-                                "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
+                                "image_url": {"url": image_url},
                             },
                         ],
                     },
@@ -581,13 +698,15 @@ def classify_specimen_list_page(
                     line for line in raw.splitlines() if not line.strip().startswith("```")
                 )
             result = json.loads(raw)
+            _cache_completion(cache_key, response)
             usage_payload = build_usage_payload(response, model)
             result["usage"] = add_usage_timing(usage_payload, elapsed)
+            report_rollups.record_llm_usage("specimen_list_classification", result["usage"])
             return result
         except Exception:
             if attempt == max_retries - 1:
                 raise
-            time.sleep(2 ** attempt)
+            time.sleep(_retry_delay(attempt))
 
 
 def build_prompt_for_card_type(card_type: str) -> str:
@@ -848,6 +967,7 @@ def chatgpt_ocr(
     model: str | None = None,
     timeout: int = 60,
     max_retries: int = 3,
+    use_cache: bool = True,
 ) -> dict:
     model = model or _default_openai_model()
     client = get_openai_client()
@@ -856,13 +976,16 @@ def chatgpt_ocr(
             "OpenAI client is not configured. Ensure OPENAI_API_KEY is set and the openai package is installed."
         )
 
-    base64_image = encode_image_to_base64(image_path)
+    image_url = prepare_image_url(image_path, "ocr")
 
     for attempt in range(max_retries):
         try:
-            response = client.chat.completions.create(
+            response, cache_key = _create_chat_completion(
+                client,
+                kind="card_ocr",
                 model=model,
                 timeout=timeout,
+                use_cache=use_cache and attempt == 0,
                 messages=[
                     {"role": "system", "content": "You are a helpful assistant that extracts structured data from images."},
                     {
@@ -871,7 +994,7 @@ def chatgpt_ocr(
                             {"type": "text", "text": f"Image ID: {image_id}\n{user_prompt}"},
                             {
                                 "type": "image_url",
-                                "image_url": {"url": f"data:image/jpeg;base64,{base64_image}"},
+                                "image_url": {"url": image_url},
                             },
                         ],
                     },
@@ -883,12 +1006,13 @@ def chatgpt_ocr(
                     line for line in content.strip().splitlines() if not line.strip().startswith("```")
                 )
             result = json.loads(content)
+            _cache_completion(cache_key, response)
             result["usage"] = build_usage_payload(response, model)
             return result
         except Exception:
             if attempt == max_retries - 1:
                 raise
-            time.sleep(2 ** attempt)
+            time.sleep(_retry_delay(attempt))
 
 
 def _normalise_boolean(value: object) -> bool:
@@ -1694,16 +1818,112 @@ def _apply_field_slips(
         AccessionFieldSlip.objects.get_or_create(accession=accession, fieldslip=field_slip)
 
 
-def _apply_rows(
+@dataclass
+class _PlannedAccessionRow:
+    """Values to write for one specimen suffix of an accession card."""
+
+    suffix: str
+    storage_name: str | None = None
+    identification: dict[str, object] = field(default_factory=dict)
+    natures: list[dict[str, object]] = field(default_factory=list)
+
+
+def _first_by_key(queryset, key) -> dict:
+    """Return the first instance per ``key(instance)`` in ``.first()`` order."""
+
+    if not queryset.ordered:
+        queryset = queryset.order_by("pk")
+    resolved: dict = {}
+    for instance in queryset:
+        resolved.setdefault(key(instance), instance)
+    return resolved
+
+
+def _get_or_create_storages(area_names: set[str]) -> dict[str, Storage]:
+    """Batch version of :func:`_get_or_create_storage` keyed by lower-cased area."""
+
+    names = {name for name in area_names if name}
+    if not names:
+        return {}
+    query = Q()
+    for name in names:
+        query |= Q(area__iexact=name)
+    storages = _first_by_key(Storage.objects.filter(query), lambda storage: storage.area.lower())
+    for name in sorted(names):
+        if name.lower() not in storages:
+            storages[name.lower()] = _get_or_create_storage(name)
+    return storages
+
+
+def _bulk_create_with_history(model, instances: list, user, *, refetch) -> list:
+    """``bulk_create`` ``instances`` and record their creation history in bulk.
+
+    Backends that cannot return primary keys from ``bulk_create`` (MySQL)
+    leave ``instances`` without ``pk``; ``refetch`` is then called and must
+    return the stored rows in insertion order.
+    """
+
+    if not instances:
+        return []
+    model.objects.bulk_create(instances)
+    created = instances
+    if any(instance.pk is None for instance in instances):
+        created = list(refetch())
+        for stored, instance in zip(created, instances):
+            reason = getattr(instance, "_change_reason", None)
+            if reason:
+                stored._change_reason = reason
+    model.history.bulk_history_create(created, default_user=user)
+    return created
+
+
+def _bulk_delete_with_history(model, instances: list, user) -> None:
+    """Delete ``instances`` with two queries while keeping deletion history.
+
+    Per-object ``delete`` signals would write one historical row each, so the
+    ``-`` history rows are inserted in bulk and the rows removed with a raw
+    delete. Only used for models without reverse relations.
+    """
+
+    if not instances:
+        return
+    history_model = model.history.model
+    if getattr(settings, "SIMPLE_HISTORY_ENABLED", True):
+        now = timezone.now()
+        history_model.objects.bulk_create(
+            [
+                history_model(
+                    history_date=now,
+                    history_user=user,
+                    history_change_reason="",
+                    history_type="-",
+                    **{
+                        field.attname: getattr(instance, field.attname)
+                        for field in history_model.tracked_fields
+                    },
+                )
+                for instance in instances
+            ]
+        )
+    queryset = model.objects.filter(pk__in=[instance.pk for instance in instances])
+    queryset._raw_delete(queryset.db)
+
+
+def _plan_rows(
     accession: Accession,
     rows: list[dict[str, object]],
-    selection: set[str] | None = None,
-    *,
-    page_image: object | None = None,
-) -> None:
+    selection: set[str] | None,
+    page_image: object | None,
+) -> dict[str, _PlannedAccessionRow]:
+    """Resolve carried-forward values and corrections for each card row.
+
+    Rows repeating a suffix replace the children planned for it, and the last
+    non-empty storage wins, matching a row-by-row ``get_or_create`` import.
+    """
+
     last_ident_data: dict[str, object] | None = None
     last_natures_data: list[dict[str, object]] = []
-    processed_suffixes: set[str] = set()
+    planned: dict[str, _PlannedAccessionRow] = {}
     truncated_suffixes: list[str] = []
 
     for index, row in enumerate(rows):
@@ -1711,37 +1931,22 @@ def _apply_rows(
         suffix = str(suffix_raw)
         if selection is not None and suffix not in selection:
             continue
-        is_new_suffix = suffix not in processed_suffixes
-        if is_new_suffix and len(processed_suffixes) >= MAX_OCR_ROWS_PER_ACCESSION:
+        is_new_suffix = suffix not in planned
+        if is_new_suffix and len(planned) >= MAX_OCR_ROWS_PER_ACCESSION:
             skipped_seen: set[str] = set()
             for remaining in rows[index:]:
                 remaining_suffix = str(remaining.get("specimen_suffix") or "-")
                 if selection is not None and remaining_suffix not in selection:
                     continue
-                if remaining_suffix in processed_suffixes or remaining_suffix in skipped_seen:
+                if remaining_suffix in planned or remaining_suffix in skipped_seen:
                     continue
                 skipped_seen.add(remaining_suffix)
                 truncated_suffixes.append(remaining_suffix)
             break
-        if is_new_suffix:
-            processed_suffixes.add(suffix)
+        plan = planned.setdefault(suffix, _PlannedAccessionRow(suffix=suffix))
         storage_name = row.get("storage")
-        storage_obj = _get_or_create_storage(str(storage_name)) if storage_name else None
-        defaults = {
-            "storage": storage_obj,
-            "status": InventoryStatus.UNKNOWN,
-        }
-        row_obj, created = AccessionRow.objects.get_or_create(
-            accession=accession,
-            specimen_suffix=suffix,
-            defaults=defaults,
-        )
-        if not created and storage_obj and row_obj.storage != storage_obj:
-            row_obj.storage = storage_obj
-            row_obj.save(update_fields=["storage"])
-
-        row_obj.identification_set.all().delete()
-        row_obj.natureofspecimen_set.all().delete()
+        if storage_name:
+            plan.storage_name = str(storage_name)
 
         ident = row.get("identification") or {}
         if _has_identification_data(ident):
@@ -1751,16 +1956,7 @@ def _apply_rows(
             ident_to_apply = last_ident_data
         else:
             ident_to_apply = {}
-
-        if _has_identification_data(ident_to_apply):
-            Identification.objects.create(
-                accession_row=row_obj,
-                taxon=ident_to_apply.get("taxon"),
-                taxon_verbatim=ident_to_apply.get("taxon_verbatim"),
-                identification_qualifier=ident_to_apply.get("identification_qualifier"),
-                verbatim_identification=ident_to_apply.get("verbatim_identification"),
-                identification_remarks=ident_to_apply.get("identification_remarks"),
-            )
+        plan.identification = ident_to_apply if _has_identification_data(ident_to_apply) else {}
 
         natures = row.get("natures") or []
         if _has_any_nature_data(natures):
@@ -1785,8 +1981,8 @@ def _apply_rows(
                 detections = _normalize_tooth_marking_detections(correction.get("detections"))
                 replacements_applied = int(correction.get("replacements_applied") or 0)
                 min_confidence = correction.get("min_confidence")
-                for index, detection in enumerate(detections):
-                    detection.setdefault("replacement_applied", index < replacements_applied)
+                for detection_index, detection in enumerate(detections):
+                    detection.setdefault("replacement_applied", detection_index < replacements_applied)
                     detection.setdefault("min_confidence", min_confidence)
                 nature["verbatim_element_raw"] = raw_element
                 nature["verbatim_element"] = corrected_element
@@ -1795,13 +1991,123 @@ def _apply_rows(
                 nature["verbatim_element_raw"] = correction_source or None
                 nature["verbatim_element"] = corrected_element or None
                 nature["tooth_marking_detections"] = detections
+            nature["element_name"] = element_name or corrected_element or verbatim_element
+        plan.natures = list(natures_to_apply)
+
+    if truncated_suffixes:
+        logger.warning(
+            "Truncated OCR rows for accession %s to %s suffixes; skipped suffix count: %s",
+            accession.pk,
+            MAX_OCR_ROWS_PER_ACCESSION,
+            len(truncated_suffixes),
+        )
+    return planned
+
+
+def _apply_rows(
+    accession: Accession,
+    rows: list[dict[str, object]],
+    selection: set[str] | None = None,
+    *,
+    page_image: object | None = None,
+) -> None:
+    """Write the card's rows, identifications and natures with bulk queries.
+
+    Storages, elements, existing rows and children are each resolved with a
+    single query and written with ``bulk_create``/``bulk_update`` plus bulk
+    history, so the number of queries does not grow with the row count
+    (new storage areas are still created one at a time). The accession's
+    search summary is refreshed once at the end.
+    """
+
+    planned = _plan_rows(accession, rows, selection, page_image)
+    if not planned:
+        return
+
+    storages = _get_or_create_storages(
+        {plan.storage_name for plan in planned.values() if plan.storage_name}
+    )
+    element_names = {
+        nature["element_name"]
+        for plan in planned.values()
+        for nature in plan.natures
+        if nature.get("element_name")
+    }
+    elements = _first_by_key(
+        Element.objects.filter(name__in=element_names | {"-Undefined"}),
+        lambda element: element.name,
+    )
+    placeholder = elements.get("-Undefined")
+
+    existing_rows = {
+        row.specimen_suffix: row
+        for row in AccessionRow.objects.filter(accession=accession, specimen_suffix__in=list(planned))
+    }
+    new_rows: list[AccessionRow] = []
+    updated_rows: list[AccessionRow] = []
+    for suffix, plan in planned.items():
+        storage_obj = storages.get(plan.storage_name.lower()) if plan.storage_name else None
+        row_obj = existing_rows.get(suffix)
+        if row_obj is None:
+            row_obj = AccessionRow(
+                accession=accession,
+                specimen_suffix=suffix,
+                storage=storage_obj,
+                status=InventoryStatus.UNKNOWN,
+            )
+            row_obj.validate_specimen_suffix()
+            new_rows.append(row_obj)
+        elif storage_obj and row_obj.storage_id != storage_obj.pk:
+            row_obj.storage = storage_obj
+            updated_rows.append(row_obj)
+
+    user = AccessionRow.stamp_bulk_instances(new_rows)
+    new_suffixes = [row.specimen_suffix for row in new_rows]
+    created_rows = _bulk_create_with_history(
+        AccessionRow,
+        new_rows,
+        user,
+        refetch=lambda: AccessionRow.objects.filter(
+            accession=accession, specimen_suffix__in=new_suffixes
+        ),
+    )
+    row_by_suffix = {**existing_rows, **{row.specimen_suffix: row for row in created_rows}}
+    if updated_rows:
+        bulk_update_with_history(updated_rows, AccessionRow, ["storage"], default_user=user)
+
+    existing_row_ids = [row.pk for row in existing_rows.values()]
+    if existing_row_ids:
+        _bulk_delete_with_history(
+            Identification,
+            list(Identification.objects.filter(accession_row_id__in=existing_row_ids)),
+            user,
+        )
+        _bulk_delete_with_history(
+            NatureOfSpecimen,
+            list(NatureOfSpecimen.objects.filter(accession_row_id__in=existing_row_ids)),
+            user,
+        )
 
-            resolved_name = element_name or corrected_element or verbatim_element
-            element = Element.objects.filter(name=resolved_name).first() if resolved_name else None
-            parent = Element.objects.filter(name="-Undefined").first()
-            resolved_element = element or parent
-            resolved_name = resolved_name or getattr(resolved_element, "name", None)
-            nature["element_name"] = resolved_name
+    identifications: list[Identification] = []
+    natures: list[NatureOfSpecimen] = []
+    for suffix, plan in planned.items():
+        row_obj = row_by_suffix[suffix]
+        if plan.identification:
+            ident_to_apply = plan.identification
+            identifications.append(
+                Identification(
+                    accession_row=row_obj,
+                    taxon=ident_to_apply.get("taxon"),
+                    taxon_verbatim=ident_to_apply.get("taxon_verbatim"),
+                    identification_qualifier=ident_to_apply.get("identification_qualifier"),
+                    verbatim_identification=ident_to_apply.get("verbatim_identification"),
+                    identification_remarks=ident_to_apply.get("identification_remarks"),
+                )
+            )
+        for nature in plan.natures:
+            resolved_name = nature.get("element_name")
+            resolved_element = (elements.get(resolved_name) if resolved_name else None) or placeholder
+            nature["element_name"] = resolved_name or getattr(resolved_element, "name", None)
             if resolved_element is None:
                 logger.warning(
                     "Skipped nature for accession %s (suffix [REDACTED]) due to missing element '[REDACTED]' and no placeholder",
@@ -1817,25 +2123,44 @@ def _apply_rows(
                     fragments_value = int(fragments)
                 except (TypeError, ValueError):
                     fragments_value = 0
-            NatureOfSpecimen.objects.create(
-                accession_row=row_obj,
-                element=resolved_element,
-                side=nature.get("side"),
-                condition=nature.get("condition"),
-                verbatim_element=nature.get("verbatim_element"),
-                verbatim_element_raw=nature.get("verbatim_element_raw"),
-                tooth_marking_detections=nature.get("tooth_marking_detections") or [],
-                portion=nature.get("portion"),
-                fragments=fragments_value,
+            natures.append(
+                NatureOfSpecimen(
+                    accession_row=row_obj,
+                    element=resolved_element,
+                    side=nature.get("side"),
+                    condition=nature.get("condition"),
+                    verbatim_element=nature.get("verbatim_element"),
+                    verbatim_element_raw=nature.get("verbatim_element_raw"),
+                    tooth_marking_detections=nature.get("tooth_marking_detections") or [],
+                    portion=nature.get("portion"),
+                    fragments=fragments_value,
+                )
             )
 
-    if truncated_suffixes:
-        logger.warning(
-            "Truncated OCR rows for accession %s to %s suffixes; skipped suffix count: %s",
-            accession.pk,
-            MAX_OCR_ROWS_PER_ACCESSION,
-            len(truncated_suffixes),
-        )
+    taxon_matches = Identification.match_controlled_taxa(
+        ident.taxon_verbatim for ident in identifications if ident.taxon_verbatim
+    )
+    for ident in identifications:
+        ident._sync_taxon_fields(taxon_matches=taxon_matches)
+        ident.validate_taxon_fields()
+    Identification.stamp_bulk_instances(identifications)
+    NatureOfSpecimen.stamp_bulk_instances(natures)
+
+    row_ids = [row.pk for row in row_by_suffix.values()]
+    _bulk_create_with_history(
+        Identification,
+        identifications,
+        user,
+        refetch=lambda: Identification.objects.filter(accession_row_id__in=row_ids).order_by("pk"),
+    )
+    _bulk_create_with_history(
+        NatureOfSpecimen,
+        natures,
+        user,
+        refetch=lambda: NatureOfSpecimen.objects.filter(accession_row_id__in=row_ids).order_by("pk"),
+    )
+    # The bulk writes above bypass the signals that keep the summary current.
+    accession_summaries.refresh([accession.pk])
 
 
 def _serialize_accession(accession: Accession) -> dict[str, object]:
@@ -2487,7 +2812,7 @@ def _process_single_scan(
             )
             if attempt == max_attempts:
                 raise OCRTimeoutError(str(exc)) from exc
-            time.sleep(2 ** (attempt - 1))
+            time.sleep(_retry_delay(attempt - 1))
         except Exception as exc:
             if _is_insufficient_quota_error(exc):
                 logger.warning(
@@ -2500,8 +2825,173 @@ def _process_single_scan(
         raise OCRTimeoutError(str(last_timeout))
 
 
+@dataclass
+class _ScanQueueProgress:
+    """Mutable counters shared by the sequential and concurrent scan loops."""
+
+    successes: int = 0
+    failures: int = 0
+    total: int = 0
+    errors: list[str] = field(default_factory=list)
+    jammed_filename: Optional[str] = None
+    processed_filenames: list[str] = field(default_factory=list)
+    insufficient_quota: bool = False
+
+    def as_tuple(self) -> tuple[int, int, int, list[str], Optional[str], list[str], bool]:
+        return (
+            self.successes,
+            self.failures,
+            self.total,
+            self.errors,
+            self.jammed_filename,
+            self.processed_filenames,
+            self.insufficient_quota,
+        )
+
+
+_PENDING_SCAN_PREFIX = "uploads/pending/"
+# Scans claimed per query during a batch replay, which mostly reads the response cache.
+_BATCH_REPLAY_CLAIM_SIZE = 50
+
+
+def _iter_pending_scans(claims: WorkClaims, limit: int | None, *, batch_size: int = 1):
+    """Claim pending scans and yield ``(media, path)`` pairs for those whose file is present.
+
+    Scans are claimed ``batch_size`` at a time as the queue consumes them so
+    that runs on other nodes share the rest of the queue. The queue is walked
+    in filename order and each scan is visited at most once per run.
+    """
+
+    pending = Media.objects.filter(media_location__startswith=_PENDING_SCAN_PREFIX).order_by(
+        "media_location", "pk"
+    )
+    after = Q()
+    yielded = 0
+    while limit is None or yielded < limit:
+        size = batch_size if limit is None else min(batch_size, limit - yielded)
+        pks = claims.claim(pending.filter(after), max(1, size))
+        if not pks:
+            return
+        media_by_pk = Media.objects.in_bulk(pks)
+        for pk in pks:
+            media = media_by_pk.get(pk)
+            if media is None:
+                continue
+            location = media.media_location.name
+            after = Q(media_location__gt=location) | Q(media_location=location, pk__gt=pk)
+            path = Path(settings.MEDIA_ROOT) / location
+            if not path.is_file():
+                claims.release([pk])
+                continue
+            yielded += 1
+            yield media, path
+
+
+def _record_scan_outcome(
+    progress: _ScanQueueProgress,
+    media: Media,
+    path: Path,
+    exc: BaseException | None,
+    failed_dir: Path,
+) -> bool:
+    """Update ``progress`` for a finished scan and return ``True`` to stop the queue."""
+
+    if exc is None:
+        progress.successes += 1
+        return False
+
+    if isinstance(exc, OCRTimeoutError):
+        progress.failures += 1
+        # Do not expose exception details to users
+        progress.errors.append(f"{path.name}: scan timed out")
+        if progress.jammed_filename is None:
+            progress.jammed_filename = path.name
+        logger.error("OCR timed out for %s after multiple attempts", path, exc_info=exc)
+        _mark_scan_failed(media, path, failed_dir, exc)
+        return True
+
+    if isinstance(exc, InsufficientQuotaError):
+        if not progress.insufficient_quota:
+            progress.errors.append("insufficient_quota")
+        progress.insufficient_quota = True
+        logger.warning("Stopping OCR queue because quota was exhausted: %s", exc)
+        progress.processed_filenames.remove(path.name)
+        progress.total -= 1
+        return True
+
+    progress.failures += 1
+    # Do not expose exception details to users
+    progress.errors.append(f"{path.name}: scan failed")
+    logger.error("OCR processing failed for %s", path, exc_info=exc)
+    _mark_scan_failed(media, path, failed_dir, exc)
+    return False
+
+
+def _process_scan_in_worker(media: Media, path: Path, ocr_dir: Path, user: Any) -> None:
+    """Run :func:`_process_single_scan` on a pool thread.
+
+    The requesting user is re-bound so ``BaseModel.save`` can stamp audit
+    fields, and the thread's database connection is closed afterwards because
+    pool threads are not managed by Django's request cycle.
+    """
+
+    try:
+        with impersonate(user):
+            _process_single_scan(media, path, ocr_dir)
+    finally:
+        connections.close_all()
+
+
+def _run_scans_concurrently(
+    candidates,
+    claims: WorkClaims,
+    progress: _ScanQueueProgress,
+    ocr_dir: Path,
+    failed_dir: Path,
+    workers: int,
+) -> None:
+    """Process scans on a bounded thread pool.
+
+    At most ``workers`` scans are in flight. Once a scan jams or the quota is
+    exhausted no further scans are submitted; scans already in flight are
+    allowed to finish and are reported normally. Failure bookkeeping (file
+    moves and ``Media`` updates for failed scans) happens on the calling
+    thread so each scan is only ever touched by one thread at a time.
+    """
+
+    user = get_current_user()
+    in_flight: dict[Future, tuple[Media, Path]] = {}
+    stop = False
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan-ocr") as executor:
+
+        def _fill() -> None:
+            while len(in_flight) < workers:
+                candidate = next(candidates, None)
+                if candidate is None:
+                    return
+                media, path = candidate
+                progress.total += 1
+                progress.processed_filenames.append(path.name)
+                future = executor.submit(_process_scan_in_worker, media, path, ocr_dir, user)
+                in_flight[future] = candidate
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                media, path = in_flight.pop(future)
+                if _record_scan_outcome(progress, media, path, future.exception(), failed_dir):
+                    stop = True
+                claims.release([media.pk])
+            if not stop:
+                _fill()
+
+
 def process_pending_scans(
     limit: int | None = None,
+    *,
+    workers: int | None = None,
 ) -> tuple[int, int, int, list[str], Optional[str], list[str], bool]:
     """Process up to ``limit`` scans awaiting OCR.
 
@@ -2513,64 +3003,80 @@ def process_pending_scans(
     ``jammed_filename`` will be set if OCR was halted early because a scan
     repeatedly timed out, and ``processed_filenames`` records each filename
     that was attempted regardless of success or failure.
+
+    ``workers`` controls how many scans are sent to OpenAI concurrently and
+    defaults to ``settings.OCR_SCAN_WORKERS``. With more than one worker, scans
+    already in flight when the queue stops still complete and are included in
+    the totals.
+
+    Each scan is claimed before it is processed (see :mod:`cms.work_claims`),
+    so runs on several nodes sharing the media volume split the queue between
+    them instead of processing the same scans twice.
     """
 
-    pending = Path(settings.MEDIA_ROOT) / "uploads" / "pending"
     ocr_dir = Path(settings.MEDIA_ROOT) / "uploads" / "ocr"
     failed_dir = Path(settings.MEDIA_ROOT) / "uploads" / "failed"
 
-    files = sorted(pending.glob("*"))
-    successes = 0
-    failures = 0
-    total = 0
-    errors: list[str] = []
-    jammed_filename: Optional[str] = None
-    processed_filenames: list[str] = []
-    insufficient_quota = False
+    if workers is None:
+        workers = default_scan_workers()
+    workers = max(1, int(workers))
 
-    for path in files:
-        if limit is not None and total >= limit:
-            break
+    progress = _ScanQueueProgress()
+    with WorkClaims(Media) as claims:
+        candidates = _iter_pending_scans(claims, limit, batch_size=workers)
+        if workers > 1:
+            _run_scans_concurrently(candidates, claims, progress, ocr_dir, failed_dir, workers)
+            return progress.as_tuple()
 
-        relative = str(path.relative_to(settings.MEDIA_ROOT))
-        media = Media.objects.filter(media_location=relative).first()
-        if not media:
-            continue
+        for media, path in candidates:
+            progress.total += 1
+            progress.processed_filenames.append(path.name)
 
-        total += 1
-        processed_filenames.append(path.name)
+            try:
+                _process_single_scan(media, path, ocr_dir)
+            except Exception as exc:
+                stop = _record_scan_outcome(progress, media, path, exc, failed_dir)
+            else:
+                stop = _record_scan_outcome(progress, media, path, None, failed_dir)
+            claims.release([media.pk])
+            if stop:
+                break
 
-        try:
-            _process_single_scan(media, path, ocr_dir)
-            successes += 1
-        except OCRTimeoutError as exc:
-            failures += 1
-            # Do not expose exception details to users
-            errors.append(f"{path.name}: scan timed out")
-            jammed_filename = path.name
-            logger.error("OCR timed out for %s after multiple attempts", path, exc_info=True)
-            _mark_scan_failed(media, path, failed_dir, exc)
-            break
-        except InsufficientQuotaError as exc:
-            insufficient_quota = True
-            errors.append("insufficient_quota")
-            logger.warning("Stopping OCR queue because quota was exhausted: %s", exc)
-            processed_filenames.pop()
-            total -= 1
-            break
-        except Exception as exc:
-            failures += 1
-            # Do not expose exception details to users
-            errors.append(f"{path.name}: scan failed")
-            logger.exception("OCR processing failed for %s", path)
-            _mark_scan_failed(media, path, failed_dir, exc)
+    return progress.as_tuple()
 
-    return (
-        successes,
-        failures,
-        total,
-        errors,
-        jammed_filename,
-        processed_filenames,
-        insufficient_quota,
-    )
+
+def replay_pending_scans_for_batch(
+    limit: int | None = None,
+) -> tuple[tuple[int, int, int, list[str], Optional[str], list[str], bool], list[llm_batch.DeferredRequest]]:
+    """Replay pending scans with uncached chat completions deferred to a batch.
+
+    Scans whose answers are all in the LLM response cache are persisted as
+    usual. Every other scan stays pending and contributes the request it is
+    waiting on. Returns the :func:`process_pending_scans` tuple for the scans
+    that finished, plus the deferred requests.
+    """
+
+    ocr_dir = Path(settings.MEDIA_ROOT) / "uploads" / "ocr"
+    failed_dir = Path(settings.MEDIA_ROOT) / "uploads" / "failed"
+
+    progress = _ScanQueueProgress()
+    deferred: list[llm_batch.DeferredRequest] = []
+    with WorkClaims(Media) as claims:
+        for media, path in _iter_pending_scans(claims, limit, batch_size=_BATCH_REPLAY_CLAIM_SIZE):
+            try:
+                with llm_batch.deferring():
+                    _process_single_scan(media, path, ocr_dir, max_attempts=1)
+            except llm_batch.BatchRequestDeferred as deferral:
+                deferred.append(deferral.request)
+                continue
+            except Exception as exc:
+                progress.total += 1
+                progress.processed_filenames.append(path.name)
+                if _record_scan_outcome(progress, media, path, exc, failed_dir):
+                    break
+            else:
+                progress.total += 1
+                progress.processed_filenames.append(path.name)
+                _record_scan_outcome(progress, media, path, None, failed_dir)
+
+    return progress.as_tuple(), deferred
@@ -0,0 +1,402 @@
+"""Keyset pagination for the large list views.
+
+Django's paginator counts the whole filtered queryset on every request and
+reads page ``n`` with ``OFFSET (n - 1) * size``, so deep pages of the media QC
+queues, the accession list and the other large lists get slower the further
+a reader goes, and distinct, annotated querysets make the count itself the
+most expensive query of the page.
+
+:class:`KeysetPaginator` orders the queryset by a stable sort key (the view's
+ordering plus the primary key) and reads one row more than a page to find
+out whether another page follows, so no count is needed to page. The first
+``LIST_PAGINATION_MAX_OFFSET_PAGES`` pages keep their ``?page=`` numbers;
+links past them carry a ``?cursor=`` token holding the sort key of the last
+(or first) row shown, and the next page is read with ``WHERE key > cursor``
+instead of an offset.
+
+The total shown under the table is counted without the views' display
+annotations and stops at ``LIST_PAGINATION_COUNT_LIMIT`` rows. Beyond that an
+unfiltered list shows the database's table statistics as an estimate and a
+filtered list shows "more than" the limit.
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import json
+import math
+import uuid
+from collections.abc import Sequence
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+from typing import Any, NamedTuple
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import EmptyPage, InvalidPage, PageNotAnInteger
+from django.db import connections, models, router
+from django.db.models import F, Q
+from django.http import Http404
+from django.utils.functional import cached_property
+from django.utils.translation import gettext as _
+
+NEXT = "next"
+PREVIOUS = "prev"
+
+
+def _positive_setting(name: str, default: int) -> int:
+    try:
+        return max(1, int(getattr(settings, name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def count_limit() -> int:
+    """Rows counted exactly before a list total becomes an estimate."""
+
+    return _positive_setting("LIST_PAGINATION_COUNT_LIMIT", 10000)
+
+
+def max_offset_pages() -> int:
+    """Pages reachable by number; links past them use cursors."""
+
+    return _positive_setting("LIST_PAGINATION_MAX_OFFSET_PAGES", 20)
+
+
+def estimated_row_count(model: type[models.Model]) -> int | None:
+    """Return the database's row estimate for ``model``'s table, or ``None`` where it keeps none."""
+
+    connection = connections[router.db_for_read(model)]
+    if connection.vendor == "mysql":
+        sql = (
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+        )
+    elif connection.vendor == "postgresql":
+        sql = "SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)"
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [model._meta.db_table])
+        row = cursor.fetchone()
+    if not row or row[0] is None or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+class SortKey(NamedTuple):
+    name: str
+    descending: bool
+    field: models.Field | None
+    nullable: bool
+
+
+def _resolve(model: type[models.Model], name: str) -> tuple[models.Field | None, bool]:
+    """Return the model field behind ``name`` and whether any step of it may be ``NULL``.
+
+    Annotations have no field and are treated as nullable.
+    """
+
+    field = None
+    nullable = False
+    for part in name.split("__"):
+        if model is None:
+            return None, True
+        try:
+            field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None, True
+        nullable = nullable or field.null
+        model = field.related_model
+    return field, nullable
+
+
+def _sort_keys(model: type[models.Model], ordering: Sequence[str]) -> list[SortKey]:
+    if isinstance(ordering, str):
+        ordering = (ordering,)
+    keys = []
+    for entry in ordering:
+        name = entry.lstrip("-")
+        keys.append(SortKey(name, entry.startswith("-"), *_resolve(model, name)))
+    # The primary key breaks ties, so every row has a distinct position.
+    if not keys or keys[-1].name not in {"pk", model._meta.pk.name, model._meta.pk.attname}:
+        keys.append(SortKey("pk", keys[-1].descending if keys else False, model._meta.pk, False))
+    return keys
+
+
+def _order_by(key: SortKey) -> models.OrderBy:
+    # NULL sorts lowest in both directions, as MySQL and SQLite already do.
+    if key.descending:
+        return F(key.name).desc(nulls_last=True)
+    return F(key.name).asc(nulls_first=True)
+
+
+def _row_value(obj: Any, name: str) -> Any:
+    value = obj
+    for part in name.split("__"):
+        if value is None:
+            return None
+        value = getattr(value, part)
+    if isinstance(value, models.Model):
+        return value.pk
+    return value
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    return value
+
+
+def _beyond(keys: Sequence[SortKey], values: Sequence[Any], reverse: bool) -> Q:
+    """Rows sorting strictly after ``values`` (before them when ``reverse``)."""
+
+    clauses = []
+    equal = Q()
+    for key, value in zip(keys, values):
+        descending = key.descending != reverse
+        if value is None:
+            # NULL sorts lowest: every value follows it ascending, none descending.
+            beyond = None if descending else Q(**{f"{key.name}__isnull": False})
+        else:
+            beyond = Q(**{f"{key.name}__{'lt' if descending else 'gt'}": value})
+            if descending and key.nullable:
+                beyond |= Q(**{f"{key.name}__isnull": True})
+        if beyond is not None:
+            clauses.append(equal & beyond)
+        equal &= Q(**{f"{key.name}__isnull": True}) if value is None else Q(**{key.name: value})
+    if not clauses:
+        return Q(pk__in=[])
+    return reduce(or_, clauses)
+
+
+class KeysetPage(Sequence):
+    """One page of a :class:`KeysetPaginator`, shaped like Django's ``Page``.
+
+    ``number`` is ``None`` on pages reached by cursor. ``next_page_number``
+    and ``previous_page_number`` return ``None`` when the neighbouring page is
+    reached by cursor instead; ``next_cursor`` and ``previous_cursor`` are then
+    set, so templates link with
+    ``{% querystring_replace page=page_obj.next_page_number cursor=page_obj.next_cursor %}``.
+    """
+
+    def __init__(
+        self,
+        object_list: list[Any],
+        paginator: KeysetPaginator,
+        *,
+        number: int | None,
+        has_previous: bool,
+        has_next: bool,
+    ):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = number
+        self._has_previous = has_previous
+        self._has_next = has_next
+
+    def __repr__(self) -> str:
+        if self.number is None:
+            return "<Page after cursor>"
+        return f"<Page {self.number}>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def has_other_pages(self) -> bool:
+        return self._has_next or self._has_previous
+
+    def next_page_number(self) -> int | None:
+        if self._has_next and self.number is not None and self.number < max_offset_pages():
+            return self.number + 1
+        return None
+
+    def previous_page_number(self) -> int | None:
+        if self._has_previous and self.number is not None and 1 < self.number <= max_offset_pages() + 1:
+            return self.number - 1
+        return None
+
+    @property
+    def next_cursor(self) -> str | None:
+        if self._has_next and self.object_list and self.next_page_number() is None:
+            return self.paginator.cursor_for(self.object_list[-1], NEXT)
+        return None
+
+    @property
+    def previous_cursor(self) -> str | None:
+        if self._has_previous and self.object_list and self.previous_page_number() is None:
+            return self.paginator.cursor_for(self.object_list[0], PREVIOUS)
+        return None
+
+
+class KeysetPaginator:
+    """Page ``queryset`` by its sort key rather than by offset.
+
+    ``count_queryset`` is what the total is counted from; pass the filtered
+    queryset without display annotations or prefetches.
+    """
+
+    def __init__(
+        self,
+        queryset: models.QuerySet,
+        per_page: int,
+        ordering: Sequence[str],
+        *,
+        count_queryset: models.QuerySet | None = None,
+    ):
+        self.per_page = int(per_page)
+        self.keys = _sort_keys(queryset.model, ordering)
+        self.queryset = queryset.order_by(*(_order_by(key) for key in self.keys))
+        self.count_queryset = queryset if count_queryset is None else count_queryset
+
+    @cached_property
+    def _total(self) -> tuple[int, str]:
+        limit = count_limit()
+        counted = self.count_queryset.order_by()[: limit + 1].count()
+        if counted <= limit:
+            return counted, "exact"
+        if not self.count_queryset.query.has_filters():
+            estimate = estimated_row_count(self.count_queryset.model)
+            if estimate is not None and estimate > limit:
+                return estimate, "estimate"
+        return limit, "lower_bound"
+
+    @property
+    def count(self) -> int:
+        return self._total[0]
+
+    @property
+    def count_is_estimate(self) -> bool:
+        return self._total[1] == "estimate"
+
+    @property
+    def count_is_lower_bound(self) -> bool:
+        return self._total[1] == "lower_bound"
+
+    @property
+    def num_pages(self) -> int:
+        return max(1, math.ceil(self.count / self.per_page))
+
+    def cursor_for(self, obj: Any, direction: str) -> str:
+        values = [_encode_value(_row_value(obj, key.name)) for key in self.keys]
+        payload = json.dumps([direction, values], separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def _decode(self, cursor: str) -> tuple[str, list[Any]]:
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            direction, values = json.loads(payload)
+        except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+            raise InvalidPage(_("That cursor is not valid.")) from None
+        if direction not in (NEXT, PREVIOUS) or not isinstance(values, list) or len(values) != len(self.keys):
+            raise InvalidPage(_("That cursor is not valid."))
+        decoded = []
+        for key, value in zip(self.keys, values):
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise InvalidPage(_("That cursor is not valid."))
+            if value is not None and key.field is not None:
+                try:
+                    value = key.field.to_python(value)
+                except ValidationError:
+                    raise InvalidPage(_("That cursor is not valid.")) from None
+            decoded.append(value)
+        return direction, decoded
+
+    def page(self, number: int | str) -> KeysetPage:
+        """Return page ``number``, read by offset."""
+
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer")) from None
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        offset = (number - 1) * self.per_page
+        rows = list(self.queryset[offset : offset + self.per_page + 1])
+        if not rows and number > 1:
+            raise EmptyPage(_("That page contains no results"))
+        return KeysetPage(
+            rows[: self.per_page],
+            self,
+            number=number,
+            has_previous=number > 1,
+            has_next=len(rows) > self.per_page,
+        )
+
+    def cursor_page(self, cursor: str) -> KeysetPage:
+        """Return the page following (or preceding) the row ``cursor`` was made from."""
+
+        direction, values = self._decode(cursor)
+        reverse = direction == PREVIOUS
+        queryset = self.queryset.filter(_beyond(self.keys, values, reverse))
+        if reverse:
+            queryset = queryset.reverse()
+        rows = list(queryset[: self.per_page + 1])
+        more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+            # Paging back onto the first rows lands on page 1 again.
+            return KeysetPage(rows, self, number=None if more else 1, has_previous=more, has_next=True)
+        return KeysetPage(rows, self, number=None, has_previous=True, has_next=more)
+
+
+class KeysetPaginationMixin:
+    """Paginate a ``ListView`` or ``FilterView`` with :class:`KeysetPaginator`.
+
+    ``keyset_ordering`` (or ``get_ordering()``) names the sort key as model
+    fields, related lookups or annotations, not ``Meta.ordering`` shorthands
+    such as a bare foreign key. ``get_page_queryset`` adds what only the
+    displayed rows need, such as counts shown in a column; the total is
+    counted without it.
+    """
+
+    keyset_ordering: Sequence[str] = ()
+    cursor_kwarg = "cursor"
+
+    def get_keyset_ordering(self) -> Sequence[str]:
+        return self.keyset_ordering or self.get_ordering() or ("pk",)
+
+    def get_page_queryset(self, queryset: models.QuerySet) -> models.QuerySet:
+        return queryset
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = KeysetPaginator(
+            self.get_page_queryset(queryset),
+            page_size,
+            self.get_keyset_ordering(),
+            count_queryset=queryset,
+        )
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        page_number = self.kwargs.get(self.page_kwarg) or self.request.GET.get(self.page_kwarg) or 1
+        try:
+            page = paginator.cursor_page(cursor) if cursor else paginator.page(page_number)
+        except InvalidPage as exc:
+            raise Http404(
+                _("Invalid page (%(page_number)s): %(message)s")
+                % {"page_number": cursor or page_number, "message": str(exc)}
+            )
+        return paginator, page, page.object_list, page.has_other_pages()
+
+
+__all__ = [
+    "KeysetPage",
+    "KeysetPaginationMixin",
+    "KeysetPaginator",
+    "count_limit",
+    "estimated_row_count",
+    "max_offset_pages",
+]
@@ -2,6 +2,7 @@
 
 from .diff import (
     diff_media_payload,
+    diff_ocr_revisions,
     ident_payload_has_meaningful_data,
     interpreted_value,
     iter_field_diffs,
@@ -10,6 +11,7 @@ from .preview import build_preview_accession
 
 __all__ = [
     "diff_media_payload",
+    "diff_ocr_revisions",
     "ident_payload_has_meaningful_data",
     "interpreted_value",
     "iter_field_diffs",
@@ -337,3 +337,25 @@ def diff_media_payload(
         "count_diffs": count_diffs,
         "warnings": warnings,
     }
+
+
+def diff_ocr_revisions(
+    old_digest: str | None,
+    new_digest: str | None,
+    *,
+    rows_reordered: bool | None = None,
+) -> dict[str, Any]:
+    """Return :func:`diff_media_payload` for two stored OCR data blobs.
+
+    History rows and QC logs record ``ocr_data`` by digest; both documents
+    are reconstructed from :class:`cms.models.OCRDataBlob` with one query.
+    """
+
+    from cms.models import OCRDataBlob
+
+    documents = OCRDataBlob.objects.documents([old_digest, new_digest])
+    return diff_media_payload(
+        documents.get(old_digest),
+        documents.get(new_digest),
+        rows_reordered=rows_reordered,
+    )
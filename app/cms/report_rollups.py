@@ -0,0 +1,486 @@
+"""Rollup tables behind the media, accession and LLM usage reports.
+
+The reports used to aggregate every :class:`cms.models.Media`,
+:class:`cms.models.Accession` and :class:`cms.models.LLMUsageRecord` row on
+each request. Instead, the counts they show are kept in
+:class:`cms.models.MediaStatusRollup`, :class:`cms.models.MediaDailyRollup`,
+:class:`cms.models.AccessionLocalityRollup` and
+:class:`cms.models.LLMUsageDailyRollup`. These tables are adjusted by one
+``F()`` update per save or delete through the signal handlers in
+:mod:`cms.signals`, by :func:`media_bulk_created` for bulk inserts that
+bypass signals, and by :func:`record_llm_usage` for pipeline stages that keep
+no usage rows of their own. :func:`rebuild` recomputes them from scratch (see
+the ``rebuild_report_rollups`` management command) after loading fixtures or
+raw SQL changes.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import Counter
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, IntegrityError, models, transaction
+from django.db.models import Count, F, Q, Sum
+from django.db.models.functions import ExtractIsoWeekDay, TruncDate
+from django.utils import timezone
+
+from .models import (
+    Accession,
+    AccessionLocalityRollup,
+    LLMUsageDailyRollup,
+    LLMUsageRecord,
+    Media,
+    MediaDailyRollup,
+    MediaStatusRollup,
+)
+
+logger = logging.getLogger(__name__)
+
+#: Stage under which :class:`LLMUsageRecord` rows, one per OCRed scan, are rolled up.
+SCAN_OCR_STAGE = "card_ocr"
+
+#: Display labels of the pipeline stages whose LLM usage is rolled up.
+LLM_STAGE_LABELS = {
+    SCAN_OCR_STAGE: "Scan OCR",
+    "specimen_list_classification": "Specimen list classification",
+    "specimen_list_raw_ocr": "Specimen list OCR",
+    "specimen_list_row_extraction": "Specimen list row extraction",
+}
+
+_LLM_USAGE_TOTALS = ("prompt_tokens", "completion_tokens", "total_tokens", "cost_usd", "processing_seconds")
+
+#: Fields whose stored values a save compares against to work out rollup deltas.
+TRACKED_FIELDS: dict[type[models.Model], tuple[str, ...]] = {
+    Media: ("ocr_status",),
+    Accession: ("specimen_prefix", "specimen_no"),
+    LLMUsageRecord: ("model_name", "cache_hit", "created_at", *_LLM_USAGE_TOTALS),
+}
+
+_PREVIOUS_ATTR = "_report_rollup_previous"
+
+# Specimens whose deletion is in progress on this thread. A queryset delete
+# sends every post_delete after all rows are gone, so only the first handler
+# for a specimen may count it as removed.
+_deleting = threading.local()
+
+
+def chart_cache_seconds() -> int:
+    try:
+        return max(0, int(getattr(settings, "REPORT_CHART_CACHE_SECONDS", 300)))
+    except (TypeError, ValueError):
+        return 300
+
+
+def _bump(model: type[models.Model], lookup: dict[str, Any], **deltas: int | Decimal) -> None:
+    """Add ``deltas`` to the counters of the rollup row matching ``lookup``.
+
+    Missing rows are created for increments only, so a decrement never
+    resurrects a row its locality cascade has just removed.
+    """
+
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    changes = {name: F(name) + delta for name, delta in deltas.items()}
+    if model.objects.filter(**lookup).update(**changes):
+        return
+    if not any(delta > 0 for delta in deltas.values()):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**lookup, **deltas)
+    except IntegrityError:
+        # Another writer created the row first.
+        model.objects.filter(**lookup).update(**changes)
+
+
+def _local_day(value: datetime | None) -> date | None:
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        return timezone.localdate(value)
+    return value.date()
+
+
+def load_previous_state(instance: models.Model, *, update_fields: Iterable[str] | None = None) -> None:
+    """Remember the stored tracked values of ``instance`` before it is saved.
+
+    Values captured at load time (see ``Media._remember_qc_state``) are used
+    as they are; only the gaps are read from the database. Saves of new rows
+    and saves whose ``update_fields`` leave the tracked fields alone skip
+    the lookup.
+    """
+
+    model = type(instance)
+    _pop_previous(instance)
+    if instance._state.adding or instance.pk is None:
+        return
+    fields = [model._meta.get_field(name) for name in TRACKED_FIELDS[model]]
+    if update_fields is not None:
+        names = set(update_fields)
+        if not any(field.name in names or field.attname in names for field in fields):
+            return
+    loaded = getattr(instance, "_qc_loaded_state", {})
+    previous = {field.attname: loaded[field.name] for field in fields if field.name in loaded}
+    missing = [field.attname for field in fields if field.attname not in previous]
+    if missing:
+        row = model._base_manager.filter(pk=instance.pk).values(*missing).first()
+        if row is None:
+            return
+        previous.update(row)
+    setattr(instance, _PREVIOUS_ATTR, previous)
+
+
+def _pop_previous(instance: models.Model) -> dict[str, Any] | None:
+    return instance.__dict__.pop(_PREVIOUS_ATTR, None)
+
+
+def media_saved(media: Media, *, created: bool) -> None:
+    if created:
+        _bump(MediaStatusRollup, {"ocr_status": media.ocr_status}, media_count=1)
+        day = _local_day(media.created_on)
+        if day is not None:
+            _bump(MediaDailyRollup, {"day": day}, media_count=1)
+        return
+    previous = _pop_previous(media)
+    if previous is None or previous["ocr_status"] == media.ocr_status:
+        return
+    _bump(MediaStatusRollup, {"ocr_status": previous["ocr_status"]}, media_count=-1)
+    _bump(MediaStatusRollup, {"ocr_status": media.ocr_status}, media_count=1)
+
+
+def media_deleted(media: Media) -> None:
+    loaded = media.__dict__
+    if "ocr_status" in loaded:
+        _bump(MediaStatusRollup, {"ocr_status": loaded["ocr_status"]}, media_count=-1)
+    day = _local_day(loaded.get("created_on"))
+    if day is not None:
+        _bump(MediaDailyRollup, {"day": day}, media_count=-1)
+
+
+def media_bulk_created(medias: Iterable[Media]) -> None:
+    """Count media inserted with ``bulk_create``, which sends no signals."""
+
+    statuses: Counter[str] = Counter()
+    days: Counter[date] = Counter()
+    for media in medias:
+        statuses[media.ocr_status] += 1
+        day = _local_day(media.created_on)
+        if day is not None:
+            days[day] += 1
+    for status, total in statuses.items():
+        _bump(MediaStatusRollup, {"ocr_status": status}, media_count=total)
+    for day, total in days.items():
+        _bump(MediaDailyRollup, {"day": day}, media_count=total)
+
+
+def _specimen_in_use(prefix_id: int, specimen_no: int, *, exclude_pk: Any = None) -> bool:
+    queryset = Accession.objects.filter(specimen_prefix_id=prefix_id, specimen_no=specimen_no)
+    if exclude_pk is not None:
+        queryset = queryset.exclude(pk=exclude_pk)
+    return queryset.exists()
+
+
+def _accession_added(prefix_id: int, specimen_no: int, pk: Any) -> None:
+    new_specimen = not _specimen_in_use(prefix_id, specimen_no, exclude_pk=pk)
+    _bump(
+        AccessionLocalityRollup,
+        {"locality_id": prefix_id},
+        accession_count=1,
+        specimen_count=int(new_specimen),
+    )
+
+
+def _accession_removed(prefix_id: int, specimen_no: int) -> None:
+    last_of_specimen = not _specimen_in_use(prefix_id, specimen_no)
+    _bump(
+        AccessionLocalityRollup,
+        {"locality_id": prefix_id},
+        accession_count=-1,
+        specimen_count=-int(last_of_specimen),
+    )
+
+
+def accession_saved(accession: Accession, *, created: bool) -> None:
+    current = (accession.specimen_prefix_id, accession.specimen_no)
+    if created:
+        _accession_added(*current, accession.pk)
+        return
+    previous = _pop_previous(accession)
+    if previous is None:
+        return
+    before = (previous["specimen_prefix_id"], previous["specimen_no"])
+    if before == current:
+        return
+    _accession_removed(*before)
+    _accession_added(*current, accession.pk)
+
+
+def _pending_deletes() -> set[tuple[int, int]]:
+    pending = getattr(_deleting, "specimens", None)
+    if pending is None:
+        pending = _deleting.specimens = set()
+    return pending
+
+
+def accession_deleting(accession: Accession) -> None:
+    _pending_deletes().add((accession.specimen_prefix_id, accession.specimen_no))
+
+
+def accession_deleted(accession: Accession) -> None:
+    pending = _pending_deletes()
+    key = (accession.specimen_prefix_id, accession.specimen_no)
+    if key in pending:
+        pending.discard(key)
+        _accession_removed(*key)
+    else:
+        # An earlier handler of the same delete already counted the specimen.
+        _bump(AccessionLocalityRollup, {"locality_id": key[0]}, accession_count=-1)
+
+
+def _llm_usage_change(values: dict[str, Any], sign: int) -> tuple[dict[str, Any], dict[str, Any]]:
+    lookup = {
+        "day": _local_day(values["created_at"]),
+        "model_name": values["model_name"],
+        "stage": values.get("stage", SCAN_OCR_STAGE),
+    }
+    deltas = {"record_count": sign, "cache_hit_count": sign * int(bool(values.get("cache_hit")))}
+    for name in _LLM_USAGE_TOTALS:
+        deltas[name] = sign * (values.get(name) or 0)
+    return lookup, deltas
+
+
+def _llm_usage_values(record: LLMUsageRecord) -> dict[str, Any]:
+    return {name: getattr(record, name) for name in TRACKED_FIELDS[LLMUsageRecord]}
+
+
+def llm_usage_saved(record: LLMUsageRecord, *, created: bool) -> None:
+    current = _llm_usage_values(record)
+    if created:
+        lookup, deltas = _llm_usage_change(current, 1)
+        _bump(LLMUsageDailyRollup, lookup, **deltas)
+        return
+    previous = _pop_previous(record)
+    if previous is None or previous == current:
+        return
+    lookup, deltas = _llm_usage_change(previous, -1)
+    _bump(LLMUsageDailyRollup, lookup, **deltas)
+    lookup, deltas = _llm_usage_change(current, 1)
+    _bump(LLMUsageDailyRollup, lookup, **deltas)
+
+
+def llm_usage_deleted(record: LLMUsageRecord) -> None:
+    lookup, deltas = _llm_usage_change(_llm_usage_values(record), -1)
+    _bump(LLMUsageDailyRollup, lookup, **deltas)
+
+
+def record_llm_usage(stage: str, payload: dict[str, object]) -> None:
+    """Add one call's usage ``payload`` to the rollup of ``stage``.
+
+    Bookkeeping failures are logged rather than raised so they never fail
+    the OCR call that produced the payload.
+    """
+
+    values = LLMUsageRecord.defaults_from_payload(payload)
+    values.update(stage=stage, created_at=timezone.now())
+    lookup, deltas = _llm_usage_change(values, 1)
+    try:
+        with transaction.atomic():
+            _bump(LLMUsageDailyRollup, lookup, **deltas)
+    except DatabaseError:
+        logger.exception("Could not record %s LLM usage", stage)
+
+
+def rebuild() -> dict[str, int]:
+    """Recompute every rollup table and return the number of rows written per table.
+
+    Writes made while the rebuild runs may be lost; run it when the archive
+    is quiet.
+    """
+
+    with transaction.atomic():
+        MediaStatusRollup.objects.all().delete()
+        statuses = MediaStatusRollup.objects.bulk_create(
+            MediaStatusRollup(ocr_status=row["ocr_status"], media_count=row["total"])
+            for row in Media.objects.order_by().values("ocr_status").annotate(total=Count("pk"))
+        )
+        MediaDailyRollup.objects.all().delete()
+        days = MediaDailyRollup.objects.bulk_create(
+            MediaDailyRollup(day=row["day"], media_count=row["total"])
+            for row in Media.objects.order_by()
+            .annotate(day=TruncDate("created_on"))
+            .values("day")
+            .annotate(total=Count("pk"))
+            if row["day"] is not None
+        )
+        AccessionLocalityRollup.objects.all().delete()
+        localities = AccessionLocalityRollup.objects.bulk_create(
+            AccessionLocalityRollup(
+                locality_id=row["specimen_prefix"],
+                accession_count=row["accessions"],
+                specimen_count=row["specimens"],
+            )
+            for row in Accession.objects.order_by()
+            .values("specimen_prefix")
+            .annotate(accessions=Count("pk"), specimens=Count("specimen_no", distinct=True))
+        )
+        # Other stages keep no usage rows to recount from, so only scan OCR is rebuilt.
+        LLMUsageDailyRollup.objects.filter(stage=SCAN_OCR_STAGE).delete()
+        usage = LLMUsageDailyRollup.objects.bulk_create(
+            LLMUsageDailyRollup(
+                day=row["day"],
+                model_name=row["model_name"],
+                stage=SCAN_OCR_STAGE,
+                record_count=row["records"],
+                cache_hit_count=row["cache_hits"],
+                prompt_tokens=row["prompt"] or 0,
+                completion_tokens=row["completion"] or 0,
+                total_tokens=row["tokens"] or 0,
+                cost_usd=row["cost"] or Decimal("0"),
+                processing_seconds=row["seconds"] or Decimal("0"),
+            )
+            for row in LLMUsageRecord.objects.order_by()
+            .annotate(day=TruncDate("created_at"))
+            .values("day", "model_name")
+            .annotate(
+                records=Count("pk"),
+                cache_hits=Count("pk", filter=Q(cache_hit=True)),
+                prompt=Sum("prompt_tokens"),
+                completion=Sum("completion_tokens"),
+                tokens=Sum("total_tokens"),
+                cost=Sum("cost_usd"),
+                seconds=Sum("processing_seconds"),
+            )
+        )
+    return {
+        MediaStatusRollup._meta.label: len(statuses),
+        MediaDailyRollup._meta.label: len(days),
+        AccessionLocalityRollup._meta.label: len(localities),
+        LLMUsageDailyRollup._meta.label: len(usage),
+    }
+
+
+def media_status_counts() -> list[tuple[str, int]]:
+    """Return ``(ocr_status, count)`` pairs, largest first."""
+
+    return list(
+        MediaStatusRollup.objects.filter(media_count__gt=0)
+        .order_by("-media_count", "ocr_status")
+        .values_list("ocr_status", "media_count")
+    )
+
+
+def media_weekday_counts() -> list[int]:
+    """Return the number of media created on each weekday, Monday first."""
+
+    counts = [0] * 7
+    rows = (
+        MediaDailyRollup.objects.order_by()
+        .annotate(weekday=ExtractIsoWeekDay("day"))
+        .values("weekday")
+        .annotate(total=Sum("media_count"))
+    )
+    for row in rows:
+        counts[row["weekday"] - 1] = max(0, row["total"] or 0)
+    return counts
+
+
+def accession_locality_counts() -> list[tuple[str, int]]:
+    """Return ``(locality name, distinct specimens)`` pairs ordered by locality name."""
+
+    return list(
+        AccessionLocalityRollup.objects.filter(specimen_count__gt=0)
+        .order_by("locality__name")
+        .values_list("locality__name", "specimen_count")
+    )
+
+
+def llm_usage_models() -> list[str]:
+    return list(
+        LLMUsageDailyRollup.objects.order_by("model_name").values_list("model_name", flat=True).distinct()
+    )
+
+
+def llm_usage_by_day_and_stage(start: date, end: date, *, model_name: str | None = None) -> list[dict[str, Any]]:
+    """Return LLM usage summed per day and stage for days in ``[start, end)``."""
+
+    queryset = LLMUsageDailyRollup.objects.filter(day__gte=start, day__lt=end)
+    if model_name:
+        queryset = queryset.filter(model_name=model_name)
+    rows = (
+        queryset.values("day", "stage")
+        .annotate(
+            records=Sum("record_count"),
+            cache_hits=Sum("cache_hit_count"),
+            prompt=Sum("prompt_tokens"),
+            completion=Sum("completion_tokens"),
+            tokens=Sum("total_tokens"),
+            cost=Sum("cost_usd"),
+            seconds=Sum("processing_seconds"),
+        )
+        .order_by("day", "stage")
+    )
+    return [
+        {
+            "day": row["day"],
+            "stage": row["stage"],
+            "record_count": row["records"] or 0,
+            "cache_hit_count": row["cache_hits"] or 0,
+            "prompt_tokens": row["prompt"] or 0,
+            "completion_tokens": row["completion"] or 0,
+            "total_tokens": row["tokens"] or 0,
+            "cost_usd": row["cost"] or Decimal("0"),
+            "processing_seconds": row["seconds"] or Decimal("0"),
+        }
+        for row in rows
+    ]
+
+
+def cached_chart(name: str, data: Any, render: Callable[[], str]) -> str:
+    """Return the chart HTML for ``data``, rendering it only on a cache miss.
+
+    The cache key includes a digest of ``data``, so a cached chart is never
+    shown for counts that have since changed.
+    """
+
+    timeout = chart_cache_seconds()
+    if not timeout:
+        return render()
+    digest = hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+    key = f"report_chart:{name}:{digest[:32]}"
+    html = cache.get(key)
+    if html is None:
+        html = render()
+        cache.set(key, html, timeout)
+    return html
+
+
+__all__ = [
+    "LLM_STAGE_LABELS",
+    "SCAN_OCR_STAGE",
+    "TRACKED_FIELDS",
+    "accession_deleted",
+    "accession_deleting",
+    "accession_locality_counts",
+    "accession_saved",
+    "cached_chart",
+    "llm_usage_by_day_and_stage",
+    "llm_usage_deleted",
+    "llm_usage_models",
+    "llm_usage_saved",
+    "load_previous_state",
+    "media_bulk_created",
+    "media_deleted",
+    "media_saved",
+    "media_status_counts",
+    "media_weekday_counts",
+    "rebuild",
+    "record_llm_usage",
+]
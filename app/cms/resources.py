@@ -40,6 +40,7 @@ from .models import (
     Taxon,
     User,
 )
+from .taxonomy.resolver import taxon_match_scope
 
 logger = logging.getLogger(__name__)
 
@@ -482,7 +483,22 @@ class IdentificationResource(resources.ModelResource):
         attribute="identification_remarks",
     )
 
+    def import_data(self, dataset, *args, **kwargs):
+        # Keep the taxon matches resolved in before_import for every row.
+        with taxon_match_scope():
+            return super().import_data(dataset, *args, **kwargs)
+
     def before_import(self, dataset, **kwargs):
+        # Resolve every taxon name in the file with one query so that each
+        # saved identification links its controlled taxon from the scope.
+        taxon_names = [
+            value
+            for header in ("taxon_verbatim", "taxon")
+            if header in (dataset.headers or [])
+            for value in dataset[header]
+            if isinstance(value, str)
+        ]
+        Identification.match_controlled_taxa(taxon_names)
         # mimic a 'dynamic field' - i.e. append field which exists on
         # Mmodel, but not in dataset
         dataset.headers.append("accession_row")
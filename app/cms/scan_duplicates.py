@@ -0,0 +1,235 @@
+"""Detect duplicate and near-duplicate card scans.
+
+Every accepted scan is hashed twice: a SHA-256 of the file bytes finds exact
+re-uploads, and a 64-bit difference hash (dHash) of the downscaled greyscale
+image finds re-scans of the same card, which differ in bytes but not in
+appearance. Perceptual hashes are split into four 16-bit bands stored in
+:class:`cms.models.MediaHashBand`; two hashes within three bits of each
+other always share a band, so lookups only compare media sharing a band.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from PIL import Image, ImageOps
+
+from .models import Media, MediaHashBand
+
+logger = logging.getLogger(__name__)
+
+HASH_SIZE = 8
+BAND_COUNT = 4
+_BAND_WIDTH = HASH_SIZE * HASH_SIZE // 4 // BAND_COUNT
+DEFAULT_NEAR_DUPLICATE_DISTANCE = 3
+
+
+@dataclass(frozen=True)
+class ImageHashes:
+    content_sha256: str
+    perceptual_hash: str = ""
+
+
+@dataclass(frozen=True)
+class DuplicateMatch:
+    media: Media
+    distance: int
+    exact: bool = False
+
+
+def near_duplicate_distance() -> int:
+    try:
+        return max(0, int(getattr(settings, "MEDIA_NEAR_DUPLICATE_DISTANCE", DEFAULT_NEAR_DUPLICATE_DISTANCE)))
+    except (TypeError, ValueError):
+        return DEFAULT_NEAR_DUPLICATE_DISTANCE
+
+
+def content_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def difference_hash(path: Path) -> str:
+    """Return the 64-bit difference hash of the image at ``path`` as hex."""
+
+    with Image.open(path) as image:
+        image.draft("L", (HASH_SIZE * 16, HASH_SIZE * 16))
+        image = ImageOps.exif_transpose(image).convert("L")
+        image = image.resize((HASH_SIZE + 1, HASH_SIZE), Image.Resampling.LANCZOS)
+        pixels = list(image.getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for column in range(HASH_SIZE):
+            value = (value << 1) | (pixels[offset + column] > pixels[offset + column + 1])
+    return f"{value:0{HASH_SIZE * HASH_SIZE // 4}x}"
+
+
+def compute_image_hashes(path: Path) -> ImageHashes:
+    """Hash the file at ``path``; the perceptual hash is empty for unreadable images."""
+
+    path = Path(path)
+    sha256 = content_sha256(path)
+    try:
+        perceptual = difference_hash(path)
+    except OSError as exc:
+        logger.warning("Cannot compute perceptual hash for %s: %s", path, exc)
+        perceptual = ""
+    return ImageHashes(content_sha256=sha256, perceptual_hash=perceptual)
+
+
+def hamming_distance(first: str, second: str) -> int:
+    return (int(first, 16) ^ int(second, 16)).bit_count()
+
+
+def hash_bands(perceptual_hash: str) -> list[str]:
+    if not perceptual_hash:
+        return []
+    return [
+        perceptual_hash[index * _BAND_WIDTH : (index + 1) * _BAND_WIDTH]
+        for index in range(BAND_COUNT)
+    ]
+
+
+def index_hashes(entries: Iterable[tuple[int, str]]) -> int:
+    """Replace the stored bands for ``(media_id, perceptual_hash)`` pairs."""
+
+    entries = list(entries)
+    if not entries:
+        return 0
+    rows = [
+        MediaHashBand(media_id=media_id, band=band, value=value)
+        for media_id, perceptual_hash in entries
+        for band, value in enumerate(hash_bands(perceptual_hash))
+    ]
+    with transaction.atomic():
+        MediaHashBand.objects.filter(media_id__in=[media_id for media_id, _ in entries]).delete()
+        MediaHashBand.objects.bulk_create(rows)
+    return len(rows)
+
+
+def find_duplicate(hashes: ImageHashes, *, exclude_pk: int | None = None) -> DuplicateMatch | None:
+    """Return the earliest media with the same bytes, else the closest near-duplicate.
+
+    Near-duplicates must be within :func:`near_duplicate_distance` bits.
+    Media already flagged as duplicates are never returned, so every scan
+    links to the original it repeats.
+    """
+
+    candidates = Media.objects.exclude(ocr_status=Media.OCRStatus.DUPLICATE)
+    if exclude_pk is not None:
+        candidates = candidates.exclude(pk=exclude_pk)
+
+    exact = candidates.filter(content_sha256=hashes.content_sha256).order_by("pk").first()
+    if exact is not None:
+        return DuplicateMatch(media=exact, distance=0, exact=True)
+
+    bands = hash_bands(hashes.perceptual_hash)
+    if not bands:
+        return None
+    threshold = near_duplicate_distance()
+    shared_band = Q()
+    for band, value in enumerate(bands):
+        shared_band |= Q(band=band, value=value)
+    shortlist = MediaHashBand.objects.filter(shared_band).values("media_id")
+
+    best: tuple[int, int] | None = None
+    rows = candidates.filter(pk__in=shortlist).exclude(perceptual_hash="").values_list("pk", "perceptual_hash")
+    for pk, perceptual_hash in rows:
+        distance = hamming_distance(hashes.perceptual_hash, perceptual_hash)
+        if distance <= threshold and (best is None or (distance, pk) < best):
+            best = (distance, pk)
+    if best is None:
+        return None
+    return DuplicateMatch(media=candidates.get(pk=best[1]), distance=best[0])
+
+
+class BatchMatcher:
+    """Find duplicates for a batch of new scans without querying per scan.
+
+    Stored candidates for every hash in the batch are loaded up front; only
+    media that a scan turns out to nearly duplicate are fetched later. Scans
+    are then matched in order with :meth:`match`, and each scan passed to
+    :meth:`add` becomes a candidate for the scans after it, as if the batch
+    had been saved one scan at a time with :func:`find_duplicate`. Matches
+    against an earlier scan of the batch refer to its unsaved ``Media``.
+    """
+
+    def __init__(self, hashes: Iterable[ImageHashes]):
+        hashes = list(hashes)
+        candidates = Media.objects.exclude(ocr_status=Media.OCRStatus.DUPLICATE)
+        self._threshold = near_duplicate_distance()
+
+        self._exact: dict[str, Media] = {}
+        digests = {entry.content_sha256 for entry in hashes}
+        for media in candidates.filter(content_sha256__in=digests).order_by("-pk"):
+            self._exact[media.content_sha256] = media
+
+        values_by_band: dict[int, set[str]] = {}
+        for entry in hashes:
+            for band, value in enumerate(hash_bands(entry.perceptual_hash)):
+                values_by_band.setdefault(band, set()).add(value)
+        # Band -> value -> [(rank, media or pk, perceptual hash)]; stored media
+        # rank before batch scans so ties go to the earlier media.
+        self._bands: dict[tuple[int, str], list[tuple[tuple[int, int], Media | int, str]]] = {}
+        if values_by_band:
+            shared_band = Q()
+            for band, values in values_by_band.items():
+                shared_band |= Q(band=band, value__in=values)
+            shortlist = MediaHashBand.objects.filter(shared_band).values("media_id")
+            rows = candidates.filter(pk__in=shortlist).exclude(perceptual_hash="").values_list("pk", "perceptual_hash")
+            for pk, perceptual_hash in rows:
+                self._index((0, pk), pk, perceptual_hash)
+        self._added = 0
+        self._stored: dict[int, Media] = {}
+
+    def _index(self, rank: tuple[int, int], media: Media | int, perceptual_hash: str) -> None:
+        for band, value in enumerate(hash_bands(perceptual_hash)):
+            self._bands.setdefault((band, value), []).append((rank, media, perceptual_hash))
+
+    def match(self, hashes: ImageHashes) -> DuplicateMatch | None:
+        exact = self._exact.get(hashes.content_sha256)
+        if exact is not None:
+            return DuplicateMatch(media=exact, distance=0, exact=True)
+
+        best: tuple[int, tuple[int, int], Media | int] | None = None
+        for band, value in enumerate(hash_bands(hashes.perceptual_hash)):
+            for rank, media, perceptual_hash in self._bands.get((band, value), ()):
+                distance = hamming_distance(hashes.perceptual_hash, perceptual_hash)
+                if distance <= self._threshold and (best is None or (distance, rank) < best[:2]):
+                    best = (distance, rank, media)
+        if best is None:
+            return None
+        distance, _rank, media = best
+        if isinstance(media, int):
+            if media not in self._stored:
+                self._stored[media] = Media.objects.get(pk=media)
+            media = self._stored[media]
+        return DuplicateMatch(media=media, distance=distance)
+
+    def add(self, media: Media, hashes: ImageHashes) -> None:
+        """Make ``media`` a candidate for the scans matched after it."""
+
+        self._exact.setdefault(hashes.content_sha256, media)
+        self._added += 1
+        self._index((1, self._added), media, hashes.perceptual_hash)
+
+
+def apply_hashes(media: Media, hashes: ImageHashes, match: DuplicateMatch | None = None) -> None:
+    """Copy ``hashes`` and the duplicate link onto an unsaved ``media``."""
+
+    media.content_sha256 = hashes.content_sha256
+    media.perceptual_hash = hashes.perceptual_hash
+    if match is not None:
+        media.duplicate_of = match.media
+        media.duplicate_distance = match.distance
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from datetime import datetime, timedelta
 from typing import Iterable, Optional
 from zoneinfo import ZoneInfo
 
+from django.db.models import Q
 from django.utils import timezone
 
 
 NAIROBI_TZ = ZoneInfo("Africa/Nairobi")
+#: Longest a scanning task runs before it ends automatically.
+MAX_SCAN_DURATION = timedelta(hours=8)
 
 
 def nairobi_now() -> datetime:
@@ -38,7 +42,7 @@ def calculate_scan_auto_end(start_time: datetime) -> datetime:
     start_nairobi = to_nairobi(start_time)
     assert start_nairobi is not None
     end_of_day = start_nairobi.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
-    eight_hours_later = start_nairobi + timedelta(hours=8)
+    eight_hours_later = start_nairobi + MAX_SCAN_DURATION
     return min(eight_hours_later, end_of_day)
 
 
@@ -63,27 +67,64 @@ def auto_complete_scans(scans: Optional[Iterable["Scanning"]] = None) -> None:
             scan.save(update_fields=["end_time"])
 
 
-def find_scan_for_timestamp(timestamp: datetime):
-    """Return the scan covering ``timestamp`` based on Nairobi time."""
+class ScanningIndex:
+    """Resolve timestamps to scanning tasks from an in-memory interval index.
 
-    from .models import Scanning
+    Each task covers ``start_time`` to its ``end_time``, or to its automatic
+    end while it is still open. Lookups bisect the sorted start times and only
+    walk back as far as the longest task, so matching a batch of uploads costs
+    one query instead of one or more per file. A closed task wins over an open
+    one, and later starts win over earlier ones.
+    """
 
-    created = to_nairobi(timestamp)
-    assert created is not None
-    scan = (
-        Scanning.objects.filter(start_time__lte=created, end_time__gte=created)
-        .order_by("-start_time")
-        .first()
-    )
-    if scan:
-        return scan
-
-    open_scans = (
-        Scanning.objects.filter(start_time__lte=created, end_time__isnull=True)
-        .order_by("-start_time")
-    )
-    for candidate in open_scans:
-        if calculate_scan_auto_end(candidate.start_time) >= created:
-            return candidate
-    return None
+    def __init__(self, scans: Iterable["Scanning"]):
+        intervals = []
+        for scan in scans:
+            start = to_nairobi(scan.start_time)
+            if scan.end_time is not None:
+                intervals.append((start, to_nairobi(scan.end_time), True, scan))
+            else:
+                intervals.append((start, calculate_scan_auto_end(scan.start_time), False, scan))
+        intervals.sort(key=lambda interval: interval[0])
+        self._intervals = intervals
+        self._starts = [interval[0] for interval in intervals]
+        self._longest = max(
+            (end - start for start, end, _closed, _scan in intervals), default=timedelta(0)
+        )
+
+    @classmethod
+    def covering(cls, timestamps: Iterable[datetime]) -> "ScanningIndex":
+        """Load the tasks that may cover any of ``timestamps``."""
+
+        from .models import Scanning
+
+        timestamps = [to_nairobi(timestamp) for timestamp in timestamps]
+        if not timestamps:
+            return cls([])
+        earliest, latest = min(timestamps), max(timestamps)
+        scans = Scanning.objects.filter(start_time__lte=latest).filter(
+            Q(end_time__gte=earliest)
+            | Q(end_time__isnull=True, start_time__gte=earliest - MAX_SCAN_DURATION)
+        )
+        return cls(scans)
+
+    def find(self, timestamp: datetime):
+        created = to_nairobi(timestamp)
+        assert created is not None
+        open_match = None
+        for index in range(bisect_right(self._starts, created) - 1, -1, -1):
+            start, end, closed, scan = self._intervals[index]
+            if start < created - self._longest:
+                break
+            if end >= created:
+                if closed:
+                    return scan
+                if open_match is None:
+                    open_match = scan
+        return open_match
+
+
+def find_scan_for_timestamp(timestamp: datetime):
+    """Return the scan covering ``timestamp`` based on Nairobi time."""
 
+    return ScanningIndex.covering([timestamp]).find(timestamp)
@@ -30,6 +30,7 @@ from cms.models import (
     SpecimenListRowCandidate,
 )
 from cms.ocr_processing import _ensure_field_slip, normalize_field_slip_payload, normalize_fragments_value
+from cms.ocr_boxes.stores import SpecimenListPageTokenBoxStore
 from cms.tooth_markings.integration import apply_tooth_marking_correction
 
 
@@ -440,7 +441,8 @@ def _apply_tooth_marking_to_row_data(
         except Exception:
             image_path = None
 
-    correction = apply_tooth_marking_correction(image_path, element_text)
+    token_store = SpecimenListPageTokenBoxStore(row.page) if image_path else None
+    correction = apply_tooth_marking_correction(image_path, element_text, token_store=token_store)
 
     row_data["element_raw"] = correction.get("element_raw") or element_text
     row_data["element_corrected"] = correction.get("element_corrected") or element_text
@@ -586,7 +588,7 @@ def _sync_media_locations(*, source_names: list[str], target_name: str, reviewer
     if not names:
         return
 
-    media_items = list(Media.objects.filter(media_location__in=names))
+    media_items = list(Media.objects.filter(media_location__in=names).defer("ocr_data"))
     for media in media_items:
         if media.media_location.name == target_name:
             continue
@@ -1,19 +1,31 @@
-from django.db.models.signals import post_save, post_delete
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
 from django.dispatch import receiver
 
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from pathlib import Path
 
+from cms import accession_summaries, report_rollups
+from cms.merge.index import index_instance, remove_instance
 from cms.models import (
     Accession,
     AccessionNumberSeries,
     AccessionReference,
+    AccessionRow,
     DrawerRegister,
+    Element,
+    FieldSlip,
+    Identification,
+    LLMUsageRecord,
     Media,
+    NatureOfSpecimen,
+    Reference,
     SpecimenListPDF,
     SpecimenListPage,
+    Storage,
+    Taxon,
 )
+from cms.taxonomy.resolver import invalidate_taxon_cache
 
 User = get_user_model()
 
@@ -88,3 +100,132 @@ def delete_specimen_list_pdf_file_on_delete(sender, instance, **kwargs):
 def delete_specimen_list_page_file_on_delete(sender, instance, **kwargs):
     if instance.image_file:
         instance.image_file.delete(save=False)
+
+
+@receiver(post_save, sender=Taxon)
+@receiver(post_delete, sender=Taxon)
+def invalidate_taxon_resolver_cache(sender, instance, **kwargs):
+    invalidate_taxon_cache()
+
+
+MERGE_SEARCH_INDEXED_MODELS = (FieldSlip, Storage, Reference, Element)
+
+
+def refresh_merge_search_index_on_save(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    index_instance(instance, update_fields=update_fields)
+
+
+def remove_merge_search_index_on_delete(sender, instance, **kwargs):
+    remove_instance(instance)
+
+
+for _model in MERGE_SEARCH_INDEXED_MODELS:
+    post_save.connect(
+        refresh_merge_search_index_on_save,
+        sender=_model,
+        dispatch_uid=f"merge_search_index_save_{_model._meta.model_name}",
+    )
+    post_delete.connect(
+        remove_merge_search_index_on_delete,
+        sender=_model,
+        dispatch_uid=f"merge_search_index_delete_{_model._meta.model_name}",
+    )
+
+
+@receiver(pre_save, sender=Media)
+@receiver(pre_save, sender=Accession)
+@receiver(pre_save, sender=LLMUsageRecord)
+def load_report_rollup_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    report_rollups.load_previous_state(instance, update_fields=update_fields)
+
+
+@receiver(post_save, sender=Media)
+def update_media_report_rollups_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    report_rollups.media_saved(instance, created=created)
+
+
+@receiver(post_delete, sender=Media)
+def update_media_report_rollups_on_delete(sender, instance, **kwargs):
+    report_rollups.media_deleted(instance)
+
+
+@receiver(post_save, sender=Accession)
+def update_accession_report_rollups_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    report_rollups.accession_saved(instance, created=created)
+
+
+@receiver(pre_delete, sender=Accession)
+def mark_accession_report_rollups_on_delete(sender, instance, **kwargs):
+    report_rollups.accession_deleting(instance)
+
+
+@receiver(post_delete, sender=Accession)
+def update_accession_report_rollups_on_delete(sender, instance, **kwargs):
+    report_rollups.accession_deleted(instance)
+
+
+@receiver(post_save, sender=LLMUsageRecord)
+def update_llm_usage_rollup_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    report_rollups.llm_usage_saved(instance, created=created)
+
+
+@receiver(post_delete, sender=LLMUsageRecord)
+def update_llm_usage_rollup_on_delete(sender, instance, **kwargs):
+    report_rollups.llm_usage_deleted(instance)
+
+
+@receiver(pre_save, sender=AccessionRow)
+@receiver(pre_save, sender=Identification)
+@receiver(pre_save, sender=NatureOfSpecimen)
+@receiver(pre_save, sender=Taxon)
+def load_accession_summary_state(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    accession_summaries.load_previous_state(instance, update_fields=update_fields)
+
+
+@receiver(post_save, sender=AccessionRow)
+@receiver(post_save, sender=Identification)
+@receiver(post_save, sender=NatureOfSpecimen)
+@receiver(post_save, sender=Taxon)
+def refresh_accession_summaries_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    accession_summaries.record_saved(instance, update_fields=update_fields)
+
+
+@receiver(pre_delete, sender=Accession)
+def mark_accession_summary_on_delete(sender, instance, **kwargs):
+    accession_summaries.accession_deleting(instance)
+
+
+@receiver(post_delete, sender=Accession)
+def clear_accession_summary_on_delete(sender, instance, **kwargs):
+    accession_summaries.accession_deleted(instance)
+
+
+@receiver(pre_delete, sender=AccessionRow)
+def mark_accession_row_summary_on_delete(sender, instance, **kwargs):
+    accession_summaries.row_deleting(instance)
+
+
+@receiver(post_delete, sender=AccessionRow)
+@receiver(post_delete, sender=Identification)
+@receiver(post_delete, sender=NatureOfSpecimen)
+def refresh_accession_summaries_on_delete(sender, instance, **kwargs):
+    accession_summaries.record_deleted(instance)
+
+
+@receiver(post_delete, sender=Taxon)
+def refresh_accession_summaries_on_taxon_delete(sender, instance, **kwargs):
+    accession_summaries.taxon_deleted(instance)
@@ -1,18 +1,29 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from decimal import Decimal, InvalidOperation
 from pathlib import Path
+from typing import Any, Iterator
 import logging
 
-from django.db import transaction
+from crum import get_current_user, impersonate
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Q
 
-from cms.models import SpecimenListPage
+from cms import llm_batch
+from cms.models import LLMBatchJob, SpecimenListPage, SpecimenListPageOCR
 from cms.ocr_processing import (
     classify_specimen_list_page,
+    prepare_image_url,
+    replay_pending_scans_for_batch,
     run_specimen_list_raw_ocr,
     run_specimen_list_row_extraction,
 )
+from cms.work_claims import WorkClaims
 
 
 logger = logging.getLogger(__name__)
@@ -34,6 +45,28 @@ class OCRQueueSummary:
     errors: list[str]
 
 
+STAGE_CLASSIFY = "classify"
+STAGE_RAW = "raw"
+STAGE_ROWS = "rows"
+PIPELINE_STAGES = (STAGE_CLASSIFY, STAGE_RAW, STAGE_ROWS)
+
+
+@dataclass
+class SpecimenListPipelineSummary:
+    stages: dict[str, OCRQueueSummary]
+    pages: int = 0
+
+    @property
+    def errors(self) -> list[str]:
+        return [error for stage in self.stages.values() for error in stage.errors]
+
+
+@dataclass
+class DuplicateClusterRunSummary:
+    clusters: dict[str, int]
+    errors: list[str]
+
+
 def _coerce_confidence(value: object) -> Decimal | None:
     if value in (None, ""):
         return None
@@ -76,154 +109,523 @@ def _set_pipeline_status(page: SpecimenListPage, status: str) -> None:
     page.pipeline_status = status
 
 
-def classify_pending_specimen_pages(
-    *,
-    limit: int | None = None,
-    ids: list[int] | None = None,
-    force: bool = False,
-) -> ClassificationRunSummary:
+class _PageStageFailure(Exception):
+    """A pipeline stage failed for a reason already logged and described."""
+
+
+@dataclass
+class _PipelinePage:
+    """A specimen list page travelling through the pipeline stages.
+
+    The page is loaded once and its image is prepared on first use for each
+    upload profile; both are shared by every stage the page passes through.
+    """
+
+    page: SpecimenListPage
+    ocr_entry: SpecimenListPageOCR | None = None
+    _image_urls: dict[str, str] = field(default_factory=dict)
+
+    def image_url(self, profile: str) -> str:
+        if profile not in self._image_urls:
+            self._image_urls[profile] = prepare_image_url(Path(self.page.image_file.path), profile)
+        return self._image_urls[profile]
+
+    def release(self) -> None:
+        self._image_urls.clear()
+        self.ocr_entry = None
+
+
+# Pages claimed per query during a batch replay, which mostly reads the response cache.
+_BATCH_REPLAY_CLAIM_SIZE = 50
+
+
+def _default_pipeline_workers() -> int:
+    try:
+        return max(1, int(getattr(settings, "SPECIMEN_LIST_PIPELINE_WORKERS", 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+_RAW_READY_STATUSES = (
+    SpecimenListPage.PipelineStatus.PENDING,
+    SpecimenListPage.PipelineStatus.CLASSIFIED,
+)
+_ROWS_READY_STATUSES = (
+    SpecimenListPage.PipelineStatus.CLASSIFIED,
+    SpecimenListPage.PipelineStatus.OCR_DONE,
+)
+
+
+def _stage_filter(stage: str, force: bool) -> Q:
+    if stage == STAGE_CLASSIFY:
+        if force:
+            return Q()
+        return Q(classification_status=SpecimenListPage.ClassificationStatus.PENDING)
+    if stage == STAGE_RAW:
+        if force:
+            return Q()
+        return Q(
+            classification_status=SpecimenListPage.ClassificationStatus.CLASSIFIED,
+            pipeline_status__in=_RAW_READY_STATUSES,
+        )
+    details = Q(page_type=SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS)
     if force:
-        queryset = SpecimenListPage.objects.all().order_by("created_on", "id")
-    else:
-        queryset = SpecimenListPage.objects.filter(
-            classification_status=SpecimenListPage.ClassificationStatus.PENDING
-        ).order_by("created_on", "id")
+        return details
+    return details & Q(pipeline_status__in=_ROWS_READY_STATUSES)
 
-    if ids:
-        queryset = queryset.filter(id__in=ids)
 
-    if limit:
-        queryset = queryset[:limit]
+def _stage_accepts(stage: str, page: SpecimenListPage, force: bool) -> bool:
+    if stage == STAGE_CLASSIFY:
+        return force or page.classification_status == SpecimenListPage.ClassificationStatus.PENDING
+    if stage == STAGE_RAW:
+        return force or (
+            page.classification_status == SpecimenListPage.ClassificationStatus.CLASSIFIED
+            and page.pipeline_status in _RAW_READY_STATUSES
+        )
+    if page.page_type != SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS:
+        return False
+    return force or page.pipeline_status in _ROWS_READY_STATUSES
 
-    page_ids = list(queryset.values_list("id", flat=True))
-    successes = 0
-    failures = 0
-    total = 0
-    errors: list[str] = []
 
-    for page_id in page_ids:
-        total += 1
-        with transaction.atomic():
-            page = SpecimenListPage.objects.select_for_update().filter(id=page_id).first()
-            if page is None:
-                continue
-            if not force and page.classification_status != SpecimenListPage.ClassificationStatus.PENDING:
-                continue
-            if not page.image_file:
-                failures += 1
-                page.classification_status = SpecimenListPage.ClassificationStatus.FAILED
-                page.classification_notes = "No image file available for classification."
-                page.save(update_fields=["classification_status", "classification_notes"])
-                errors.append(f"page {page.id}: missing image file")
-                logger.warning("Specimen list page %s missing image file", page.id)
-                continue
+def _advance_pipeline_status(page: SpecimenListPage, status: str) -> None:
+    """Move ``page`` to ``status`` unless a reviewer has since taken it over.
+
+    Only the current ``pipeline_status`` is re-read, under a row lock, so the
+    already loaded page does not need to be fetched again.
+    """
+
+    with transaction.atomic():
+        current = (
+            SpecimenListPage.objects.select_for_update()
+            .filter(pk=page.pk)
+            .values_list("pipeline_status", flat=True)
+            .first()
+        )
+        if current is None:
+            return
+        page.pipeline_status = current
+        _set_pipeline_status(page, status)
+        if page.pipeline_status != current:
+            page.save(update_fields=["pipeline_status"])
+
+
+def _fail_classification(page: SpecimenListPage, notes: str, error: str) -> _PageStageFailure:
+    page.classification_status = SpecimenListPage.ClassificationStatus.FAILED
+    page.classification_notes = notes
+    page.save(update_fields=["classification_status", "classification_notes"])
+    return _PageStageFailure(error)
+
+
+def _classify_stage(item: _PipelinePage, force: bool) -> None:
+    page = item.page
+    if not page.image_file:
+        logger.warning("Specimen list page %s missing image file", page.id)
+        raise _fail_classification(page, "No image file available for classification.", "missing image file")
+
+    image_path = Path(page.image_file.path)
+    if not image_path.exists():
+        logger.warning("Specimen list page %s image path missing: %s", page.id, image_path)
+        raise _fail_classification(page, "Image file not found on disk.", "image file missing")
+
+    try:
+        result = classify_specimen_list_page(image_path, image_url=item.image_url("classify"))
+        normalized_type = _normalize_page_type(result.get("page_type"))
+        if normalized_type is None:
+            raise ValueError("Unrecognized page_type from classification")
+    except Exception as exc:
+        logger.exception("Classification failed for specimen list page %s", page.id)
+        raise _fail_classification(page, f"Attempt failed: {exc}", "classification failed") from exc
+
+    page.page_type = normalized_type
+    page.classification_status = SpecimenListPage.ClassificationStatus.CLASSIFIED
+    page.classification_confidence = _coerce_confidence(result.get("confidence"))
+    page.classification_notes = str(result.get("notes") or "").strip()
+    page.pipeline_status = SpecimenListPage.PipelineStatus.CLASSIFIED
+    page.save(
+        update_fields=[
+            "page_type",
+            "classification_status",
+            "classification_confidence",
+            "classification_notes",
+            "pipeline_status",
+        ]
+    )
+    logger.info("Classified specimen list page %s as %s", page.id, normalized_type)
+
+
+def _raw_ocr_stage(item: _PipelinePage, force: bool) -> None:
+    page = item.page
+    if not page.image_file:
+        logger.warning("Specimen list page %s missing image file", page.id)
+        raise _PageStageFailure("missing image file")
+    try:
+        item.ocr_entry = run_specimen_list_raw_ocr(
+            page, force=force, image_url=item.image_url("ocr")
+        )
+        _advance_pipeline_status(page, SpecimenListPage.PipelineStatus.OCR_DONE)
+    except Exception as exc:
+        logger.exception("Raw OCR failed for specimen list page %s: %s", page.id, exc)
+        raise _PageStageFailure("raw OCR failed") from exc
+    logger.info("Completed raw OCR for specimen list page %s", page.id)
+
+
+def _row_extraction_stage(item: _PipelinePage, force: bool) -> None:
+    page = item.page
+    if not page.image_file:
+        logger.warning("Specimen list page %s missing image file", page.id)
+        raise _PageStageFailure("missing image file")
+    if item.ocr_entry is None and not page.ocr_entries.exists():
+        logger.warning("Specimen list page %s missing raw OCR entry", page.id)
+        raise _PageStageFailure("missing raw OCR")
+    try:
+        created_rows = run_specimen_list_row_extraction(
+            page,
+            force=force,
+            image_url=item.image_url("ocr"),
+            ocr_entry=item.ocr_entry,
+        )
+        _advance_pipeline_status(page, SpecimenListPage.PipelineStatus.EXTRACTED)
+    except Exception as exc:
+        logger.exception("Row extraction failed for specimen list page %s: %s", page.id, exc)
+        raise _PageStageFailure("row extraction failed") from exc
+    logger.info(
+        "Extracted %s row candidates for specimen list page %s",
+        len(created_rows),
+        page.id,
+    )
+
+
+_STAGE_RUNNERS = {
+    STAGE_CLASSIFY: _classify_stage,
+    STAGE_RAW: _raw_ocr_stage,
+    STAGE_ROWS: _row_extraction_stage,
+}
 
-            image_path = Path(page.image_file.path)
-            if not image_path.exists():
-                failures += 1
-                page.classification_status = SpecimenListPage.ClassificationStatus.FAILED
-                page.classification_notes = "Image file not found on disk."
-                page.save(update_fields=["classification_status", "classification_notes"])
-                errors.append(f"page {page.id}: image file missing")
-                logger.warning("Specimen list page %s image path missing: %s", page.id, image_path)
-                continue
 
+def _run_stage_in_worker(stage: str, item: _PipelinePage, force: bool, user: Any) -> None:
+    """Run one stage on a pool thread as ``user``, closing its connection afterwards."""
+
+    try:
+        with impersonate(user):
+            _STAGE_RUNNERS[stage](item, force)
+    finally:
+        connections.close_all()
+
+
+def _record_stage_outcome(
+    summary: SpecimenListPipelineSummary,
+    stage: str,
+    item: _PipelinePage,
+    exc: BaseException | None,
+) -> bool:
+    """Update ``summary`` for a finished stage and return ``True`` to continue the page."""
+
+    stage_summary = summary.stages[stage]
+    if exc is None:
+        stage_summary.successes += 1
+        return True
+    stage_summary.failures += 1
+    if isinstance(exc, _PageStageFailure):
+        stage_summary.errors.append(f"page {item.page.id}: {exc}")
+    else:
+        stage_summary.errors.append(f"page {item.page.id}: {stage} stage failed")
+        logger.error(
+            "Specimen list %s stage failed for page %s", stage, item.page.id, exc_info=exc
+        )
+    return False
+
+
+def _next_stage(stages: tuple[str, ...], stage: str, item: _PipelinePage, force: bool) -> str | None:
+    for candidate in stages[stages.index(stage) + 1 :]:
+        if _stage_accepts(candidate, item.page, force):
+            return candidate
+    return None
+
+
+def _run_pipeline_sequentially(
+    entries: Iterator[tuple[str, _PipelinePage]],
+    claims: WorkClaims,
+    stages: tuple[str, ...],
+    force: bool,
+    summary: SpecimenListPipelineSummary,
+) -> None:
+    for stage, item in entries:
+        summary.pages += 1
+        while stage is not None:
+            summary.stages[stage].total += 1
             try:
-                result = classify_specimen_list_page(image_path)
-                normalized_type = _normalize_page_type(result.get("page_type"))
-                if normalized_type is None:
-                    raise ValueError("Unrecognized page_type from classification")
-                page.page_type = normalized_type
-                page.classification_status = SpecimenListPage.ClassificationStatus.CLASSIFIED
-                page.classification_confidence = _coerce_confidence(result.get("confidence"))
-                page.classification_notes = str(result.get("notes") or "").strip()
-                page.pipeline_status = SpecimenListPage.PipelineStatus.CLASSIFIED
-                page.save(
-                    update_fields=[
-                        "page_type",
-                        "classification_status",
-                        "classification_confidence",
-                        "classification_notes",
-                        "pipeline_status",
-                    ]
-                )
-                successes += 1
-                logger.info("Classified specimen list page %s as %s", page.id, normalized_type)
+                _STAGE_RUNNERS[stage](item, force)
             except Exception as exc:
-                failures += 1
-                page.classification_status = SpecimenListPage.ClassificationStatus.FAILED
-                page.classification_notes = f"Attempt failed: {exc}"
-                page.save(update_fields=["classification_status", "classification_notes"])
-                errors.append(f"page {page.id}: classification failed")
-                logger.exception("Classification failed for specimen list page %s", page.id)
+                _record_stage_outcome(summary, stage, item, exc)
+                break
+            _record_stage_outcome(summary, stage, item, None)
+            stage = _next_stage(stages, stage, item, force)
+        item.release()
+        claims.release([item.page.pk])
+
+
+def _run_pipeline_concurrently(
+    entries: Iterator[tuple[str, _PipelinePage]],
+    claims: WorkClaims,
+    stages: tuple[str, ...],
+    force: bool,
+    summary: SpecimenListPipelineSummary,
+    workers: int,
+) -> None:
+    """Stream pages through one bounded thread pool per stage.
+
+    Each stage runs at most ``workers`` pages at a time, and a page is queued
+    for its next stage as soon as the previous one finishes. A stage only
+    starts new pages while the queue in front of the next stage is shorter
+    than ``workers``, which bounds how many encoded images are held in memory.
+    New pages are drawn from ``entries`` only while fewer than ``workers``
+    pages are waiting, so the run claims no more pages than it can work on.
+    Bookkeeping happens on the calling thread.
+    """
+
+    user = get_current_user()
+    queues: dict[str, deque[_PipelinePage]] = {stage: deque() for stage in stages}
+    running = {stage: 0 for stage in stages}
+    in_flight: dict[Future, tuple[str, _PipelinePage]] = {}
+
+    with ExitStack() as stack:
+        executors = {
+            stage: stack.enter_context(
+                ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"specimen-list-{stage}")
+            )
+            for stage in stages
+        }
+
+        def _fill() -> None:
+            while sum(len(queue) for queue in queues.values()) < workers:
+                entry = next(entries, None)
+                if entry is None:
+                    break
+                summary.pages += 1
+                queues[entry[0]].append(entry[1])
+            # Drain downstream stages first so pages leave the pipeline early.
+            for index in range(len(stages) - 1, -1, -1):
+                stage = stages[index]
+                downstream = queues[stages[index + 1]] if index + 1 < len(stages) else None
+                while queues[stage] and running[stage] < workers:
+                    if downstream is not None and len(downstream) >= workers:
+                        break
+                    item = queues[stage].popleft()
+                    summary.stages[stage].total += 1
+                    running[stage] += 1
+                    future = executors[stage].submit(_run_stage_in_worker, stage, item, force, user)
+                    in_flight[future] = (stage, item)
+
+        _fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, item = in_flight.pop(future)
+                running[stage] -= 1
+                next_stage = None
+                if _record_stage_outcome(summary, stage, item, future.exception()):
+                    next_stage = _next_stage(stages, stage, item, force)
+                if next_stage is None:
+                    item.release()
+                    claims.release([item.page.pk])
+                else:
+                    queues[next_stage].append(item)
+            _fill()
+
+
+def _pipeline_entries(
+    claims: WorkClaims,
+    stages: tuple[str, ...],
+    *,
+    limit: int | None,
+    ids: list[int] | None,
+    force: bool,
+    batch_size: int = 1,
+) -> Iterator[tuple[str, _PipelinePage]]:
+    """Claim the pages ready for any of ``stages`` and yield each with the first stage it enters.
+
+    Pages are claimed ``batch_size`` at a time as the pipeline takes them, so
+    runs on other nodes share the rest of the queue. The queue is walked in
+    ``(created_on, id)`` order and each page is visited at most once per run,
+    even when a failed page is released while still ready for its stage.
+    """
+
+    ready = Q(pk__in=[])
+    for stage in stages:
+        ready |= _stage_filter(stage, force)
+    queryset = SpecimenListPage.objects.filter(ready).order_by("created_on", "id")
+    if ids:
+        queryset = queryset.filter(id__in=ids)
 
-    return ClassificationRunSummary(successes=successes, failures=failures, total=total, errors=errors)
+    after = Q()
+    yielded = 0
+    while not limit or yielded < limit:
+        size = batch_size if not limit else min(batch_size, limit - yielded)
+        pks = claims.claim(queryset.filter(after), max(1, size))
+        if not pks:
+            return
+        pages = SpecimenListPage.objects.select_related("pdf", "assigned_reviewer").in_bulk(pks)
+        for pk in pks:
+            page = pages.get(pk)
+            if page is None:
+                continue
+            after = Q(created_on__gt=page.created_on) | Q(created_on=page.created_on, id__gt=page.id)
+            stage = next((stage for stage in stages if _stage_accepts(stage, page, force)), None)
+            if stage is None:
+                # The page changed between claiming and loading; hand it back.
+                claims.release([pk])
+                continue
+            yielded += 1
+            yield stage, _PipelinePage(page)
 
 
-def run_specimen_list_ocr_queue(
+def run_specimen_list_pipeline(
     *,
+    stages: tuple[str, ...] | list[str] = PIPELINE_STAGES,
     limit: int | None = None,
     ids: list[int] | None = None,
     force: bool = False,
-) -> OCRQueueSummary:
-    if force:
-        queryset = SpecimenListPage.objects.all().order_by("created_on", "id")
+    workers: int | None = None,
+) -> SpecimenListPipelineSummary:
+    """Stream specimen list pages through classification, raw OCR and row extraction.
+
+    Every page enters at the first of ``stages`` it is ready for and moves on
+    to the next stage as soon as the previous one succeeds. Pages are claimed
+    in small batches as the pipeline takes them (see :mod:`cms.work_claims`),
+    so runs on several nodes never process the same page at once, and each
+    page's image is encoded once for all stages. ``workers``
+    bounds how many pages each stage processes concurrently and defaults to
+    ``settings.SPECIMEN_LIST_PIPELINE_WORKERS``; with one worker, pages run
+    through all stages one after another on the calling thread.
+    """
+
+    stages = tuple(stage for stage in PIPELINE_STAGES if stage in stages)
+    if workers is None:
+        workers = _default_pipeline_workers()
+    workers = max(1, int(workers))
+    summary = SpecimenListPipelineSummary(
+        stages={stage: OCRQueueSummary(successes=0, failures=0, total=0, errors=[]) for stage in stages}
+    )
+    if not stages:
+        return summary
+
+    with WorkClaims(SpecimenListPage) as claims:
+        entries = _pipeline_entries(claims, stages, limit=limit, ids=ids, force=force, batch_size=workers)
+        if workers > 1:
+            _run_pipeline_concurrently(entries, claims, stages, force, summary, workers)
+        else:
+            _run_pipeline_sequentially(entries, claims, stages, force, summary)
+    return summary
+
+
+def replay_specimen_list_pipeline_for_batch(
+    *,
+    stages: tuple[str, ...] | list[str] = PIPELINE_STAGES,
+    limit: int | None = None,
+    ids: list[int] | None = None,
+) -> tuple[SpecimenListPipelineSummary, list[llm_batch.DeferredRequest]]:
+    """Replay the pipeline with uncached chat completions deferred to a batch.
+
+    Each page runs through its stages until one needs a completion that is
+    not in the LLM response cache; the page stays at that stage and its
+    request is returned for the next batch. Stages answered from the cache
+    are counted in the summary as usual.
+    """
+
+    stages = tuple(stage for stage in PIPELINE_STAGES if stage in stages)
+    summary = SpecimenListPipelineSummary(
+        stages={stage: OCRQueueSummary(successes=0, failures=0, total=0, errors=[]) for stage in stages}
+    )
+    deferred: list[llm_batch.DeferredRequest] = []
+    if not stages:
+        return summary, deferred
+
+    with WorkClaims(SpecimenListPage) as claims:
+        entries = _pipeline_entries(
+            claims, stages, limit=limit, ids=ids, force=False, batch_size=_BATCH_REPLAY_CLAIM_SIZE
+        )
+        for stage, item in entries:
+            summary.pages += 1
+            while stage is not None:
+                try:
+                    with llm_batch.deferring():
+                        _STAGE_RUNNERS[stage](item, False)
+                except llm_batch.BatchRequestDeferred as deferral:
+                    deferred.append(deferral.request)
+                    break
+                except Exception as exc:
+                    summary.stages[stage].total += 1
+                    _record_stage_outcome(summary, stage, item, exc)
+                    break
+                summary.stages[stage].total += 1
+                _record_stage_outcome(summary, stage, item, None)
+                stage = _next_stage(stages, stage, item, False)
+            item.release()
+            claims.release([item.page.pk])
+    return summary, deferred
+
+
+def run_ocr_batch_cycle(
+    target: str,
+    *,
+    limit: int | None = None,
+    stages: tuple[str, ...] | list[str] = PIPELINE_STAGES,
+) -> llm_batch.BatchCycleSummary:
+    """Advance the Batch API backlog for ``target`` by one cycle.
+
+    Finished batches are polled and cached, the queue is replayed so cached
+    answers are persisted, and the requests still missing are submitted as a
+    new batch. Run it periodically until nothing is left to submit.
+    """
+
+    summary = llm_batch.poll_jobs(target)
+    if target == LLMBatchJob.Target.SCANS:
+        (successes, failures, _total, errors, *_rest), deferred = replay_pending_scans_for_batch(limit)
+        summary.completed_items = successes
+        summary.failed_items = failures
+        summary.errors.extend(errors)
     else:
-        queryset = SpecimenListPage.objects.filter(
-            classification_status=SpecimenListPage.ClassificationStatus.CLASSIFIED,
-            pipeline_status__in=[
-                SpecimenListPage.PipelineStatus.PENDING,
-                SpecimenListPage.PipelineStatus.CLASSIFIED,
-            ],
-        ).order_by("created_on", "id")
+        pipeline, deferred = replay_specimen_list_pipeline_for_batch(stages=stages, limit=limit)
+        summary.completed_items = sum(stage.successes for stage in pipeline.stages.values())
+        summary.failed_items = sum(stage.failures for stage in pipeline.stages.values())
+        summary.errors.extend(pipeline.errors)
+    llm_batch.mark_replayed(target)
 
-    if ids:
-        queryset = queryset.filter(id__in=ids)
+    jobs = llm_batch.submit_requests(target, deferred)
+    summary.submitted_requests = sum(job.request_count for job in jobs)
+    summary.submitted_batches = [job.batch_id for job in jobs]
+    summary.open_batches += len(jobs)
+    return summary
 
-    if limit:
-        queryset = queryset[:limit]
 
-    page_ids = list(queryset.values_list("id", flat=True))
-    successes = 0
-    failures = 0
-    total = 0
-    errors: list[str] = []
+def classify_pending_specimen_pages(
+    *,
+    limit: int | None = None,
+    ids: list[int] | None = None,
+    force: bool = False,
+    workers: int | None = None,
+) -> ClassificationRunSummary:
+    summary = run_specimen_list_pipeline(
+        stages=(STAGE_CLASSIFY,), limit=limit, ids=ids, force=force, workers=workers
+    ).stages[STAGE_CLASSIFY]
+    return ClassificationRunSummary(
+        successes=summary.successes,
+        failures=summary.failures,
+        total=summary.total,
+        errors=summary.errors,
+    )
 
-    for page_id in page_ids:
-        total += 1
-        page = (
-            SpecimenListPage.objects.select_related("pdf", "assigned_reviewer")
-            .filter(id=page_id)
-            .first()
-        )
-        if page is None:
-            continue
-        if not force and page.pipeline_status not in {
-            SpecimenListPage.PipelineStatus.PENDING,
-            SpecimenListPage.PipelineStatus.CLASSIFIED,
-        }:
-            continue
-        if not page.image_file:
-            failures += 1
-            errors.append(f"page {page.id}: missing image file")
-            logger.warning("Specimen list page %s missing image file", page.id)
-            continue
-        try:
-            run_specimen_list_raw_ocr(page, force=force)
-            with transaction.atomic():
-                page = SpecimenListPage.objects.select_for_update().filter(id=page_id).first()
-                if page is None:
-                    continue
-                _set_pipeline_status(page, SpecimenListPage.PipelineStatus.OCR_DONE)
-                page.save(update_fields=["pipeline_status"])
-            successes += 1
-            logger.info("Completed raw OCR for specimen list page %s", page_id)
-        except Exception as exc:
-            failures += 1
-            errors.append(f"page {page_id}: raw OCR failed")
-            logger.exception("Raw OCR failed for specimen list page %s: %s", page_id, exc)
 
-    return OCRQueueSummary(successes=successes, failures=failures, total=total, errors=errors)
+def run_specimen_list_ocr_queue(
+    *,
+    limit: int | None = None,
+    ids: list[int] | None = None,
+    force: bool = False,
+    workers: int | None = None,
+) -> OCRQueueSummary:
+    return run_specimen_list_pipeline(
+        stages=(STAGE_RAW,), limit=limit, ids=ids, force=force, workers=workers
+    ).stages[STAGE_RAW]
 
 
 def run_specimen_list_row_extraction_queue(
@@ -231,75 +633,42 @@ def run_specimen_list_row_extraction_queue(
     limit: int | None = None,
     ids: list[int] | None = None,
     force: bool = False,
+    workers: int | None = None,
 ) -> OCRQueueSummary:
-    if force:
-        queryset = SpecimenListPage.objects.filter(
-            page_type=SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS
-        ).order_by("created_on", "id")
-    else:
-        queryset = SpecimenListPage.objects.filter(
-            page_type=SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS,
-            pipeline_status__in=[
-                SpecimenListPage.PipelineStatus.CLASSIFIED,
-                SpecimenListPage.PipelineStatus.OCR_DONE,
-            ],
-        ).order_by("created_on", "id")
+    return run_specimen_list_pipeline(
+        stages=(STAGE_ROWS,), limit=limit, ids=ids, force=force, workers=workers
+    ).stages[STAGE_ROWS]
 
-    if ids:
-        queryset = queryset.filter(id__in=ids)
 
-    if limit:
-        queryset = queryset[:limit]
-
-    page_ids = list(queryset.values_list("id", flat=True))
-    successes = 0
-    failures = 0
-    total = 0
+def run_duplicate_cluster_job(
+    *,
+    models: list | None = None,
+    fields: list[str] | None = None,
+    threshold: float | None = None,
+    workers: int = -1,
+) -> DuplicateClusterRunSummary:
+    """Recompute the stored near-duplicate clusters for merge-enabled models."""
+
+    from cms.merge.clusters import (
+        DEFAULT_CLUSTER_THRESHOLD,
+        merge_enabled_models,
+        refresh_duplicate_clusters,
+    )
+    from cms.merge.index import model_label
+
+    if threshold is None:
+        threshold = DEFAULT_CLUSTER_THRESHOLD
+    clusters: dict[str, int] = {}
     errors: list[str] = []
-
-    for page_id in page_ids:
-        total += 1
-        page = (
-            SpecimenListPage.objects.select_related("pdf", "assigned_reviewer")
-            .filter(id=page_id)
-            .first()
-        )
-        if page is None:
-            continue
-        if page.page_type != SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS:
-            continue
-        if not force and page.pipeline_status not in {
-            SpecimenListPage.PipelineStatus.CLASSIFIED,
-            SpecimenListPage.PipelineStatus.OCR_DONE,
-        }:
-            continue
-        if not page.image_file:
-            failures += 1
-            errors.append(f"page {page.id}: missing image file")
-            logger.warning("Specimen list page %s missing image file", page.id)
-            continue
-        if not page.ocr_entries.exists():
-            failures += 1
-            errors.append(f"page {page.id}: missing raw OCR")
-            logger.warning("Specimen list page %s missing raw OCR entry", page.id)
-            continue
+    for model in models or merge_enabled_models():
+        label = model_label(model)
         try:
-            created_rows = run_specimen_list_row_extraction(page, force=force)
-            with transaction.atomic():
-                page = SpecimenListPage.objects.select_for_update().filter(id=page_id).first()
-                if page is None:
-                    continue
-                _set_pipeline_status(page, SpecimenListPage.PipelineStatus.EXTRACTED)
-                page.save(update_fields=["pipeline_status"])
-            successes += 1
-            logger.info(
-                "Extracted %s row candidates for specimen list page %s",
-                len(created_rows),
-                page_id,
+            clusters[label] = refresh_duplicate_clusters(
+                model, fields=fields, threshold=threshold, workers=workers
             )
+            logger.info("Stored %s duplicate clusters for %s", clusters[label], label)
         except Exception as exc:
-            failures += 1
-            errors.append(f"page {page_id}: row extraction failed")
-            logger.exception("Row extraction failed for specimen list page %s: %s", page_id, exc)
+            errors.append(f"{label}: duplicate clustering failed")
+            logger.exception("Duplicate clustering failed for %s: %s", label, exc)
 
-    return OCRQueueSummary(successes=successes, failures=failures, total=total, errors=errors)
+    return DuplicateClusterRunSummary(clusters=clusters, errors=errors)
@@ -0,0 +1,108 @@
+"""Resolution of free-text taxon names to controlled Taxon records.
+
+Identifications link to a controlled taxon when exactly one accepted, active
+taxon carries the same name (case-insensitively). Matches are looked up on
+the indexed ``Taxon.taxon_name_normalized`` column, so bulk writers resolve
+many names with one query per :data:`RESOLVE_BATCH_SIZE` names.
+
+Outside :func:`taxon_match_scope` every lookup queries the database, so a
+taxon created in another process is linked straight away. Bulk writers that
+save many identifications open a scope: matches, including misses, are then
+kept for the rest of the scope. Taxon saves, deletes and taxonomy syncs call
+:func:`invalidate_taxon_cache`, which empties the open scope.
+"""
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from ..models import Taxon, TaxonStatus
+
+#: Maximum number of names sent in a single ``IN`` lookup.
+RESOLVE_BATCH_SIZE = 900
+
+_scope_matches: ContextVar[Optional[Dict[str, Optional[Taxon]]]] = ContextVar(
+    "taxon_scope_matches", default=None
+)
+
+
+@contextmanager
+def taxon_match_scope() -> Iterator[None]:
+    """Keep resolved matches until the block exits; nested scopes share them."""
+
+    if _scope_matches.get() is not None:
+        yield
+        return
+    token = _scope_matches.set({})
+    try:
+        yield
+    finally:
+        _scope_matches.reset(token)
+
+
+def invalidate_taxon_cache() -> None:
+    """Discard the matches kept by the open :func:`taxon_match_scope`, if any."""
+
+    matches = _scope_matches.get()
+    if matches is not None:
+        matches.clear()
+
+
+def _query_matches(names: List[str]) -> Dict[str, Optional[Taxon]]:
+    candidates: Dict[str, List[Taxon]] = {name: [] for name in names}
+    for start in range(0, len(names), RESOLVE_BATCH_SIZE):
+        batch = names[start : start + RESOLVE_BATCH_SIZE]
+        for taxon in Taxon.objects.filter(
+            taxon_name_normalized__in=batch,
+            status=TaxonStatus.ACCEPTED,
+            is_active=True,
+        ):
+            candidates[taxon.taxon_name_normalized].append(taxon)
+    return {
+        name: matches[0] if len(matches) == 1 else None
+        for name, matches in candidates.items()
+    }
+
+
+def resolve_controlled_taxa(taxon_names: Iterable[Optional[str]]) -> Dict[str, Optional[Taxon]]:
+    """Return unique accepted, active taxa keyed by normalised name.
+
+    Names without a unique match map to ``None``. Inside a
+    :func:`taxon_match_scope` only names the scope has not resolved yet are
+    queried.
+    """
+
+    names = {Taxon.normalize_name(name) for name in taxon_names}
+    names.discard("")
+    if not names:
+        return {}
+
+    scope = _scope_matches.get()
+    if scope is None:
+        return _query_matches(sorted(names))
+
+    resolved = {name: scope[name] for name in names if name in scope}
+    missing = sorted(names - set(resolved))
+    if missing:
+        matches = _query_matches(missing)
+        scope.update(matches)
+        resolved.update(matches)
+    return resolved
+
+
+def resolve_controlled_taxon(taxon_name: Optional[str]) -> Optional[Taxon]:
+    """Return the unique accepted, active taxon matching ``taxon_name``."""
+
+    normalized = Taxon.normalize_name(taxon_name)
+    if not normalized:
+        return None
+    return resolve_controlled_taxa([normalized]).get(normalized)
+
+
+__all__ = [
+    "invalidate_taxon_cache",
+    "resolve_controlled_taxa",
+    "resolve_controlled_taxon",
+    "taxon_match_scope",
+]
@@ -12,12 +12,14 @@ from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
 
+from .. import accession_summaries
 from ..models import (
     Taxon,
     TaxonExternalSource,
     TaxonStatus,
     TaxonomyImport,
 )
+from .resolver import invalidate_taxon_cache
 
 logger = logging.getLogger(__name__)
 
@@ -451,6 +453,7 @@ class NowTaxonomySyncService:
                     [item.instance for item in accepted_updates],
                     [
                         "taxon_name",
+                        "taxon_name_normalized",
                         "taxon_rank",
                         "author_year",
                         "status",
@@ -512,6 +515,7 @@ class NowTaxonomySyncService:
                     [item.instance for item in synonym_updates],
                     [
                         "taxon_name",
+                        "taxon_name_normalized",
                         "taxon_rank",
                         "author_year",
                         "status",
@@ -557,6 +561,10 @@ class NowTaxonomySyncService:
             )
             import_log.finished_at = timezone.now()
             import_log.save()
+            # Bulk writes skip the Taxon signals that normally clear cached matches
+            # and refresh the accession search summaries.
+            transaction.on_commit(invalidate_taxon_cache)
+            transaction.on_commit(accession_summaries.rebuild)
 
         return import_log
 
@@ -723,6 +731,7 @@ def build_taxon_from_record(
         source_version=getattr(record, "source_version", ""),
         taxon_rank=taxon_rank_value,
         taxon_name=normalized_name,
+        taxon_name_normalized=Taxon.normalize_name(normalized_name),
         kingdom=taxonomy.get("kingdom", TAXONOMY_DEFAULTS["kingdom"]),
         phylum=taxonomy.get("phylum", TAXONOMY_DEFAULTS["phylum"]),
         class_name=taxonomy.get("class_name", TAXONOMY_DEFAULTS["class_name"]),
@@ -741,4 +750,5 @@ def build_taxon_from_record(
 def apply_changes(instance: Taxon, changes: Dict[str, Any]) -> None:
     for field, value in changes.items():
         setattr(instance, field, value)
+    instance.taxon_name_normalized = Taxon.normalize_name(instance.taxon_name)
 
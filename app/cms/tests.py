@@ -24,6 +24,7 @@ from cms.models import (
     Accession,
     AccessionNumberSeries,
     AccessionRow,
+    BackgroundJob,
     Organisation,
     UserOrganisation,
     Storage,
@@ -63,7 +64,7 @@ from cms.filters import DrawerRegisterFilter
 from cms.resources import DrawerRegisterResource, PlaceResource
 from tablib import Dataset
 from cms.upload_processing import TIMESTAMP_FORMAT, process_file
-from cms import scanning_utils
+from cms import jobs, report_rollups, scanning_utils
 from cms.ocr_processing import (
     process_pending_scans,
     describe_accession_conflicts,
@@ -478,23 +479,15 @@ class UploadProcessingTests(TestCase):
             saved_path.write_bytes(b"uploaded")
             return collision_name
 
-        processed_paths = []
-
-        def fake_process(path):
-            processed_paths.append(path)
-            self.assertEqual(path.name, filename)
-            self.assertTrue(path.exists())
-            return path
-
         url = reverse("admin-upload-scan")
         self.client.force_login(self.user)
 
         with patch("cms.views.FileSystemStorage.save", new=fake_save):
-            with patch("cms.views.process_file", side_effect=fake_process):
-                response = self.client.post(url, {"files": [upload]}, follow=True)
+            response = self.client.post(url, {"files": [upload]}, follow=True)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(len(processed_paths), 1)
+        job = BackgroundJob.objects.get(kind=BackgroundJob.Kind.INGEST_SCANS)
+        self.assertEqual(job.payload, {"files": [filename]})
         self.assertTrue((incoming / filename).exists())
         self.assertFalse((incoming / collision_name).exists())
 
@@ -2082,6 +2075,10 @@ class UploadScanViewTests(TestCase):
         upload = SimpleUploadedFile("2025-01-01T010203.png", b"data", content_type="image/png")
         response = self.client.post(self.url, {"files": upload})
         self.assertEqual(response.status_code, 302)
+        job = BackgroundJob.objects.get(kind=BackgroundJob.Kind.INGEST_SCANS)
+        self.assertEqual(response.url, reverse("admin-job-status", args=[job.pk]))
+        self.assertTrue((self.uploads_root / "incoming" / "2025-01-01T010203.png").exists())
+        jobs.run_job(jobs.claim_next("test-worker"), "test-worker")
         pending = Path(settings.MEDIA_ROOT) / "uploads" / "pending" / "2025-01-01T010203.png"
         self.assertTrue(pending.exists())
         self.assertTrue(Media.objects.filter(media_location=f"uploads/pending/2025-01-01T010203.png").exists())
@@ -2094,6 +2091,8 @@ class UploadScanViewTests(TestCase):
         upload = SimpleUploadedFile("badname.png", b"data", content_type="image/png")
         response = self.client.post(self.url, {"files": upload})
         self.assertEqual(response.status_code, 302)
+        jobs.run_job(jobs.claim_next("test-worker"), "test-worker")
+        self.assertEqual(BackgroundJob.objects.get().result["destinations"], {"rejected": 1})
         rejected = Path(settings.MEDIA_ROOT) / "uploads" / "rejected" / "badname.png"
         self.assertTrue(rejected.exists())
         self.assertFalse(Media.objects.filter(media_location="uploads/rejected/badname.png").exists())
@@ -2133,6 +2132,7 @@ class UploadScanViewTests(TestCase):
                 "Uploaded 2025-01-01T010204.png (2 of 2)",
             ],
         )
+        jobs.run_job(jobs.claim_next("test-worker"), "test-worker")
         pending = Path(settings.MEDIA_ROOT) / "uploads" / "pending"
         self.assertTrue(pending.exists())
         saved_files = {item.name for item in pending.iterdir()}
@@ -2147,7 +2147,6 @@ class OcrViewTests(TestCase):
         self.user = User.objects.create_user(username="cm", password="pass", is_staff=True)
         Group.objects.create(name="Collection Managers").user_set.add(self.user)
         self.url = reverse("admin-do-ocr")
-        self.loop_url = f"{self.url}?loop=1"
         patcher = patch("cms.models.get_current_user", return_value=self.user)
         patcher.start()
         self.addCleanup(patcher.stop)
@@ -2179,32 +2178,45 @@ class OcrViewTests(TestCase):
         self.assertContains(response, "Please choose one of the available options.")
 
     @patch("cms.views._count_pending_scans", return_value=50)
-    def test_do_ocr_prompt_redirects_with_limit(self, mock_count):
+    def test_do_ocr_prompt_queues_job_with_limit(self, mock_count):
         self.client.login(username="cm", password="pass")
-        response = self.client.post(self.url, {"scan_limit": "200"})
-        self.assertEqual(response.status_code, 302)
-        self.assertTrue(response["Location"].endswith("?loop=1&limit=200"))
+        response = self.client.post(self.url, {"scan_limit": "200", "scan_workers": "4"})
+        job = BackgroundJob.objects.get()
+        self.assertRedirects(
+            response, reverse("admin-job-status", args=[job.pk]), fetch_redirect_response=False
+        )
+        self.assertEqual(job.kind, BackgroundJob.Kind.SCAN_OCR)
+        self.assertEqual(job.payload, {"limit": 200, "workers": 4})
+        self.assertEqual(job.created_by, self.user)
 
     @patch("cms.views._count_pending_scans", return_value=12)
-    def test_do_ocr_prompt_redirects_for_all(self, mock_count):
+    def test_do_ocr_prompt_queues_job_for_all(self, mock_count):
         self.client.login(username="cm", password="pass")
         response = self.client.post(self.url, {"scan_limit": "all"})
         self.assertEqual(response.status_code, 302)
-        self.assertTrue(response["Location"].endswith("?loop=1"))
-        self.assertNotIn("limit=", response["Location"])
+        self.assertIsNone(BackgroundJob.objects.get().payload["limit"])
+
+    @patch("cms.views._count_pending_scans", return_value=12)
+    def test_do_ocr_reuses_active_job(self, mock_count):
+        self.client.login(username="cm", password="pass")
+        first = self.client.post(self.url, {"scan_limit": "all"})
+        second = self.client.post(self.url, {"scan_limit": "100"})
+        self.assertEqual(first["Location"], second["Location"])
+        self.assertEqual(BackgroundJob.objects.count(), 1)
 
     @patch("cms.views._count_pending_scans", return_value=0)
     def test_do_ocr_prompt_handles_no_pending(self, mock_count):
         self.client.login(username="cm", password="pass")
         response = self.client.post(self.url, {"scan_limit": "all"}, follow=True)
         self.assertContains(response, "No pending scans to process.")
+        self.assertFalse(BackgroundJob.objects.exists())
 
     @patch("cms.ocr_processing.detect_card_type", return_value={"card_type": "accession_card"})
     @patch(
         "cms.ocr_processing.chatgpt_ocr",
         return_value=with_usage({"foo": "bar"}, usage_overrides={"remaining_quota_usd": 11.0}),
     )
-    def test_ocr_moves_file_and_saves_json(self, mock_ocr, mock_detect):
+    def test_ocr_job_moves_file_and_saves_json(self, mock_ocr, mock_detect):
         self.client.login(username="cm", password="pass")
         pending = Path(settings.MEDIA_ROOT) / "uploads" / "pending"
         pending.mkdir(parents=True, exist_ok=True)
@@ -2212,8 +2224,15 @@ class OcrViewTests(TestCase):
         file_path = pending / filename
         file_path.write_bytes(b"data")
         Media.objects.create(media_location=f"uploads/pending/{filename}")
-        response = self.client.get(self.url)
+        response = self.client.post(self.url, {"scan_limit": "all"})
         self.assertEqual(response.status_code, 302)
+
+        job = jobs.claim_next("test-worker")
+        jobs.run_job(job, "test-worker")
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, BackgroundJob.Status.SUCCEEDED)
+        self.assertEqual(job.result["successes"], 1)
         ocr_file = Path(settings.MEDIA_ROOT) / "uploads" / "ocr" / filename
         self.assertTrue(ocr_file.exists())
         media = Media.objects.get()
@@ -2234,9 +2253,6 @@ class OcrViewTests(TestCase):
             usage_record.cost_usd,
             Decimal(str(DEFAULT_USAGE_PAYLOAD["total_cost_usd"])),
         )
-
-
-
         self.assertEqual(usage_record.response_id, DEFAULT_USAGE_PAYLOAD["request_id"])
         self.assertEqual(usage_record.remaining_quota_usd, Decimal("11.0"))
         self.assertIsNotNone(usage_record.processing_seconds)
@@ -2244,124 +2260,55 @@ class OcrViewTests(TestCase):
         import shutil
         shutil.rmtree(pending.parent)
 
-    @patch("cms.views._count_pending_scans", return_value=5)
-    @patch(
-        "cms.views.process_pending_scans",
-        return_value=(0, 1, 1, ["test.png: boom"], None, ["test.png"], False),
-    )
-    def test_do_ocr_shows_error_details(self, mock_process, mock_count):
+    def _finished_job(self, **result):
+        return BackgroundJob.objects.create(
+            kind=BackgroundJob.Kind.SCAN_OCR,
+            status=BackgroundJob.Status.SUCCEEDED,
+            result=result,
+            created_by=self.user,
+        )
+
+    @patch("cms.views._count_pending_scans", return_value=0)
+    def test_job_status_shows_error_details(self, mock_count):
         self.client.login(username="cm", password="pass")
-        response = self.client.post(self.url, {"scan_limit": "all"}, follow=True)
+        job = self._finished_job(
+            successes=0, failures=1, total=1, errors=["test.png: boom"], latest_filename="test.png"
+        )
+        response = self.client.get(reverse("admin-job-status", args=[job.pk]))
         self.assertContains(response, "Processed 0 of 1 scans this run. Latest scan: test.png.")
         self.assertContains(response, "OCR failed for 1 scans: test.png")
+        self.assertNotContains(response, "boom")
 
-    @patch("cms.views._count_pending_scans", return_value=2)
-    @patch(
-        "cms.views.process_pending_scans",
-        return_value=(3, 0, 5, [], None, ["scan-5.png"], False),
-    )
-    def test_do_ocr_reports_progress(self, mock_process, mock_count):
-        self.client.login(username="cm", password="pass")
-        response = self.client.post(self.url, {"scan_limit": "all"}, follow=True)
-        self.assertContains(response, "Processed 3 of 5 scans this run. Latest scan: scan-5.png.")
-
-    @patch("cms.views._count_pending_scans", return_value=5)
-    @patch(
-        "cms.views.process_pending_scans",
-        return_value=(0, 0, 0, ["insufficient_quota"], None, [], True),
-    )
-    def test_do_ocr_aborts_on_insufficient_quota(self, mock_process, mock_count):
-        self.client.login(username="cm", password="pass")
-        response = self.client.post(self.url, {"scan_limit": "all"}, follow=True)
-        self.assertContains(response, "OpenAI quota has been exhausted")
-        messages = [str(message) for message in get_messages(response.wsgi_request)]
-        self.assertTrue(any("OpenAI quota" in message for message in messages))
-
-    @patch("cms.views._count_pending_scans", return_value=4)
-    @patch("cms.views.process_pending_scans", return_value=(1, 0, 1, [], None, ["scan-1.png"], False))
-    def test_loop_mode_auto_refreshes(self, mock_process, mock_count):
-        self.client.login(username="cm", password="pass")
-        response = self.client.get(self.loop_url)
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(response["Refresh"], f"0;url={self.loop_url}")
-        body = response.content.decode()
-        self.assertIn("Continuing OCR… scan 1 of 5 (Latest: scan-1.png).", body)
-        session = self.client.session
-        self.assertEqual(session["ocr_loop_stats"]["successes"], 1)
-        self.assertEqual(session["ocr_loop_stats"]["attempted"], 1)
-        self.assertEqual(session["ocr_loop_stats"]["latest_filename"], "scan-1.png")
-
-    @patch("cms.views._count_pending_scans", return_value=99)
-    @patch("cms.views.process_pending_scans", return_value=(1, 0, 1, [], None, ["scan-1.png"], False))
-    def test_loop_mode_uses_limit_for_expected_total(self, mock_process, mock_count):
-        self.client.login(username="cm", password="pass")
-        url = f"{self.loop_url}&limit=100"
-        response = self.client.get(url)
-        self.assertEqual(response.status_code, 200)
-        self.assertIn("Continuing OCR… scan 1 of 100 (Latest: scan-1.png).", response.content.decode())
-        self.assertEqual(response["Refresh"], f"0;url={url}")
-
-    @patch("cms.views._count_pending_scans")
-    @patch("cms.views.process_pending_scans")
-    def test_loop_mode_finalizes_and_reports(self, mock_process, mock_count):
-        self.client.login(username="cm", password="pass")
-        mock_process.side_effect = [
-            (1, 0, 1, [], None, ["scan-1.png"], False),
-            (1, 0, 1, [], None, ["scan-2.png"], False),
-        ]
-        mock_count.side_effect = [2, 0]
-
-        first = self.client.get(self.loop_url)
-        self.assertEqual(first.status_code, 200)
-        self.assertEqual(first["Refresh"], f"0;url={self.loop_url}")
-
-        final = self.client.get(self.loop_url, follow=True)
-        self.assertContains(final, "Processed 2 of 2 scans this run. Latest scan: scan-2.png.")
-        self.assertIsNone(self.client.session.get("ocr_loop_stats"))
-
-    @patch("cms.views._count_pending_scans")
-    @patch("cms.views.process_pending_scans")
-    def test_loop_mode_respects_limit(self, mock_process, mock_count):
-        self.client.login(username="cm", password="pass")
-        mock_process.side_effect = [
-            (1, 0, 1, [], None, ["scan-1.png"], False),
-            (1, 0, 1, [], None, ["scan-2.png"], False),
-        ]
-        mock_count.side_effect = [5, 4]
-
-        url = f"{self.loop_url}&limit=2"
-        first = self.client.get(url)
-        self.assertEqual(first.status_code, 200)
-        self.assertEqual(first["Refresh"], f"0;url={url}")
-
-        final = self.client.get(url, follow=True)
-        self.assertContains(final, "Processed 2 of 2 scans this run. Latest scan: scan-2.png.")
-        self.assertIsNone(self.client.session.get("ocr_loop_stats"))
-
-    @patch("cms.views._count_pending_scans", return_value=5)
-    @patch(
-        "cms.views.process_pending_scans",
-        return_value=(0, 1, 1, ["jam.png: timeout"], "jam.png", ["jam.png"], False),
-    )
-    def test_loop_mode_stops_on_jam(self, mock_process, mock_count):
+    @patch("cms.views._count_pending_scans", return_value=0)
+    def test_job_status_reports_jam_and_quota(self, mock_count):
         self.client.login(username="cm", password="pass")
-        response = self.client.get(self.loop_url, follow=True)
-        self.assertContains(response, "OCR failed for 1 scans: jam.png")
+        job = self._finished_job(
+            successes=0,
+            failures=1,
+            total=1,
+            errors=["jam.png: scan timed out"],
+            jammed="jam.png",
+            insufficient_quota=True,
+        )
+        response = self.client.get(reverse("admin-job-status", args=[job.pk]))
         self.assertContains(
             response,
             "OCR halted because scan jam.png timed out after three attempts. Please investigate before retrying.",
         )
+        self.assertContains(response, "OpenAI quota has been exhausted")
 
-    @patch("cms.views._count_pending_scans", return_value=5)
-    @patch(
-        "cms.views.process_pending_scans",
-        return_value=(0, 0, 0, ["insufficient_quota"], None, [], True),
-    )
-    def test_loop_mode_aborts_on_insufficient_quota(self, mock_process, mock_count):
+    @patch("cms.views._count_pending_scans", return_value=4)
+    def test_job_status_refreshes_while_active(self, mock_count):
         self.client.login(username="cm", password="pass")
-        response = self.client.get(self.loop_url, follow=True)
-        self.assertContains(response, "OpenAI quota has been exhausted")
-        self.assertIsNone(self.client.session.get("ocr_loop_stats"))
+        job = BackgroundJob.objects.create(kind=BackgroundJob.Kind.SCAN_OCR, created_by=self.user)
+        url = reverse("admin-job-status", args=[job.pk])
+        response = self.client.get(url)
+        self.assertContains(response, '<meta http-equiv="refresh" content="5">', html=False)
+        self.assertContains(response, "Queued")
+
+        data = self.client.get(url, HTTP_X_REQUESTED_WITH="XMLHttpRequest").json()
+        self.assertEqual(data["status"], BackgroundJob.Status.QUEUED)
+        self.assertEqual(data["kind"], BackgroundJob.Kind.SCAN_OCR)
 
 
 
@@ -5002,6 +4949,8 @@ class ChatGPTUsageReportViewTests(TestCase):
         LLMUsageRecord.objects.filter(pk=record_two.pk).update(
             created_at=newer, updated_at=newer
         )
+        # Queryset updates bypass the signals that maintain the usage rollup.
+        report_rollups.rebuild()
 
     def test_requires_staff_access(self):
         self.client.force_login(self.standard_user)
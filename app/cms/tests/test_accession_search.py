@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+from crum import set_current_user
+from django.test import override_settings
+
+from cms.accession_search import FullTextSearchBackend, matching_accession_ids, search_terms
+from cms.filters import AccessionFilter
+from cms.models import Accession, AccessionRow, Collection, Element, Identification, Locality, NatureOfSpecimen
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"search-{uuid.uuid4().hex}", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _identified(number, taxon, element=None):
+    collection, _ = Collection.objects.get_or_create(abbreviation="KN", defaults={"description": "Kenya"})
+    locality, _ = Locality.objects.get_or_create(abbreviation="ER", defaults={"name": "East Rudolf"})
+    accession = Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=number)
+    row = AccessionRow.objects.create(accession=accession)
+    Identification.objects.create(accession_row=row, taxon_verbatim=taxon)
+    if element:
+        NatureOfSpecimen.objects.create(
+            accession_row=row, element=Element.objects.get_or_create(name=element)[0]
+        )
+    return accession
+
+
+def _filtered(**data):
+    return set(AccessionFilter(data=data, queryset=Accession.objects.all()).qs)
+
+
+def test_filters_match_every_word_as_a_prefix(staff_user):
+    erectus = _identified(1, "Homo erectus", element="Left femur")
+    habilis = _identified(2, "Homo habilis", element="Mandible")
+    _identified(3, "Theropithecus oswaldi")
+
+    assert _filtered(taxon="homo") == {erectus, habilis}
+    assert _filtered(taxon="Homo ere") == {erectus}
+    assert _filtered(taxon="erectus homo") == {erectus}
+    # Matches start at word boundaries, as in the FULLTEXT index.
+    assert _filtered(taxon="pithecus") == set()
+    assert _filtered(element="fem") == {erectus}
+    assert _filtered(taxon="--") == {erectus, habilis, Accession.objects.get(specimen_no=3)}
+
+
+def test_matching_ids_rejects_unknown_fields():
+    with pytest.raises(ValueError):
+        matching_accession_ids("comment", "Homo")
+    assert search_terms("Homo  sp. homo") == ["Homo", "sp", "homo"]
+
+
+@override_settings(ACCESSION_SEARCH_MIN_TOKEN_SIZE=3)
+def test_fulltext_backend_sends_short_words_and_stopwords_to_the_regex():
+    sql = str(FullTextSearchBackend().matching("taxon_names", ["Homo", "sp", "the"]).query)
+
+    assert "MATCH" in sql and "+Homo*" in sql
+    assert "+sp*" not in sql and "+the*" not in sql
+    assert sql.count("REGEXP") == 2
@@ -0,0 +1,149 @@
+import uuid
+
+import pytest
+from crum import set_current_user
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cms.filters import AccessionFilter
+from cms.models import (
+    Accession,
+    AccessionRow,
+    AccessionSearchSummary,
+    Collection,
+    Element,
+    Identification,
+    Locality,
+    NatureOfSpecimen,
+    Storage,
+    Taxon,
+    TaxonExternalSource,
+    TaxonRank,
+    TaxonStatus,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"summaries-{uuid.uuid4().hex}", password="x")
+    user.groups.add(Group.objects.get_or_create(name="Collection Managers")[0])
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _accession(number=1):
+    collection, _ = Collection.objects.get_or_create(abbreviation="KN", defaults={"description": "Kenya"})
+    locality, _ = Locality.objects.get_or_create(abbreviation="ER", defaults={"name": "East Rudolf"})
+    return Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=number)
+
+
+def _taxon(name, **fields):
+    genus, species = name.split()
+    values = {
+        "external_source": TaxonExternalSource.NOW,
+        "external_id": f"NOW:species:{name}",
+        "status": TaxonStatus.ACCEPTED,
+        "taxon_rank": TaxonRank.SPECIES,
+        "taxon_name": name,
+        "kingdom": "Animalia",
+        "phylum": "Chordata",
+        "class_name": "Mammalia",
+        "order": "Primates",
+        "family": "Hominidae",
+        "genus": genus,
+        "species": species,
+    }
+    values.update(fields)
+    return Taxon.objects.create(**values)
+
+
+def _summary(accession):
+    return AccessionSearchSummary.objects.get(accession=accession)
+
+
+def test_summary_follows_rows_identifications_and_natures(staff_user):
+    accession = _accession()
+    femur = Element.objects.create(name="Femur")
+    row = AccessionRow.objects.create(accession=accession, storage=Storage.objects.create(area="Drawer 4"))
+    Identification.objects.create(accession_row=row, taxon_verbatim="Homo erectus")
+    nature = NatureOfSpecimen.objects.create(accession_row=row, element=femur)
+
+    summary = _summary(accession)
+    assert summary.taxa_list == ["Homo erectus"]
+    assert summary.element_list == ["Femur"]
+    assert summary.storage_list == ["Drawer 4"]
+    assert (summary.row_count, summary.identification_count, summary.specimen_count) == (1, 1, 1)
+
+    other = _accession(2)
+    nature.accession_row = AccessionRow.objects.create(accession=other)
+    nature.save()
+    assert _summary(accession).element_list == []
+    assert _summary(other).element_list == ["Femur"]
+
+    row.delete()
+    assert _summary(accession).row_count == 0
+    accession.delete()
+    assert not AccessionSearchSummary.objects.filter(accession_id=accession.pk).exists()
+
+
+def test_taxon_changes_refresh_rank_and_synonym_names(staff_user):
+    accession = _accession()
+    row = AccessionRow.objects.create(accession=accession)
+    Identification.objects.create(accession_row=row, taxon_verbatim="Paranthropus boisei")
+    taxon = _taxon("Paranthropus boisei")
+    # The accepted taxon arrived after the identification, so only the free-text name links them.
+    assert _summary(accession).family == "Hominidae"
+
+    taxon.family = "Hominidaeus"
+    taxon.save()
+    _taxon(
+        "Zinjanthropus boisei",
+        status=TaxonStatus.SYNONYM,
+        accepted_taxon=taxon,
+        external_id="NOW:syn:Zinjanthropus boisei",
+    )
+    # Saving the identification links it to the now controlled taxon and its synonyms.
+    Identification.objects.filter(accession_row=row).first().save()
+
+    summary = _summary(accession)
+    assert summary.family == "Hominidaeus"
+    assert "Zinjanthropus boisei" in summary.taxon_names.split("\n")
+    filterset = AccessionFilter(data={"taxon": "Zinjanthropus"}, queryset=Accession.objects.all())
+    assert list(filterset.qs) == [accession]
+
+
+def test_rebuild_command_repairs_bulk_changes(staff_user):
+    accession = _accession()
+    row = AccessionRow.objects.create(accession=accession)
+    Identification.objects.create(accession_row=row, taxon_verbatim="Homo habilis")
+    Identification.objects.filter(accession_row=row).update(taxon_verbatim="Homo rudolfensis", taxon="Homo rudolfensis")
+    AccessionSearchSummary.objects.all().delete()
+
+    call_command("rebuild_accession_summaries")
+
+    assert _summary(accession).taxa_list == ["Homo rudolfensis"]
+
+
+def test_accession_list_pages_in_constant_queries(client, staff_user):
+    element = Element.objects.create(name="Mandible")
+    for number in range(1, 25):
+        row = AccessionRow.objects.create(accession=_accession(number))
+        Identification.objects.create(accession_row=row, taxon_verbatim=f"Taxon {number}")
+        NatureOfSpecimen.objects.create(accession_row=row, element=element)
+    client.force_login(staff_user)
+
+    counts = []
+    for page in (1, 3):
+        with CaptureQueriesContext(connection) as captured:
+            response = client.get(reverse("accession_list"), {"page": page})
+        assert response.status_code == 200
+        counts.append(len(captured))
+
+    assert counts[0] == counts[1]
+    assert "Mandible" in response.content.decode()
@@ -15,7 +15,7 @@ from django.test import RequestFactory
 from django.urls import reverse
 
 from cms import admin as cms_admin
-from cms.models import SpecimenListPDF, Taxon
+from cms.models import BackgroundJob, SpecimenListPDF, Taxon
 
 pytestmark = pytest.mark.django_db
 
@@ -79,6 +79,26 @@ def test_taxonomy_sync_apply_get_redirects_preview(monkeypatch):
     assert response.status_code == 302
 
 
+def test_taxonomy_sync_apply_post_queues_job():
+    user = _superuser()
+    set_current_user(user)
+    request = RequestFactory().post("/admin/taxonomy/sync/apply/")
+    request.user = user
+    _attach_messages(request)
+
+    try:
+        with patch("cms.admin.NowTaxonomySyncService") as service_cls:
+            response = cms_admin._taxonomy_sync_apply_view(request)
+    finally:
+        set_current_user(None)
+
+    job = BackgroundJob.objects.get()
+    assert response.status_code == 302
+    assert response["Location"] == reverse("taxonomy_sync_job", args=[job.pk])
+    assert job.kind == BackgroundJob.Kind.TAXONOMY_SYNC
+    service_cls.return_value.sync.assert_not_called()
+
+
 @pytest.mark.parametrize("button,method_name", [("_start_split", "can_split"), ("_requeue_pages", "can_requeue")])
 def test_specimen_list_pdf_admin_post_buttons_queue_jobs(button, method_name, monkeypatch):
     user = _superuser()
@@ -0,0 +1,147 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from crum import get_current_user, set_current_user
+from django.utils import timezone
+
+from cms import jobs
+from cms.models import BackgroundJob
+from cms.upload_processing import queue_specimen_list_processing
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user(django_user_model):
+    user = django_user_model.objects.create_user(username="job-user", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+@pytest.fixture
+def echo_handler():
+    calls = []
+
+    def _handler(payload):
+        calls.append((payload, get_current_user()))
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+        return {"echo": payload.get("value")}
+
+    jobs.HANDLERS["echo"] = _handler
+    yield calls
+    del jobs.HANDLERS["echo"]
+
+
+def test_enqueue_dedupes_active_jobs(user):
+    first = queue_specimen_list_processing(7)
+    again = queue_specimen_list_processing(7)
+    other = queue_specimen_list_processing(8)
+
+    assert first.pk == again.pk
+    assert other.pk != first.pk
+    assert first.kind == BackgroundJob.Kind.SPLIT_SPECIMEN_LIST_PDF
+    assert first.payload == {"pdf_id": 7}
+    assert first.created_by == user
+
+
+def test_enqueue_rejects_unknown_kind(user):
+    with pytest.raises(ValueError):
+        jobs.enqueue("nope")
+
+
+def test_claim_orders_by_priority_and_skips_future_jobs(user, echo_handler):
+    low = jobs.enqueue("echo", {"value": 1})
+    high = jobs.enqueue("echo", {"value": 2}, priority=5)
+    later = jobs.enqueue("echo", {"value": 3}, priority=10)
+    BackgroundJob.objects.filter(pk=later.pk).update(run_after=timezone.now() + timedelta(hours=1))
+
+    claimed = jobs.claim_next("worker-a")
+
+    assert claimed.pk == high.pk
+    assert claimed.status == BackgroundJob.Status.RUNNING
+    assert claimed.locked_by == "worker-a"
+    assert claimed.attempts == 1
+    assert jobs.claim_next("worker-b").pk == low.pk
+    assert jobs.claim_next("worker-c") is None
+
+
+def test_run_job_records_result_as_creator(user, echo_handler):
+    job = jobs.enqueue("echo", {"value": "hi"})
+    set_current_user(None)
+
+    jobs.run_job(jobs.claim_next("worker-a"), "worker-a")
+    job.refresh_from_db()
+
+    assert job.status == BackgroundJob.Status.SUCCEEDED
+    assert job.result == {"echo": "hi"}
+    assert job.locked_by == ""
+    assert echo_handler == [({"value": "hi"}, user)]
+
+
+def test_failed_job_is_retried_with_backoff_then_failed(user, echo_handler, settings):
+    settings.JOB_RETRY_BASE_SECONDS = 10
+    job = jobs.enqueue("echo", {"fail": True}, max_attempts=2)
+
+    before = timezone.now()
+    jobs.run_job(jobs.claim_next("worker-a"), "worker-a")
+    job.refresh_from_db()
+    assert job.status == BackgroundJob.Status.QUEUED
+    assert job.last_error == "RuntimeError: boom"
+    assert job.run_after >= before + timedelta(seconds=10)
+
+    BackgroundJob.objects.filter(pk=job.pk).update(run_after=timezone.now())
+    jobs.run_job(jobs.claim_next("worker-a"), "worker-a")
+    job.refresh_from_db()
+    assert job.status == BackgroundJob.Status.FAILED
+    assert job.attempts == 2
+    assert job.finished_at is not None
+
+
+def test_expired_lease_is_reclaimed_by_another_worker(user, echo_handler):
+    job = jobs.enqueue("echo", {"value": 1})
+    jobs.claim_next("dead-worker")
+    assert jobs.claim_next("worker-b") is None
+
+    BackgroundJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+    reclaimed = jobs.claim_next("worker-b")
+
+    assert reclaimed.pk == job.pk
+    assert reclaimed.locked_by == "worker-b"
+    assert reclaimed.attempts == 2
+    # The dead worker can no longer renew or finish the job.
+    assert not jobs.renew_lease(job, "dead-worker")
+    assert jobs.renew_lease(job, "worker-b")
+
+
+def test_expired_lease_without_attempts_left_fails(user, echo_handler):
+    job = jobs.enqueue("echo", {"value": 1}, max_attempts=1)
+    jobs.claim_next("dead-worker")
+    BackgroundJob.objects.filter(pk=job.pk).update(lease_expires_at=timezone.now() - timedelta(seconds=1))
+
+    assert jobs.claim_next("worker-b") is None
+    job.refresh_from_db()
+    assert job.status == BackgroundJob.Status.FAILED
+    assert "dead-worker" in job.last_error
+
+
+@patch("cms.ocr_processing.process_pending_scans")
+def test_scan_ocr_handler_summarises_run(mock_process, user):
+    mock_process.return_value = (2, 1, 3, ["a.png: scan failed", "insufficient_quota"], None, ["a.png", "b.png"], True)
+    job = jobs.enqueue(BackgroundJob.Kind.SCAN_OCR, {"limit": 3, "workers": 2})
+
+    jobs.run_job(jobs.claim_next("worker-a"), "worker-a")
+    job.refresh_from_db()
+
+    mock_process.assert_called_once_with(limit=3, workers=2)
+    assert job.result == {
+        "successes": 2,
+        "failures": 1,
+        "total": 3,
+        "errors": ["a.png: scan failed"],
+        "jammed": None,
+        "latest_filename": "b.png",
+        "insufficient_quota": True,
+    }
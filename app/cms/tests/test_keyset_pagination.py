@@ -0,0 +1,121 @@
+import uuid
+from datetime import date
+
+import pytest
+from crum import set_current_user
+from django.contrib.auth.models import Group
+from django.urls import reverse
+
+from cms.models import (
+    Accession,
+    Collection,
+    FieldSlip,
+    Locality,
+    Media,
+    MediaQCComment,
+    MediaQCLog,
+)
+from cms.pagination import KeysetPaginator
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"paging-{uuid.uuid4().hex}", password="x")
+    user.groups.add(Group.objects.get_or_create(name="Collection Managers")[0])
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _accessions(count):
+    collection = Collection.objects.create(abbreviation="KN", description="Kenya")
+    locality = Locality.objects.create(abbreviation="ER", name="East Rudolf")
+    for number in range(1, count + 1):
+        Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=number)
+    return Accession.objects.all()
+
+
+def _walk(paginator, page):
+    """Follow next cursors from ``page`` and return every primary key seen."""
+
+    seen = [obj.pk for obj in page]
+    while page.has_next():
+        if page.next_page_number() is not None:
+            page = paginator.page(page.next_page_number())
+        else:
+            page = paginator.cursor_page(page.next_cursor)
+        seen.extend(obj.pk for obj in page)
+    return seen
+
+
+def test_pages_switch_from_numbers_to_cursors_and_back(settings, staff_user):
+    settings.LIST_PAGINATION_MAX_OFFSET_PAGES = 2
+    queryset = _accessions(12)
+    ordering = ("-specimen_no", "pk")
+    expected = list(queryset.order_by("-specimen_no", "pk").values_list("pk", flat=True))
+    paginator = KeysetPaginator(queryset, 5, ordering)
+
+    second = paginator.page(2)
+    assert (second.previous_page_number(), second.next_page_number()) == (1, None)
+    assert second.next_cursor and second.previous_cursor is None
+    assert _walk(paginator, paginator.page(1)) == expected
+
+    third = paginator.cursor_page(second.next_cursor)
+    assert third.number is None and not third.has_next()
+    back = paginator.cursor_page(third.previous_cursor)
+    assert [obj.pk for obj in back] == expected[5:10] and back.number is None
+    first = paginator.cursor_page(back.previous_cursor)
+    assert [obj.pk for obj in first] == expected[:5]
+    assert first.number == 1 and not first.has_previous()
+
+
+def test_nullable_sort_keys_keep_every_row(staff_user):
+    for index, collected in enumerate([None, date(2020, 1, 1), None, date(2019, 5, 2), date(2020, 1, 1)]):
+        FieldSlip.objects.create(field_number=f"FS-{index}", collection_date=collected)
+
+    for ordering in (("collection_date",), ("-collection_date",)):
+        paginator = KeysetPaginator(FieldSlip.objects.all(), 2, ordering)
+        expected = [obj.pk for obj in paginator.queryset]
+        first = paginator.page(1)
+        seen = [obj.pk for obj in first]
+        page = first
+        while page.has_next():
+            page = paginator.cursor_page(paginator.cursor_for(page[-1], "next"))
+            seen.extend(obj.pk for obj in page)
+        assert seen == expected
+
+
+def test_counts_stop_at_the_limit(settings, staff_user):
+    settings.LIST_PAGINATION_COUNT_LIMIT = 4
+    queryset = _accessions(6)
+
+    exact = KeysetPaginator(queryset.filter(specimen_no__lte=3), 2, ("specimen_no",))
+    assert (exact.count, exact.num_pages, exact.count_is_lower_bound) == (3, 2, False)
+
+    capped = KeysetPaginator(queryset.filter(specimen_no__gte=1), 2, ("specimen_no",))
+    assert (capped.count, capped.count_is_lower_bound, capped.count_is_estimate) == (4, True, False)
+
+
+def test_media_queue_links_cursor_pages(client, settings, staff_user):
+    settings.LIST_PAGINATION_MAX_OFFSET_PAGES = 1
+    medias = [Media.objects.create(media_location=f"uploads/ocr/{index}.png") for index in range(55)]
+    log = MediaQCLog.objects.create(media=medias[0], change_type=MediaQCLog.ChangeType.STATUS)
+    MediaQCComment.objects.create(log=log, comment="Check row 2")
+    MediaQCComment.objects.create(log=log, comment="Fixed")
+    Media.objects.update(rows_rearranged=True)
+    client.force_login(staff_user)
+
+    response = client.get(reverse("media_qc_rows_rearranged"))
+    page = response.context["page_obj"]
+    assert page.paginator.count == 55 and page.next_page_number() is None
+    assert f"cursor={page.next_cursor}" in response.content.decode()
+
+    response = client.get(reverse("media_qc_rows_rearranged"), {"cursor": page.next_cursor})
+    rest = response.context["page_obj"]
+    assert len(rest) == 5 and not rest.has_next()
+    assert {media.pk: media.comment_count for media in rest}[medias[0].pk] == 2
+
+    response = client.get(reverse("media_qc_rows_rearranged"), {"cursor": "not-a-cursor"})
+    assert response.status_code == 404
@@ -0,0 +1,181 @@
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from crum import set_current_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from cms import llm_batch, llm_cache
+from cms.models import LLMBatchJob, LLMResponseCache, SpecimenListPage, SpecimenListPDF
+from cms.ocr_processing import _create_chat_completion
+from cms.tasks import STAGE_RAW, run_ocr_batch_cycle
+
+pytestmark = pytest.mark.django_db
+
+RAW_OCR = json.dumps({"raw_text": "KNM-ER 1 femur", "bounding_boxes": []})
+
+
+class FakeBatchClient:
+    """In-memory stand-in for the OpenAI files and batches endpoints."""
+
+    batches: dict[str, dict] = {}
+
+    def submit(self, jsonl, *, metadata):
+        batch_id = f"batch_{len(self.batches) + 1}"
+        self.batches[batch_id] = {
+            "status": "in_progress",
+            "requests": [json.loads(line) for line in jsonl.splitlines() if line],
+        }
+        return batch_id
+
+    def status(self, batch_id):
+        batch = self.batches[batch_id]
+        output_file_id = f"file_{batch_id}" if batch["status"] == "completed" else ""
+        return llm_batch.BatchStatus(status=batch["status"], output_file_id=output_file_id)
+
+    def download(self, file_id):
+        batch = self.batches[file_id.removeprefix("file_")]
+        return "\n".join(
+            json.dumps(
+                {
+                    "custom_id": request["custom_id"],
+                    "response": {
+                        "status_code": 200,
+                        "body": {
+                            "id": f"resp_{index}",
+                            "choices": [{"message": {"content": RAW_OCR}}],
+                            "usage": {"prompt_tokens": 100, "completion_tokens": 20, "total_tokens": 120},
+                        },
+                    },
+                }
+            )
+            for index, request in enumerate(batch["requests"])
+        )
+
+    @classmethod
+    def complete_all(cls):
+        for batch in cls.batches.values():
+            batch["status"] = "completed"
+
+
+class _UnusedClient:
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        raise AssertionError("batch mode must not call the chat completions API")
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"batch-{uuid.uuid4().hex}", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+@pytest.fixture
+def batch_client(settings):
+    settings.OPENAI_BATCH_CLIENT = "cms.tests.test_llm_batch.FakeBatchClient"
+    FakeBatchClient.batches = {}
+    yield FakeBatchClient
+    FakeBatchClient.batches = {}
+
+
+def _create_page():
+    pdf = SpecimenListPDF.objects.create(
+        source_label="Batch",
+        original_filename="batch.pdf",
+        stored_file=SimpleUploadedFile("batch.pdf", b"%PDF-1.4", content_type="application/pdf"),
+    )
+    page = SpecimenListPage.objects.create(
+        pdf=pdf,
+        page_number=1,
+        classification_status=SpecimenListPage.ClassificationStatus.CLASSIFIED,
+        page_type=SpecimenListPage.PageType.TYPED_TEXT,
+        pipeline_status=SpecimenListPage.PipelineStatus.CLASSIFIED,
+    )
+    page.image_file.save("page.png", SimpleUploadedFile("page.png", b"img", content_type="image/png"), save=True)
+    return page
+
+
+def test_deferring_raises_on_cache_miss_without_calling_the_api():
+    messages = [{"role": "user", "content": "Read the card."}]
+
+    with pytest.raises(llm_batch.BatchRequestDeferred) as excinfo:
+        with llm_batch.deferring():
+            _create_chat_completion(_UnusedClient(), kind="card_ocr", model="gpt-4o", timeout=5, messages=messages)
+
+    request = excinfo.value.request
+    assert request.custom_id == llm_cache.build_cache_key("card_ocr", "gpt-4o", messages).key
+    assert request.body == {"model": "gpt-4o", "messages": messages}
+    assert json.loads(request.as_jsonl())["url"] == "/v1/chat/completions"
+    assert not llm_batch.is_deferring()
+
+
+@patch("cms.ocr_processing.get_openai_client", return_value=_UnusedClient())
+@patch("cms.tasks.prepare_image_url", return_value="data:image/jpeg;base64,AAAA")
+def test_batch_cycle_submits_then_persists_results(mock_prepare, mock_client, staff_user, batch_client):
+    page = _create_page()
+    target = LLMBatchJob.Target.SPECIMEN_LISTS
+
+    first = run_ocr_batch_cycle(target, stages=(STAGE_RAW,))
+    assert first.submitted_requests == 1
+    assert not page.ocr_entries.exists()
+
+    # A second run while the batch is open does not resubmit the request.
+    waiting = run_ocr_batch_cycle(target, stages=(STAGE_RAW,))
+    assert waiting.submitted_requests == 0
+    assert waiting.open_batches == 1
+
+    batch_client.complete_all()
+    done = run_ocr_batch_cycle(target, stages=(STAGE_RAW,))
+    page.refresh_from_db()
+
+    assert done.ingested == 1
+    assert done.completed_items == 1
+    assert done.submitted_requests == 0
+    assert page.ocr_entries.get().raw_text == "KNM-ER 1 femur"
+    assert page.pipeline_status == SpecimenListPage.PipelineStatus.OCR_DONE
+    job = LLMBatchJob.objects.get()
+    assert job.status == LLMBatchJob.Status.INGESTED
+    assert job.ingested_count == 1
+    assert LLMResponseCache.objects.get().batch_id == job.batch_id
+
+
+def test_first_use_of_batch_result_carries_usage():
+    cache_key = llm_cache.build_cache_key("card_ocr", "gpt-4o", [{"role": "user", "content": "x"}])
+    llm_cache.store_batch_result(
+        cache_key,
+        content="{}",
+        usage={"prompt_tokens": 7, "completion_tokens": 3, "total_tokens": 10},
+        response_id="resp_1",
+        batch_id="batch_1",
+    )
+
+    first = llm_cache.lookup(cache_key)
+    second = llm_cache.lookup(cache_key)
+
+    assert first.cache_hit is False
+    assert first.usage.total_tokens == 10
+    assert second.cache_hit is True
+    assert second.usage is None
+
+
+def test_failed_batch_requests_are_submitted_again(batch_client):
+    request = llm_batch.DeferredRequest(
+        llm_cache.build_cache_key("card_ocr", "gpt-4o", [{"role": "user", "content": "x"}]),
+        {"model": "gpt-4o", "messages": [{"role": "user", "content": "x"}]},
+    )
+    target = LLMBatchJob.Target.SCANS
+    llm_batch.submit_requests(target, [request, request])
+    assert LLMBatchJob.objects.get().request_count == 1
+
+    batch_client.batches["batch_1"]["status"] = "expired"
+    summary = llm_batch.poll_jobs(target)
+
+    assert summary.errors == ["batch batch_1 expired"]
+    assert LLMBatchJob.objects.get().status == LLMBatchJob.Status.FAILED
+    assert len(llm_batch.submit_requests(target, [request])) == 1
@@ -0,0 +1,143 @@
+import json
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+from crum import set_current_user
+from django.contrib.auth import get_user_model
+
+from cms import llm_cache
+from cms.llm_usage import build_usage_payload
+from cms.models import LLMResponseCache, LLMUsageRecord, Media
+from cms.ocr_processing import chatgpt_ocr
+
+pytestmark = pytest.mark.django_db
+
+
+def _messages(prompt="Read the card.", image="data:image/jpeg;base64,AAAA"):
+    return [
+        {"role": "system", "content": "You extract data."},
+        {
+            "role": "user",
+            "content": [
+                {"type": "text", "text": prompt},
+                {"type": "image_url", "image_url": {"url": image}},
+            ],
+        },
+    ]
+
+
+def _response(content, response_id="resp_1"):
+    return SimpleNamespace(
+        id=response_id,
+        model="gpt-4o",
+        choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+        usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+    )
+
+
+class _Client:
+    def __init__(self, content):
+        self.calls = 0
+        self.content = content
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **kwargs):
+        self.calls += 1
+        return _response(self.content, response_id=f"resp_{self.calls}")
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="cache-user", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+@pytest.fixture
+def card_image(tmp_path):
+    path = tmp_path / "card.png"
+    path.write_bytes(b"card-bytes")
+    return path
+
+
+def test_cache_key_separates_image_prompt_and_model():
+    key = llm_cache.build_cache_key("card_ocr", "gpt-4o", _messages())
+
+    assert key == llm_cache.build_cache_key("card_ocr", "gpt-4o", _messages())
+    assert key.key != llm_cache.build_cache_key("card_ocr", "gpt-4o-mini", _messages()).key
+    other_prompt = llm_cache.build_cache_key("card_ocr", "gpt-4o", _messages(prompt="Read it again."))
+    assert other_prompt.image_sha256 == key.image_sha256
+    assert other_prompt.prompt_sha256 != key.prompt_sha256
+    other_image = llm_cache.build_cache_key("card_ocr", "gpt-4o", _messages(image="data:image/jpeg;base64,BBBB"))
+    assert other_image.prompt_sha256 == key.prompt_sha256
+    assert other_image.key != key.key
+
+
+@patch("cms.ocr_processing.prepare_image_url", return_value="data:image/jpeg;base64,AAAA")
+def test_repeated_ocr_is_served_from_cache(mock_prepare, card_image):
+    client = _Client(json.dumps({"accession_number": "KNM-ER 1"}))
+
+    with patch("cms.ocr_processing.get_openai_client", return_value=client):
+        first = chatgpt_ocr(card_image, "1", "Read the card.", model="gpt-4o", max_retries=1)
+        second = chatgpt_ocr(card_image, "1", "Read the card.", model="gpt-4o", max_retries=1)
+
+    assert client.calls == 1
+    assert second["accession_number"] == first["accession_number"]
+    assert "cache_hit" not in first["usage"]
+    assert second["usage"]["cache_hit"] is True
+    assert second["usage"]["total_tokens"] == 0
+    entry = LLMResponseCache.objects.get()
+    assert entry.kind == "card_ocr"
+    assert entry.hit_count == 1
+
+
+@patch("cms.ocr_processing.prepare_image_url", return_value="data:image/jpeg;base64,AAAA")
+def test_use_cache_false_bypasses_cache(mock_prepare, card_image, settings):
+    client = _Client(json.dumps({"accession_number": "KNM-ER 1"}))
+
+    with patch("cms.ocr_processing.get_openai_client", return_value=client):
+        chatgpt_ocr(card_image, "1", "Read the card.", model="gpt-4o", max_retries=1)
+        chatgpt_ocr(card_image, "1", "Read the card.", model="gpt-4o", max_retries=1, use_cache=False)
+        settings.LLM_RESPONSE_CACHE_ENABLED = False
+        chatgpt_ocr(card_image, "1", "Read the card.", model="gpt-4o", max_retries=1)
+
+    assert client.calls == 3
+
+
+@patch("cms.ocr_processing.prepare_image_url", return_value="data:image/jpeg;base64,AAAA")
+def test_unparseable_response_is_not_cached(mock_prepare, card_image):
+    client = _Client("not json")
+
+    with patch("cms.ocr_processing.get_openai_client", return_value=client):
+        with pytest.raises(json.JSONDecodeError):
+            chatgpt_ocr(card_image, "1", "Read the card.", model="gpt-4o", max_retries=1)
+
+    assert not LLMResponseCache.objects.exists()
+
+
+def test_store_evicts_least_recently_used(settings):
+    settings.LLM_RESPONSE_CACHE_MAX_ENTRIES = 2
+    keys = [
+        llm_cache.build_cache_key("card_ocr", "gpt-4o", _messages(prompt=f"prompt {index}"))
+        for index in range(3)
+    ]
+    llm_cache.store(keys[0], _response("{}"))
+    llm_cache.store(keys[1], _response("{}"))
+    assert llm_cache.lookup(keys[0]) is not None
+
+    llm_cache.store(keys[2], _response("{}"))
+
+    assert set(LLMResponseCache.objects.values_list("key", flat=True)) == {keys[0].key, keys[2].key}
+
+
+def test_usage_record_flags_cache_hits(user):
+    media = Media.objects.create(media_location="uploads/card.png", file_name="card.png")
+    cached = llm_cache.CachedCompletion(id="resp_1", model="gpt-4o")
+
+    payload = build_usage_payload(cached, "gpt-4o")
+    record = LLMUsageRecord.objects.create(media=media, **LLMUsageRecord.defaults_from_payload(payload))
+
+    assert record.cache_hit is True
+    assert record.total_tokens == 0
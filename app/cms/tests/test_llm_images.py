@@ -0,0 +1,88 @@
+import base64
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+from PIL import Image
+
+from cms import llm_images
+from cms.llm_images import get_image_profile, prepare_image
+
+
+@pytest.fixture(autouse=True)
+def image_cache(tmp_path, settings):
+    settings.LLM_IMAGE_CACHE_DIR = str(tmp_path / "cache")
+    llm_images.source_digests.clear()
+    llm_images.cache_usage.clear()
+    yield tmp_path / "cache"
+    llm_images.source_digests.clear()
+    llm_images.cache_usage.clear()
+
+
+def _write_png(path, size=(3000, 1500), mode="RGB"):
+    Image.new(mode, size, "white").save(path, format="PNG")
+    return path
+
+
+def test_prepare_image_downscales_png_to_labelled_jpeg(tmp_path, image_cache):
+    source = _write_png(tmp_path / "page.png")
+
+    prepared = prepare_image(source, "ocr")
+
+    assert prepared.mime_type == "image/jpeg"
+    assert prepared.path.parent.parent == image_cache
+    assert prepared.data_url.startswith("data:image/jpeg;base64,")
+    with Image.open(io.BytesIO(base64.b64decode(prepared.base64))) as image:
+        assert image.format == "JPEG"
+        assert image.size == (2048, 1024)
+
+
+def test_prepare_image_reuses_cached_derivative(tmp_path):
+    source = _write_png(tmp_path / "page.png")
+    first = prepare_image(source, "classify")
+
+    with patch("cms.llm_images._encode") as encode:
+        second = prepare_image(source, "classify")
+
+    encode.assert_not_called()
+    assert second == first
+
+
+def test_profiles_are_cached_separately_and_overridable(tmp_path, settings):
+    settings.LLM_IMAGE_PROFILES = {"classify": {"max_edge": 512, "format": "WEBP"}}
+    source = _write_png(tmp_path / "page.png", mode="RGBA")
+
+    classify = prepare_image(source, "classify")
+    ocr = prepare_image(source, "ocr")
+
+    assert get_image_profile("classify").max_edge == 512
+    assert classify.mime_type == "image/webp"
+    assert classify.path != ocr.path
+    with Image.open(classify.path) as image:
+        assert max(image.size) == 512
+
+
+def test_unreadable_image_is_sent_unchanged(tmp_path):
+    source = tmp_path / "page.png"
+    source.write_bytes(b"not an image")
+
+    prepared = prepare_image(source, "ocr")
+
+    assert prepared.path == source
+    assert prepared.mime_type == "image/png"
+
+
+def test_cache_prunes_least_recently_used_derivatives(tmp_path, settings):
+    old = prepare_image(_write_png(tmp_path / "old.png", size=(800, 400)), "classify")
+    used = prepare_image(_write_png(tmp_path / "used.png", size=(900, 400)), "classify")
+    os.utime(old.path, (1, 1))
+    os.utime(used.path, (1, 1))
+    settings.LLM_IMAGE_CACHE_MAX_BYTES = old.path.stat().st_size + used.path.stat().st_size
+
+    # Reading ``used`` again marks it as the most recent derivative.
+    assert prepare_image(tmp_path / "used.png", "classify") == used
+    new = prepare_image(_write_png(tmp_path / "new.png", size=(1000, 400)), "classify")
+
+    assert not old.path.exists()
+    assert used.path.exists() and new.path.exists()
@@ -0,0 +1,161 @@
+import json
+import threading
+from io import StringIO
+from types import SimpleNamespace
+
+import pytest
+from django.core.management import call_command
+
+from cms import llm_rate_limit
+from cms.llm_rate_limit import LimiterConfig, LocalStore, RateLimiter
+from cms.ocr_processing import _create_chat_completion
+
+
+def _limiter(**overrides):
+    config = LimiterConfig(
+        requests_per_minute=overrides.pop("requests_per_minute", 60),
+        tokens_per_minute=overrides.pop("tokens_per_minute", 0),
+        max_concurrency=overrides.pop("max_concurrency", 4),
+        latency_target=overrides.pop("latency_target", 10),
+        estimated_tokens=overrides.pop("estimated_tokens", 100),
+    )
+    return RateLimiter(LocalStore(), config)
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiter():
+    llm_rate_limit.reset_limiter()
+    yield
+    llm_rate_limit.reset_limiter()
+
+
+class _RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self):
+        super().__init__("Rate limit reached for requests")
+        self.response = SimpleNamespace(status_code=429, headers={"retry-after": "7"})
+
+
+def test_local_bucket_waits_once_exhausted():
+    store = LocalStore()
+
+    assert store.take("bucket", 2, capacity=2, rate=1)[1] == 0
+    level, wait = store.take("bucket", 1, capacity=2, rate=1)
+
+    assert level < 1
+    assert 0 < wait <= 1
+
+
+def test_throttle_halves_concurrency_and_sets_shared_cooldown():
+    limiter = _limiter(max_concurrency=8)
+
+    limiter.record_throttle("gpt-4o", retry_after=5)
+
+    assert limiter.concurrency_limit() == 4
+    assert 4 < limiter.cooldown_remaining() <= 5.01
+    assert limiter.backoff_delay(0) >= limiter.cooldown_remaining() - 0.01
+    assert limiter.state("gpt-4o")["throttled_total"] == 1
+
+
+def test_concurrency_grows_on_fast_calls_and_shrinks_on_slow_calls():
+    limiter = _limiter(max_concurrency=8, latency_target=10)
+    limiter.record_throttle("gpt-4o", retry_after=0.01)
+    limiter.record_throttle("gpt-4o", retry_after=0.01)
+
+    limiter.record_success("gpt-4o", latency=1, tokens_used=None, estimated_tokens=100)
+    grown = limiter.concurrency_limit()
+    limiter.record_success("gpt-4o", latency=20, tokens_used=None, estimated_tokens=100)
+
+    assert grown == pytest.approx(2.5)
+    assert limiter.concurrency_limit() == pytest.approx(2.25)
+
+
+def test_token_bucket_settles_actual_usage():
+    limiter = _limiter(tokens_per_minute=1000, estimated_tokens=100)
+
+    with limiter.acquire("gpt-4o") as permit:
+        permit.complete(600)
+
+    assert limiter.state("gpt-4o")["tokens_available"] == pytest.approx(400, abs=5)
+
+
+def test_acquire_bounds_in_flight_calls():
+    limiter = _limiter(max_concurrency=2, requests_per_minute=0)
+    lock = threading.Lock()
+    running = []
+    peak = []
+    release = threading.Event()
+
+    def call():
+        with limiter.acquire("gpt-4o"):
+            with lock:
+                running.append(1)
+                peak.append(len(running))
+            release.wait(0.05)
+            with lock:
+                running.pop()
+
+    threads = [threading.Thread(target=call) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(peak) <= 2
+
+
+def test_unreachable_redis_falls_back_to_local_state_and_recovers():
+    class FlakyStore(LocalStore):
+        name = "redis"
+        down = True
+        calls = 0
+
+        def get(self, key):
+            self.calls += 1
+            if self.down:
+                raise ConnectionError("redis down")
+            return "2"
+
+    store = FlakyStore()
+    limiter = RateLimiter(store, _limiter().config)
+
+    assert limiter.concurrency_limit() == 4
+    assert limiter.backend == "local"
+    # Redis is not retried until the backoff has passed.
+    limiter.concurrency_limit()
+    assert store.calls == 1
+
+    store.down = False
+    limiter._redis_retry_at = 0.0
+    assert limiter.concurrency_limit() == 2
+    assert limiter.backend == "redis"
+
+
+def test_chat_completion_reports_rate_limits_to_limiter(settings):
+    settings.OPENAI_MAX_CONCURRENCY = 8
+
+    def create(**kwargs):
+        raise _RateLimitError()
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    with pytest.raises(_RateLimitError):
+        _create_chat_completion(
+            client, kind="card_ocr", model="gpt-4o", timeout=5, messages=[], use_cache=False
+        )
+
+    limiter = llm_rate_limit.get_limiter()
+    assert limiter.concurrency_limit() == 4
+    assert limiter.cooldown_remaining() > 6
+
+
+def test_status_command_prints_json_state():
+    out = StringIO()
+
+    call_command("llm_rate_limit_status", "--json", "--model", "gpt-4o", stdout=out)
+
+    state = json.loads(out.getvalue())
+    assert state["backend"] == "local"
+    assert state["model"] == "gpt-4o"
+    assert "requests_available" in state
@@ -0,0 +1,81 @@
+import pytest
+from crum import set_current_user
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from cms.models import Media, MediaQCLog
+
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="tracker", password="pass")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def make_media(**kwargs) -> Media:
+    media = Media.objects.create(
+        media_location="uploads/tracking.png",
+        file_name="tracking.png",
+        ocr_data={"accessions": []},
+        **kwargs,
+    )
+    return Media.objects.get(pk=media.pk)
+
+
+def select_queries(context) -> list[str]:
+    return [query["sql"] for query in context.captured_queries if query["sql"].startswith("SELECT")]
+
+
+def test_location_save_skips_previous_row_lookup(user):
+    media = make_media()
+    media.media_location = "uploads/relocated.png"
+
+    with CaptureQueriesContext(connection) as context:
+        media.save(update_fields=["media_location", "file_name", "format"])
+
+    assert not any('"cms_media"' in sql for sql in select_queries(context))
+    assert not media.qc_logs.exists()
+
+
+def test_loaded_state_detects_changes_without_reload(user):
+    media = make_media()
+    media.qc_status = Media.QCStatus.PENDING_EXPERT
+    media.ocr_data["accessions"].append({"specimen_no": {"interpreted": "7"}})
+    media.rows_rearranged = True
+
+    with CaptureQueriesContext(connection) as context:
+        media.save()
+
+    assert not any('FROM "cms_media" WHERE' in sql for sql in select_queries(context))
+    assert set(media.qc_logs.values_list("change_type", flat=True)) == {
+        MediaQCLog.ChangeType.STATUS,
+        MediaQCLog.ChangeType.OCR_DATA,
+        MediaQCLog.ChangeType.ROWS_REARRANGED,
+    }
+
+
+def test_repeated_save_compares_against_last_save(user):
+    media = make_media()
+    media.qc_status = Media.QCStatus.PENDING_EXPERT
+    media.save()
+    media.save()
+
+    assert media.qc_logs.filter(change_type=MediaQCLog.ChangeType.STATUS).count() == 1
+
+
+def test_unloaded_instance_falls_back_to_tracked_columns(user):
+    media = make_media()
+    deferred = Media.objects.defer("qc_status", "rows_rearranged", "ocr_data").get(pk=media.pk)
+    deferred.qc_status = Media.QCStatus.PENDING_EXPERT
+
+    deferred.save(update_fields=["qc_status"])
+
+    log = media.qc_logs.get(change_type=MediaQCLog.ChangeType.STATUS)
+    assert log.old_value == {"qc_status": Media.QCStatus.PENDING_INTERN}
+    assert log.new_value == {"qc_status": Media.QCStatus.PENDING_EXPERT}
@@ -0,0 +1,119 @@
+import pytest
+from crum import set_current_user
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+
+from cms.models import Media, MediaQCLog, OCRDataBlob
+from cms.qc import diff_ocr_revisions
+from cms.utils import build_history_entries
+
+
+pytestmark = pytest.mark.django_db
+
+
+FIRST = {"accessions": [{"specimen_no": {"interpreted": "1"}}]}
+SECOND = {"accessions": [{"specimen_no": {"interpreted": "2"}}]}
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="qc", password="pass", is_staff=True)
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def make_media(ocr_data=None) -> Media:
+    return Media.objects.create(
+        media_location="uploads/ocr-history.png",
+        file_name="ocr-history.png",
+        ocr_data=ocr_data,
+    )
+
+
+def test_digest_ignores_key_order():
+    assert OCRDataBlob.objects.digest_for({"a": 1, "b": [1, 2]}) == OCRDataBlob.objects.digest_for(
+        {"b": [1, 2], "a": 1}
+    )
+    assert OCRDataBlob.objects.digest_for(None) == ""
+
+
+def test_history_stores_digest_and_reconstructs_document(user):
+    media = make_media(FIRST)
+    media.ocr_data = SECOND
+    media.save()
+
+    assert media.ocr_data_digest == OCRDataBlob.objects.digest_for(SECOND)
+    records = list(media.history.order_by("history_date"))
+    assert [record.ocr_data_digest for record in records] == [
+        OCRDataBlob.objects.digest_for(FIRST),
+        OCRDataBlob.objects.digest_for(SECOND),
+    ]
+    assert records[0].ocr_data == FIRST
+    assert records[0].instance.ocr_data == FIRST
+    assert OCRDataBlob.objects.count() == 2
+
+
+def test_identical_payloads_share_one_blob(user):
+    make_media(FIRST)
+    other = make_media({"accessions": [{"specimen_no": {"interpreted": "1"}}]})
+    other.qc_status = Media.QCStatus.PENDING_EXPERT
+    other.save()
+
+    assert OCRDataBlob.objects.count() == 1
+
+
+def test_update_fields_include_digest(user):
+    media = make_media(FIRST)
+    media.ocr_data = SECOND
+    media.save(update_fields=["ocr_data"])
+
+    media.refresh_from_db()
+    assert media.ocr_data_digest == OCRDataBlob.objects.digest_for(SECOND)
+    assert media.history.latest().ocr_data == SECOND
+
+
+def test_qc_log_references_blobs(user):
+    media = make_media(FIRST)
+    media.ocr_data = SECOND
+    media.save()
+
+    log = media.qc_logs.get(change_type=MediaQCLog.ChangeType.OCR_DATA)
+    assert log.old_value is None and log.new_value is None
+    assert log.old_document == FIRST
+    assert log.new_document == SECOND
+
+    diff = diff_ocr_revisions(log.old_ocr_digest, log.new_ocr_digest)
+    assert diff["field_diffs"] == [("accessions[0].specimen_no", "1", "2")]
+
+
+def test_load_documents_uses_one_query(user, django_assert_num_queries):
+    media = make_media(FIRST)
+    media.ocr_data = SECOND
+    media.save()
+    logs = list(media.qc_logs.all())
+
+    with django_assert_num_queries(1):
+        MediaQCLog.load_documents(logs)
+        assert [log.new_document for log in logs] == [SECOND]
+
+
+def test_build_history_entries_expands_ocr_data(user):
+    media = make_media(FIRST)
+    media.ocr_data = SECOND
+    media.save()
+
+    latest = build_history_entries(media)[0]
+    assert {"field": "Ocr data", "old": FIRST, "new": SECOND} in latest["changes"]
+
+
+def test_qc_history_view_renders_reconstructed_document(client, user):
+    media = make_media(FIRST)
+    media.ocr_data = SECOND
+    media.save()
+    client.force_login(user)
+
+    response = client.get(reverse("media_qc_history"), {"change_type": "ocr_data"})
+
+    assert response.status_code == 200
+    assert "specimen_no" in response.content.decode()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from crum import impersonate
+
+from cms.merge.clusters import (
+    blocking_keys,
+    cluster_worklist,
+    find_duplicate_clusters,
+    merge_enabled_models,
+    refresh_duplicate_clusters,
+)
+from cms.merge.registry import MERGE_REGISTRY
+from cms.models import (
+    AccessionReference,
+    Element,
+    FieldSlip,
+    MergeDuplicateCluster,
+    NatureOfSpecimen,
+    Reference,
+    Storage,
+)
+
+
+class DuplicateClusterTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="clusterer", is_staff=True)
+        self._impersonation = impersonate(self.user)
+        self._impersonation.__enter__()
+        self.addCleanup(self._impersonation.__exit__, None, None, None)
+
+        self.first = FieldSlip.objects.create(field_number="KNM-ER 1470", verbatim_taxon="Homo rudolfensis")
+        self.second = FieldSlip.objects.create(field_number="KNM ER 1470", verbatim_taxon="Homo rudolfensis")
+        self.third = FieldSlip.objects.create(field_number="KNM-ER 1470.", verbatim_taxon="Homo rudolfensis")
+        self.other = FieldSlip.objects.create(field_number="FS-9", verbatim_taxon="Pan troglodytes")
+
+    def test_blocking_keys_use_token_prefixes(self):
+        self.assertEqual(blocking_keys("Homo rudolfensis KNM 1"), {"homo", "rudo", "knm", "1"})
+
+    def test_merge_enabled_models_cover_all_mixins(self):
+        models = merge_enabled_models()
+        for model in (Element, FieldSlip, Reference, Storage, NatureOfSpecimen, AccessionReference):
+            self.assertIn(model, models)
+
+    def test_find_duplicate_clusters_links_near_duplicates(self):
+        clusters = find_duplicate_clusters(
+            FieldSlip, fields=["field_number", "verbatim_taxon"], threshold=85
+        )
+
+        self.assertEqual(len(clusters), 1)
+        cluster = clusters[0]
+        self.assertEqual(cluster.pks, [self.first.pk, self.second.pk, self.third.pk])
+        self.assertGreaterEqual(cluster.top_score, 85)
+        for left, right, score in cluster.pairs:
+            self.assertLess(left, right)
+            self.assertGreaterEqual(score, 85)
+
+    def test_refresh_replaces_stored_clusters(self):
+        fields = ["field_number", "verbatim_taxon"]
+        self.assertEqual(refresh_duplicate_clusters(FieldSlip, fields=fields, threshold=85), 1)
+        self.assertEqual(refresh_duplicate_clusters(FieldSlip, fields=fields, threshold=85), 1)
+
+        stored = MergeDuplicateCluster.objects.get()
+        self.assertEqual(stored.model_label, "cms.fieldslip")
+        self.assertEqual(stored.size, 3)
+        self.assertEqual(stored.member_pks, [str(self.first.pk), str(self.second.pk), str(self.third.pk)])
+
+        self.third.delete()
+        worklist = cluster_worklist()
+        self.assertEqual(len(worklist), 1)
+        self.assertEqual(
+            [member["label"] for member in worklist[0]["members"]],
+            ["KNM-ER 1470", "KNM ER 1470"],
+        )
+
+    def test_command_stores_clusters_for_requested_model(self):
+        stdout = StringIO()
+        call_command(
+            "find_duplicate_clusters",
+            "cms.FieldSlip",
+            "--fields=field_number,verbatim_taxon",
+            "--threshold=85",
+            stdout=stdout,
+        )
+
+        self.assertIn("cms.fieldslip: stored 1 duplicate clusters.", stdout.getvalue())
+        self.assertEqual(MergeDuplicateCluster.objects.count(), 1)
+
+    @override_settings(MERGE_TOOL_FEATURE=True)
+    def test_admin_view_lists_stored_clusters(self):
+        refresh_duplicate_clusters(FieldSlip, fields=["field_number", "verbatim_taxon"], threshold=85)
+        self.client.force_login(self.user)
+
+        with patch.dict(MERGE_REGISTRY, {FieldSlip: {"fields": {}, "relations": {}}}):
+            response = self.client.get(reverse("merge:merge_candidates"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Precomputed duplicate clusters")
+        self.assertContains(response, "KNM ER 1470")
@@ -2,12 +2,17 @@ from __future__ import annotations
 
 from django.contrib.auth import get_user_model
 from django.db import connection, models
-from django.test import TransactionTestCase
+from django.test import TestCase, TransactionTestCase
 from django.test.utils import isolate_apps
 from django.urls import reverse
 
+from crum import impersonate
+
+from cms.merge.fuzzy import rank_candidate_keys, score_candidates
+from cms.merge.index import rebuild_index, shortlist_candidate_pks, text_grams
 from cms.merge.mixins import MergeMixin
 from cms.merge.registry import MERGE_REGISTRY, register_merge_rules
+from cms.models import FieldSlip, MergeSearchGram, MergeSearchIndexState
 
 
 @isolate_apps("cms")
@@ -109,3 +114,82 @@ class MergeCandidateAPITests(TransactionTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "Merge candidate search results")
         self.assertContains(response, "Alpha Beta")
+
+    def test_index_shortlists_records_sharing_trigrams(self):
+        self.assertIsNone(shortlist_candidate_pks(self.Model, "Alpha Beta", fields=["name"]))
+
+        self.assertEqual(rebuild_index(self.Model), 3)
+        shortlist = shortlist_candidate_pks(self.Model, "Alpha Beta", fields=["name"])
+        # "Delta" only shares the "ta " trigram so it is ranked last.
+        self.assertEqual(shortlist, [str(self.best.pk), str(self.partial.pk), str(self.low.pk)])
+        self.assertIsNone(shortlist_candidate_pks(self.Model, "Alpha", fields=["pk"]))
+
+    def test_indexed_scoring_matches_full_scan(self):
+        full_scan = rank_candidate_keys(
+            self.Model, "Alpha Beta", fields=["name"], threshold=50, use_index=False
+        )
+        rebuild_index(self.Model)
+        indexed = rank_candidate_keys(self.Model, "Alpha Beta", fields=["name"], threshold=50)
+
+        self.assertEqual(indexed, full_scan)
+        self.assertEqual([item.pk for item in indexed], [self.best.pk, self.partial.pk])
+
+        matches = score_candidates(self.Model, "Alpha Beta", fields=["name"], threshold=50)
+        self.assertEqual([match.instance for match in matches], [self.best, self.partial])
+
+    def test_view_only_materialises_current_page(self):
+        staff = self.UserModel.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.force_login(staff)
+        rebuild_index(self.Model)
+
+        params = {
+            "model_label": self.model_label,
+            "query": "Alpha Beta",
+            "fields": "name",
+            "threshold": "50",
+            "page_size": "1",
+            "page": "2",
+        }
+        response = self.client.get(self.url, params, HTTP_ACCEPT="application/json")
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["total_results"], 2)
+        self.assertEqual([result["candidate"]["pk"] for result in payload["results"]], [self.partial.pk])
+
+
+class MergeSearchIndexSignalTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create(username="indexer")
+        self._impersonation = impersonate(self.user)
+        self._impersonation.__enter__()
+        self.addCleanup(self._impersonation.__exit__, None, None, None)
+
+    def test_text_grams_are_padded_token_trigrams(self):
+        self.assertEqual(text_grams("Ab c"), {" ab", "ab ", " c "})
+        self.assertEqual(text_grams(None), set())
+
+    def test_saves_are_only_indexed_once_the_index_is_built(self):
+        FieldSlip.objects.create(field_number="FS-100", verbatim_taxon="Homo")
+        self.assertFalse(MergeSearchGram.objects.exists())
+
+        rebuild_index(FieldSlip)
+        state = MergeSearchIndexState.objects.get(model_label="cms.fieldslip")
+        self.assertEqual(state.record_count, 1)
+        self.assertIn("verbatim_taxon", state.fields)
+
+        slip = FieldSlip.objects.create(field_number="FS-200", verbatim_taxon="Pan troglodytes")
+        grams = MergeSearchGram.objects.filter(model_label="cms.fieldslip", object_pk=str(slip.pk))
+        self.assertTrue(grams.filter(field_name="verbatim_taxon", gram="pan").exists())
+
+        matches = score_candidates(
+            FieldSlip, "Pan troglodytes", fields=["verbatim_taxon"], threshold=80
+        )
+        self.assertEqual([match.instance for match in matches], [slip])
+
+        slip.verbatim_taxon = "Gorilla"
+        slip.save()
+        self.assertFalse(grams.filter(gram="pan").exists())
+        self.assertTrue(grams.filter(gram="gor").exists())
+
+        slip.delete()
+        self.assertFalse(grams.exists())
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from cms.models import (
+    Accession,
+    AccessionRow,
+    Collection,
+    Element,
+    Identification,
+    Locality,
+    NatureOfSpecimen,
+    Storage,
+)
+from cms.ocr_processing import _apply_rows
+
+
+def _card_rows(count: int, *, taxon: str = "Homo", element: str = "Femur") -> list[dict]:
+    rows = []
+    for index in range(count):
+        rows.append(
+            {
+                "specimen_suffix": chr(ord("A") + index),
+                "storage": "Cabinet 1" if index % 2 else "cabinet 2",
+                "identification": {"taxon_verbatim": taxon} if index == 0 else {},
+                "natures": [{"element_name": element, "side": "left", "fragments": "2"}] if index == 0 else [],
+            }
+        )
+    return rows
+
+
+class ApplyRowsBulkWriteTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username="approver", password="pass")
+        patcher = patch("cms.models.get_current_user", return_value=self.user)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        collection = Collection.objects.create(abbreviation="KNM", description="Kenya")
+        locality = Locality.objects.create(abbreviation="ER", name="Koobi Fora")
+        self.accession = Accession.objects.create(
+            collection=collection, specimen_prefix=locality, specimen_no=1
+        )
+        Element.objects.create(name="-Undefined")
+        Element.objects.create(name="Femur")
+        Storage.objects.create(area="Cabinet 1")
+        Storage.objects.create(area="Cabinet 2")
+
+    def _count_queries(self, rows) -> int:
+        with CaptureQueriesContext(connection) as captured:
+            _apply_rows(self.accession, rows)
+        return len(captured)
+
+    def test_carries_values_forward_and_writes_history(self):
+        _apply_rows(self.accession, _card_rows(3))
+
+        rows = AccessionRow.objects.filter(accession=self.accession).order_by("specimen_suffix")
+        self.assertEqual([row.specimen_suffix for row in rows], ["A", "B", "C"])
+        self.assertEqual([row.storage.area for row in rows], ["Cabinet 2", "Cabinet 1", "Cabinet 2"])
+        self.assertEqual(Identification.objects.filter(taxon_verbatim="Homo").count(), 3)
+        natures = NatureOfSpecimen.objects.filter(accession_row__accession=self.accession)
+        self.assertEqual(natures.count(), 3)
+        self.assertTrue(all(nature.element.name == "Femur" and nature.fragments == 2 for nature in natures))
+        self.assertTrue(all(nature.created_by == self.user for nature in natures))
+
+        self.assertEqual(AccessionRow.history.filter(history_type="+").count(), 3)
+        self.assertEqual(Identification.history.filter(history_type="+").count(), 3)
+        self.assertEqual(NatureOfSpecimen.history.filter(history_type="+").count(), 3)
+
+    def test_reapproval_replaces_children_with_deletion_history(self):
+        _apply_rows(self.accession, _card_rows(2))
+        _apply_rows(self.accession, _card_rows(2, taxon="Pan", element="Tibia"))
+
+        self.assertEqual(AccessionRow.objects.filter(accession=self.accession).count(), 2)
+        self.assertEqual(
+            list(Identification.objects.values_list("taxon_verbatim", flat=True).distinct()),
+            ["Pan"],
+        )
+        # Unknown elements fall back to the placeholder element.
+        self.assertEqual(
+            set(NatureOfSpecimen.objects.values_list("element__name", flat=True)),
+            {"-Undefined"},
+        )
+        self.assertEqual(Identification.history.filter(history_type="-").count(), 2)
+        self.assertEqual(NatureOfSpecimen.history.filter(history_type="-").count(), 2)
+
+    def test_query_count_does_not_grow_with_rows(self):
+        small = self._count_queries(_card_rows(2))
+        AccessionRow.objects.all().delete()
+        large = self._count_queries(_card_rows(12))
+        self.assertEqual(small, large)
+
+        rerun_small = self._count_queries(_card_rows(2))
+        rerun_large = self._count_queries(_card_rows(12))
+        self.assertEqual(rerun_small, rerun_large)
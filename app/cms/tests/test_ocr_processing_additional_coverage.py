@@ -1,11 +1,14 @@
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
 
 import pytest
+from crum import set_current_user
 from django.test import override_settings
 
 pytestmark = pytest.mark.django_db
 
+from cms.models import Media
 from cms.ocr_processing import (
     InsufficientQuotaError,
     OCRTimeoutError,
@@ -138,7 +141,20 @@ def test_mark_scan_failed_moves_file_and_updates_media(tmp_path):
     assert media.saved is True
 
 
-def test_process_pending_scans_handles_timeout_quota_and_generic_failure(monkeypatch, tmp_path):
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"scan-{uuid.uuid4().hex}", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _create_pending_media(*names):
+    for name in names:
+        Media.objects.create(media_location=f"uploads/pending/{name}")
+
+
+def test_process_pending_scans_handles_timeout_quota_and_generic_failure(monkeypatch, tmp_path, staff_user):
     media_root = tmp_path
     pending = media_root / "uploads" / "pending"
     pending.mkdir(parents=True)
@@ -148,18 +164,7 @@ def test_process_pending_scans_handles_timeout_quota_and_generic_failure(monkeyp
     for f in (file_a, file_b, file_c):
         f.write_bytes(b"x")
 
-    media = _FakeMedia()
-
-    class _FilterResult:
-        def first(self):
-            return media
-
-    class _Manager:
-        def filter(self, **_kwargs):
-            return _FilterResult()
-
-    class _Media:
-        objects = _Manager()
+    _create_pending_media("a.jpg", "b.jpg", "c.jpg")
 
     calls = {"count": 0}
 
@@ -176,7 +181,6 @@ def test_process_pending_scans_handles_timeout_quota_and_generic_failure(monkeyp
     def _mark(_media, path, _failed_dir, _exc):
         marked.append(path.name)
 
-    monkeypatch.setattr("cms.ocr_processing.Media", _Media)
     monkeypatch.setattr("cms.ocr_processing._process_single_scan", _proc)
     monkeypatch.setattr("cms.ocr_processing._mark_scan_failed", _mark)
 
@@ -191,3 +195,71 @@ def test_process_pending_scans_handles_timeout_quota_and_generic_failure(monkeyp
     assert insufficient is False
     assert marked == ["a.jpg"]
     assert any("timed out" in e for e in errors)
+
+
+def test_process_pending_scans_runs_scans_concurrently(monkeypatch, tmp_path, staff_user):
+    import threading
+
+    media_root = tmp_path
+    pending = media_root / "uploads" / "pending"
+    pending.mkdir(parents=True)
+    names = ["a.jpg", "b.jpg", "c.jpg", "d.jpg"]
+    for name in names:
+        (pending / name).write_bytes(b"x")
+    _create_pending_media(*names)
+
+    barrier = threading.Barrier(2, timeout=5)
+    thread_names = set()
+
+    def _proc(_media, path, _ocr_dir):
+        thread_names.add(threading.current_thread().name)
+        if path.name in {"a.jpg", "b.jpg"}:
+            # Both scans must be in flight at the same time to pass the barrier.
+            barrier.wait()
+        if path.name == "c.jpg":
+            raise RuntimeError("fail")
+
+    marked = []
+    monkeypatch.setattr("cms.ocr_processing._process_single_scan", _proc)
+    monkeypatch.setattr(
+        "cms.ocr_processing._mark_scan_failed",
+        lambda _media, path, _failed_dir, _exc: marked.append(path.name),
+    )
+
+    with override_settings(MEDIA_ROOT=str(media_root)):
+        successes, failures, total, errors, jammed, processed, insufficient = process_pending_scans(workers=2)
+
+    assert (successes, failures, total) == (3, 1, 4)
+    assert processed == names
+    assert errors == ["c.jpg: scan failed"]
+    assert marked == ["c.jpg"]
+    assert jammed is None
+    assert insufficient is False
+    assert all(name.startswith("scan-ocr") for name in thread_names)
+
+
+def test_process_pending_scans_concurrent_quota_stops_submitting(monkeypatch, tmp_path, staff_user):
+    media_root = tmp_path
+    pending = media_root / "uploads" / "pending"
+    pending.mkdir(parents=True)
+    for name in ("a.jpg", "b.jpg", "c.jpg", "d.jpg"):
+        (pending / name).write_bytes(b"x")
+    _create_pending_media("a.jpg", "b.jpg", "c.jpg", "d.jpg")
+
+    attempted = []
+
+    def _proc(_media, path, _ocr_dir):
+        attempted.append(path.name)
+        if path.name == "a.jpg":
+            raise InsufficientQuotaError("quota")
+
+    monkeypatch.setattr("cms.ocr_processing._process_single_scan", _proc)
+
+    with override_settings(MEDIA_ROOT=str(media_root)):
+        successes, failures, total, errors, jammed, processed, insufficient = process_pending_scans(workers=2)
+
+    assert insufficient is True
+    assert errors == ["insufficient_quota"]
+    assert "a.jpg" not in processed
+    assert "c.jpg" not in attempted and "d.jpg" not in attempted
+    assert successes == total == len(processed)
@@ -0,0 +1,212 @@
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+import pytest
+from crum import set_current_user
+from django.contrib.auth.models import Group
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+
+from cms import report_rollups
+from cms.models import (
+    Accession,
+    AccessionLocalityRollup,
+    Collection,
+    LLMUsageDailyRollup,
+    LLMUsageRecord,
+    Locality,
+    Media,
+    MediaDailyRollup,
+    MediaStatusRollup,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"rollups-{uuid.uuid4().hex}", password="x")
+    user.groups.add(Group.objects.get_or_create(name="Collection Managers")[0])
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _status_counts():
+    return dict(MediaStatusRollup.objects.filter(media_count__gt=0).values_list("ocr_status", "media_count"))
+
+
+def _locality_counts(locality):
+    rollup = AccessionLocalityRollup.objects.get(locality=locality)
+    return rollup.accession_count, rollup.specimen_count
+
+
+def test_media_rollups_follow_saves_and_deletes(staff_user):
+    first = Media.objects.create(media_location="uploads/pending/a.png")
+    second = Media.objects.create(media_location="uploads/pending/b.png")
+    assert _status_counts() == {"pending": 2}
+    assert MediaDailyRollup.objects.get(day=timezone.localdate(first.created_on)).media_count == 2
+
+    first.ocr_status = Media.OCRStatus.COMPLETED
+    first.save()
+    # Saves that leave ocr_status alone do not touch the status rollup.
+    second.file_name = "b.png"
+    second.save(update_fields=["file_name"])
+    assert _status_counts() == {"pending": 1, "completed": 1}
+
+    second.delete()
+    assert _status_counts() == {"completed": 1}
+    assert report_rollups.media_weekday_counts()[timezone.localdate(first.created_on).isoweekday() - 1] == 1
+
+
+def test_accession_rollups_count_distinct_specimens(staff_user):
+    collection = Collection.objects.create(abbreviation="KN", description="Kenya")
+    locality = Locality.objects.create(abbreviation="ER", name="East Rudolf")
+    other = Locality.objects.create(abbreviation="WT", name="West Turkana")
+
+    first = Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=1)
+    Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=1, instance_number=2)
+    moved = Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=2)
+    assert _locality_counts(locality) == (3, 2)
+
+    moved.specimen_prefix = other
+    moved.save()
+    assert _locality_counts(locality) == (2, 1)
+    assert _locality_counts(other) == (1, 1)
+
+    first.delete()
+    assert _locality_counts(locality) == (1, 1)
+    Accession.objects.filter(specimen_prefix=locality).delete()
+    assert _locality_counts(locality) == (0, 0)
+    assert report_rollups.accession_locality_counts() == [("West Turkana", 1)]
+
+
+def test_rebuild_command_repairs_drifted_rollups(staff_user):
+    collection = Collection.objects.create(abbreviation="KN", description="Kenya")
+    locality = Locality.objects.create(abbreviation="ER", name="East Rudolf")
+    for number, instance in ((1, 1), (1, 2), (2, 1)):
+        Accession.objects.create(
+            collection=collection, specimen_prefix=locality, specimen_no=number, instance_number=instance
+        )
+    Media.objects.create(media_location="uploads/pending/a.png")
+    Media.objects.filter(ocr_status=Media.OCRStatus.PENDING).update(ocr_status=Media.OCRStatus.FAILED)
+    AccessionLocalityRollup.objects.update(accession_count=0, specimen_count=0)
+
+    call_command("rebuild_report_rollups")
+
+    assert _status_counts() == {"failed": 1}
+    assert _locality_counts(locality) == (3, 2)
+
+
+def test_reports_read_rollups(client, staff_user):
+    collection = Collection.objects.create(abbreviation="KN", description="Kenya")
+    locality = Locality.objects.create(abbreviation="ER", name="East Rudolf")
+    Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=7)
+    media = Media.objects.create(media_location="uploads/pending/a.png")
+    media.ocr_status = Media.OCRStatus.COMPLETED
+    media.save()
+    Media.objects.create(media_location="uploads/pending/b.png")
+    client.force_login(staff_user)
+
+    response = client.get(reverse("media_report"))
+    assert response.status_code == 200
+    assert response.context["summary"] == {"total": 2, "completed": 1, "completion_rate": 50.0}
+
+    response = client.get(reverse("accession_distribution_report"))
+    assert response.status_code == 200
+    assert response.context["locality_table"] == [{"Locality": "East Rudolf", "Accessions": 1}]
+
+
+def test_cached_chart_renders_once_per_data(settings):
+    settings.REPORT_CHART_CACHE_SECONDS = 60
+    rendered = []
+
+    def render():
+        rendered.append(1)
+        return f"<div>{len(rendered)}</div>"
+
+    name = f"test-{uuid.uuid4().hex}"
+    assert report_rollups.cached_chart(name, [("pending", 1)], render) == "<div>1</div>"
+    assert report_rollups.cached_chart(name, [("pending", 1)], render) == "<div>1</div>"
+    assert report_rollups.cached_chart(name, [("pending", 2)], render) == "<div>2</div>"
+    assert len(rendered) == 2
+
+
+def test_bulk_created_media_are_counted(staff_user):
+    medias = [Media(media_location=f"uploads/pending/{name}.png") for name in ("a", "b")]
+    Media.stamp_bulk_instances(medias)
+    Media.objects.bulk_create(medias)
+    assert _status_counts() == {}
+
+    report_rollups.media_bulk_created(medias)
+
+    assert _status_counts() == {"pending": 2}
+    assert MediaDailyRollup.objects.get(day=timezone.localdate(medias[0].created_on)).media_count == 2
+
+
+def _usage_record(media_name, **fields):
+    media = Media.objects.create(media_location=f"uploads/ocr/{media_name}")
+    values = {
+        "model_name": "gpt-4o",
+        "prompt_tokens": 10,
+        "completion_tokens": 5,
+        "total_tokens": 15,
+        "cost_usd": Decimal("0.50"),
+        "processing_seconds": Decimal("2.000"),
+    }
+    values.update(fields)
+    return LLMUsageRecord.objects.create(media=media, **values)
+
+
+def test_llm_usage_rollup_follows_records_and_stage_calls(staff_user):
+    record = _usage_record("one.png")
+    _usage_record("two.png", model_name="gpt-4o-mini", cost_usd=Decimal("0.10"), cache_hit=True)
+    today = timezone.localdate()
+
+    LLMUsageRecord.objects.update_or_create(
+        media=record.media,
+        defaults=LLMUsageRecord.defaults_from_payload({"model": "gpt-4o", "total_tokens": 20, "total_cost_usd": 0.75}),
+    )
+    report_rollups.record_llm_usage(
+        "specimen_list_raw_ocr", {"model": "gpt-4o", "total_tokens": 100, "total_cost_usd": 1.25}
+    )
+
+    rows = {
+        (row.model_name, row.stage): row
+        for row in LLMUsageDailyRollup.objects.filter(day=today, record_count__gt=0)
+    }
+    scans = rows[("gpt-4o", report_rollups.SCAN_OCR_STAGE)]
+    assert (scans.record_count, scans.total_tokens, scans.cost_usd) == (1, 20, Decimal("0.75"))
+    assert rows[("gpt-4o-mini", report_rollups.SCAN_OCR_STAGE)].cache_hit_count == 1
+    assert rows[("gpt-4o", "specimen_list_raw_ocr")].cost_usd == Decimal("1.25")
+
+    record.media.delete()
+    assert not LLMUsageDailyRollup.objects.filter(
+        model_name="gpt-4o", stage=report_rollups.SCAN_OCR_STAGE, record_count__gt=0
+    ).exists()
+
+
+def test_usage_report_reads_half_open_day_ranges_and_stage_costs(client, staff_user):
+    staff_user.is_staff = True
+    staff_user.save()
+    _usage_record("one.png")
+    earlier = _usage_record("two.png", cost_usd=Decimal("0.25"))
+    LLMUsageRecord.objects.filter(pk=earlier.pk).update(created_at=timezone.now() - timedelta(days=3))
+    report_rollups.rebuild()
+    report_rollups.record_llm_usage("specimen_list_classification", {"model": "gpt-4o", "total_cost_usd": 0.05})
+    client.force_login(staff_user)
+    today = timezone.localdate()
+
+    response = client.get(reverse("admin-chatgpt-usage"), {"start_date": today, "end_date": today})
+
+    assert response.status_code == 200
+    assert [row["day"] for row in response.context["daily_totals"]] == [today]
+    assert response.context["scans_processed"] == 1
+    assert response.context["cumulative_cost"] == Decimal("0.55")
+    stages = {row["stage"]: row["cost_usd"] for row in response.context["stage_totals"]}
+    assert stages == {
+        report_rollups.SCAN_OCR_STAGE: Decimal("0.50"),
+        "specimen_list_classification": Decimal("0.05"),
+    }
@@ -0,0 +1,108 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from crum import set_current_user
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from PIL import Image
+
+from cms.models import Media, MediaHashBand
+from cms.scan_duplicates import (
+    ImageHashes,
+    compute_image_hashes,
+    find_duplicate,
+    hamming_distance,
+    hash_bands,
+    index_hashes,
+)
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def user():
+    user = get_user_model().objects.create_user(username="hasher", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _gradient(path, reverse=False):
+    image = Image.new("L", (90, 80))
+    image.putdata([(255 - x * 2 if reverse else x * 2) for y in range(80) for x in range(90)])
+    image.save(path, format="PNG")
+    return path
+
+
+def _media(name, **kwargs):
+    media = Media(**kwargs)
+    media.media_location.name = name
+    media.save()
+    return media
+
+
+def test_difference_hash_separates_unrelated_images(tmp_path):
+    left = compute_image_hashes(_gradient(tmp_path / "left.png"))
+    right = compute_image_hashes(_gradient(tmp_path / "right.png", reverse=True))
+
+    assert len(left.perceptual_hash) == 16
+    assert hamming_distance(left.perceptual_hash, right.perceptual_hash) == 64
+    assert hash_bands(left.perceptual_hash) == [left.perceptual_hash[i : i + 4] for i in range(0, 16, 4)]
+
+
+def test_unreadable_file_has_no_perceptual_hash(tmp_path):
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+
+    hashes = compute_image_hashes(path)
+
+    assert hashes.perceptual_hash == ""
+    assert len(hashes.content_sha256) == 64
+
+
+def test_find_duplicate_prefers_exact_match_and_skips_flagged_duplicates():
+    original = _media("uploads/ocr/a.png", content_sha256="a" * 64, perceptual_hash="0" * 16)
+    _media(
+        "uploads/duplicates/b.png",
+        content_sha256="a" * 64,
+        perceptual_hash="0" * 16,
+        ocr_status=Media.OCRStatus.DUPLICATE,
+    )
+
+    match = find_duplicate(ImageHashes("a" * 64, "0" * 16))
+
+    assert match.media == original
+    assert match.exact
+
+
+def test_find_duplicate_uses_band_shortlist_and_threshold(settings):
+    settings.MEDIA_NEAR_DUPLICATE_DISTANCE = 3
+    close = _media("uploads/ocr/close.png", content_sha256="c" * 64, perceptual_hash="00000000000000ff")
+    near = _media("uploads/ocr/near.png", content_sha256="d" * 64, perceptual_hash="0000000000000007")
+    index_hashes([(close.pk, close.perceptual_hash), (near.pk, near.perceptual_hash)])
+
+    match = find_duplicate(ImageHashes("e" * 64, "0000000000000001"))
+
+    assert match.media == near
+    assert match.distance == 2
+    assert not match.exact
+    assert find_duplicate(ImageHashes("e" * 64, "ffff000000000000")) is None
+
+
+def test_backfill_media_hashes_hashes_archive_and_indexes_bands(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    (tmp_path / "uploads" / "ocr").mkdir(parents=True)
+    _gradient(tmp_path / "uploads" / "ocr" / "card.png")
+    hashed = _media("uploads/ocr/card.png")
+    missing = _media("uploads/ocr/missing.png")
+    out = StringIO()
+
+    call_command("backfill_media_hashes", "--workers", "2", stdout=out)
+
+    hashed.refresh_from_db()
+    missing.refresh_from_db()
+    assert hashed.content_sha256 == compute_image_hashes(Path(tmp_path / "uploads/ocr/card.png")).content_sha256
+    assert missing.content_sha256 == ""
+    assert MediaHashBand.objects.filter(media=hashed).count() == 4
+    assert "Hashed 1 media files: 1 skipped" in out.getvalue()
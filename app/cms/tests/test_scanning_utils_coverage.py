@@ -6,6 +6,7 @@ from django.utils import timezone
 
 from cms.models import DrawerRegister, Scanning
 from cms.scanning_utils import (
+    ScanningIndex,
     auto_complete_scans,
     calculate_scan_auto_end,
     find_scan_for_timestamp,
@@ -67,3 +68,24 @@ def test_find_scan_for_timestamp_returns_matching_open_scan(scan_user):
     found = find_scan_for_timestamp(timezone.now())
     assert found is not None
     assert found.id == scan.id
+
+
+def test_scanning_index_prefers_closed_then_latest_scans(scan_user):
+    drawer = _create_drawer(scan_user)
+    now = timezone.now()
+    set_current_user(scan_user)
+    open_scan = Scanning.objects.create(drawer=drawer, user=scan_user, start_time=now - timedelta(minutes=30))
+    closed = Scanning.objects.create(
+        drawer=drawer, user=scan_user, start_time=now - timedelta(hours=2), end_time=now + timedelta(minutes=1)
+    )
+    earlier = Scanning.objects.create(
+        drawer=drawer, user=scan_user, start_time=now - timedelta(hours=3), end_time=now - timedelta(hours=1)
+    )
+
+    index = ScanningIndex.covering([now, now - timedelta(minutes=90), now + timedelta(minutes=2)])
+
+    assert index.find(now) == closed
+    assert index.find(now - timedelta(minutes=90)) == closed
+    assert index.find(now - timedelta(hours=2, minutes=30)) == earlier
+    assert index.find(now + timedelta(minutes=2)) == open_scan
+    assert index.find(now - timedelta(hours=5)) is None
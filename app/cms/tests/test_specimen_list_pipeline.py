@@ -0,0 +1,111 @@
+import threading
+import uuid
+from unittest.mock import patch
+
+import pytest
+from crum import set_current_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+
+from cms import tasks
+from cms.models import SpecimenListPage, SpecimenListPDF
+from cms.tasks import run_specimen_list_pipeline
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"staff-{uuid.uuid4().hex}", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _create_page(page_number=1, **kwargs):
+    pdf = SpecimenListPDF.objects.create(
+        source_label="Batch",
+        original_filename="batch.pdf",
+        stored_file=SimpleUploadedFile("batch.pdf", b"%PDF-1.4", content_type="application/pdf"),
+    )
+    page = SpecimenListPage.objects.create(pdf=pdf, page_number=page_number, **kwargs)
+    page.image_file.save("page.png", SimpleUploadedFile("page.png", b"img", content_type="image/png"), save=True)
+    return page
+
+
+@patch("cms.tasks.run_specimen_list_row_extraction")
+@patch("cms.tasks.run_specimen_list_raw_ocr")
+@patch("cms.tasks.classify_specimen_list_page")
+@patch("cms.tasks.prepare_image_url", return_value="data:image/jpeg;base64,encoded")
+def test_pipeline_streams_page_through_all_stages(mock_prepare, mock_classify, mock_raw, mock_rows, staff_user):
+    mock_classify.return_value = {"page_type": "specimen_list_details", "confidence": 0.9}
+    mock_rows.return_value = []
+    page = _create_page()
+
+    summary = run_specimen_list_pipeline(ids=[page.id])
+    page.refresh_from_db()
+
+    assert summary.pages == 1
+    assert [stage.successes for stage in summary.stages.values()] == [1, 1, 1]
+    assert page.pipeline_status == SpecimenListPage.PipelineStatus.EXTRACTED
+    assert [call.args[1] for call in mock_prepare.call_args_list] == ["classify", "ocr"]
+    assert mock_raw.call_args.kwargs["image_url"] == mock_rows.call_args.kwargs["image_url"]
+    assert mock_rows.call_args.kwargs["ocr_entry"] is mock_raw.return_value
+
+
+@patch("cms.tasks.run_specimen_list_row_extraction")
+@patch("cms.tasks.run_specimen_list_raw_ocr")
+@patch("cms.tasks.classify_specimen_list_page")
+def test_pipeline_skips_rows_for_other_page_types(mock_classify, mock_raw, mock_rows, staff_user):
+    mock_classify.return_value = {"page_type": "typewritten_text"}
+    page = _create_page()
+
+    summary = run_specimen_list_pipeline(ids=[page.id])
+
+    assert summary.stages["raw"].successes == 1
+    assert summary.stages["rows"].total == 0
+    mock_rows.assert_not_called()
+
+
+@patch("cms.tasks.run_specimen_list_raw_ocr", side_effect=RuntimeError("boom"))
+def test_pipeline_stops_page_after_failed_stage(mock_raw, staff_user):
+    page = _create_page(
+        classification_status=SpecimenListPage.ClassificationStatus.CLASSIFIED,
+        page_type=SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS,
+        pipeline_status=SpecimenListPage.PipelineStatus.CLASSIFIED,
+    )
+
+    summary = run_specimen_list_pipeline(ids=[page.id])
+
+    assert summary.stages["classify"].total == 0
+    assert summary.stages["raw"].failures == 1
+    assert summary.stages["rows"].total == 0
+    assert summary.errors == [f"page {page.id}: raw OCR failed"]
+
+
+def test_concurrent_pipeline_bounds_each_stage(staff_user):
+    pages = [_create_page(page_number=number) for number in range(1, 7)]
+    lock = threading.Lock()
+    running = {"classify": 0, "raw": 0}
+    peak = {"classify": 0, "raw": 0}
+    finished = []
+
+    def _stage(name):
+        def run(item, force):
+            with lock:
+                running[name] += 1
+                peak[name] = max(peak[name], running[name])
+            with lock:
+                running[name] -= 1
+                if name == "raw":
+                    finished.append(item.page.id)
+
+        return run
+
+    runners = {"classify": _stage("classify"), "raw": _stage("raw"), "rows": _stage("rows")}
+    with patch.dict(tasks._STAGE_RUNNERS, runners), patch.object(tasks, "_stage_accepts", return_value=True):
+        summary = run_specimen_list_pipeline(stages=("classify", "raw"), workers=2)
+
+    assert summary.stages["classify"].successes == len(pages)
+    assert summary.stages["raw"].successes == len(pages)
+    assert sorted(finished) == sorted(page.id for page in pages)
+    assert peak["classify"] <= 2 and peak["raw"] <= 2
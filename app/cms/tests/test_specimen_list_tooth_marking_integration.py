@@ -118,3 +118,29 @@ class SpecimenListToothMarkingIntegrationTests(TestCase):
         self.assertIn("row 1:", message)
         self.assertIn("KNM, KNMI, KNMP", message)
 
+
+
+class SpecimenListPageTokenBoxStoreTests(TestCase):
+    def test_store_round_trips_token_boxes_per_backend_and_roi(self):
+        from cms.ocr_boxes.base import TokenBox
+        from cms.ocr_boxes.stores import SpecimenListPageTokenBoxStore
+
+        pdf_file = SimpleUploadedFile("specimen.pdf", b"%PDF-1.4", content_type="application/pdf")
+        pdf = SpecimenListPDF.objects.create(
+            source_label="Specimen List",
+            original_filename="specimen.pdf",
+            stored_file=pdf_file,
+        )
+        page = SpecimenListPage.objects.create(pdf=pdf, page_number=1)
+        store = SpecimenListPageTokenBoxStore(page)
+        boxes = [TokenBox(token_id=0, text="M1", conf=0.9, x1=1, y1=2, x2=3, y2=4, line_id=1, block_id=2)]
+
+        self.assertIsNone(store.load("backend", None))
+        store.save("backend", None, boxes)
+        store.save("backend", None, boxes)
+
+        self.assertEqual(store.load("backend", None), boxes)
+        self.assertIsNone(store.load("backend", (0, 0, 10, 10)))
+        self.assertIsNone(store.load("other-backend", None))
+        self.assertEqual(page.token_boxes.count(), 1)
+        self.assertFalse(page.ocr_entries.exists())
@@ -7,6 +7,8 @@ from django.core.management import call_command
 
 from cms.models import SpecimenListPDF, SpecimenListPage
 from cms.tasks import (
+    OCRQueueSummary,
+    SpecimenListPipelineSummary,
     _coerce_confidence,
     _normalize_page_type,
     _set_pipeline_status,
@@ -14,30 +16,51 @@ from cms.tasks import (
 )
 
 
+def _pipeline_summary(**stages):
+    return SpecimenListPipelineSummary(
+        stages={
+            name: OCRQueueSummary(successes=values[0], failures=values[1], total=values[2], errors=values[3])
+            for name, values in stages.items()
+        }
+    )
+
+
 @pytest.mark.django_db
-@patch("cms.management.commands.classify_specimen_pages.classify_pending_specimen_pages")
-def test_classify_specimen_pages_command_outputs_summary(mock_classify, capsys):
-    mock_classify.return_value = type("S", (), {"errors": ["page 1: bad"], "successes": 2, "failures": 1, "total": 3})()
+@patch("cms.management.commands.classify_specimen_pages.run_specimen_list_pipeline")
+def test_classify_specimen_pages_command_outputs_summary(mock_pipeline, capsys):
+    mock_pipeline.return_value = _pipeline_summary(classify=(2, 1, 3, ["page 1: bad"]))
     call_command("classify_specimen_pages", "--limit", "5", "--force")
     out = capsys.readouterr().out
+    mock_pipeline.assert_called_once_with(stages=("classify",), limit=5, ids=None, force=True, workers=1)
     assert "page 1: bad" in out
     assert "Classified 2 pages with 1 failures (total 3)." in out
 
 
 @pytest.mark.django_db
-@patch("cms.management.commands.process_specimen_list_ocr.run_specimen_list_ocr_queue")
-@patch("cms.management.commands.process_specimen_list_ocr.run_specimen_list_row_extraction_queue")
-def test_process_specimen_list_ocr_command_runs_both_stages(mock_rows, mock_raw, capsys):
-    mock_raw.return_value = type("S", (), {"errors": [], "successes": 1, "failures": 0, "total": 1})()
-    mock_rows.return_value = type("S", (), {"errors": ["row failed"], "successes": 0, "failures": 1, "total": 1})()
+@patch("cms.management.commands.process_specimen_list_ocr.run_specimen_list_pipeline")
+def test_process_specimen_list_ocr_command_runs_both_stages(mock_pipeline, capsys):
+    mock_pipeline.return_value = _pipeline_summary(raw=(1, 0, 1, []), rows=(0, 1, 1, ["row failed"]))
 
-    call_command("process_specimen_list_ocr", "--stage", "both", "--limit", "2")
+    call_command("process_specimen_list_ocr", "--stage", "both", "--limit", "2", "--workers", "3")
     out = capsys.readouterr().out
+    mock_pipeline.assert_called_once_with(stages=("raw", "rows"), limit=2, ids=None, force=False, workers=3)
     assert "OCR: 1 succeeded, 0 failed (total 1)." in out
     assert "row failed" in out
     assert "Rows: 0 succeeded, 1 failed (total 1)." in out
 
 
+@pytest.mark.django_db
+@patch("cms.management.commands.process_pending_scans.process_pending_scans")
+def test_process_pending_scans_command_passes_workers(mock_process, capsys):
+    mock_process.return_value = (2, 1, 3, ["c.png: scan failed"], None, ["a.png", "b.png", "c.png"], False)
+
+    call_command("process_pending_scans", "--limit", "3", "--workers", "4")
+    out = capsys.readouterr().out
+    mock_process.assert_called_once_with(limit=3, workers=4)
+    assert "c.png: scan failed" in out
+    assert "OCR: 2 succeeded, 1 failed (total 3, workers 4)." in out
+
+
 @pytest.mark.django_db
 @patch("cms.management.commands.process_specimen_list_pdfs.process_specimen_list_pdf")
 def test_process_specimen_list_pdfs_command_processes_uploaded_items(mock_process, capsys):
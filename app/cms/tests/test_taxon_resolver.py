@@ -0,0 +1,95 @@
+import pytest
+from crum import set_current_user
+from django.contrib.auth import get_user_model
+
+from cms.models import Identification, Taxon, TaxonExternalSource, TaxonRank, TaxonStatus
+from cms.taxonomy.resolver import resolve_controlled_taxa, resolve_controlled_taxon, taxon_match_scope
+from cms.taxonomy.sync import apply_changes
+
+
+pytestmark = pytest.mark.django_db
+
+
+def make_taxon(name: str, *, external_id: str | None = None, authorship: str = "Author") -> Taxon:
+    return Taxon.objects.create(
+        external_source=TaxonExternalSource.NOW,
+        external_id=external_id or f"NOW:genus:{name}",
+        status=TaxonStatus.ACCEPTED,
+        is_active=True,
+        taxon_rank=TaxonRank.GENUS,
+        taxon_name=name,
+        kingdom="Animalia",
+        phylum="Chordata",
+        class_name="Mammalia",
+        order="Primates",
+        family="Hominidae",
+        genus=name,
+        scientific_name_authorship=authorship,
+    )
+
+
+@pytest.fixture
+def user():
+    user = get_user_model().objects.create_user(username="taxonomist", password="pass")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def test_taxon_save_stores_normalized_name(user):
+    taxon = make_taxon("Homo")
+    assert taxon.taxon_name_normalized == "homo"
+
+    taxon.taxon_name = " Pan "
+    taxon.save(update_fields=["taxon_name"])
+    taxon.refresh_from_db()
+    assert taxon.taxon_name_normalized == "pan"
+
+    apply_changes(taxon, {"taxon_name": "Gorilla"})
+    assert taxon.taxon_name_normalized == "gorilla"
+
+
+def test_resolve_many_names_in_one_query_then_from_scope(user, django_assert_num_queries):
+    homo = make_taxon("Homo")
+    pan = make_taxon("Pan")
+
+    with taxon_match_scope():
+        with django_assert_num_queries(1):
+            resolved = resolve_controlled_taxa(["HOMO", " pan", "Gorilla", "", None])
+        assert resolved == {"homo": homo, "pan": pan, "gorilla": None}
+
+        with django_assert_num_queries(0):
+            assert resolve_controlled_taxon("Homo") == homo
+            assert resolve_controlled_taxon("gorilla") is None
+
+    # Outside a scope misses are not remembered.
+    gorilla = make_taxon("Gorilla")
+    with django_assert_num_queries(1):
+        assert resolve_controlled_taxon("gorilla") == gorilla
+
+
+def test_taxon_saves_invalidate_scoped_matches(user):
+    make_taxon("Homo")
+    with taxon_match_scope():
+        assert resolve_controlled_taxon("homo") is not None
+
+        # A second accepted taxon with the same name makes the match ambiguous.
+        make_taxon("Homo", external_id="NOW:genus:Homo-2", authorship="Other")
+        assert resolve_controlled_taxon("homo") is None
+
+
+def test_identification_links_taxon_through_resolver(user):
+    from cms.models import Accession, AccessionRow, Collection, Locality
+
+    homo = make_taxon("Homo")
+    collection = Collection.objects.create(abbreviation="TX", description="Taxon tests")
+    locality = Locality.objects.create(abbreviation="TL", name="Taxon Locality")
+    accession = Accession.objects.create(collection=collection, specimen_prefix=locality, specimen_no=1)
+    row = AccessionRow.objects.create(accession=accession)
+
+    first = Identification.objects.create(accession_row=row, taxon_verbatim="homo")
+    assert first.taxon_record == homo
+
+    second = Identification(accession_row=row, taxon_verbatim="Homo")
+    second._sync_taxon_fields()
+    assert second.taxon_record == homo
@@ -6,6 +6,7 @@ from django.contrib.auth import get_user_model
 from app.cms.models import (
     Accession,
     AccessionRow,
+    AccessionSearchSummary,
     Collection,
     Identification,
     Locality,
@@ -14,7 +15,6 @@ from app.cms.models import (
     TaxonRank,
     TaxonStatus,
 )
-from app.cms.views import attach_accession_summaries
 
 
 pytestmark = pytest.mark.django_db
@@ -65,7 +65,7 @@ def make_accession_row(user) -> AccessionRow:
     return accession_row
 
 
-def test_attach_accession_summaries_prefers_controlled_taxon_name():
+def test_accession_search_summary_prefers_controlled_taxon_name():
     user_model = get_user_model()
     user = user_model.objects.create(username="summary-user")
     accession_row = make_accession_row(user)
@@ -82,10 +82,10 @@ def test_attach_accession_summaries_prefers_controlled_taxon_name():
     )
     set_current_user(None)
 
-    accession = accession_row.accession
-    attach_accession_summaries([accession])
+    summary = AccessionSearchSummary.objects.get(accession=accession_row.accession)
 
-    assert accession.taxa_list == ["Alternate entry", "Verbatim only"]
+    assert summary.taxa_list == ["Alternate entry", "Verbatim only"]
+    assert summary.identification_count == 2
 
 
 def test_admin_displays_taxonomy_fields_readonly():
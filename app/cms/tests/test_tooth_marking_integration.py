@@ -1,13 +1,24 @@
+import tempfile
+from pathlib import Path
 from unittest import TestCase
 from unittest import mock
 
+from PIL import Image
+
+from cms.ocr_boxes.base import TokenBox
+from cms.ocr_boxes.cache import page_token_cache
 from cms.tooth_markings import integration
+from cms.tooth_markings.rewrite import candidate_match_key, find_correction_candidates
 
 
 class ToothMarkingIntegrationTests(TestCase):
     def test_apply_tooth_marking_correction_returns_deterministic_keys(self):
         with mock.patch.dict("os.environ", {"TOOTH_MARKING_MIN_CONF": "0.85"}, clear=False):
-            with mock.patch.object(integration, "get_token_boxes", return_value=[object()]):
+            with mock.patch.object(
+                integration,
+                "get_token_boxes",
+                return_value=[TokenBox(token_id=0, text="Ml", conf=0.9, x1=0, y1=0, x2=8, y2=8)],
+            ):
                 with mock.patch.object(integration, "get_token_crops", return_value=[{"token": "Ml", "image": object()}]):
                     with mock.patch.object(
                         integration,
@@ -49,3 +60,116 @@ class ToothMarkingIntegrationTests(TestCase):
         self.assertEqual(result["detections"], [])
         self.assertEqual(result["replacements_applied"], 0)
         self.assertEqual(result["error"], "ocr failed")
+
+    def test_page_tokens_are_computed_once_per_page_image(self):
+        page_token_cache.clear()
+        self.addCleanup(page_token_cache.clear)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            image_path = Path(tmp_dir) / "page.png"
+            Image.new("RGB", (60, 40), "white").save(image_path)
+            boxes = [TokenBox(token_id=0, text="Ml", conf=0.9, x1=1, y1=2, x2=20, y2=12)]
+
+            with mock.patch.object(integration, "get_token_boxes", return_value=boxes) as mock_boxes:
+                with mock.patch.object(
+                    integration,
+                    "correct_element_text",
+                    return_value={"element_raw": "Ml", "element_corrected": "Ml", "detections": []},
+                ) as mock_correct:
+                    for element_text in ("Ml", "Ml left", "Ml right"):
+                        integration.apply_tooth_marking_correction(str(image_path), element_text)
+
+            self.assertEqual(mock_boxes.call_count, 1)
+            crops = [call.kwargs["token_crops"] for call in mock_correct.call_args_list]
+            self.assertEqual(len(crops), 3)
+            self.assertIs(crops[0][0]["image"], crops[2][0]["image"])
+            self.assertIsNot(crops[0][0], crops[2][0])
+            self.assertEqual(page_token_cache.hits, 2)
+
+    def test_token_store_supplies_boxes_without_running_backend(self):
+        page_token_cache.clear()
+        self.addCleanup(page_token_cache.clear)
+        stored = [TokenBox(token_id=0, text="M2", conf=0.8, x1=0, y1=0, x2=5, y2=5)]
+        store = mock.Mock()
+        store.load.return_value = stored
+
+        with mock.patch.object(integration, "get_token_boxes") as mock_boxes:
+            boxes, crops = integration.load_page_tokens(
+                Image.new("RGB", (10, 10), "white"),
+                token_store=store,
+            )
+
+        mock_boxes.assert_not_called()
+        store.save.assert_not_called()
+        self.assertEqual(boxes, stored)
+        self.assertEqual(crops[0]["bbox"], (0, 0, 5, 5))
+
+    def test_only_tokens_matching_element_suspects_are_classified(self):
+        page_token_cache.clear()
+        self.addCleanup(page_token_cache.clear)
+        boxes = [
+            TokenBox(token_id=0, text="mandible", conf=0.9, x1=0, y1=0, x2=30, y2=10),
+            TokenBox(token_id=1, text="Ml", conf=0.9, x1=32, y1=0, x2=40, y2=10),
+            TokenBox(token_id=2, text="fragment,", conf=0.9, x1=42, y1=0, x2=70, y2=10),
+            TokenBox(token_id=3, text="p3", conf=0.9, x1=72, y1=0, x2=80, y2=10),
+            TokenBox(token_id=4, text="M2", conf=0.9, x1=82, y1=0, x2=90, y2=10),
+        ]
+        image = Image.new("RGB", (100, 20), "white")
+
+        with mock.patch.object(integration, "get_token_boxes", return_value=boxes):
+            with mock.patch.object(
+                integration,
+                "correct_element_text",
+                return_value={"detections": []},
+            ) as mock_correct:
+                integration.apply_tooth_marking_correction(image, "mandible fragment with M1 and p3")
+
+        crops = mock_correct.call_args.kwargs["token_crops"]
+        self.assertEqual(
+            [(crop["token"], crop["ocr_token"], crop["start"], crop["end"]) for crop in crops],
+            [("M1", "Ml", 23, 25), ("p3", "p3", 30, 32)],
+        )
+        self.assertEqual(crops[0]["bbox"], (32, 0, 40, 10))
+
+    def test_element_without_suspects_skips_ocr_and_inference(self):
+        with mock.patch.object(integration, "get_token_boxes") as mock_boxes:
+            with mock.patch.object(integration, "correct_element_text") as mock_correct:
+                result = integration.apply_tooth_marking_correction("dummy.png", "mandible fragment")
+
+        mock_boxes.assert_not_called()
+        mock_correct.assert_not_called()
+        self.assertEqual(result["element_corrected"], "mandible fragment")
+        self.assertEqual(result["detections"], [])
+        self.assertIsNone(result["error"])
+
+    def test_match_keys_pair_case_variants_and_misread_index_digits(self):
+        self.assertEqual(candidate_match_key("I2"), candidate_match_key("i2"))
+        self.assertEqual(candidate_match_key("LM1"), candidate_match_key("lM1"))
+        self.assertEqual(candidate_match_key("lMl"), "lm1")
+        self.assertEqual(candidate_match_key("Ml,"), candidate_match_key("M1"))
+        self.assertEqual(candidate_match_key("Pz"), "p2")
+
+    def test_suspects_only_match_boxes_on_their_own_line(self):
+        boxes = [
+            TokenBox(token_id=0, text="M1", conf=0.9, x1=0, y1=0, x2=8, y2=8, line_id=1),
+            TokenBox(token_id=1, text="molar", conf=0.9, x1=10, y1=0, x2=30, y2=8, line_id=1),
+            TokenBox(token_id=2, text="Ml", conf=0.9, x1=0, y1=20, x2=8, y2=28, line_id=2),
+            TokenBox(token_id=3, text="crown", conf=0.9, x1=10, y1=20, x2=30, y2=28, line_id=2),
+        ]
+        element_text = "M1 crown"
+
+        matches = integration.match_suspect_boxes(
+            find_correction_candidates(element_text), boxes, element_text=element_text
+        )
+
+        self.assertEqual([(suspect.token, box.token_id) for suspect, box in matches], [("M1", 2)])
+
+    def test_ambiguous_boxes_are_not_rewritten(self):
+        boxes = [
+            TokenBox(token_id=0, text="M1", conf=0.9, x1=0, y1=0, x2=8, y2=8, line_id=1),
+            TokenBox(token_id=1, text="Ml", conf=0.9, x1=0, y1=20, x2=8, y2=28, line_id=2),
+        ]
+
+        self.assertEqual(
+            integration.match_suspect_boxes(find_correction_candidates("M1"), boxes, element_text="M1"),
+            [],
+        )
@@ -18,9 +18,16 @@ from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import Client
 from django.urls import reverse
+from PIL import Image, ImageDraw
 
-from cms.models import Media  # noqa: E402  pylint: disable=wrong-import-position
-from cms.upload_processing import process_file  # noqa: E402  pylint: disable=wrong-import-position
+from cms import jobs  # noqa: E402  pylint: disable=wrong-import-position
+from cms.models import Media, SpecimenListPDF, SpecimenListPage  # noqa: E402  pylint: disable=wrong-import-position
+from cms.upload_processing import (  # noqa: E402  pylint: disable=wrong-import-position
+    _page_ranges,
+    ingest_files,
+    process_file,
+    process_specimen_list_pdf,
+)
 
 
 
@@ -97,6 +104,7 @@ def test_upload_scan_accepts_manual_qc_jpeg(client):
     response = client.post(reverse("admin-upload-scan"), {"files": [upload]}, follow=True)
 
     assert response.status_code == 200
+    jobs.run_job(jobs.claim_next("test-worker"), "test-worker")
     manual_path = Path(settings.MEDIA_ROOT) / "uploads" / "manual_qc" / "1.jpg"
     assert manual_path.exists()
 
@@ -104,3 +112,130 @@ def test_upload_scan_accepts_manual_qc_jpeg(client):
     assert media.media_location == "uploads/manual_qc/1.jpg"
     assert media.file_name == "1.jpg"
     assert media.scanning_id is None
+
+
+def _write_scan(path, shade=0):
+    image = Image.new("L", (400, 250), "white")
+    draw = ImageDraw.Draw(image)
+    for index in range(8):
+        draw.rectangle((index * 50, 0, index * 50 + 20, 250), fill=index * 30)
+    if shade:
+        image.putpixel((399, 249), shade)
+    image.save(path, format="PNG")
+    return path
+
+
+def test_process_file_short_circuits_exact_duplicate_scans():
+    incoming = Path(settings.MEDIA_ROOT) / "uploads" / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    first = process_file(_write_scan(incoming / "2024-01-01T100000.png"))
+    second = process_file(_write_scan(incoming / "2024-01-01T100500.png"))
+
+    original = Media.objects.get(media_location="uploads/pending/2024-01-01T100000.png")
+    duplicate = Media.objects.get(media_location="uploads/duplicates/2024-01-01T100500.png")
+    assert first.parent.name == "pending"
+    assert second.parent.name == "duplicates"
+    assert original.content_sha256 == duplicate.content_sha256
+    assert len(original.perceptual_hash) == 16
+    assert duplicate.ocr_status == Media.OCRStatus.DUPLICATE
+    assert duplicate.duplicate_of == original
+    assert duplicate.duplicate_distance == 0
+
+
+def test_process_file_links_near_duplicate_scans():
+    incoming = Path(settings.MEDIA_ROOT) / "uploads" / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    process_file(_write_scan(incoming / "2024-01-01T100000.png"))
+    dest = process_file(_write_scan(incoming / "2024-01-01T100500.png", shade=40))
+
+    original = Media.objects.get(media_location="uploads/pending/2024-01-01T100000.png")
+    rescan = Media.objects.get(media_location="uploads/pending/2024-01-01T100500.png")
+    assert dest.parent.name == "pending"
+    assert rescan.content_sha256 != original.content_sha256
+    assert rescan.ocr_status == Media.OCRStatus.PENDING
+    assert rescan.duplicate_of == original
+    assert rescan.duplicate_distance <= 3
+
+
+def test_ingest_files_links_duplicates_within_one_batch():
+    incoming = Path(settings.MEDIA_ROOT) / "uploads" / "incoming"
+    incoming.mkdir(parents=True, exist_ok=True)
+    paths = [
+        _write_scan(incoming / "2024-01-01T100000.png"),
+        _write_scan(incoming / "2024-01-01T100500.png"),
+        _write_scan(incoming / "2024-01-01T101000.png", shade=40),
+        incoming / "badname.png",
+    ]
+    paths[-1].write_bytes(b"data")
+
+    destinations = ingest_files(paths, batch_size=10)
+
+    assert [dest.parent.name for dest in destinations] == ["pending", "duplicates", "pending", "rejected"]
+    original = Media.objects.get(media_location="uploads/pending/2024-01-01T100000.png")
+    duplicate = Media.objects.get(media_location="uploads/duplicates/2024-01-01T100500.png")
+    rescan = Media.objects.get(media_location="uploads/pending/2024-01-01T101000.png")
+    assert duplicate.ocr_status == Media.OCRStatus.DUPLICATE
+    assert (duplicate.duplicate_of, duplicate.duplicate_distance) == (original, 0)
+    assert rescan.duplicate_of == original
+    assert original.file_name == "2024-01-01T100000.png"
+    assert original.history.count() == 1
+    assert Media.objects.count() == 3
+
+
+def test_page_ranges_groups_contiguous_pages_into_shards():
+    assert _page_ranges([1, 2, 3, 5, 6, 9], 1) == [(1, 3), (5, 6), (9, 9)]
+    assert _page_ranges(list(range(1, 9)), 2) == [(1, 4), (5, 8)]
+    assert _page_ranges([], 4) == []
+
+
+def _fake_render(rendered_dir):
+    def render(pdf_path, output_dir, dpi, page_ranges, workers=1):
+        numbers = [1, 2, 3] if page_ranges is None else [
+            number for start, end in page_ranges for number in range(start, end + 1)
+        ]
+        for number in numbers:
+            path = rendered_dir / f"page-{number}.png"
+            path.write_bytes(b"png")
+            yield number, path
+
+    return render
+
+
+def test_process_specimen_list_pdf_renders_whole_document_in_one_pass(tmp_path):
+    pdf = SpecimenListPDF.objects.create(
+        original_filename="ledger.pdf",
+        stored_file=SimpleUploadedFile("ledger.pdf", b"%PDF-1.4", content_type="application/pdf"),
+    )
+
+    with patch("cms.upload_processing._get_pdf_page_count") as page_count, patch(
+        "cms.upload_processing._render_pdf_pages", side_effect=_fake_render(tmp_path)
+    ) as render:
+        process_specimen_list_pdf(pdf.id)
+
+    pdf.refresh_from_db()
+    page_count.assert_not_called()
+    assert render.call_args.kwargs["page_ranges"] is None
+    assert pdf.status == SpecimenListPDF.Status.SPLIT
+    assert pdf.page_count == 3
+    assert list(pdf.pages.order_by("page_number").values_list("page_number", flat=True)) == [1, 2, 3]
+
+
+def test_process_specimen_list_pdf_renders_only_missing_pages(tmp_path):
+    pdf = SpecimenListPDF.objects.create(
+        original_filename="ledger.pdf",
+        stored_file=SimpleUploadedFile("ledger.pdf", b"%PDF-1.4", content_type="application/pdf"),
+    )
+    done = SpecimenListPage.objects.create(pdf=pdf, page_number=2)
+    done.image_file.save("page_002.png", SimpleUploadedFile("page_002.png", b"png"), save=True)
+    SpecimenListPage.objects.create(pdf=pdf, page_number=4)
+
+    with patch("cms.upload_processing._get_pdf_page_count", return_value=5), patch(
+        "cms.upload_processing._render_pdf_pages", side_effect=_fake_render(tmp_path)
+    ) as render:
+        process_specimen_list_pdf(pdf.id)
+
+    pdf.refresh_from_db()
+    assert render.call_args.kwargs["page_ranges"] == [(1, 1), (3, 5)]
+    assert pdf.page_count == 5
+    assert pdf.pages.count() == 5
+    assert all(page.image_file for page in pdf.pages.all())
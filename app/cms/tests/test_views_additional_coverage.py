@@ -2,7 +2,6 @@ from __future__ import annotations
 
 from datetime import datetime
 from types import SimpleNamespace
-from unittest.mock import patch
 
 import pytest
 from django.contrib.auth.models import AnonymousUser, Group
@@ -31,8 +30,7 @@ class TestViewCoverageAdditions:
         user.groups.add(Group.objects.create(name="Collection Managers"))
         client.force_login(user)
 
-        with patch("cms.views.Media.objects.values", return_value=[]):
-            response = client.get(reverse("media_report"))
+        response = client.get(reverse("media_report"))
 
         assert response.status_code == 200
         assert "No media data available for reporting yet." in response.content.decode()
@@ -42,18 +40,7 @@ class TestViewCoverageAdditions:
         user.groups.add(Group.objects.create(name="Collection Managers"))
         client.force_login(user)
 
-        class _EmptyQS:
-            def values(self, *_args, **_kwargs):
-                return self
-
-            def annotate(self, *_args, **_kwargs):
-                return self
-
-            def order_by(self, *_args, **_kwargs):
-                return []
-
-        with patch("cms.views.Accession.objects", _EmptyQS()):
-            response = client.get(reverse("accession_distribution_report"))
+        response = client.get(reverse("accession_distribution_report"))
 
         assert response.status_code == 200
         assert "No accession data available yet." in response.content.decode()
@@ -1,17 +1,13 @@
 from datetime import date
 from decimal import Decimal
-from types import SimpleNamespace
 
 from cms.views import (
     _coerce_decimal,
-    _compute_expected_total,
     _form_order_value,
     _form_row_id,
     _ident_payload_has_explicit_fields,
     _natures_payload_has_meaningful_data,
-    _parse_ocr_limit,
     _set_interpreted,
-    _should_loop,
     _split_csv_tokens,
 )
 
@@ -33,22 +29,6 @@ class _FakeForm:
         return self._fields[key]
 
 
-def test_should_loop_and_parse_ocr_limit_behaviour():
-    req = SimpleNamespace(GET={"loop": "yes", "limit": "25"})
-    assert _should_loop(req) is True
-    assert _parse_ocr_limit(req) == 25
-
-    req = SimpleNamespace(GET={"loop": "no", "limit": "-1"})
-    assert _should_loop(req) is False
-    assert _parse_ocr_limit(req) is None
-
-
-def test_compute_expected_total_honours_limit():
-    assert _compute_expected_total(attempted=1, remaining=5, limit=None) == 6
-    assert _compute_expected_total(attempted=1, remaining=9, limit=3) == 3
-    assert _compute_expected_total(attempted=5, remaining=9, limit=3) == 5
-
-
 def test_coerce_decimal_falls_back_to_zero():
     assert _coerce_decimal(None) == Decimal("0")
     assert _coerce_decimal("") == Decimal("0")
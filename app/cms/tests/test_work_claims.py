@@ -0,0 +1,100 @@
+import uuid
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from crum import set_current_user
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
+from django.utils import timezone
+
+from cms.models import Media, SpecimenListPage, SpecimenListPDF
+from cms.ocr_processing import process_pending_scans
+from cms.tasks import run_specimen_list_pipeline
+from cms.work_claims import WorkClaims
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def staff_user(django_user_model):
+    user = django_user_model.objects.create_user(username=f"claims-{uuid.uuid4().hex}", password="x")
+    set_current_user(user)
+    yield user
+    set_current_user(None)
+
+
+def _pending_scans(media_root, *names):
+    pending = media_root / "uploads" / "pending"
+    pending.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        (pending / name).write_bytes(b"x")
+    return [Media.objects.create(media_location=f"uploads/pending/{name}") for name in names]
+
+
+def test_claims_are_exclusive_until_released_or_expired(staff_user):
+    first, second = (Media.objects.create(media_location=f"uploads/pending/{name}") for name in ("a.png", "b.png"))
+    queryset = Media.objects.order_by("media_location")
+    node_a = WorkClaims(Media, owner="node-a")
+    node_b = WorkClaims(Media, owner="node-b")
+
+    assert node_a.claim(queryset, 1) == [first.pk]
+    assert node_b.claim(queryset, 5) == [second.pk]
+    assert node_b.claim(queryset, 5) == []
+
+    node_a.release([first.pk])
+    assert node_b.claim(queryset, 5) == [first.pk]
+
+    Media.objects.filter(pk=second.pk).update(claim_expires_at=timezone.now() - timedelta(seconds=1))
+    assert node_a.claim(queryset, 5) == [second.pk]
+    # node-b no longer holds the lapsed claim, so renewing only extends one lease.
+    assert node_b.renew() == 1
+
+
+def test_pending_scans_claimed_by_another_node_are_skipped(tmp_path, staff_user):
+    taken, free = _pending_scans(tmp_path, "a.png", "b.png")
+    other_node = WorkClaims(Media, owner="other-node")
+    other_node.claim(Media.objects.filter(pk=taken.pk), 1)
+    attempted = []
+
+    with override_settings(MEDIA_ROOT=str(tmp_path)), patch(
+        "cms.ocr_processing._process_single_scan",
+        side_effect=lambda media, path, ocr_dir: attempted.append(path.name),
+    ):
+        successes, _failures, total, *_rest = process_pending_scans()
+
+    assert attempted == ["b.png"]
+    assert (successes, total) == (1, 1)
+    free.refresh_from_db()
+    taken.refresh_from_db()
+    assert free.claimed_by == "" and free.claim_expires_at is None
+    assert taken.claimed_by == "other-node"
+
+
+@patch("cms.tasks.run_specimen_list_raw_ocr")
+@patch("cms.tasks.prepare_image_url", return_value="data:image/jpeg;base64,encoded")
+def test_pipeline_skips_pages_claimed_by_another_node(mock_prepare, mock_raw, staff_user):
+    pdf = SpecimenListPDF.objects.create(
+        source_label="Claims",
+        original_filename="claims.pdf",
+        stored_file=SimpleUploadedFile("claims.pdf", b"%PDF-1.4", content_type="application/pdf"),
+    )
+    pages = []
+    for number in (1, 2):
+        page = SpecimenListPage.objects.create(
+            pdf=pdf,
+            page_number=number,
+            classification_status=SpecimenListPage.ClassificationStatus.CLASSIFIED,
+            page_type=SpecimenListPage.PageType.TYPED_TEXT,
+            pipeline_status=SpecimenListPage.PipelineStatus.CLASSIFIED,
+        )
+        page.image_file.save("page.png", SimpleUploadedFile("page.png", b"img", content_type="image/png"))
+        pages.append(page)
+    WorkClaims(SpecimenListPage, owner="other-node").claim(SpecimenListPage.objects.filter(pk=pages[0].pk), 1)
+
+    summary = run_specimen_list_pipeline(stages=("raw",))
+
+    assert summary.pages == 1
+    assert [call.args[0].pk for call in mock_raw.call_args_list] == [pages[1].pk]
+    pages[1].refresh_from_db()
+    assert pages[1].claimed_by == ""
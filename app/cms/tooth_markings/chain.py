@@ -2,28 +2,42 @@
 
 from __future__ import annotations
 
-from typing import Dict, Tuple
+import os
+from typing import Dict, List, Sequence, Tuple
 
 from PIL import Image
 
-from .predict import predict_index, predict_jaw, predict_type
-from .preprocess import image_to_batch
+from .predict import (
+    predict_index,
+    predict_index_batch,
+    predict_jaw,
+    predict_jaw_batch,
+    predict_type,
+    predict_type_batch,
+)
+from .preprocess import image_to_batch, images_to_batch
 
+_DEFAULT_BATCH_SIZE = 64
 
-def classify_token_image(image: Image.Image) -> Tuple[str, float, Dict[str, Dict[str, float | str]]]:
-    """Predict tooth notation from one token crop image.
+Classification = Tuple[str, float, Dict[str, Dict[str, float | str]]]
 
-    Returns:
-        notation: e.g. 'M2' or 'm2' (notebook format)
-        confidence: min probability across chain
-        parts: structured jaw/type/index predictions
-    """
-    image_rgb = image.convert("RGB")
-    input_batch = image_to_batch(image_rgb)
 
-    jaw_label, jaw_prob = predict_jaw(input_batch)
-    type_label, type_prob = predict_type(input_batch)
-    index_label, index_prob = predict_index(input_batch, type_label=type_label)
+def _batch_size_from_env() -> int:
+    raw = os.getenv("TOOTH_MARKING_BATCH_SIZE", str(_DEFAULT_BATCH_SIZE)).strip()
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return _DEFAULT_BATCH_SIZE
+
+
+def _compose(
+    jaw: Tuple[str, float],
+    tooth_type: Tuple[str, float],
+    index: Tuple[str, float],
+) -> Classification:
+    jaw_label, jaw_prob = jaw
+    type_label, type_prob = tooth_type
+    index_label, index_prob = index
 
     letter = type_label.upper() if jaw_label == "up" else type_label.lower()
     notation = f"{letter}{index_label}"
@@ -35,3 +49,46 @@ def classify_token_image(image: Image.Image) -> Tuple[str, float, Dict[str, Dict
         "index": {"label": index_label, "prob": index_prob},
     }
     return notation, confidence, parts
+
+
+def classify_token_image(image: Image.Image) -> Classification:
+    """Predict tooth notation from one token crop image.
+
+    Returns:
+        notation: e.g. 'M2' or 'm2' (notebook format)
+        confidence: min probability across chain
+        parts: structured jaw/type/index predictions
+    """
+    image_rgb = image.convert("RGB")
+    input_batch = image_to_batch(image_rgb)
+
+    jaw = predict_jaw(input_batch)
+    tooth_type = predict_type(input_batch)
+    index = predict_index(input_batch, type_label=tooth_type[0])
+    return _compose(jaw, tooth_type, index)
+
+
+def classify_token_images(
+    images: Sequence[Image.Image],
+    *,
+    batch_size: int | None = None,
+) -> List[Classification]:
+    """Predict tooth notations for many token crops at once.
+
+    Crops are preprocessed into batches of at most ``batch_size`` (default
+    ``TOOTH_MARKING_BATCH_SIZE`` or 64) and each head runs once per batch.
+    The index head is routed per sample by predicted type, exactly as in
+    :func:`classify_token_image`, and results are returned in input order.
+    """
+    if not images:
+        return []
+
+    size = batch_size or _batch_size_from_env()
+    results: List[Classification] = []
+    for offset in range(0, len(images), size):
+        input_batch = images_to_batch(images[offset : offset + size])
+        jaws = predict_jaw_batch(input_batch)
+        types = predict_type_batch(input_batch)
+        indexes = predict_index_batch(input_batch, type_labels=[label for label, _prob in types])
+        results.extend(_compose(jaw, tooth_type, index) for jaw, tooth_type, index in zip(jaws, types, indexes))
+    return results
@@ -4,9 +4,17 @@ from __future__ import annotations
 
 import logging
 import os
-from typing import Any
+from typing import Any, Callable
 
-from cms.ocr_boxes.service import get_token_boxes, get_token_crops
+from cms.ocr_boxes.base import TokenBox, TokenBoxStore
+from cms.ocr_boxes.cache import PageTokens, page_token_cache, page_tokens_cache_key, token_crop_key
+from cms.ocr_boxes.service import backend_cache_key, get_token_boxes, get_token_crops
+from cms.tooth_markings.rewrite import (
+    SuspectToken,
+    candidate_match_key,
+    find_correction_candidates,
+    is_candidate_token,
+)
 from cms.tooth_markings.service import correct_element_text
 
 logger = logging.getLogger(__name__)
@@ -74,16 +82,142 @@ def _apply_confident_replacements(
     return corrected, len(replacements)
 
 
+def _load_page_entry(
+    page_image: Any,
+    roi: tuple[int, int, int, int] | None,
+    token_store: TokenBoxStore | None,
+) -> PageTokens:
+    backend_key = backend_cache_key()
+    cache_key = page_tokens_cache_key(page_image, roi, backend_key)
+    if cache_key is not None:
+        cached = page_token_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+    token_boxes = token_store.load(backend_key, roi) if token_store is not None else None
+    if token_boxes is None:
+        token_boxes = get_token_boxes(page_image, roi=roi)
+        if token_store is not None:
+            token_store.save(backend_key, roi, token_boxes)
+
+    entry = PageTokens(tuple(token_boxes))
+    if cache_key is not None:
+        page_token_cache.set(cache_key, entry)
+    return entry
+
+
+def _crops_for_boxes(entry: PageTokens, page_image: Any, boxes: list[TokenBox]) -> list[dict[str, Any]]:
+    missing = [box for box in boxes if token_crop_key(box) not in entry.crops]
+    if missing:
+        for box, crop in zip(missing, get_token_crops(page_image, missing)):
+            entry.crops[token_crop_key(box)] = crop
+    return [dict(entry.crops[token_crop_key(box)]) for box in boxes]
+
+
+def load_page_tokens(
+    page_image: Any,
+    *,
+    roi: tuple[int, int, int, int] | None = None,
+    token_store: TokenBoxStore | None = None,
+    boxes_to_crop: Callable[[list[TokenBox]], list[TokenBox]] | None = None,
+) -> tuple[list[TokenBox], list[dict[str, Any]]]:
+    """Return token boxes and crops for ``page_image``, tokenising it at most once.
+
+    Boxes are served from the in-process page cache first, then from
+    ``token_store`` (when given), and only then from the OCR backend.
+    ``boxes_to_crop`` selects which boxes are cropped (all by default); crops
+    are cached per token and returned as fresh dictionaries so callers may
+    annotate them.
+    """
+
+    entry = _load_page_entry(page_image, roi, token_store)
+    token_boxes = list(entry.boxes)
+    selected = boxes_to_crop(token_boxes) if boxes_to_crop is not None else token_boxes
+    return token_boxes, _crops_for_boxes(entry, page_image, selected)
+
+
+def _boxes_by_line(token_boxes: list[TokenBox]) -> dict[tuple[int | None, int], list[TokenBox]]:
+    lines: dict[tuple[int | None, int], list[TokenBox]] = {}
+    for box in token_boxes:
+        if box.line_id is not None:
+            lines.setdefault((box.block_id, box.line_id), []).append(box)
+    return lines
+
+
+def _contains_words(line: list[TokenBox], words: list[str]) -> bool:
+    keys = [candidate_match_key(box.text) for box in sorted(line, key=lambda box: box.token_id)]
+    return any(keys[index : index + len(words)] == words for index in range(len(keys) - len(words) + 1))
+
+
+def _element_scope(token_boxes: list[TokenBox], element_text: str) -> list[TokenBox]:
+    """Return the boxes of the one OCR line showing ``element_text``.
+
+    Without line ids, or when no single line shows the whole element (it
+    wraps, or OCR split it differently), the page or ROI is the scope. When
+    several lines show it, which one the element came from is unknown and no
+    boxes qualify.
+    """
+
+    words = [key for key in (candidate_match_key(word) for word in element_text.split()) if key]
+    lines = _boxes_by_line(token_boxes)
+    if not words or not lines:
+        return token_boxes
+    showing = [line for line in lines.values() if _contains_words(line, words)]
+    if not showing:
+        return token_boxes
+    if len(showing) > 1:
+        return []
+    return showing[0]
+
+
+def match_suspect_boxes(
+    suspects: list[SuspectToken],
+    token_boxes: list[TokenBox],
+    *,
+    element_text: str = "",
+) -> list[tuple[SuspectToken, TokenBox]]:
+    """Pair element-text suspects with OCR token boxes showing the same token.
+
+    Only tooth-like boxes on the element's own line (see :func:`_element_scope`)
+    are considered. Suspects sharing a normalised key pair with that line's
+    boxes of the key in reading order, and only when there are exactly as many
+    boxes as suspects; otherwise the pairing is ambiguous and those suspects are
+    left unrewritten rather than given another row's crop.
+    """
+
+    available: dict[str, list[TokenBox]] = {}
+    for box in sorted(_element_scope(token_boxes, element_text), key=lambda box: box.token_id):
+        if is_candidate_token(box.text):
+            available.setdefault(candidate_match_key(box.text), []).append(box)
+
+    by_key: dict[str, list[SuspectToken]] = {}
+    for suspect in suspects:
+        by_key.setdefault(candidate_match_key(suspect.token), []).append(suspect)
+
+    paired: dict[SuspectToken, TokenBox] = {}
+    for key, keyed_suspects in by_key.items():
+        boxes = available.get(key, [])
+        if len(boxes) == len(keyed_suspects):
+            paired.update(zip(keyed_suspects, boxes))
+    return [(suspect, paired[suspect]) for suspect in suspects if suspect in paired]
+
+
 def apply_tooth_marking_correction(
     page_image: Any,
     element_text: str,
     *,
     roi: tuple[int, int, int, int] | None = None,
+    token_store: TokenBoxStore | None = None,
 ) -> dict[str, Any]:
     """Apply tooth-marking correction using OCR token boxes.
 
-    Returns deterministic keys and never raises, so callers can safely use this
-    helper within OCR pipelines without disrupting ingestion.
+    Only OCR tokens that match a tooth-notation suspect in ``element_text``
+    are cropped and classified, and each crop carries the suspect's
+    ``start``/``end`` offsets so confident predictions replace that span.
+    Token boxes and crops are shared across calls for the same page (see
+    :func:`load_page_tokens`). Returns deterministic keys and never raises, so
+    callers can safely use this helper within OCR pipelines without disrupting
+    ingestion.
     """
 
     raw_text = element_text or ""
@@ -99,13 +233,34 @@ def apply_tooth_marking_correction(
     }
 
     try:
-        token_boxes = get_token_boxes(page_image, roi=roi)
-        token_crops = get_token_crops(page_image, token_boxes)
+        suspects = find_correction_candidates(raw_text)
+        if not suspects:
+            return result
+
+        matches: list[tuple[SuspectToken, TokenBox]] = []
+
+        def _select(token_boxes: list[TokenBox]) -> list[TokenBox]:
+            matches.extend(match_suspect_boxes(suspects, token_boxes, element_text=raw_text))
+            return [box for _suspect, box in matches]
+
+        _token_boxes, token_crops = load_page_tokens(
+            page_image,
+            roi=roi,
+            token_store=token_store,
+            boxes_to_crop=_select,
+        )
+        for crop, (suspect, box) in zip(token_crops, matches):
+            crop["token"] = suspect.token
+            crop["ocr_token"] = box.text
+            crop["start"] = suspect.start
+            crop["end"] = suspect.end
 
-        correction_payload = correct_element_text(raw_text, token_crops=token_crops)
-        detections = correction_payload.get("detections")
-        if not isinstance(detections, list):
-            detections = []
+        detections: list[Any] = []
+        if token_crops:
+            correction_payload = correct_element_text(raw_text, token_crops=token_crops)
+            detections = correction_payload.get("detections")
+            if not isinstance(detections, list):
+                detections = []
 
         corrected_text, replacements_applied = _apply_confident_replacements(
             raw_text,
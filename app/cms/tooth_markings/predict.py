@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Dict, Tuple
+from typing import Dict, List, Sequence, Tuple
 
 import torch
 from torch import Tensor
@@ -38,6 +38,20 @@ def _infer(model: torch.nn.Module, input_batch: Tensor) -> Tuple[int, float]:
         return int(best_idx.item()), float(best_prob.item())
 
 
+def _infer_batch(model: torch.nn.Module, input_batch: Tensor) -> List[Tuple[int, float]]:
+    """Run ``model`` once over a batch and return ``(index, prob)`` per sample."""
+    if input_batch.shape[0] == 0:
+        return []
+    with torch.inference_mode():
+        logits = model(input_batch)
+        if isinstance(logits, (tuple, list)):
+            logits = logits[0]
+
+        probs = torch.softmax(logits, dim=1)
+        best_prob, best_idx = torch.max(probs, dim=1)
+        return [(int(idx), float(prob)) for idx, prob in zip(best_idx.tolist(), best_prob.tolist())]
+
+
 def predict_jaw(input_batch: Tensor) -> Tuple[str, float]:
     """Predict 'up' or 'low' jaw class and probability."""
     idx, prob = _infer(get_models().uplow_model, input_batch)
@@ -60,3 +74,44 @@ def predict_index(input_batch: Tensor, *, type_label: str) -> Tuple[str, float]:
     head = "1234" if type_label == "P" else "123"
     idx, prob = _infer(model, input_batch)
     return _idx_to_class(head, idx), prob
+
+
+def predict_jaw_batch(input_batch: Tensor) -> List[Tuple[str, float]]:
+    """Batched :func:`predict_jaw`: one forward pass for all samples."""
+    return [
+        (_idx_to_class("upperlower", idx), prob)
+        for idx, prob in _infer_batch(get_models().uplow_model, input_batch)
+    ]
+
+
+def predict_type_batch(input_batch: Tensor) -> List[Tuple[str, float]]:
+    """Batched :func:`predict_type`: one forward pass for all samples."""
+    return [
+        (_idx_to_class("mpi", idx), prob)
+        for idx, prob in _infer_batch(get_models().mpi_model, input_batch)
+    ]
+
+
+def predict_index_batch(input_batch: Tensor, *, type_labels: Sequence[str]) -> List[Tuple[str, float]]:
+    """Batched :func:`predict_index`.
+
+    Samples are routed by their predicted type: premolars (P) go through the
+    1234 model and everything else through the 123 model, each in a single
+    forward pass over its sub-batch.
+    """
+    if len(type_labels) != input_batch.shape[0]:
+        raise ValueError("type_labels must contain one label per batch sample")
+
+    models = get_models()
+    results: List[Tuple[str, float] | None] = [None] * len(type_labels)
+    routes = (
+        ("1234", models.index_model_1234, [i for i, label in enumerate(type_labels) if label == "P"]),
+        ("123", models.index_model_123, [i for i, label in enumerate(type_labels) if label != "P"]),
+    )
+    for head, model, positions in routes:
+        if not positions:
+            continue
+        sub_batch = input_batch[torch.tensor(positions, dtype=torch.long)]
+        for position, (idx, prob) in zip(positions, _infer_batch(model, sub_batch)):
+            results[position] = (_idx_to_class(head, idx), prob)
+    return [result for result in results if result is not None]
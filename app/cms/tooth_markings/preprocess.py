@@ -6,6 +6,9 @@ korolainenriikka/fine-tuned-ocr-for-dental-markings.
 
 from __future__ import annotations
 
+from typing import Sequence
+
+import torch
 from PIL import Image
 from torch import Tensor
 from torchvision import transforms
@@ -26,3 +29,8 @@ def image_to_batch(image: Image.Image) -> Tensor:
     """Convert a PIL image to a model batch of shape [1, C, H, W]."""
     input_tensor = PREPROCESS(image)
     return input_tensor.unsqueeze(0)
+
+
+def images_to_batch(images: Sequence[Image.Image]) -> Tensor:
+    """Convert PIL images to one model batch of shape [N, C, H, W]."""
+    return torch.stack([PREPROCESS(image.convert("RGB")) for image in images])
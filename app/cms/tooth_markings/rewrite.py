@@ -13,6 +13,20 @@ SUSPECT_TOKEN_RE = re.compile(
 )
 
 
+# OCR frequently misreads the tooth index digit (``Ml`` for ``M1``, ``Pz`` for
+# ``P2``). Candidates for correction therefore also accept those look-alikes.
+CANDIDATE_TOKEN_RE = re.compile(
+    r"(?<![A-Za-z0-9])"
+    r"(?:[lLuU]?[iImMpPcC][0-4lI|!zZ]|[iImMpPcCdD][0-4]?|[dD]\d{1,2})"
+    r"(?![A-Za-z0-9])"
+)
+
+_TOKEN_PUNCTUATION = ".,;:()[]{}'\""
+_TOOTH_LETTERS = "impc"
+# Casefolded look-alikes of the index digit.
+_DIGIT_LOOKALIKES = {"l": "1", "i": "1", "|": "1", "!": "1", "z": "2"}
+
+
 @dataclass(frozen=True)
 class SuspectToken:
     token: str
@@ -28,6 +42,30 @@ def find_suspects(element_text: str) -> List[SuspectToken]:
     ]
 
 
+def find_correction_candidates(element_text: str) -> List[SuspectToken]:
+    """Find suspects, including tokens whose index digit looks misread."""
+    return [
+        SuspectToken(token=m.group(0), start=m.start(), end=m.end())
+        for m in CANDIDATE_TOKEN_RE.finditer(element_text)
+    ]
+
+
+def is_candidate_token(token: str) -> bool:
+    """Return True when an OCR token could be a tooth notation."""
+    cleaned = token.strip().strip(_TOKEN_PUNCTUATION)
+    return bool(cleaned) and CANDIDATE_TOKEN_RE.fullmatch(cleaned) is not None
+
+
+def candidate_match_key(token: str) -> str:
+    """Normalise a token so OCR look-alikes of the same notation compare equal."""
+    key = token.strip().strip(_TOKEN_PUNCTUATION).casefold()
+    # Only the index after the tooth letter can be a misread digit; a leading
+    # ``l`` or ``i`` is the lower-jaw prefix or the incisor letter itself.
+    if len(key) >= 2 and key[-2] in _TOOTH_LETTERS and key[-1] in _DIGIT_LOOKALIKES:
+        key = key[:-1] + _DIGIT_LOOKALIKES[key[-1]]
+    return key
+
+
 def _coerce_image(image_like: Any) -> Image.Image:
     if isinstance(image_like, Image.Image):
         return image_like
@@ -40,16 +78,18 @@ def rewrite_with_crops(element_text: str, token_crops: Iterable[Dict[str, Any]])
     """Classify provided token crops and rewrite text spans.
 
     Each crop should include at least `image`, and usually `start` and `end`.
+    All crops are classified together in one batched pass through the chain.
     """
-    from .chain import classify_token_image
+    from .chain import classify_token_images
+
+    crops = list(token_crops)
+    images = [_coerce_image(crop["image"]) for crop in crops]
+    classifications = classify_token_images(images)
 
     detections: List[Dict[str, Any]] = []
     replacements: List[Dict[str, Any]] = []
 
-    for crop in token_crops:
-        image = _coerce_image(crop["image"])
-        notation, confidence, parts = classify_token_image(image)
-
+    for crop, (notation, confidence, parts) in zip(crops, classifications):
         start = crop.get("start")
         end = crop.get("end")
         token_raw = crop.get("token", "")
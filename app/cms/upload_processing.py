@@ -1,19 +1,23 @@
 import hashlib
 import logging
+import os
 import re
 import shutil
 import subprocess
 import tempfile
-import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import Iterable
 
 from django.conf import settings
 from django.core.files import File
-from django.db import close_old_connections
+from django.db import close_old_connections, transaction
 
-from .models import Media, SpecimenListPDF, SpecimenListPage
-from . import scanning_utils
+from .models import BackgroundJob, Media, SpecimenListPDF, SpecimenListPage
+from . import jobs, report_rollups, scan_duplicates, scanning_utils
 
 logger = logging.getLogger("cms.upload_processing")
 
@@ -21,6 +25,7 @@ INCOMING = Path(settings.MEDIA_ROOT) / "uploads" / "incoming"
 PENDING = Path(settings.MEDIA_ROOT) / "uploads" / "pending"
 MANUAL_QC = Path(settings.MEDIA_ROOT) / "uploads" / "manual_qc"
 REJECTED = Path(settings.MEDIA_ROOT) / "uploads" / "rejected"
+DUPLICATES = Path(settings.MEDIA_ROOT) / "uploads" / "duplicates"
 
 TIMESTAMP_FORMAT = "%Y-%m-%dT%H%M%S"
 NAME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{6}\.png$", re.IGNORECASE)
@@ -28,79 +33,211 @@ MANUAL_QC_PATTERN = re.compile(r"^\d+\.jpe?g$", re.IGNORECASE)
 SPECIMEN_LIST_DPI = getattr(settings, "SPECIMEN_LIST_DPI", 300)
 
 
-def create_media(
-    path: Path, *, scan_timestamp: datetime
-) -> None:
-    """Create a Media record for a newly accepted scan."""
-    logger.info(
-        "Processing uploaded media %s with filename timestamp %s",
-        path,
-        scan_timestamp.isoformat(),
-    )
-    created = scanning_utils.to_nairobi(scan_timestamp)
-    scanning_utils.auto_complete_scans()
-    scan = scanning_utils.find_scan_for_timestamp(created)
-    if scan:
-        logger.info(
-            "Matched media %s to scanning #%s (%s -> %s) using Nairobi timestamp %s",
-            path,
-            scan.pk,
-            scan.start_time,
-            scan.end_time,
-            created.isoformat(),
-        )
-    else:
-        logger.warning(
-            "No scanning found for media %s using Nairobi timestamp %s",
-            path,
-            created.isoformat(),
-        )
-    media = Media(
-        type="photo",
-        license="CC0",
-        rights_holder="National Museums of Kenya",
-        scanning=scan,
-    )
-    media.media_location.name = str(path.relative_to(settings.MEDIA_ROOT))
-    media.save()
+def _default_ingest_batch_size() -> int:
+    try:
+        return max(1, int(getattr(settings, "SCAN_INGEST_BATCH_SIZE", 50)))
+    except (TypeError, ValueError):
+        return 50
+
+
+def _default_ingest_workers() -> int:
+    try:
+        return max(1, int(getattr(settings, "SCAN_INGEST_WORKERS", 4)))
+    except (TypeError, ValueError):
+        return 4
+
 
+@dataclass
+class _AcceptedUpload:
+    """A valid upload on its way to ``pending``, ``manual_qc`` or ``duplicates``."""
 
-def create_manual_qc_media(path: Path) -> None:
-    """Create a Media record for a manual QC scan upload."""
+    src: Path
+    media: Media
+    hashes: scan_duplicates.ImageHashes
+    scan_timestamp: datetime | None = None
+    match: scan_duplicates.DuplicateMatch | None = None
+    dest: Path | None = None
 
-    logger.info("Processing manual QC media %s", path)
+
+def _accepted_upload(src: Path, hashes: scan_duplicates.ImageHashes) -> _AcceptedUpload:
     media = Media(
         type="photo",
         license="CC0",
         rights_holder="National Museums of Kenya",
     )
-    media.media_location.name = str(path.relative_to(settings.MEDIA_ROOT))
-    media.save()
+    upload = _AcceptedUpload(src=src, media=media, hashes=hashes)
+    if NAME_PATTERN.match(src.name):
+        timestamp = datetime.strptime(src.stem, TIMESTAMP_FORMAT)
+        upload.scan_timestamp = scanning_utils.to_nairobi(timestamp.replace(tzinfo=scanning_utils.NAIROBI_TZ))
+    return upload
+
+
+def _match_duplicates(uploads: list[_AcceptedUpload]) -> None:
+    """Link each upload to the media it duplicates and pick its destination.
+
+    Exact duplicates of an earlier scan get the ``duplicate`` OCR status and
+    go to ``duplicates`` so they never reach the OCR queue. Manual QC uploads
+    keep their folder and status and are only linked.
+    """
+
+    matcher = scan_duplicates.BatchMatcher(upload.hashes for upload in uploads)
+    for upload in uploads:
+        upload.match = match = matcher.match(upload.hashes)
+        if match is not None:
+            logger.info(
+                "Upload %s %s media %s (%s bits apart)",
+                upload.src.name,
+                "duplicates" if match.exact else "nearly duplicates",
+                match.media.pk or "from the same batch",
+                match.distance,
+            )
+        if upload.scan_timestamp is None:
+            target = MANUAL_QC
+        elif match is not None and match.exact:
+            target = DUPLICATES
+            upload.media.ocr_status = Media.OCRStatus.DUPLICATE
+        else:
+            target = PENDING
+        upload.dest = target / upload.src.name
+        if upload.media.ocr_status != Media.OCRStatus.DUPLICATE:
+            matcher.add(upload.media, upload.hashes)
+
+
+def _assign_scannings(uploads: list[_AcceptedUpload]) -> None:
+    """Close expired scanning tasks once and match every scan to its task."""
+
+    scans = [upload for upload in uploads if upload.scan_timestamp is not None]
+    if not scans:
+        return
+    scanning_utils.auto_complete_scans()
+    index = scanning_utils.ScanningIndex.covering(upload.scan_timestamp for upload in scans)
+    for upload in scans:
+        scan = index.find(upload.scan_timestamp)
+        upload.media.scanning = scan
+        if scan:
+            logger.info(
+                "Matched media %s to scanning #%s (%s -> %s) using Nairobi timestamp %s",
+                upload.dest,
+                scan.pk,
+                scan.start_time,
+                scan.end_time,
+                upload.scan_timestamp.isoformat(),
+            )
+        else:
+            logger.warning(
+                "No scanning found for media %s using Nairobi timestamp %s",
+                upload.dest,
+                upload.scan_timestamp.isoformat(),
+            )
+
+
+def _create_media(uploads: list[_AcceptedUpload]) -> None:
+    """Insert the Media rows for ``uploads`` in bulk, with their creation history."""
+
+    if not uploads:
+        return
+    medias = [upload.media for upload in uploads]
+    user = Media.stamp_bulk_instances(medias)
+    for upload in uploads:
+        media = upload.media
+        media.media_location.name = str(upload.dest.relative_to(settings.MEDIA_ROOT))
+        media.file_name = os.path.basename(media.media_location.name)
+        media.format = os.path.splitext(media.media_location.name)[1].lower().strip(".")
+        # Links to scans of the same batch are set once those have a primary key.
+        stored_match = upload.match if upload.match is not None and upload.match.media.pk else None
+        scan_duplicates.apply_hashes(media, upload.hashes, stored_match)
+
+    with transaction.atomic():
+        Media.objects.bulk_create(medias)
+        if any(media.pk is None for media in medias):
+            # Backends such as MySQL do not return primary keys from bulk inserts.
+            locations = {media.media_location.name for media in medias}
+            stored = dict(
+                Media.objects.filter(media_location__in=locations)
+                .order_by("pk")
+                .values_list("media_location", "pk")
+            )
+            for media in medias:
+                media.pk = stored[media.media_location.name]
+        linked = []
+        for upload in uploads:
+            if upload.match is not None and upload.media.duplicate_of_id is None:
+                upload.media.duplicate_of = upload.match.media
+                upload.media.duplicate_distance = upload.match.distance
+                linked.append(upload.media)
+        if linked:
+            Media.objects.bulk_update(linked, ["duplicate_of", "duplicate_distance"])
+        Media.history.bulk_history_create(medias, default_user=user)
+        report_rollups.media_bulk_created(medias)
+        scan_duplicates.index_hashes(
+            (media.pk, media.perceptual_hash)
+            for media in medias
+            if media.ocr_status != Media.OCRStatus.DUPLICATE
+        )
+
+
+def _ingest_batch(paths: list[Path]) -> list[Path]:
+    accepted_paths = [
+        src for src in paths if NAME_PATTERN.match(src.name) or MANUAL_QC_PATTERN.match(src.name)
+    ]
+    workers = min(_default_ingest_workers(), len(accepted_paths))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scan-ingest") as executor:
+            hashes = list(executor.map(scan_duplicates.compute_image_hashes, accepted_paths))
+    else:
+        hashes = [scan_duplicates.compute_image_hashes(src) for src in accepted_paths]
+    uploads = [_accepted_upload(src, entry) for src, entry in zip(accepted_paths, hashes)]
+    _match_duplicates(uploads)
+
+    destinations: dict[Path, Path] = {}
+    for upload in uploads:
+        logger.info("Processing uploaded media %s", upload.src)
+        upload.dest.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(upload.src, upload.dest)
+        destinations[upload.src] = upload.dest
+    for src in paths:
+        if src not in destinations:
+            dest = REJECTED / src.name
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(src, dest)
+            destinations[src] = dest
+
+    _assign_scannings(uploads)
+    _create_media(uploads)
+    return [destinations[src] for src in paths]
+
+
+def ingest_files(paths: Iterable[Path], *, batch_size: int | None = None) -> list[Path]:
+    """Validate ``paths`` and move each to ``pending``, ``manual_qc``, ``duplicates`` or ``rejected``.
+
+    Returns the destination of every path, in order. Files are handled in
+    batches of ``batch_size`` (default ``settings.SCAN_INGEST_BATCH_SIZE``):
+    each batch is hashed on ``settings.SCAN_INGEST_WORKERS`` threads, checked
+    for duplicates with a few queries, closes expired scanning tasks once and
+    creates its ``Media`` rows in bulk. Scans whose bytes match an earlier
+    media, including one earlier in the same upload, are moved to
+    ``duplicates`` instead of ``pending``; near-duplicates still go to
+    ``pending`` and are linked to the media they resemble.
+    """
+
+    paths = list(dict.fromkeys(Path(path) for path in paths))
+    if batch_size is None:
+        batch_size = _default_ingest_batch_size()
+    batch_size = max(1, int(batch_size))
+    destinations: list[Path] = []
+    for start in range(0, len(paths), batch_size):
+        destinations.extend(_ingest_batch(paths[start : start + batch_size]))
+    return destinations
 
 
 def process_file(src: Path) -> Path:
     """Validate ``src`` and move it to ``pending`` or ``rejected``.
 
     Returns the destination path after moving. Creates a ``Media`` row for
-    valid files.
+    valid files; see :func:`ingest_files`.
     """
-    if NAME_PATTERN.match(src.name):
-        dest = PENDING / src.name
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        timestamp = datetime.strptime(src.stem, TIMESTAMP_FORMAT)
-        timestamp = timestamp.replace(tzinfo=scanning_utils.NAIROBI_TZ)
-        shutil.move(src, dest)
-        create_media(dest, scan_timestamp=timestamp)
-    elif MANUAL_QC_PATTERN.match(src.name):
-        dest = MANUAL_QC / src.name
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(src, dest)
-        create_manual_qc_media(dest)
-    else:
-        dest = REJECTED / src.name
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(src, dest)
-    return dest
+
+    return ingest_files([src])[0]
 
 
 def _compute_sha256(path: Path) -> str:
@@ -121,50 +258,112 @@ def _get_pdf_page_count(pdf_path: Path) -> int:
     raise RuntimeError("Unable to determine PDF page count via pdfinfo.")
 
 
-def _split_pdf_page_to_image(
-    pdf_path: Path, output_dir: Path, dpi: int, page_number: int
-) -> Path:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    prefix = output_dir / "page"
-    command = [
-        "pdftoppm",
-        "-png",
-        "-r",
-        str(dpi),
-        "-f",
-        str(page_number),
-        "-l",
-        str(page_number),
-        str(pdf_path),
-        str(prefix),
-    ]
-    subprocess.run(command, check=True)
-    expected_name = f"page-{page_number}.png"
-    matches = list(output_dir.glob("page-*.png"))
-    if not matches:
-        raise RuntimeError(
-            f"Expected page image not found for page {page_number}."
-        )
-    matches.sort()
-    image = matches[0]
-    renamed_path = output_dir / f"page_{page_number:03d}.png"
-    image.rename(renamed_path)
-    return renamed_path
+RENDERED_PAGE_PATTERN = re.compile(r"-(\d+)\.png$")
+RENDER_POLL_INTERVAL = 0.05
 
 
-def queue_specimen_list_processing(pdf_id: int) -> None:
-    if not getattr(settings, "SPECIMEN_LIST_PROCESS_ASYNC", False):
-        logger.info(
-            "Specimen list PDF %s queued for offline processing.", pdf_id
-        )
-        return
-    thread = threading.Thread(
-        target=process_specimen_list_pdf,
-        args=(pdf_id,),
-        name=f"specimen-list-{pdf_id}",
-        daemon=True,
+def _default_split_workers() -> int:
+    try:
+        return max(1, int(getattr(settings, "SPECIMEN_LIST_SPLIT_WORKERS", 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def _page_ranges(page_numbers: list[int], shards: int) -> list[tuple[int, int]]:
+    """Group ``page_numbers`` into contiguous ranges, split into about ``shards`` parts."""
+
+    runs: list[list[int]] = []
+    for number in sorted(page_numbers):
+        if runs and number == runs[-1][-1] + 1:
+            runs[-1].append(number)
+        else:
+            runs.append([number])
+    size = max(1, -(-len(page_numbers) // max(1, shards)))
+    ranges: list[tuple[int, int]] = []
+    for run in runs:
+        for index in range(0, len(run), size):
+            chunk = run[index : index + size]
+            ranges.append((chunk[0], chunk[-1]))
+    return ranges
+
+
+def _rendered_pages(output_dir: Path) -> dict[int, Path]:
+    pages = {}
+    for path in output_dir.glob("page-*.png"):
+        match = RENDERED_PAGE_PATTERN.search(path.name)
+        if match:
+            pages[int(match.group(1))] = path
+    return pages
+
+
+def _render_pdf_pages(
+    pdf_path: Path,
+    output_dir: Path,
+    dpi: int,
+    page_ranges: list[tuple[int, int]] | None,
+    workers: int = 1,
+):
+    """Rasterise ``page_ranges`` of ``pdf_path`` and yield ``(page_number, path)``.
+
+    Each range is rendered by one ``pdftoppm`` invocation, so the PDF is parsed
+    once per range rather than once per page; ``None`` renders the whole
+    document in a single call. At most ``workers`` invocations run at a time.
+    ``pdftoppm`` writes pages in order, so a page is yielded as soon as the
+    next one appears or its process exits, letting callers store it while the
+    rest of the range is still rendering.
+    """
+
+    pending = list(page_ranges) if page_ranges is not None else [None]
+    running: list[tuple[subprocess.Popen, Path, set[int]]] = []
+    launched = 0
+    try:
+        while pending or running:
+            while pending and len(running) < max(1, workers):
+                page_range = pending.pop(0)
+                launched += 1
+                shard_dir = output_dir / f"shard-{launched}"
+                shard_dir.mkdir(parents=True, exist_ok=True)
+                command = ["pdftoppm", "-png", "-r", str(dpi)]
+                if page_range is not None:
+                    command += ["-f", str(page_range[0]), "-l", str(page_range[1])]
+                command += [str(pdf_path), str(shard_dir / "page")]
+                running.append((subprocess.Popen(command), shard_dir, set()))
+
+            progressed = False
+            for entry in list(running):
+                process, shard_dir, yielded = entry
+                finished = process.poll() is not None
+                rendered = _rendered_pages(shard_dir)
+                numbers = sorted(number for number in rendered if number not in yielded)
+                if not finished:
+                    # The highest numbered file may still be being written.
+                    numbers = numbers[:-1]
+                for number in numbers:
+                    yielded.add(number)
+                    progressed = True
+                    yield number, rendered[number]
+                if finished:
+                    running.remove(entry)
+                    progressed = True
+                    if process.returncode != 0:
+                        raise subprocess.CalledProcessError(process.returncode, process.args)
+            if not progressed:
+                time.sleep(RENDER_POLL_INTERVAL)
+    finally:
+        for process, _shard_dir, _yielded in running:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+
+
+def queue_specimen_list_processing(pdf_id: int) -> BackgroundJob:
+    """Queue ``pdf_id`` for splitting by the ``run_workers`` command."""
+
+    return jobs.enqueue(
+        BackgroundJob.Kind.SPLIT_SPECIMEN_LIST_PDF,
+        {"pdf_id": pdf_id},
+        dedupe_key=f"split_specimen_list_pdf:{pdf_id}",
     )
-    thread.start()
 
 
 def process_specimen_list_pdf(pdf_id: int) -> None:
@@ -201,30 +400,39 @@ def process_specimen_list_pdf(pdf_id: int) -> None:
     try:
         with tempfile.TemporaryDirectory() as tmpdir:
             output_dir = Path(tmpdir)
-            page_total = _get_pdf_page_count(pdf_path)
-
-            pages: list[SpecimenListPage] = []
-            for page_number in range(1, page_total + 1):
-                existing = pdf.pages.filter(page_number=page_number).first()
-                if existing and existing.image_file:
-                    pages.append(existing)
-                    continue
-                image_path = _split_pdf_page_to_image(
-                    pdf_path,
-                    output_dir,
-                    dpi=SPECIMEN_LIST_DPI,
-                    page_number=page_number,
-                )
-                page = existing or SpecimenListPage(
+            existing = {page.page_number: page for page in pdf.pages.all()}
+            workers = _default_split_workers()
+
+            page_ranges = None
+            page_total = None
+            if existing or workers > 1:
+                page_total = _get_pdf_page_count(pdf_path)
+                missing = [
+                    number
+                    for number in range(1, page_total + 1)
+                    if not (number in existing and existing[number].image_file)
+                ]
+                page_ranges = _page_ranges(missing, workers)
+
+            rendered = 0
+            for page_number, image_path in _render_pdf_pages(
+                pdf_path,
+                output_dir,
+                dpi=SPECIMEN_LIST_DPI,
+                page_ranges=page_ranges,
+                workers=workers,
+            ):
+                page = existing.get(page_number) or SpecimenListPage(
                     pdf=pdf,
                     page_number=page_number,
                 )
                 with image_path.open("rb") as handle:
-                    page.image_file.save(image_path.name, File(handle), save=False)
+                    page.image_file.save(f"page_{page_number:03d}.png", File(handle), save=False)
                 page.save()
-                pages.append(page)
+                image_path.unlink()
+                rendered += 1
 
-            pdf.page_count = len(pages)
+            pdf.page_count = rendered if page_total is None else page_total
             pdf.status = SpecimenListPDF.Status.SPLIT
             pdf.save(update_fields=["page_count", "status"])
     except Exception as exc:
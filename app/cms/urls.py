@@ -97,7 +97,7 @@ from cms.forms import (AccessionForm,
                        SpecimenCompositeForm)
 from cms.views import AccessionWizard
 from cms.views import media_report_view
-from .admin import taxonomy_sync_apply_view, taxonomy_sync_preview_view
+from .admin import taxonomy_sync_apply_view, taxonomy_sync_job_view, taxonomy_sync_preview_view
 
 urlpatterns = [
     path('reports/accession-distribution/', accession_distribution_report, name='accession_distribution_report'),
@@ -243,4 +243,5 @@ urlpatterns += [
 urlpatterns += [
     path("taxonomy/sync/", taxonomy_sync_preview_view, name="taxonomy_sync_preview"),
     path("taxonomy/sync/apply/", taxonomy_sync_apply_view, name="taxonomy_sync_apply"),
+    path("taxonomy/sync/jobs/<int:pk>/", taxonomy_sync_job_view, name="taxonomy_sync_job"),
 ]
@@ -12,6 +12,7 @@ from cms.models import (
     AccessionNumberSeries,
     AccessionRow,
     Identification,
+    OCRDataBlob,
     Taxon,
 )
 
@@ -64,34 +65,50 @@ def build_history_entries(instance):
 
     Each entry contains the historical log record and a list of field-level
     changes with verbose field names and resolved foreign-key references.
+    Digest fields listed in the model's ``history_document_fields`` are shown
+    as the documents they address, loaded from :class:`OCRDataBlob`.
     """
     model = type(instance)
-    history_entries = []
+    document_fields = getattr(model, "history_document_fields", {})
+    deltas = []
     for log in instance.history.all().order_by("-history_date", "-history_id"):
         prev = log.prev_record
+        deltas.append((log, log.diff_against(prev).changes if prev else []))
+
+    documents = OCRDataBlob.objects.documents(
+        digest
+        for _, changes in deltas
+        for change in changes
+        if change.field in document_fields
+        for digest in (change.old, change.new)
+    )
+
+    history_entries = []
+    for log, delta_changes in deltas:
         changes = []
-        if prev:
-            delta = log.diff_against(prev)
-            for change in delta.changes:
-                field = model._meta.get_field(change.field)
-                field_name = field.verbose_name.capitalize()
-                old = change.old
-                new = change.new
-                if isinstance(field, models.ForeignKey):
-                    related_model = field.remote_field.model
-                    old_obj = related_model.objects.filter(pk=old).first()
-                    new_obj = related_model.objects.filter(pk=new).first()
-                    old = str(old_obj) if old_obj else old
-                    new = str(new_obj) if new_obj else new
-                elif isinstance(field, models.ManyToManyField):
-                    related_model = field.remote_field.model
-                    old_ids = set(old or [])
-                    new_ids = set(new or [])
-                    old_objs = related_model.objects.filter(pk__in=old_ids)
-                    new_objs = related_model.objects.filter(pk__in=new_ids)
-                    old = ", ".join(str(obj) for obj in old_objs)
-                    new = ", ".join(str(obj) for obj in new_objs)
-                changes.append({"field": field_name, "old": old, "new": new})
+        for change in delta_changes:
+            field = model._meta.get_field(document_fields.get(change.field, change.field))
+            field_name = field.verbose_name.capitalize()
+            old = change.old
+            new = change.new
+            if change.field in document_fields:
+                old = documents.get(old)
+                new = documents.get(new)
+            elif isinstance(field, models.ForeignKey):
+                related_model = field.remote_field.model
+                old_obj = related_model.objects.filter(pk=old).first()
+                new_obj = related_model.objects.filter(pk=new).first()
+                old = str(old_obj) if old_obj else old
+                new = str(new_obj) if new_obj else new
+            elif isinstance(field, models.ManyToManyField):
+                related_model = field.remote_field.model
+                old_ids = set(old or [])
+                new_ids = set(new or [])
+                old_objs = related_model.objects.filter(pk__in=old_ids)
+                new_objs = related_model.objects.filter(pk__in=new_ids)
+                old = ", ".join(str(obj) for obj in old_objs)
+                new = ", ".join(str(obj) for obj in new_objs)
+            changes.append({"field": field_name, "old": old, "new": new})
         history_entries.append({"log": log, "changes": changes})
     return history_entries
 
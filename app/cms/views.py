@@ -19,8 +19,8 @@ from dal import autocomplete
 from django import forms
 from django.apps import apps
 from django.db import models, transaction
-from django.db.models import Value, CharField, Count, Q, Max, Prefetch, OuterRef, Subquery, Sum
-from django.db.models.functions import Concat, Greatest, TruncDate, TruncWeek
+from django.db.models import Value, CharField, Count, Exists, Q, Max, Prefetch, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce, Concat, Greatest
 from django.http import JsonResponse
 from django.utils.decorators import method_decorator
 from django.views import View
@@ -112,6 +112,7 @@ from cms.manual_import import parse_accession_number
 from cms.models import (
     Accession,
     AccessionNumberSeries,
+    BackgroundJob,
     AccessionFieldSlip,
     AccessionReference,
     AccessionRow,
@@ -171,13 +172,15 @@ from cms.merge.services import (
     build_accession_reference_field_selection_form,
     merge_accession_reference_candidates,
 )
-from cms.merge.fuzzy import score_candidates
+from cms.merge.clusters import cluster_worklist
+from cms.merge.fuzzy import materialise_candidates, rank_candidate_keys
+from cms.pagination import KeysetPaginationMixin
 from cms.resources import FieldSlipResource
 from .utils import build_accession_identification_maps, build_history_entries
 from cms.utils import generate_accessions_from_series
-from cms.upload_processing import process_file, queue_specimen_list_processing
+from cms.upload_processing import queue_specimen_list_processing
 from cms.ocr_processing import (
-    process_pending_scans,
+    default_scan_workers,
     describe_accession_conflicts,
     normalize_fragments_value,
 )
@@ -187,7 +190,7 @@ from cms.qc import (
     ident_payload_has_meaningful_data as qc_ident_payload_has_meaningful_data,
     interpreted_value as qc_interpreted_value,
 )
-from cms import scanning_utils
+from cms import jobs, report_rollups, scanning_utils
 from cms.services.review_locks import (
     SPECIMEN_LIST_LOCK_TTL_SECONDS,
     acquire_review_lock,
@@ -215,12 +218,11 @@ class CollectionManagerAccessMixin(UserPassesTestMixin):
 @login_required
 @user_passes_test(is_collection_manager)
 def media_report_view(request):
-    # Fetch OCR status data
-    data = Media.objects.values('ocr_status', 'created_on')
-    df = pd.DataFrame.from_records(data)
+    # OCR status and upload day counts come from rollups kept current on save.
+    status_counts = report_rollups.media_status_counts()
 
     # Handle empty dataset
-    if df.empty or 'ocr_status' not in df.columns:
+    if not status_counts:
         context = {
             'chart_html': None,
             'daily_chart_html': None,
@@ -230,63 +232,61 @@ def media_report_view(request):
         return render(request, 'reports/media_report.html', context)
 
     # ======== OCR STATUS SUMMARY =========
-    counts = df['ocr_status'].value_counts().reset_index()
-    counts.columns = ['OCR Status', 'Count']
-
     #  labels
     status_labels = {
         'pending': 'Pending OCR',
         'completed': 'Completed',
         'failed': 'Failed',
     }
-    counts['OCR Status'] = counts['OCR Status'].map(lambda x: status_labels.get(x.lower(), x.title()))
+    counts = pd.DataFrame(
+        [
+            (status_labels.get(status.lower(), status.title()), count)
+            for status, count in status_counts
+        ],
+        columns=['OCR Status', 'Count'],
+    )
 
-    total_files = counts['Count'].sum()
-    completed = counts.loc[counts['OCR Status'] == 'Completed', 'Count'].sum()
+    total_files = int(counts['Count'].sum())
+    completed = int(counts.loc[counts['OCR Status'] == 'Completed', 'Count'].sum())
     completion_rate = (completed / total_files * 100) if total_files > 0 else 0
 
     # Build OCR summary chart
-    fig1 = px.bar(
-        counts,
-        x='OCR Status',
-        y='Count',
-        title="OCR Status Summary of Media Files",
-        color='OCR Status',
-        text='Count',
-        color_discrete_sequence=px.colors.qualitative.Vivid
-    )
-    fig1.update_traces(textposition='outside')
-    fig1.update_layout(
-        plot_bgcolor='#ffffff',
-        paper_bgcolor='#ffffff',
-        title_font_size=22,
-        title_font_color='#2c3e50',
-        font=dict(size=14),
-        xaxis_title="OCR Status",
-        yaxis_title="Number of Files",
-        xaxis_tickangle=-15,
-        showlegend=False
-    )
-    chart_html = to_html(fig1, full_html=False, include_plotlyjs='cdn')
-
-    # ======== DAILY UPLOAD PROGRESS (MON-SUN) =========
-    if 'created_on' in df.columns:
-        df['created_on'] = pd.to_datetime(df['created_on'], errors='coerce')
-        df = df.dropna(subset=['created_on'])
-        df['day_of_week'] = df['created_on'].dt.day_name()
+    def render_status_chart():
+        fig1 = px.bar(
+            counts,
+            x='OCR Status',
+            y='Count',
+            title="OCR Status Summary of Media Files",
+            color='OCR Status',
+            text='Count',
+            color_discrete_sequence=px.colors.qualitative.Vivid
+        )
+        fig1.update_traces(textposition='outside')
+        fig1.update_layout(
+            plot_bgcolor='#ffffff',
+            paper_bgcolor='#ffffff',
+            title_font_size=22,
+            title_font_color='#2c3e50',
+            font=dict(size=14),
+            xaxis_title="OCR Status",
+            yaxis_title="Number of Files",
+            xaxis_tickangle=-15,
+            showlegend=False
+        )
+        return to_html(fig1, full_html=False, include_plotlyjs='cdn')
 
-        # Ensure week order
-        week_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        daily_counts = df['day_of_week'].value_counts().reindex(week_order, fill_value=0)
+    chart_html = report_rollups.cached_chart('media_status', status_counts, render_status_chart)
 
-        # Force integers only
-        daily_counts = daily_counts.astype(int)
+    # ======== DAILY UPLOAD PROGRESS (MON-SUN) =========
+    week_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+    daily_counts = report_rollups.media_weekday_counts()
 
-        # Build line/bar chart for daily uploads
+    # Build line/bar chart for daily uploads
+    def render_daily_chart():
         fig2 = go.Figure(data=go.Bar(
-            x=daily_counts.index,
-            y=daily_counts.values,
-            text=daily_counts.values,
+            x=week_order,
+            y=daily_counts,
+            text=daily_counts,
             textposition='outside',
             marker_color='rgba(46, 204, 113, 0.8)'
         ))
@@ -302,9 +302,9 @@ def media_report_view(request):
             yaxis=dict(dtick=1),  # ensure whole numbers
             margin=dict(l=40, r=40, t=60, b=40)
         )
-        daily_chart_html = to_html(fig2, full_html=False, include_plotlyjs=False)
-    else:
-        daily_chart_html = None
+        return to_html(fig2, full_html=False, include_plotlyjs=False)
+
+    daily_chart_html = report_rollups.cached_chart('media_weekday', daily_counts, render_daily_chart)
 
     context = {
         'chart_html': chart_html,
@@ -324,43 +324,39 @@ def accession_distribution_report(request):
     """
     Generates a report showing the distribution of accessions per locality.
     """
-    # Query grouped counts per locality (specimen_prefix)
-    accession_data = (
-        Accession.objects
-        .values('specimen_prefix__name')
-        .annotate(total_accessions=Count('specimen_no', distinct=True))
-        .order_by('specimen_prefix__name')
-    )
+    # Distinct specimen numbers per locality (specimen_prefix), read from the rollup
+    accession_data = report_rollups.accession_locality_counts()
 
     if not accession_data:
         return render(request, 'reports/accession_distribution.html', {
             'message': 'No accession data available yet.'
         })
 
-    df = pd.DataFrame.from_records(accession_data)
-    df.rename(columns={'specimen_prefix__name': 'Locality', 'total_accessions': 'Accessions'}, inplace=True)
+    df = pd.DataFrame(accession_data, columns=['Locality', 'Accessions'])
 
     # --- Locality-based chart ---
-    fig_locality = px.bar(
-        df,
-        x='Locality',
-        y='Accessions',
-        text='Accessions',
-        title='Accessions per Locality',
-        color='Locality',
-        color_discrete_sequence=px.colors.qualitative.Set3
-    )
-    fig_locality.update_traces(textposition='outside')
-    fig_locality.update_layout(
-        xaxis_title='Locality',
-        yaxis_title='Number of Accessions',
-        xaxis_tickangle=-30,
-        showlegend=False,
-        plot_bgcolor='#ffffff',
-        paper_bgcolor='#ffffff'
-    )
+    def render_locality_chart():
+        fig_locality = px.bar(
+            df,
+            x='Locality',
+            y='Accessions',
+            text='Accessions',
+            title='Accessions per Locality',
+            color='Locality',
+            color_discrete_sequence=px.colors.qualitative.Set3
+        )
+        fig_locality.update_traces(textposition='outside')
+        fig_locality.update_layout(
+            xaxis_title='Locality',
+            yaxis_title='Number of Accessions',
+            xaxis_tickangle=-30,
+            showlegend=False,
+            plot_bgcolor='#ffffff',
+            paper_bgcolor='#ffffff'
+        )
+        return to_html(fig_locality, full_html=False, include_plotlyjs='cdn')
 
-    chart_locality = to_html(fig_locality, full_html=False, include_plotlyjs='cdn')
+    chart_locality = report_rollups.cached_chart('accession_locality', accession_data, render_locality_chart)
 
     context = {
         'chart_locality': chart_locality,
@@ -440,6 +436,11 @@ class MergeCandidateAdminView(LoginRequiredMixin, TemplateView):
             else ""
         )
         context["default_threshold"] = 75
+        context["duplicate_clusters"] = (
+            cluster_worklist(model_labels=[item["label"] for item in context["merge_models"]])
+            if context["merge_models"]
+            else []
+        )
         return context
 
     def _get_merge_models(self) -> list[dict[str, str]]:
@@ -541,10 +542,12 @@ class MergeCandidateAPIView(View):
             )
 
         try:
-            matches = score_candidates(model, query, fields=fields, threshold=threshold, queryset=queryset)
+            matches = rank_candidate_keys(
+                model, query, fields=fields, threshold=threshold, queryset=queryset
+            )
         except RuntimeError as exc:
             import logging
-            logging.exception("RuntimeError in MergeCandidateAPIView.score_candidates")
+            logging.exception("RuntimeError in MergeCandidateAPIView.rank_candidate_keys")
             return self._error_response(
                 request,
                 "Service temporarily unavailable.",
@@ -585,7 +588,12 @@ class MergeCandidateAPIView(View):
             "total_results": paginator.count,
             "num_pages": paginator.num_pages,
             "preview_fields": fields,
-            "results": [self._serialise_match(match, fields) for match in page_obj.object_list],
+            "results": [
+                self._serialise_match(match, fields)
+                for match in materialise_candidates(
+                    model, page_obj.object_list, queryset=queryset
+                )
+            ],
         }
         return self._final_response(
             request,
@@ -931,29 +939,13 @@ def prefetch_accession_related(qs):
     )
 
 
-def attach_accession_summaries(accessions):
-    """Attach taxon and element summaries to each accession in the iterable."""
-    if accessions is None:
-        return
-
-    accession_list = getattr(accessions, 'object_list', accessions)
+def with_accession_summaries(qs):
+    """Join the columns accession lists display, including the search summary.
 
-    for accession in accession_list:
-        taxa = set()
-        elements = set()
-
-        for row in accession.accessionrow_set.all():
-            for identification in row.identification_set.all():
-                taxon = (identification.preferred_taxon_name or "").strip()
-                if taxon:
-                    taxa.add(taxon)
-            for specimen in row.natureofspecimen_set.all():
-                element = getattr(specimen, 'element', None)
-                if element and element.name:
-                    elements.add(element.name)
-
-        accession.taxa_list = sorted(taxa)
-        accession.element_list = sorted(elements)
+    Taxa, elements and counts come from :class:`AccessionSearchSummary`, so a
+    page of accessions is read with a single query.
+    """
+    return qs.select_related('collection', 'specimen_prefix', 'accessioned_by', 'search_summary')
 
 def add_fieldslip_to_accession(request, pk):
     """
@@ -1432,7 +1424,7 @@ def dashboard(request):
     return render(request, "cms/dashboard.html", context)
 
 
-class MediaQCQueueView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class MediaQCQueueView(LoginRequiredMixin, UserPassesTestMixin, KeysetPaginationMixin, ListView):
     """Base list view for filtered media QC queues."""
 
     model = Media
@@ -1470,9 +1462,7 @@ class MediaQCQueueView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         return False
 
     def get_queryset(self):
-        queryset = Media.objects.filter(**self.get_filters()).select_related(
-            "accession", "accession_row"
-        ).annotate(comment_count=Count("qc_logs__comments", distinct=True))
+        queryset = Media.objects.filter(**self.get_filters())
 
         if self.distinct:
             queryset = queryset.distinct()
@@ -1486,6 +1476,19 @@ class MediaQCQueueView(LoginRequiredMixin, UserPassesTestMixin, ListView):
 
         return queryset
 
+    def get_page_queryset(self, queryset):
+        # Counted per displayed row rather than grouped over the whole queue.
+        comment_counts = (
+            MediaQCComment.objects.filter(log__media=OuterRef("pk"))
+            .order_by()
+            .values("log__media")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return queryset.select_related("accession", "accession_row").annotate(
+            comment_count=Coalesce(Subquery(comment_counts), 0)
+        )
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context.update(
@@ -1551,7 +1554,7 @@ class MediaWithCommentsQueueView(MediaQCQueueView):
     queue_empty_message = "No media entries have QC comments yet."
 
 
-class MediaQCHistoryView(LoginRequiredMixin, UserPassesTestMixin, ListView):
+class MediaQCHistoryView(LoginRequiredMixin, UserPassesTestMixin, KeysetPaginationMixin, ListView):
     """Display a paginated timeline of media QC activity."""
 
     model = MediaQCLog
@@ -1559,6 +1562,7 @@ class MediaQCHistoryView(LoginRequiredMixin, UserPassesTestMixin, ListView):
     context_object_name = "qc_logs"
     paginate_by = 25
     raise_exception = True
+    keyset_ordering = ("-created_on", "-pk")
     filter_media: Media | None = None
 
     def test_func(self) -> bool:
@@ -1566,11 +1570,7 @@ class MediaQCHistoryView(LoginRequiredMixin, UserPassesTestMixin, ListView):
         return user.is_superuser or user.is_staff
 
     def get_queryset(self):
-        queryset = (
-            MediaQCLog.objects.select_related("media", "changed_by")
-            .prefetch_related(_QC_COMMENT_PREFETCH)
-            .order_by("-created_on")
-        )
+        queryset = MediaQCLog.objects.order_by("-created_on")
         media_uuid = self.request.GET.get("media")
         self.filter_media = None
         if media_uuid:
@@ -1584,8 +1584,12 @@ class MediaQCHistoryView(LoginRequiredMixin, UserPassesTestMixin, ListView):
             self.active_change_type = change_type
         return queryset
 
+    def get_page_queryset(self, queryset):
+        return queryset.select_related("media", "changed_by").prefetch_related(_QC_COMMENT_PREFETCH)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        MediaQCLog.load_documents(context["qc_logs"])
         context["filter_media"] = self.filter_media
         context["page_title"] = _("Media QC history")
         context["active_media"] = self.request.GET.get("media", "")
@@ -1753,24 +1757,22 @@ class FieldSlipDetailView(DetailView):
         if not can_view_unpublished:
             accessions = accessions.filter(is_published=True)
 
-        accessions = prefetch_accession_related(accessions)
-        attach_accession_summaries(accessions)
-
-        context["accessions"] = accessions
+        context["accessions"] = with_accession_summaries(accessions)
         context["can_view_unpublished_accessions"] = can_view_unpublished
         context["show_accession_staff_columns"] = can_view_unpublished
 
         return context
 
-class FieldSlipListView(LoginRequiredMixin, UserPassesTestMixin, FilterView):
+class FieldSlipListView(LoginRequiredMixin, UserPassesTestMixin, KeysetPaginationMixin, FilterView):
     model = FieldSlip
     template_name = 'cms/fieldslip_list.html'
     context_object_name = 'fieldslips'
     paginate_by = 10
     filterset_class = FieldSlipFilter
+    keyset_ordering = ("field_number", "pk")
 
-    def get_queryset(self):
-        return _with_fieldslip_sedimentary_related(super().get_queryset())
+    def get_page_queryset(self, queryset):
+        return _with_fieldslip_sedimentary_related(queryset)
 
     def test_func(self):
         user = self.request.user
@@ -1878,12 +1880,14 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView
 from django_filters.views import FilterView
 
-class AccessionListView(FilterView):
+class AccessionListView(KeysetPaginationMixin, FilterView):
     model = Accession
     context_object_name = 'accessions'
     template_name = 'cms/accession_list.html'
     paginate_by = 10
     filterset_class = AccessionFilter
+    # Meta.ordering spelled out as columns: collections have no ordering, localities sort by name.
+    keyset_ordering = ("collection_id", "specimen_prefix__name", "specimen_no", "pk")
 
     def get_queryset(self):
         qs = super().get_queryset()
@@ -1898,14 +1902,17 @@ class AccessionListView(FilterView):
         ):
             qs = qs.filter(is_published=True)
 
-        return prefetch_accession_related(qs)
+        return qs
+
+    def get_page_queryset(self, queryset):
+        return with_accession_summaries(queryset)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        accessions = context.get('accessions')
-        if accessions is not None:
-            attach_accession_summaries(accessions)
-
+        user = self.request.user
+        context['show_accession_staff_columns'] = user.is_authenticated and (
+            user.is_superuser or user.groups.filter(name="Collection Managers").exists()
+        )
         return context
 
 class AccessionRowDetailView(DetailView):
@@ -2367,12 +2374,7 @@ class ReferenceDetailView(DetailView):
 
         accession_entries = []
         if accession_ids:
-            accessions = list(
-                prefetch_accession_related(
-                    Accession.objects.filter(id__in=accession_ids)
-                )
-            )
-            attach_accession_summaries(accessions)
+            accessions = with_accession_summaries(Accession.objects.filter(id__in=accession_ids))
             accession_map = {accession.id: accession for accession in accessions}
 
             for accession_reference in accession_references:
@@ -2390,7 +2392,7 @@ class ReferenceDetailView(DetailView):
         context["accession_entries"] = accession_entries
         return context
 
-class ReferenceListView(FilterView):
+class ReferenceListView(KeysetPaginationMixin, FilterView):
     model = Reference
     template_name = 'cms/reference_list.html'
     context_object_name = 'references'
@@ -2405,23 +2407,7 @@ class ReferenceListView(FilterView):
     }
     default_order = "first_author"
 
-    def get_queryset(self):
-        queryset = super().get_queryset()
-        user = self.request.user
-
-        if is_public_user(user):
-            queryset = queryset.annotate(
-                accession_count=Count(
-                    "accessionreference",
-                    filter=Q(accessionreference__accession__is_published=True),
-                    distinct=True,
-                )
-            ).filter(accession_count__gt=0)
-        else:
-            queryset = queryset.annotate(
-                accession_count=Count("accessionreference", distinct=True)
-            )
-
+    def get_sort(self) -> tuple[str, str]:
         sort_key = self.request.GET.get("sort") or self.default_order
         direction = self.request.GET.get("direction", "asc")
 
@@ -2429,22 +2415,41 @@ class ReferenceListView(FilterView):
             sort_key = self.default_order
         if direction not in {"asc", "desc"}:
             direction = "asc"
+        return sort_key, direction
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if is_public_user(self.request.user):
+            queryset = queryset.filter(
+                Exists(
+                    AccessionReference.objects.filter(
+                        reference=OuterRef("pk"), accession__is_published=True
+                    )
+                )
+            )
+        return queryset
 
+    def get_keyset_ordering(self):
+        sort_key, direction = self.get_sort()
         order_expression = self.ordering_fields[sort_key]
         if direction == "desc":
             order_expression = f"-{order_expression}"
+        return (order_expression, "title", "pk")
 
-        return queryset.order_by(order_expression, "title")
+    def get_page_queryset(self, queryset):
+        if is_public_user(self.request.user):
+            return queryset.annotate(
+                accession_count=Count(
+                    "accessionreference",
+                    filter=Q(accessionreference__accession__is_published=True),
+                    distinct=True,
+                )
+            )
+        return queryset.annotate(accession_count=Count("accessionreference", distinct=True))
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        sort_key = self.request.GET.get("sort") or self.default_order
-        direction = self.request.GET.get("direction", "asc")
-
-        if sort_key not in self.ordering_fields:
-            sort_key = self.default_order
-        if direction not in {"asc", "desc"}:
-            direction = "asc"
+        sort_key, direction = self.get_sort()
 
         context["current_sort"] = sort_key
         context["current_direction"] = direction
@@ -2832,8 +2837,10 @@ def _get_qc_history(media: Media, limit: int | None = None) -> list[MediaQCLog]:
         .order_by("-created_on")
     )
     if limit is not None:
-        return list(queryset[:limit])
-    return list(queryset)
+        queryset = queryset[:limit]
+    logs = list(queryset)
+    MediaQCLog.load_documents(logs)
+    return logs
 
 
 class MediaQCFormManager:
@@ -4587,14 +4594,12 @@ class LocalityDetailView(DetailView):
         if not can_view_restricted:
             accessions = accessions.filter(is_published=True)
 
-        accessions = prefetch_accession_related(accessions)
+        accessions = with_accession_summaries(accessions)
 
         paginator = Paginator(accessions, 10)
         page_number = self.request.GET.get('page')
         accessions = paginator.get_page(page_number)
 
-        attach_accession_summaries(accessions)
-
         context['accessions'] = accessions
         context['page_obj'] = accessions
         context['is_paginated'] = accessions.paginator.num_pages > 1
@@ -4689,10 +4694,7 @@ def chatgpt_usage_report(request):
     today = timezone.localdate()
     default_start = today - timedelta(days=30)
 
-    base_qs = LLMUsageRecord.objects.all()
-    model_values = list(
-        base_qs.order_by("model_name").values_list("model_name", flat=True).distinct()
-    )
+    model_values = report_rollups.llm_usage_models()
 
     if request.GET:
         form = LLMUsageReportFilterForm(request.GET, model_choices=model_values)
@@ -4713,66 +4715,68 @@ def chatgpt_usage_report(request):
         end_date = today
         model_name = None
 
-    filtered_qs = base_qs
-    if start_date:
-        filtered_qs = filtered_qs.filter(created_at__date__gte=start_date)
-    if end_date:
-        filtered_qs = filtered_qs.filter(created_at__date__lte=end_date)
-    if model_name:
-        filtered_qs = filtered_qs.filter(model_name=model_name)
-
-    daily_totals_qs = (
-        filtered_qs
-        .annotate(day=TruncDate("created_at"))
-        .values("day")
-        .order_by("day")
-        .annotate(
-            prompt_tokens=Sum("prompt_tokens"),
-            completion_tokens=Sum("completion_tokens"),
-            total_tokens=Sum("total_tokens"),
-            cost_usd=Sum("cost_usd"),
-            processing_seconds=Sum("processing_seconds"),
-            record_count=Count("id"),
-        )
+    # Half-open ranges keep the date columns free of functions so indexes apply.
+    end_day = end_date + timedelta(days=1)
+    usage_rows = report_rollups.llm_usage_by_day_and_stage(start_date, end_day, model_name=model_name)
+
+    summed_fields = (
+        "record_count",
+        "prompt_tokens",
+        "completion_tokens",
+        "total_tokens",
+        "cost_usd",
+        "processing_seconds",
     )
 
-    weekly_totals_qs = (
-        filtered_qs
-        .annotate(week=TruncWeek("created_at"))
-        .values("week")
-        .order_by("week")
-        .annotate(
-            prompt_tokens=Sum("prompt_tokens"),
-            completion_tokens=Sum("completion_tokens"),
-            total_tokens=Sum("total_tokens"),
-            cost_usd=Sum("cost_usd"),
-            processing_seconds=Sum("processing_seconds"),
-            record_count=Count("id"),
-        )
-    )
-
-    totals = filtered_qs.aggregate(
-        prompt_tokens=Sum("prompt_tokens"),
-        completion_tokens=Sum("completion_tokens"),
-        total_tokens=Sum("total_tokens"),
-        cost_usd=Sum("cost_usd"),
-        processing_seconds=Sum("processing_seconds"),
-        record_count=Count("id"),
+    def _sum_rows(rows, key):
+        grouped: dict[Any, dict[str, Any]] = {}
+        for row in rows:
+            label = key(row)
+            entry = grouped.setdefault(label, {field: 0 for field in summed_fields})
+            for field in summed_fields:
+                entry[field] += row[field]
+        return grouped
+
+    daily_totals = [
+        {"day": day, **values}
+        for day, values in _sum_rows(usage_rows, lambda row: row["day"]).items()
+    ]
+    weekly_totals = [
+        {"week": week, **values}
+        for week, values in _sum_rows(
+            usage_rows, lambda row: row["day"] - timedelta(days=row["day"].weekday())
+        ).items()
+    ]
+    stage_totals = [
+        {"stage": stage, "label": report_rollups.LLM_STAGE_LABELS.get(stage, stage), **values}
+        for stage, values in sorted(_sum_rows(usage_rows, lambda row: row["stage"]).items())
+    ]
+    totals = {field: sum(row[field] for row in daily_totals) for field in summed_fields}
+    scan_totals = next(
+        (row for row in stage_totals if row["stage"] == report_rollups.SCAN_OCR_STAGE),
+        {field: 0 for field in summed_fields},
     )
 
-    cumulative_cost = totals.get("cost_usd") or Decimal("0")
-    total_processing_seconds = totals.get("processing_seconds") or Decimal("0")
-    scans_processed = totals.get("record_count") or 0
+    cumulative_cost = _coerce_decimal(totals["cost_usd"])
+    total_processing_seconds = _coerce_decimal(scan_totals["processing_seconds"])
+    scans_processed = scan_totals["record_count"]
     avg_processing_seconds = None
     if scans_processed:
         avg_processing_seconds = total_processing_seconds / Decimal(scans_processed)
 
+    scan_cost = _coerce_decimal(scan_totals["cost_usd"])
     avg_cost_per_scan: Decimal | None = None
-    if scans_processed and cumulative_cost > 0:
-        avg_cost_per_scan = cumulative_cost / Decimal(scans_processed)
+    if scans_processed and scan_cost > 0:
+        avg_cost_per_scan = scan_cost / Decimal(scans_processed)
 
+    quota_qs = LLMUsageRecord.objects.filter(
+        created_at__gte=timezone.make_aware(datetime.combine(start_date, datetime.min.time())),
+        created_at__lt=timezone.make_aware(datetime.combine(end_day, datetime.min.time())),
+    )
+    if model_name:
+        quota_qs = quota_qs.filter(model_name=model_name)
     latest_remaining_quota = (
-        filtered_qs.exclude(remaining_quota_usd__isnull=True)
+        quota_qs.exclude(remaining_quota_usd__isnull=True)
         .order_by("-created_at")
         .values_list("remaining_quota_usd", flat=True)
         .first()
@@ -4805,9 +4809,6 @@ def chatgpt_usage_report(request):
             "processing_seconds": [float(entry.get("processing_seconds") or 0) for entry in items],
         }
 
-    daily_totals = list(daily_totals_qs)
-    weekly_totals = list(weekly_totals_qs)
-
     def _attach_average(entries: list[dict[str, Any]]) -> None:
         for entry in entries:
             total_seconds = _coerce_decimal(entry.get("processing_seconds"))
@@ -4820,6 +4821,7 @@ def chatgpt_usage_report(request):
 
     _attach_average(daily_totals)
     _attach_average(weekly_totals)
+    _attach_average(stage_totals)
 
     chart_data = {
         "daily": _prepare_time_series(daily_totals, "day"),
@@ -4830,6 +4832,7 @@ def chatgpt_usage_report(request):
         "filter_form": form,
         "daily_totals": daily_totals,
         "weekly_totals": weekly_totals,
+        "stage_totals": stage_totals,
         "totals": totals,
         "cumulative_cost": cumulative_cost,
         "total_processing_seconds": total_processing_seconds,
@@ -4853,8 +4856,9 @@ def chatgpt_usage_report(request):
 def upload_scan(request):
     """Upload one or more scan images to the ``uploads/incoming`` folder.
 
-    The watcher script later validates filenames and moves each file to
-    ``uploads/pending`` or ``uploads/rejected`` as appropriate.
+    The saved files are then ingested by a background job, which validates
+    filenames and moves each file to ``uploads/pending`` or
+    ``uploads/rejected`` as appropriate; the view redirects to its status page.
     """
     incoming_dir = Path(settings.MEDIA_ROOT) / 'uploads' / 'incoming'
     os.makedirs(incoming_dir, exist_ok=True)
@@ -4867,7 +4871,8 @@ def upload_scan(request):
             files = form.cleaned_data['files']
             total_files = len(files)
             fs = FileSystemStorage(location=incoming_dir)
-            for index, file in enumerate(files, start=1):
+            saved_names = []
+            for file in files:
                 saved_name = fs.save(file.name, file)
                 saved_path = incoming_dir / saved_name
                 if saved_name != file.name:
@@ -4876,13 +4881,14 @@ def upload_scan(request):
                         desired_path.unlink()
                     saved_path.rename(desired_path)
                     saved_name = file.name
-                    saved_path = desired_path
-                process_file(saved_path)
+                saved_names.append(saved_name)
+            job = jobs.enqueue(BackgroundJob.Kind.INGEST_SCANS, {"files": saved_names})
+            for index, file in enumerate(files, start=1):
                 messages.success(
                     request,
                     f'Uploaded {file.name} ({index} of {total_files})',
                 )
-            return redirect('admin-upload-scan')
+            return redirect('admin-job-status', pk=job.pk)
     else:
         form = ScanUploadForm(**form_kwargs)
 
@@ -4934,7 +4940,7 @@ class SpecimenListUploadView(LoginRequiredMixin, PermissionRequiredMixin, FormVi
         return redirect(self.get_success_url())
 
 
-class SpecimenListQueueView(LoginRequiredMixin, PermissionRequiredMixin, FilterView):
+class SpecimenListQueueView(LoginRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, FilterView):
     template_name = "cms/specimen_list_queue.html"
     filterset_class = SpecimenListPageFilter
     paginate_by = 25
@@ -4945,15 +4951,16 @@ class SpecimenListQueueView(LoginRequiredMixin, PermissionRequiredMixin, FilterV
             raise Http404("Specimen list review UI is disabled.")
         return super().dispatch(request, *args, **kwargs)
 
+    keyset_ordering = ("pipeline_status", "pdf_id", "page_number", "pk")
+
     def get_queryset(self):
-        return (
-            SpecimenListPage.objects.select_related("pdf", "assigned_reviewer")
-            .filter(page_type=SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS)
-            .order_by("pipeline_status", "pdf_id", "page_number")
-        )
+        return SpecimenListPage.objects.filter(page_type=SpecimenListPage.PageType.SPECIMEN_LIST_DETAILS)
 
+    def get_page_queryset(self, queryset):
+        return queryset.select_related("pdf", "assigned_reviewer")
 
-class SpecimenListOCRQueueView(LoginRequiredMixin, PermissionRequiredMixin, FilterView):
+
+class SpecimenListOCRQueueView(LoginRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, FilterView):
     template_name = "cms/specimen_list_ocr_queue.html"
     filterset_class = SpecimenListPageFilter
     paginate_by = 25
@@ -4964,12 +4971,13 @@ class SpecimenListOCRQueueView(LoginRequiredMixin, PermissionRequiredMixin, Filt
             raise Http404("Specimen list review UI is disabled.")
         return super().dispatch(request, *args, **kwargs)
 
+    keyset_ordering = ("pipeline_status", "pdf_id", "page_number", "pk")
+
     def get_queryset(self):
-        return (
-            SpecimenListPage.objects.select_related("pdf", "assigned_reviewer")
-            .exclude(review_status=SpecimenListPage.ReviewStatus.APPROVED)
-            .order_by("pipeline_status", "pdf_id", "page_number")
-        )
+        return SpecimenListPage.objects.exclude(review_status=SpecimenListPage.ReviewStatus.APPROVED)
+
+    def get_page_queryset(self, queryset):
+        return queryset.select_related("pdf", "assigned_reviewer")
 
 
 class SpecimenListRowCandidateForm(forms.Form):
@@ -4986,17 +4994,19 @@ class SpecimenListRowCandidateForm(forms.Form):
     )
 
 
-class SpecimenListRowReviewView(LoginRequiredMixin, PermissionRequiredMixin, FilterView):
+class SpecimenListRowReviewView(LoginRequiredMixin, PermissionRequiredMixin, KeysetPaginationMixin, FilterView):
     template_name = "cms/specimen_list_row_review.html"
     filterset_class = SpecimenListRowCandidateFilter
     paginate_by = 25
     permission_required = "cms.review_specimenlistrowcandidate"
 
+    keyset_ordering = ("page_id", "row_index", "pk")
+
     def get_queryset(self):
-        return (
-            SpecimenListRowCandidate.objects.select_related("page", "page__pdf", "page__assigned_reviewer")
-            .order_by("page_id", "row_index")
-        )
+        return SpecimenListRowCandidate.objects.all()
+
+    def get_page_queryset(self, queryset):
+        return queryset.select_related("page", "page__pdf", "page__assigned_reviewer")
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -5595,226 +5605,140 @@ def _count_pending_scans() -> int:
     return sum(1 for _ in pending_dir.glob("*"))
 
 
-def _should_loop(request) -> bool:
-    flag = request.GET.get("loop", "").lower()
-    return flag in {"1", "true", "yes", "on"}
-
-
-def _parse_ocr_limit(request) -> int | None:
-    raw = request.GET.get("limit")
-    if not raw:
-        return None
-    try:
-        value = int(raw)
-    except (TypeError, ValueError):
-        return None
-    return value if value > 0 else None
-
-
-def _compute_expected_total(attempted: int, remaining: int, limit: int | None) -> int:
-    if limit is None:
-        return attempted + remaining
-    return max(attempted, min(limit, attempted + remaining))
+OCR_WORKER_OPTIONS = (1, 2, 4, 8)
 
 
 @staff_member_required
 def do_ocr(request):
-    """Process pending scans sequentially, looping if requested."""
+    """Queue OCR of pending scans as a background job and show its progress."""
 
-    loop = _should_loop(request)
-    limit_hint = _parse_ocr_limit(request)
-    if not loop:
-        pending_total = _count_pending_scans()
-        limit_options = [100 * i for i in range(1, 11)]
-        selection_error = None
-        choice_value: str | None = None
+    pending_total = _count_pending_scans()
+    limit_options = [100 * i for i in range(1, 11)]
+    selection_error = None
+    choice_value: str | None = None
+    workers_value = str(default_scan_workers())
 
-        if request.method == "POST":
-            choice = request.POST.get("scan_limit") or ""
-            choice_value = choice
-            valid_values = {str(option) for option in limit_options}
-            if choice == "all":
-                selected_limit = None
-            elif choice in valid_values:
-                selected_limit = int(choice)
-            else:
-                selected_limit = None
-                selection_error = "Please choose one of the available options."
-
-            if selection_error is None and pending_total == 0:
-                messages.info(request, "No pending scans to process.")
-                return redirect("admin-do-ocr")
-
-            if selection_error is None:
-                query_params: dict[str, str] = {"loop": "1"}
-                if selected_limit:
-                    query_params["limit"] = str(selected_limit)
-                url = reverse("admin-do-ocr")
-                if query_params:
-                    url = f"{url}?{urlencode(query_params)}"
-                return redirect(url)
+    if request.method == "POST":
+        choice = request.POST.get("scan_limit") or ""
+        choice_value = choice
+        valid_values = {str(option) for option in limit_options}
+        if choice == "all":
+            selected_limit = None
+        elif choice in valid_values:
+            selected_limit = int(choice)
+        else:
+            selected_limit = None
+            selection_error = "Please choose one of the available options."
+
+        workers_value = request.POST.get("scan_workers") or str(default_scan_workers())
+        workers = default_scan_workers()
+        if workers_value in {str(option) for option in OCR_WORKER_OPTIONS}:
+            workers = int(workers_value)
+        elif selection_error is None:
+            selection_error = "Please choose one of the available concurrency levels."
+
+        if selection_error is None and pending_total == 0:
+            messages.info(request, "No pending scans to process.")
+            return redirect("admin-do-ocr")
+
+        if selection_error is None:
+            job = jobs.enqueue(
+                BackgroundJob.Kind.SCAN_OCR,
+                {"limit": selected_limit, "workers": workers},
+                dedupe_key="scan_ocr",
+            )
+            return redirect("admin-job-status", pk=job.pk)
 
-        context = {
-            "pending_total": pending_total,
-            "limit_options": limit_options,
-            "selection_error": selection_error,
-            "selected_choice": choice_value,
-        }
-        return render(request, "admin/do_ocr_prompt.html", context)
-
-    (
-        successes,
-        failures,
-        total,
-        errors,
-        jammed,
-        processed_filenames,
-        insufficient_quota,
-    ) = process_pending_scans(limit=1)
-    latest_filename = processed_filenames[-1] if processed_filenames else None
-
-    aggregated: dict[str, Any] | None = None
-    if loop:
-        stats = request.session.get("ocr_loop_stats", {
-            "successes": 0,
-            "failures": 0,
-            "attempted": 0,
-            "errors": [],
-        })
-        stats["successes"] += successes
-        stats["failures"] += failures
-        stats["attempted"] += total
-        stats.setdefault("errors", [])
-        stats["errors"].extend(errors)
-        stats.setdefault("latest_filename", None)
-        stats.setdefault("expected_total", None)
-        stats.setdefault("insufficient_quota", False)
-        stats["insufficient_quota"] = stats["insufficient_quota"] or insufficient_quota
-        stats.setdefault("limit", limit_hint)
-        if limit_hint is not None:
-            stats["limit"] = limit_hint
-        if latest_filename:
-            stats["latest_filename"] = latest_filename
-        if jammed:
-            stats["jammed"] = jammed
-        aggregated = stats
-        request.session["ocr_loop_stats"] = stats
-        request.session.modified = True
-
-    remaining = _count_pending_scans()
-    errors_list = list(aggregated["errors"]) if aggregated else list(errors)
-    attempted_total = aggregated["attempted"] if aggregated else total
-    insufficient_quota_flag = (
-        aggregated.get("insufficient_quota") if aggregated else insufficient_quota
-    )
-    selected_limit = aggregated.get("limit") if aggregated else limit_hint
-    expected_total = _compute_expected_total(attempted_total, remaining, selected_limit)
-    if aggregated is not None:
-        aggregated["expected_total"] = expected_total
-        if aggregated.get("latest_filename") is None and latest_filename:
-            aggregated["latest_filename"] = latest_filename
-
-    # Sanitize error messages for external exposure: extract only the scan filename portion.
-    def _sanitize_ocr_errors(error_list):
-        sanitized = []
-        for msg in error_list:
-            if msg == "insufficient_quota":
-                continue
-            # Expected format: "{filename}: {exception}"
-            parts = msg.split(':', 1)
-            filename = parts[0].strip() if parts else "Unknown"
-            sanitized.append(filename)
-        return sanitized
-
-    sanitized_errors = _sanitize_ocr_errors(errors_list)
-    detail = {
-        "successes": aggregated["successes"] if aggregated else successes,
-        "failures": aggregated["failures"] if aggregated else failures,
-        "attempted": attempted_total,
-        "errors": sanitized_errors,
-        "jammed": aggregated.get("jammed") if aggregated else jammed,
-        "remaining": remaining,
-        "loop": loop,
-        "expected_total": aggregated.get("expected_total") if aggregated else expected_total,
-        "latest_filename": aggregated.get("latest_filename") if aggregated else latest_filename,
-        "current_index": attempted_total,
-        "insufficient_quota": insufficient_quota_flag,
-        "limit": selected_limit,
+    context = {
+        "pending_total": pending_total,
+        "limit_options": limit_options,
+        "selection_error": selection_error,
+        "selected_choice": choice_value,
+        "worker_options": OCR_WORKER_OPTIONS,
+        "selected_workers": workers_value,
     }
+    return render(request, "admin/do_ocr_prompt.html", context)
 
-    if request.headers.get("HX-Request") or request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        return JsonResponse(detail)
-
-    limit_reached = (
-        detail["limit"] is not None and detail["current_index"] >= detail["limit"]
-    )
-
-    if (
-        loop
-        and remaining > 0
-        and not detail["jammed"]
-        and not detail["insufficient_quota"]
-        and not limit_reached
-    ):
-        query_params = {"loop": "1"}
-        if detail["limit"] is not None:
-            query_params["limit"] = str(detail["limit"])
-        next_url = f"{reverse('admin-do-ocr')}?{urlencode(query_params)}"
-        expected_display = detail["expected_total"] or detail["attempted"]
-        latest_segment = (
-            f" (Latest: {detail['latest_filename']})"
-            if detail["latest_filename"]
-            else ""
-        )
-        body = (
-            "<!doctype html><html lang=\"en\"><head><meta charset=\"utf-8\">"
-            f"<title>Continuing OCR…</title><meta http-equiv=\"refresh\" content=\"0; url={next_url}\"></head>"
-            "<body><p>Continuing OCR… scan "
-            f"{detail['current_index']} of {expected_display}{latest_segment}.</p></body></html>"
-        )
-        response = HttpResponse(body)
-        response["Refresh"] = f"0;url={next_url}"
-        return response
-
-    if loop and "ocr_loop_stats" in request.session:
-        del request.session["ocr_loop_stats"]
-        request.session.modified = True
 
-    if detail["attempted"] == 0:
-        messages.info(request, "No pending scans to process.")
-        # Show only affected scan file names, not raw error messages
+def _scan_ocr_job_messages(result: dict[str, Any]) -> list[tuple[str, str]]:
+    notes: list[tuple[str, str]] = []
+    if not result.get("total"):
+        notes.append(("info", "No pending scans to process."))
     else:
-        expected_display = detail["expected_total"] or detail["attempted"]
-        latest_segment = (
-            f" Latest scan: {detail['latest_filename']}."
-            if detail["latest_filename"]
-            else ""
-        )
-        messages.info(
-            request,
-            f"Processed {detail['successes']} of {expected_display} scans this run.{latest_segment}",
+        latest = result.get("latest_filename")
+        latest_segment = f" Latest scan: {latest}." if latest else ""
+        notes.append(
+            ("info", f"Processed {result.get('successes', 0)} of {result['total']} scans this run.{latest_segment}")
         )
-
-    if detail["failures"]:
-        error_text = "; ".join(detail["errors"])
-        messages.error(request, f"OCR failed for {detail['failures']} scans: {error_text}")
-    if detail["jammed"]:
-        messages.error(
-            request,
+    if result.get("failures"):
+        # Show only affected scan file names, not raw error messages.
+        filenames = "; ".join(error.split(":", 1)[0].strip() for error in result.get("errors", []))
+        notes.append(("error", f"OCR failed for {result['failures']} scans: {filenames}"))
+    if result.get("jammed"):
+        notes.append(
             (
-                "OCR halted because scan "
-                f"{detail['jammed']} timed out after three attempts. Please investigate before retrying."
-            ),
+                "error",
+                f"OCR halted because scan {result['jammed']} timed out after three attempts. "
+                "Please investigate before retrying.",
+            )
         )
-    if detail["insufficient_quota"]:
-        messages.error(
-            request,
+    if result.get("insufficient_quota"):
+        notes.append(
             (
+                "error",
                 "OCR aborted because the OpenAI quota has been exhausted. "
-                "The current scan remains in the pending folder. Please review your plan and retry later."
-            ),
+                "The remaining scans stay in the pending folder. Please review your plan and retry later.",
+            )
+        )
+    return notes
+
+
+def _ingest_scans_job_messages(result: dict[str, Any]) -> list[tuple[str, str]]:
+    destinations = result.get("destinations", {})
+    notes = [
+        (
+            "info",
+            f"Ingested {sum(destinations.values())} of {result.get('total', 0)} uploaded scans: "
+            + ", ".join(f"{count} to {folder}" for folder, count in sorted(destinations.items())),
         )
-    return redirect('admin:index')
+    ]
+    if destinations.get("rejected"):
+        notes.append(("error", f"{destinations['rejected']} scans were rejected; check their filenames."))
+    if result.get("missing"):
+        notes.append(("info", f"{result['missing']} scans had already left the incoming folder."))
+    return notes
+
+
+@staff_member_required
+def job_status(request, pk: int):
+    """Report the progress of a background job; refreshes itself while the job is active."""
+
+    job = get_object_or_404(BackgroundJob, pk=pk)
+    if request.headers.get("HX-Request") or request.headers.get("X-Requested-With") == "XMLHttpRequest":
+        return JsonResponse(
+            {
+                "id": job.pk,
+                "kind": job.kind,
+                "status": job.status,
+                "attempts": job.attempts,
+                "max_attempts": job.max_attempts,
+                "result": job.result,
+                "error": job.last_error if job.status == BackgroundJob.Status.FAILED else "",
+            }
+        )
+
+    notes: list[tuple[str, str]] = []
+    if job.status == BackgroundJob.Status.SUCCEEDED and job.kind == BackgroundJob.Kind.SCAN_OCR:
+        notes = _scan_ocr_job_messages(job.result)
+    elif job.status == BackgroundJob.Status.SUCCEEDED and job.kind == BackgroundJob.Kind.INGEST_SCANS:
+        notes = _ingest_scans_job_messages(job.result)
+    context = {
+        "job": job,
+        "notes": notes,
+        "pending_total": _count_pending_scans() if job.kind == BackgroundJob.Kind.SCAN_OCR else None,
+        "refresh_seconds": 5 if job.is_active else None,
+    }
+    return render(request, "admin/job_status.html", context)
 
 @login_required
 @user_passes_test(is_collection_manager)
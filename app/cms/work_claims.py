@@ -0,0 +1,155 @@
+"""Leases that let OCR workers on several nodes share one queue.
+
+Pending scans (:class:`cms.models.Media`) and specimen list pages
+(:class:`cms.models.SpecimenListPage`) carry ``claimed_by`` and
+``claim_expires_at`` columns. A queue run claims the rows it is about to
+process with ``SELECT ... FOR UPDATE SKIP LOCKED`` followed by a conditional
+update, so concurrent runs on other hosts skip them instead of paying for the
+same LLM calls twice. Claims are renewed while the run is alive and released
+when each row leaves the queue. A claim left behind by a crashed worker lapses
+once its lease expires and the row becomes claimable again.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Iterable
+
+from django.conf import settings
+from django.db import connections, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def lease_seconds() -> int:
+    try:
+        return max(10, int(getattr(settings, "WORK_CLAIM_LEASE_SECONDS", 600)))
+    except (TypeError, ValueError):
+        return 600
+
+
+def default_owner() -> str:
+    """Return an identifier unique to one queue run on this host."""
+
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}:{uuid.uuid4().hex[:8]}"
+
+
+def claimable(now: datetime) -> Q:
+    """Match rows nobody holds a live claim on at ``now``."""
+
+    return Q(claimed_by="") | Q(claim_expires_at__isnull=True) | Q(claim_expires_at__lt=now)
+
+
+class WorkClaims:
+    """The claims one queue run holds on rows of ``model``.
+
+    Use it as a context manager: while the block runs a heartbeat thread
+    renews the held claims every third of the lease, and every claim still
+    held is released on exit.
+    """
+
+    def __init__(self, model: type[models.Model], *, owner: str | None = None):
+        self.model = model
+        self.owner = owner or default_owner()
+        self._held: set[int] = set()
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._heartbeat: threading.Thread | None = None
+
+    @property
+    def held(self) -> set[int]:
+        with self._lock:
+            return set(self._held)
+
+    def claim(self, queryset: models.QuerySet, limit: int) -> list[int]:
+        """Claim up to ``limit`` unclaimed rows of ``queryset`` and return their pks in queryset order."""
+
+        if limit <= 0:
+            return []
+        while True:
+            now = timezone.now()
+            with transaction.atomic():
+                candidates = list(
+                    queryset.filter(claimable(now))
+                    .select_for_update(skip_locked=True)
+                    .values_list("pk", flat=True)[:limit]
+                )
+                if not candidates:
+                    return []
+                # The conditional update keeps claims exclusive on databases
+                # without row locks, where SKIP LOCKED is a no-op.
+                self.model.objects.filter(claimable(now), pk__in=candidates).update(
+                    claimed_by=self.owner, claim_expires_at=now + timedelta(seconds=lease_seconds())
+                )
+            won = set(
+                self.model.objects.filter(pk__in=candidates, claimed_by=self.owner).values_list("pk", flat=True)
+            )
+            if won:
+                with self._lock:
+                    self._held.update(won)
+                return [pk for pk in candidates if pk in won]
+            # Another run claimed every candidate first; look further down the queue.
+
+    def release(self, pks: Iterable[int]) -> None:
+        pks = set(pks)
+        with self._lock:
+            pks &= self._held
+            self._held -= pks
+        if pks:
+            self.model.objects.filter(pk__in=pks, claimed_by=self.owner).update(
+                claimed_by="", claim_expires_at=None
+            )
+
+    def release_all(self) -> None:
+        self.release(self.held)
+
+    def renew(self) -> int:
+        """Extend the lease on every held claim and return how many are still ours."""
+
+        pks = self.held
+        if not pks:
+            return 0
+        renewed = self.model.objects.filter(pk__in=pks, claimed_by=self.owner).update(
+            claim_expires_at=timezone.now() + timedelta(seconds=lease_seconds())
+        )
+        if renewed < len(pks):
+            logger.warning(
+                "%s of %s claims held by %s lapsed before renewal",
+                len(pks) - renewed,
+                len(pks),
+                self.owner,
+            )
+        return renewed
+
+    def _keep_claims(self) -> None:
+        interval = lease_seconds() / 3
+        try:
+            while not self._done.wait(interval):
+                try:
+                    self.renew()
+                except Exception:
+                    logger.exception("Could not renew claims held by %s", self.owner)
+        finally:
+            connections.close_all()
+
+    def __enter__(self) -> WorkClaims:
+        self._done.clear()
+        self._heartbeat = threading.Thread(
+            target=self._keep_claims, name=f"work-claims-{self.model._meta.model_name}", daemon=True
+        )
+        self._heartbeat.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._done.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        self.release_all()
@@ -52,6 +52,38 @@ def get_var(name, default_value=None):
 
 OPENAI_DEFAULT_MODEL = get_var("OPENAI_DEFAULT_MODEL", "gpt-5.2")
 OCR_DEFAULT_ENGINE = get_var("OCR_DEFAULT_ENGINE", "chatgpt-vision")
+# Shared OpenAI budget per model across all workers (0 disables a bucket).
+OPENAI_REQUESTS_PER_MINUTE = int(get_var("OPENAI_REQUESTS_PER_MINUTE", 500))
+OPENAI_TOKENS_PER_MINUTE = int(get_var("OPENAI_TOKENS_PER_MINUTE", 0))
+OPENAI_ESTIMATED_TOKENS_PER_CALL = int(get_var("OPENAI_ESTIMATED_TOKENS_PER_CALL", 2000))
+# Upper bound for the adaptive number of concurrent OpenAI calls, and the latency above which it shrinks.
+OPENAI_MAX_CONCURRENCY = int(get_var("OPENAI_MAX_CONCURRENCY", 8))
+OPENAI_LATENCY_TARGET_SECONDS = float(get_var("OPENAI_LATENCY_TARGET_SECONDS", 30))
+# Number of pending scans sent to OpenAI concurrently by ``process_pending_scans``.
+OCR_SCAN_WORKERS = int(get_var("OCR_SCAN_WORKERS", 1))
+# Pages each specimen list pipeline stage (classify, raw OCR, rows) runs concurrently.
+SPECIMEN_LIST_PIPELINE_WORKERS = int(get_var("SPECIMEN_LIST_PIPELINE_WORKERS", 1))
+# Concurrent ``pdftoppm`` processes, each rendering one page range, when splitting a specimen list PDF.
+SPECIMEN_LIST_SPLIT_WORKERS = int(get_var("SPECIMEN_LIST_SPLIT_WORKERS", 1))
+# Disk cache for size-capped images sent to OpenAI; empty means MEDIA_ROOT/cache/llm_images.
+LLM_IMAGE_CACHE_DIR = get_var("LLM_IMAGE_CACHE_DIR", "")
+# Size cap for that cache; the least recently used derivatives are deleted past it (0 disables the cap).
+LLM_IMAGE_CACHE_MAX_BYTES = int(get_var("LLM_IMAGE_CACHE_MAX_BYTES", 2 * 1024**3))
+# Reuse OpenAI OCR responses for identical image bytes, prompt and model.
+LLM_RESPONSE_CACHE_ENABLED = bool(int(get_var("LLM_RESPONSE_CACHE_ENABLED", 1)))
+LLM_RESPONSE_CACHE_MAX_ENTRIES = int(get_var("LLM_RESPONSE_CACHE_MAX_ENTRIES", 10000))
+# OpenAI Batch API mode (``--batch`` on the OCR queue commands).
+OPENAI_BATCH_CLIENT = get_var("OPENAI_BATCH_CLIENT", "cms.llm_batch.OpenAIBatchClient")
+OPENAI_BATCH_BASE_URL = get_var("OPENAI_BATCH_BASE_URL", "")
+OPENAI_BATCH_MAX_REQUESTS = int(get_var("OPENAI_BATCH_MAX_REQUESTS", 1000))
+# Background jobs run by ``run_workers``: lease length (renewed while a job runs)
+# and the base delay of the exponential retry backoff.
+JOB_LEASE_SECONDS = int(get_var("JOB_LEASE_SECONDS", 300))
+JOB_RETRY_BASE_SECONDS = int(get_var("JOB_RETRY_BASE_SECONDS", 30))
+# How long an OCR worker's claim on a scan or specimen list page lasts unless renewed.
+WORK_CLAIM_LEASE_SECONDS = int(get_var("WORK_CLAIM_LEASE_SECONDS", 600))
+# Scans whose perceptual hashes differ by at most this many bits are linked as near-duplicates.
+MEDIA_NEAR_DUPLICATE_DISTANCE = int(get_var("MEDIA_NEAR_DUPLICATE_DISTANCE", 3))
 
 
 # Quick-start development settings - unsuitable for production
@@ -251,6 +283,16 @@ CACHES = {
     }
 }
 
+if USE_REDIS:
+    # Shared OpenAI rate limiter state (see cms.llm_rate_limit).
+    CACHES["llm_rate_limit"] = {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': 'redis://redis:6379/1',
+        'OPTIONS': {
+            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+        },
+    }
+
 SELECT2_CACHE_BACKEND = "select2"
 
 # Static files (CSS, JavaScript, Images)
@@ -274,6 +316,22 @@ DATA_UPLOAD_MAX_NUMBER_FIELDS = 10000
 SCAN_UPLOAD_MAX_BYTES = int(get_var("SCAN_UPLOAD_MAX_BYTES", 5 * 1024 * 1024))
 SCAN_UPLOAD_BATCH_MAX_BYTES = int(get_var("SCAN_UPLOAD_BATCH_MAX_BYTES", 0))
 SCAN_UPLOAD_TIMEOUT_SECONDS = int(get_var("SCAN_UPLOAD_TIMEOUT_SECONDS", 60))
+# Uploaded scans are ingested in batches of this size, hashed on this many threads.
+SCAN_INGEST_BATCH_SIZE = int(get_var("SCAN_INGEST_BATCH_SIZE", 50))
+SCAN_INGEST_WORKERS = int(get_var("SCAN_INGEST_WORKERS", 4))
+
+# Seconds a rendered report chart stays cached; 0 renders charts on every request.
+REPORT_CHART_CACHE_SECONDS = int(get_var("REPORT_CHART_CACHE_SECONDS", 300))
+
+# Accession filter search backend (dotted class path); empty picks FULLTEXT on MySQL.
+ACCESSION_SEARCH_BACKEND = get_var("ACCESSION_SEARCH_BACKEND", "")
+# Must match the server's innodb_ft_min_token_size; shorter words bypass the index.
+ACCESSION_SEARCH_MIN_TOKEN_SIZE = int(get_var("ACCESSION_SEARCH_MIN_TOKEN_SIZE", 3))
+
+# Large lists count at most this many rows, then show an estimate or "more than".
+LIST_PAGINATION_COUNT_LIMIT = int(get_var("LIST_PAGINATION_COUNT_LIMIT", 10000))
+# Pages linked by number before the links switch to keyset cursors.
+LIST_PAGINATION_MAX_OFFSET_PAGES = int(get_var("LIST_PAGINATION_MAX_OFFSET_PAGES", 20))
 
 # Email Configuration
 EMAIL_BACKEND = get_var(
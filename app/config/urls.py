@@ -26,12 +26,14 @@ from cms.views import (
     FieldSlipListView,
     upload_scan,
     do_ocr,
+    job_status,
     chatgpt_usage_report,
 )
 
 urlpatterns = [
     path('admin/upload-scan/', upload_scan, name='admin-upload-scan'),
     path('admin/do-ocr/', do_ocr, name='admin-do-ocr'),
+    path('admin/jobs/<int:pk>/', job_status, name='admin-job-status'),
     path('admin/chatgpt-usage/', chatgpt_usage_report, name='admin-chatgpt-usage'),
     path('admin/', admin.site.urls),
 
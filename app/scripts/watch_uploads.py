@@ -1,6 +1,13 @@
 #!/usr/bin/env python
-"""Watch incoming uploads and create Media records."""
+"""Watch incoming uploads and create Media records.
+
+New files are collected into micro-batches: once a file arrives, the
+watcher waits ``BATCH_WINDOW_SECONDS`` for the rest of the burst and then
+ingests everything that arrived together, up to ``SCAN_INGEST_BATCH_SIZE``
+files per batch.
+"""
 import os
+import queue
 import time
 from pathlib import Path
 
@@ -11,24 +18,51 @@ from watchdog.observers import Observer
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 django.setup()
 
-from cms.upload_processing import INCOMING, process_file
+from django.conf import settings
+
+from cms.upload_processing import INCOMING, ingest_files
+
+BATCH_WINDOW_SECONDS = 2
 
 
 class UploadHandler(FileSystemEventHandler):
+    def __init__(self, arrivals: "queue.Queue[Path]"):
+        super().__init__()
+        self.arrivals = arrivals
+
     def on_created(self, event):
         if event.is_directory:
             return
-        process_file(Path(event.src_path))
+        self.arrivals.put(Path(event.src_path))
+
+
+def _next_batch(arrivals: "queue.Queue[Path]", first: Path, limit: int) -> list[Path]:
+    batch = [first]
+    while len(batch) < limit:
+        try:
+            batch.append(arrivals.get_nowait())
+        except queue.Empty:
+            break
+    return [path for path in dict.fromkeys(batch) if path.exists()]
 
 
 def main():
-    handler = UploadHandler()
+    arrivals: "queue.Queue[Path]" = queue.Queue()
+    handler = UploadHandler(arrivals)
     observer = Observer()
     observer.schedule(handler, str(INCOMING), recursive=False)
     observer.start()
+    batch_size = max(1, int(getattr(settings, "SCAN_INGEST_BATCH_SIZE", 50)))
     try:
         while True:
-            time.sleep(1)
+            try:
+                first = arrivals.get(timeout=1)
+            except queue.Empty:
+                continue
+            time.sleep(BATCH_WINDOW_SECONDS)
+            batch = _next_batch(arrivals, first, batch_size)
+            if batch:
+                ingest_files(batch)
     except KeyboardInterrupt:
         observer.stop()
     observer.join()
@@ -13,6 +13,8 @@ import sys
 from pathlib import Path
 from types import ModuleType
 
+import pytest
+
 
 # Ensure pytest uses a local SQLite database unless caller explicitly overrides DB settings.
 os.environ.setdefault("DB_ENGINE", "django.db.backends.sqlite3")
@@ -56,3 +58,13 @@ def pytest_configure() -> None:
     """Install legacy import aliases without duplicating pytest-django setup."""
 
     _install_legacy_app_cms_aliases()
+
+
+@pytest.fixture(autouse=True)
+def _reset_taxon_resolver_cache():
+    """Drop cached taxon matches that may point at rolled-back test rows."""
+
+    yield
+    from cms.taxonomy.resolver import invalidate_taxon_cache
+
+    invalidate_taxon_cache()
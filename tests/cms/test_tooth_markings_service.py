@@ -19,14 +19,21 @@ def test_correct_element_text_without_crops_returns_unchanged_text() -> None:
 def test_correct_element_text_with_crops_rewrites_spans(monkeypatch) -> None:
     fake_chain = types.ModuleType("cms.tooth_markings.chain")
 
-    def classify_token_image(_image):
-        return "LM2", 0.93, {
-            "jaw": {"label": "low", "prob": 0.95},
-            "type": {"label": "M", "prob": 0.94},
-            "index": {"label": "2", "prob": 0.93},
-        }
-
-    fake_chain.classify_token_image = classify_token_image
+    def classify_token_images(images):
+        return [
+            (
+                "LM2",
+                0.93,
+                {
+                    "jaw": {"label": "low", "prob": 0.95},
+                    "type": {"label": "M", "prob": 0.94},
+                    "index": {"label": "2", "prob": 0.93},
+                },
+            )
+            for _image in images
+        ]
+
+    fake_chain.classify_token_images = classify_token_images
     monkeypatch.setitem(sys.modules, "cms.tooth_markings.chain", fake_chain)
 
     image = Image.new("RGB", (32, 32), color="white")
@@ -38,3 +45,71 @@ def test_correct_element_text_with_crops_rewrites_spans(monkeypatch) -> None:
     assert result["element_corrected"] == "Element LM2"
     assert len(result["detections"]) == 1
     assert result["detections"][0]["notation"] == "LM2"
+
+
+def test_correct_element_text_classifies_all_crops_in_one_batch(monkeypatch) -> None:
+    fake_chain = types.ModuleType("cms.tooth_markings.chain")
+    batches = []
+
+    def classify_token_images(images):
+        batches.append(len(images))
+        return [
+            ("M1", 0.9, {}),
+            ("p3", 0.8, {}),
+        ]
+
+    fake_chain.classify_token_images = classify_token_images
+    monkeypatch.setitem(sys.modules, "cms.tooth_markings.chain", fake_chain)
+
+    image = Image.new("RGB", (32, 32), color="white")
+    result = correct_element_text(
+        "Ml and p3",
+        token_crops=[
+            {"token": "Ml", "image": image, "start": 0, "end": 2},
+            {"token": "p3", "image": image, "start": 7, "end": 9},
+        ],
+    )
+
+    assert batches == [2]
+    assert result["element_corrected"] == "M1 and p3"
+    assert [det["notation"] for det in result["detections"]] == ["M1", "p3"]
+
+
+def test_batched_chain_matches_per_crop_chain(monkeypatch) -> None:
+    import pytest
+
+    torch = pytest.importorskip("torch")
+    pytest.importorskip("torchvision")
+
+    from cms.tooth_markings import chain, predict
+    from cms.tooth_markings.models import ModelBundle
+
+    torch.manual_seed(0)
+
+    def _head(classes: int) -> "torch.nn.Module":
+        return torch.nn.Sequential(
+            torch.nn.AdaptiveAvgPool2d(4),
+            torch.nn.Flatten(),
+            torch.nn.Linear(3 * 4 * 4, classes),
+        ).eval()
+
+    bundle = ModelBundle(
+        uplow_model=_head(2),
+        mpi_model=_head(3),
+        index_model_123=_head(3),
+        index_model_1234=_head(4),
+        device=torch.device("cpu"),
+    )
+    monkeypatch.setattr(predict, "get_models", lambda: bundle)
+
+    images = [
+        Image.effect_noise((40 + 7 * i, 30 + 3 * i), 20 + 10 * i).convert("RGB")
+        for i in range(6)
+    ]
+    expected = [chain.classify_token_image(image) for image in images]
+    batched = chain.classify_token_images(images, batch_size=4)
+
+    assert [item[0] for item in batched] == [item[0] for item in expected]
+    for (_n, conf_b, parts_b), (_e, conf_e, parts_e) in zip(batched, expected):
+        assert conf_b == pytest.approx(conf_e, abs=1e-6)
+        assert parts_b["index"]["label"] == parts_e["index"]["label"]